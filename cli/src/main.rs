@@ -47,6 +47,7 @@ async fn main() -> Result<()> {
                         .arg(Arg::new("name").help("Collection name").required(true))
                         .arg(Arg::new("dimension").long("dimension").short('d').help("Vector dimension").required(true))
                         .arg(Arg::new("metric").long("metric").short('m').help("Distance metric (cosine, euclidean, dot_product, manhattan)").default_value("cosine"))
+                        .arg(Arg::new("index").long("index").help("Index type (hnsw, ivf_pq, flat)").default_value("hnsw"))
                 )
                 .subcommand(
                     Command::new("list")
@@ -89,6 +90,10 @@ async fn main() -> Result<()> {
                         .arg(Arg::new("vector").help("Query vector as JSON array").required(true))
                         .arg(Arg::new("limit").long("limit").short('l').help("Number of results").default_value("10"))
                         .arg(Arg::new("ef-search").long("ef-search").help("EF search parameter"))
+                        .arg(Arg::new("nprobe").long("nprobe").help("IVF-PQ clusters to scan"))
+                        .arg(Arg::new("oversampling").long("oversampling").help("Candidates per result to rescore from a compressed index"))
+                        .arg(Arg::new("exact").long("exact").help("Scan every vector instead of searching the index").action(clap::ArgAction::SetTrue))
+                        .arg(Arg::new("deadline-ms").long("deadline-ms").help("Milliseconds to search before returning the best results so far"))
                 )
                 .subcommand(
                     Command::new("get")
@@ -171,12 +176,22 @@ async fn handle_collections_command(client: &dyn VectorDbClient, matches: &ArgMa
                 _ => return Err(anyhow::anyhow!("Invalid distance metric: {}", metric_str)),
             };
 
+            let index_str = sub_matches.get_one::<String>("index").unwrap();
+            let index_type = match index_str.as_str() {
+                "hnsw" => IndexType::Hnsw,
+                "ivf_pq" => IndexType::IvfPq,
+                "flat" => IndexType::Flat,
+                _ => return Err(anyhow::anyhow!("Invalid index type: {}", index_str)),
+            };
+
             let config = CollectionConfig {
                 name: name.clone(),
                 dimension,
                 distance_metric,
                 vector_type: VectorType::Float32,
-                index_config: IndexConfig::default(),
+                index_config: IndexConfig { index_type, ..IndexConfig::default() },
+                durability: None,
+                indexed_fields: Vec::new(),
             };
 
             client.create_collection(&config).await?;
@@ -272,6 +287,10 @@ async fn handle_vectors_command(client: &dyn VectorDbClient, matches: &ArgMatche
             let vector_str = sub_matches.get_one::<String>("vector").unwrap();
             let limit: usize = sub_matches.get_one::<String>("limit").unwrap().parse()?;
             let ef_search = sub_matches.get_one::<String>("ef-search").map(|s| s.parse().unwrap());
+            let nprobe = sub_matches.get_one::<String>("nprobe").map(|s| s.parse().unwrap());
+            let oversampling = sub_matches.get_one::<String>("oversampling").map(|s| s.parse().unwrap());
+            let exact = sub_matches.get_flag("exact");
+            let deadline_ms = sub_matches.get_one::<String>("deadline-ms").map(|s| s.parse().unwrap());
 
             let query_vector: Vec<f32> = serde_json::from_str(vector_str)?;
 
@@ -280,7 +299,11 @@ async fn handle_vectors_command(client: &dyn VectorDbClient, matches: &ArgMatche
                 vector: query_vector,
                 limit,
                 ef_search,
+                nprobe,
+                oversampling,
+                exact,
                 filter: None,
+                deadline_ms,
             };
 
             let results = client.query(&request).await?;
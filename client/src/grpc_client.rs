@@ -103,12 +103,8 @@ impl VectorDbClient for GrpcClient {
             dimension: config.dimension as u32,
             distance_metric: config.distance_metric.into(),
             vector_type: config.vector_type.into(),
-            index_config: Some(vectordb_proto::IndexConfig {
-                max_connections: config.index_config.max_connections as u32,
-                ef_construction: config.index_config.ef_construction as u32,
-                ef_search: config.index_config.ef_search as u32,
-                max_layer: config.index_config.max_layer as u32,
-            }),
+            index_config: Some(config.index_config.clone().into()),
+            indexed_fields: config.indexed_fields.clone(),
         };
 
         let request = CreateCollectionRequest {
@@ -189,14 +185,9 @@ impl VectorDbClient for GrpcClient {
             dimension: proto_config.dimension as usize,
             distance_metric: proto_config.distance_metric().into(),
             vector_type: proto_config.vector_type().into(),
-            index_config: proto_config.index_config.map_or(IndexConfig::default(), |ic| {
-                IndexConfig {
-                    max_connections: ic.max_connections as usize,
-                    ef_construction: ic.ef_construction as usize,
-                    ef_search: ic.ef_search as usize,
-                    max_layer: ic.max_layer as usize,
-                }
-            }),
+            index_config: proto_config.index_config.clone().map_or(IndexConfig::default(), Into::into),
+            durability: None,
+            indexed_fields: proto_config.indexed_fields.clone(),
         };
 
         let stats = CommonCollectionStats {
@@ -284,11 +275,15 @@ impl VectorDbClient for GrpcClient {
             query_vector: request.vector.clone(),
             limit: request.limit as u32,
             ef_search: request.ef_search.map(|ef| ef as u32),
+            nprobe: request.nprobe.map(|nprobe| nprobe as u32),
+            oversampling: request.oversampling,
+            exact: request.exact,
             filter: request.filter.as_ref().map_or(HashMap::new(), |filter| {
                 filter.iter()
                     .map(|(k, v)| (k.clone(), v.to_string()))
                     .collect()
             }),
+            deadline_ms: request.deadline_ms,
         };
 
         let response = self.with_retry(|| async {
@@ -405,6 +400,8 @@ impl VectorDbClient for GrpcClient {
             memory_usage: stats.memory_usage,
             disk_usage: stats.disk_usage,
             uptime_seconds: stats.uptime_seconds,
+            search_queue_depth: stats.search_queue_depth,
+            search_queue_capacity: stats.search_queue_capacity,
         })
     }
 
@@ -57,6 +57,12 @@ pub struct ServerStats {
     pub memory_usage: u64,
     pub disk_usage: u64,
     pub uptime_seconds: u64,
+    /// Searches and index builds waiting for a server worker
+    #[serde(default)]
+    pub search_queue_depth: u64,
+    /// Jobs that may wait before the server rejects searches
+    #[serde(default)]
+    pub search_queue_capacity: u64,
 }
 
 /// Create a client based on configuration
@@ -245,14 +245,22 @@ impl VectorDbClient for RestClient {
             vector: Vec<f32>,
             limit: Option<usize>,
             ef_search: Option<usize>,
+            nprobe: Option<usize>,
+            oversampling: Option<f32>,
+            exact: bool,
             filter: Option<HashMap<String, serde_json::Value>>,
+            deadline_ms: Option<u64>,
         }
 
         let request_body = QueryVectorsRequest {
             vector: request.vector.clone(),
             limit: Some(request.limit),
             ef_search: request.ef_search,
+            nprobe: request.nprobe,
+            oversampling: request.oversampling,
+            exact: request.exact,
             filter: request.filter.clone(),
+            deadline_ms: request.deadline_ms,
         };
 
         let http_request = self.client
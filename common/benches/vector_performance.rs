@@ -1,6 +1,7 @@
-use criterion::{black_box, criterion_group, criterion_main, Criterion};
+use criterion::{black_box, criterion_group, criterion_main, BenchmarkId, Criterion, Throughput};
 use vectordb_common::types::*;
 use vectordb_common::distance::*;
+use vectordb_common::simd::{magnitude, Kernels, SimdLevel};
 use vectordb_index::{VectorIndex, HnswIndex};
 use uuid::Uuid;
 use std::collections::HashMap;
@@ -18,27 +19,64 @@ fn generate_test_vectors(count: usize, dim: usize) -> Vec<(VectorId, Vec<f32>)>
 }
 
 fn bench_distance_calculations(c: &mut Criterion) {
-    let dim = 128;
-    let a = vec![1.0; dim];
-    let b = vec![0.5; dim];
-    
-    c.bench_function("cosine_distance", |bench| {
-        bench.iter(|| {
-            black_box(distance(&a, &b, DistanceMetric::Cosine))
-        })
-    });
-    
-    c.bench_function("euclidean_distance", |bench| {
-        bench.iter(|| {
-            black_box(distance(&a, &b, DistanceMetric::Euclidean))
-        })
-    });
-    
-    c.bench_function("dot_product", |bench| {
-        bench.iter(|| {
-            black_box(distance(&a, &b, DistanceMetric::DotProduct))
-        })
-    });
+    for dim in [128, 384, 768, 1536] {
+        let a: Vec<f32> = (0..dim).map(|i| (i as f32 * 0.37).sin()).collect();
+        let b: Vec<f32> = (0..dim).map(|i| (i as f32 * 0.11).cos()).collect();
+        let b_f16: Vec<half::f16> = b.iter().map(|&x| half::f16::from_f32(x)).collect();
+        let b_i8: Vec<i8> = b.iter().map(|&x| (x * 127.0).round() as i8).collect();
+        let sign_bits = |v: &[f32]| -> Vec<u64> {
+            v.chunks(64)
+                .map(|chunk| chunk.iter().enumerate().fold(0u64, |bits, (i, &x)| bits | ((x > 0.0) as u64) << i))
+                .collect()
+        };
+        let (a_bits, b_bits) = (sign_bits(&a), sign_bits(&b));
+        
+        // Every kernel set this CPU supports, for each metric's kernel
+        let mut group = c.benchmark_group(format!("distance_kernels_{}", dim));
+        group.throughput(Throughput::Elements(dim as u64));
+        for level in SimdLevel::available() {
+            let kernels = Kernels::for_level(level);
+            group.bench_function(BenchmarkId::new("dot_product", level.name()), |bench| {
+                bench.iter(|| black_box((kernels.dot_product)(black_box(&a), black_box(&b))))
+            });
+            group.bench_function(BenchmarkId::new("squared_euclidean", level.name()), |bench| {
+                bench.iter(|| black_box((kernels.squared_euclidean)(black_box(&a), black_box(&b))))
+            });
+            group.bench_function(BenchmarkId::new("manhattan", level.name()), |bench| {
+                bench.iter(|| black_box((kernels.manhattan)(black_box(&a), black_box(&b))))
+            });
+            group.bench_function(BenchmarkId::new("dot_product_f16", level.name()), |bench| {
+                bench.iter(|| black_box((kernels.dot_product_f16)(black_box(&a), black_box(&b_f16))))
+            });
+            group.bench_function(BenchmarkId::new("dot_product_i8", level.name()), |bench| {
+                bench.iter(|| black_box((kernels.dot_product_i8)(black_box(&a), black_box(&b_i8), 1.0 / 127.0)))
+            });
+            group.bench_function(BenchmarkId::new("hamming", level.name()), |bench| {
+                bench.iter(|| black_box((kernels.hamming)(black_box(&a_bits), black_box(&b_bits))))
+            });
+        }
+        group.finish();
+        
+        // Dispatched metrics, with cosine recomputing norms and using stored ones
+        let mut group = c.benchmark_group(format!("distance_metrics_{}", dim));
+        for metric in [
+            DistanceMetric::Cosine,
+            DistanceMetric::Euclidean,
+            DistanceMetric::DotProduct,
+            DistanceMetric::Manhattan,
+        ] {
+            group.bench_function(format!("{:?}", metric), |bench| {
+                bench.iter(|| black_box(distance(black_box(&a), black_box(&b), metric)))
+            });
+        }
+        let (norm_a, norm_b) = (magnitude(&a), magnitude(&b));
+        group.bench_function("Cosine_with_norms", |bench| {
+            bench.iter(|| {
+                black_box(distance_with_norms(black_box(&a), black_box(&b), norm_a, norm_b, DistanceMetric::Cosine))
+            })
+        });
+        group.finish();
+    }
 }
 
 fn bench_hnsw_operations(c: &mut Criterion) {
@@ -48,12 +86,13 @@ fn bench_hnsw_operations(c: &mut Criterion) {
         ef_construction: 200,
         ef_search: 50,
         max_layer: 16,
+        ..IndexConfig::default()
     };
     
     // Benchmark vector insertion
     c.bench_function("hnsw_insert_1000", |bench| {
         bench.iter(|| {
-            let mut index = HnswIndex::new(config.clone(), DistanceMetric::Cosine, dim);
+            let index = HnswIndex::new(config.clone(), DistanceMetric::Cosine, dim);
             let vectors = generate_test_vectors(1000, dim);
             
             for (id, vector) in vectors {
@@ -62,8 +101,21 @@ fn bench_hnsw_operations(c: &mut Criterion) {
         })
     });
     
+    // Benchmark parallel batch insertion
+    c.bench_function("hnsw_batch_insert_1000", |bench| {
+        bench.iter(|| {
+            let index = HnswIndex::new(config.clone(), DistanceMetric::Cosine, dim);
+            let vectors: Vec<Vector> = generate_test_vectors(1000, dim)
+                .into_iter()
+                .map(|(id, data)| Vector { id, data, metadata: None })
+                .collect();
+            
+            let _ = index.batch_insert(&vectors);
+        })
+    });
+    
     // Benchmark search performance
-    let mut index = HnswIndex::new(config.clone(), DistanceMetric::Cosine, dim);
+    let index = HnswIndex::new(config.clone(), DistanceMetric::Cosine, dim);
     let vectors = generate_test_vectors(5000, dim);
     
     // Pre-populate index
@@ -78,12 +130,19 @@ fn bench_hnsw_operations(c: &mut Criterion) {
             black_box(index.search(&query_vector, 10, None).unwrap())
         })
     });
+    
+    // Wide beam: dominated by neighbor traversal and distance computations
+    c.bench_function("hnsw_search_5000_ef200", |bench| {
+        bench.iter(|| {
+            black_box(index.search(&query_vector, 10, Some(200)).unwrap())
+        })
+    });
 }
 
 fn bench_metadata_operations(c: &mut Criterion) {
     let dim = 128;
     let config = IndexConfig::default();
-    let mut index = HnswIndex::new(config, DistanceMetric::Cosine, dim);
+    let index = HnswIndex::new(config, DistanceMetric::Cosine, dim);
     
     // Test with metadata
     c.bench_function("insert_with_metadata", |bench| {
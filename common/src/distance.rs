@@ -13,11 +13,25 @@ pub fn distance(a: &[f32], b: &[f32], metric: DistanceMetric) -> f32 {
     }
 }
 
+/// Calculate distance given both vectors' magnitudes
+///
+/// Only cosine uses the magnitudes, which indexes compute once per stored
+/// vector and once per query instead of on every comparison.
+pub fn distance_with_norms(a: &[f32], b: &[f32], norm_a: f32, norm_b: f32, metric: DistanceMetric) -> f32 {
+    match metric {
+        DistanceMetric::Cosine => 1.0 - cosine_similarity_with_norms(a, b, norm_a, norm_b),
+        _ => distance(a, b, metric),
+    }
+}
+
 /// Calculate cosine similarity between two vectors
 pub fn cosine_similarity(a: &[f32], b: &[f32]) -> f32 {
+    cosine_similarity_with_norms(a, b, simd::magnitude(a), simd::magnitude(b))
+}
+
+/// Calculate cosine similarity given both vectors' magnitudes
+pub fn cosine_similarity_with_norms(a: &[f32], b: &[f32], norm_a: f32, norm_b: f32) -> f32 {
     let dot = simd::dot_product(a, b);
-    let norm_a = simd::magnitude(a);
-    let norm_b = simd::magnitude(b);
     
     if norm_a == 0.0 || norm_b == 0.0 {
         0.0
@@ -66,6 +80,16 @@ mod tests {
         assert!((cosine_similarity(&a, &b) - 0.0).abs() < 1e-6);
     }
 
+    #[test]
+    fn test_distance_with_norms() {
+        let a = vec![3.0, 4.0, 0.0];
+        let b = vec![1.0, 2.0, 2.0];
+        for metric in [DistanceMetric::Cosine, DistanceMetric::Euclidean, DistanceMetric::DotProduct] {
+            let with_norms = distance_with_norms(&a, &b, 5.0, 3.0, metric);
+            assert!((with_norms - distance(&a, &b, metric)).abs() < 1e-6);
+        }
+    }
+
     #[test]
     fn test_euclidean_distance() {
         let a = vec![0.0, 0.0];
@@ -37,6 +37,9 @@ pub enum VectorDbError {
     #[error("Configuration error: {message}")]
     ConfigError { message: String },
 
+    #[error("Server overloaded: {message}")]
+    Overloaded { message: String },
+
     #[error("Internal error: {message}")]
     Internal { message: String },
 }
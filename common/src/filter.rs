@@ -0,0 +1,101 @@
+use serde_json::Value;
+use std::collections::HashMap;
+
+/// Conjunction of metadata conditions taken from a query's `filter`
+///
+/// Every key must be present in a vector's metadata with a matching value.
+/// An array in the filter matches any of its elements, and an array in the
+/// metadata matches if any of its elements does. Strings match numbers and
+/// booleans by their text form, since gRPC carries filter values as strings.
+#[derive(Debug, Clone, Default)]
+pub struct MetadataFilter {
+    conditions: Vec<(String, Vec<Value>)>,
+}
+
+impl MetadataFilter {
+    pub fn new(filter: &HashMap<String, Value>) -> Self {
+        let conditions = filter
+            .iter()
+            .map(|(key, value)| {
+                let allowed = match value {
+                    Value::Array(values) => values.clone(),
+                    value => vec![value.clone()],
+                };
+                (key.clone(), allowed)
+            })
+            .collect();
+        Self { conditions }
+    }
+
+    pub fn is_empty(&self) -> bool {
+        self.conditions.is_empty()
+    }
+
+    /// Metadata keys and the values each may take
+    pub fn conditions(&self) -> impl Iterator<Item = (&str, &[Value])> {
+        self.conditions.iter().map(|(key, allowed)| (key.as_str(), allowed.as_slice()))
+    }
+
+    /// Whether a vector's metadata satisfies every condition
+    pub fn matches(&self, metadata: Option<&HashMap<String, Value>>) -> bool {
+        self.conditions.iter().all(|(key, allowed)| {
+            metadata
+                .and_then(|metadata| metadata.get(key))
+                .map_or(false, |value| {
+                    allowed.iter().any(|expected| value_matches(expected, value))
+                })
+        })
+    }
+}
+
+/// Text form of a scalar metadata value, as used for matching and index keys
+pub fn value_key(value: &Value) -> Option<String> {
+    match value {
+        Value::String(s) => Some(s.clone()),
+        Value::Number(n) => Some(n.to_string()),
+        Value::Bool(b) => Some(b.to_string()),
+        _ => None,
+    }
+}
+
+/// Index keys a metadata value is found under; arrays under each element
+pub fn value_keys(value: &Value) -> Vec<String> {
+    match value {
+        Value::Array(values) => values.iter().filter_map(value_key).collect(),
+        value => value_key(value).into_iter().collect(),
+    }
+}
+
+fn value_matches(expected: &Value, actual: &Value) -> bool {
+    if expected == actual {
+        return true;
+    }
+    match actual {
+        Value::Array(values) => values.iter().any(|value| value_matches(expected, value)),
+        actual => value_key(expected).is_some() && value_key(expected) == value_key(actual),
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use serde_json::json;
+
+    fn metadata(value: Value) -> HashMap<String, Value> {
+        serde_json::from_value(value).unwrap()
+    }
+
+    #[test]
+    fn test_filter_matching() {
+        let doc = metadata(json!({"category": "news", "index": 5, "tags": ["a", "b"]}));
+        let filter = |value: Value| MetadataFilter::new(&metadata(value));
+
+        assert!(filter(json!({"category": "news"})).matches(Some(&doc)));
+        assert!(filter(json!({"index": "5"})).matches(Some(&doc)));
+        assert!(filter(json!({"category": ["sports", "news"], "tags": "b"})).matches(Some(&doc)));
+        assert!(!filter(json!({"category": "news", "index": 6})).matches(Some(&doc)));
+        assert!(!filter(json!({"missing": "x"})).matches(Some(&doc)));
+        assert!(!filter(json!({"category": "news"})).matches(None));
+        assert!(filter(json!({})).matches(None));
+    }
+}
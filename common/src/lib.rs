@@ -1,8 +1,11 @@
 pub mod error;
 pub mod types;
 pub mod distance;
+pub mod filter;
+pub mod metadata;
 pub mod simd;
 
 pub use error::{VectorDbError, Result};
 pub use types::*;
-pub use distance::*;
\ No newline at end of file
+pub use distance::*;
+pub use filter::MetadataFilter;
\ No newline at end of file
@@ -0,0 +1,93 @@
+//! Serde support for vector metadata in binary formats
+//!
+//! Metadata values are `serde_json::Value`s, which can only be decoded by
+//! self-describing formats. Records, WAL entries and index snapshots are
+//! bincode, which is not one, so there metadata is written as a JSON
+//! string instead. Human-readable formats such as the REST API's JSON
+//! still see a plain map.
+//!
+//! Use on an `Option<Metadata>` field with
+//! `#[serde(with = "vectordb_common::metadata")]`, or on a
+//! `Vec<Option<Metadata>>` with `vectordb_common::metadata::seq`.
+
+use serde::de::Error as _;
+use serde::ser::Error as _;
+use serde::{Deserialize, Deserializer, Serialize, Serializer};
+use std::collections::HashMap;
+
+/// Metadata attached to a vector
+pub type Metadata = HashMap<String, serde_json::Value>;
+
+pub fn serialize<S: Serializer>(metadata: &Option<Metadata>, serializer: S) -> Result<S::Ok, S::Error> {
+    if serializer.is_human_readable() {
+        return metadata.serialize(serializer);
+    }
+    let json = metadata
+        .as_ref()
+        .map(serde_json::to_string)
+        .transpose()
+        .map_err(S::Error::custom)?;
+    json.serialize(serializer)
+}
+
+pub fn deserialize<'de, D: Deserializer<'de>>(deserializer: D) -> Result<Option<Metadata>, D::Error> {
+    if deserializer.is_human_readable() {
+        return Option::<Metadata>::deserialize(deserializer);
+    }
+    Option::<String>::deserialize(deserializer)?
+        .map(|json| serde_json::from_str(&json))
+        .transpose()
+        .map_err(D::Error::custom)
+}
+
+/// The same encoding for the metadata of a sequence of vectors
+pub mod seq {
+    use super::Metadata;
+    use serde::{Deserialize, Deserializer, Serialize, Serializer};
+
+    struct Encode<'a>(&'a Option<Metadata>);
+
+    impl Serialize for Encode<'_> {
+        fn serialize<S: Serializer>(&self, serializer: S) -> Result<S::Ok, S::Error> {
+            super::serialize(self.0, serializer)
+        }
+    }
+
+    struct Decode(Option<Metadata>);
+
+    impl<'de> Deserialize<'de> for Decode {
+        fn deserialize<D: Deserializer<'de>>(deserializer: D) -> Result<Self, D::Error> {
+            super::deserialize(deserializer).map(Decode)
+        }
+    }
+
+    pub fn serialize<S: Serializer>(metadata: &[Option<Metadata>], serializer: S) -> Result<S::Ok, S::Error> {
+        serializer.collect_seq(metadata.iter().map(Encode))
+    }
+
+    pub fn deserialize<'de, D: Deserializer<'de>>(deserializer: D) -> Result<Vec<Option<Metadata>>, D::Error> {
+        let decoded = Vec::<Decode>::deserialize(deserializer)?;
+        Ok(decoded.into_iter().map(|m| m.0).collect())
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use crate::types::Vector;
+
+    #[test]
+    fn test_metadata_round_trips_through_bincode() {
+        let vector = Vector {
+            id: uuid::Uuid::new_v4(),
+            data: vec![1.0, 2.0],
+            metadata: serde_json::from_value(serde_json::json!({"tag": "a", "n": [1, 2.5, null]})).unwrap(),
+        };
+        let bytes = bincode::serialize(&vector).unwrap();
+        let decoded: Vector = bincode::deserialize(&bytes).unwrap();
+        assert_eq!(decoded.metadata, vector.metadata);
+
+        // JSON still carries a plain map
+        let json = serde_json::to_value(&vector).unwrap();
+        assert_eq!(json["metadata"]["tag"], "a");
+    }
+}
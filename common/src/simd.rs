@@ -1,46 +1,537 @@
-/// SIMD-optimized vector operations
-/// For now, using standard implementations - SIMD optimization can be added later
+//! SIMD-optimized vector operations
+//!
+//! Each operation has a portable implementation plus AVX2/FMA and AVX-512
+//! kernels on x86_64. The best kernel set the CPU supports is picked once,
+//! on first use, and every call after that goes straight to it.
+//!
+//! Besides f32 pairs there are kernels comparing an f32 query against a
+//! compressed row, float16 or int8, widening the row as it is read, and a
+//! popcount kernel for the Hamming distance between bit-packed rows.
+
+use half::f16;
+use std::sync::OnceLock;
+
+/// Instruction set a kernel is written for
+#[derive(Debug, Clone, Copy, PartialEq, Eq, PartialOrd, Ord, Hash)]
+pub enum SimdLevel {
+    /// Portable Rust, left to the compiler to vectorize
+    Scalar,
+    /// 256-bit AVX2 with fused multiply-add and F16C conversions
+    Avx2,
+    /// 512-bit AVX-512F, with VPOPCNTDQ for Hamming distance where present
+    Avx512,
+}
+
+impl SimdLevel {
+    /// Best level supported by the running CPU
+    pub fn detect() -> Self {
+        #[cfg(target_arch = "x86_64")]
+        {
+            // The AVX-512 level reuses the AVX2 kernels for compressed rows
+            let avx2 = is_x86_feature_detected!("avx2")
+                && is_x86_feature_detected!("fma")
+                && is_x86_feature_detected!("f16c");
+            if avx2 && is_x86_feature_detected!("avx512f") {
+                return SimdLevel::Avx512;
+            }
+            if avx2 {
+                return SimdLevel::Avx2;
+            }
+        }
+        SimdLevel::Scalar
+    }
+
+    /// Every level the running CPU supports, from portable to widest
+    pub fn available() -> Vec<Self> {
+        [SimdLevel::Scalar, SimdLevel::Avx2, SimdLevel::Avx512]
+            .into_iter()
+            .filter(|level| *level <= Self::detect())
+            .collect()
+    }
+
+    pub fn name(&self) -> &'static str {
+        match self {
+            SimdLevel::Scalar => "scalar",
+            SimdLevel::Avx2 => "avx2",
+            SimdLevel::Avx512 => "avx512",
+        }
+    }
+}
+
+type Kernel = fn(&[f32], &[f32]) -> f32;
+/// Query against a float16 row
+type HalfKernel = fn(&[f32], &[f16]) -> f32;
+/// Query against an int8 row, whose codes are multiplied by the row's scale
+type Int8Kernel = fn(&[f32], &[i8], f32) -> f32;
+/// Differing bits between two bit-packed rows
+type HammingKernel = fn(&[u64], &[u64]) -> u32;
+
+/// Distance kernels written for one instruction set
+#[derive(Debug, Clone, Copy)]
+pub struct Kernels {
+    pub level: SimdLevel,
+    pub dot_product: Kernel,
+    /// Squared Euclidean distance
+    pub squared_euclidean: Kernel,
+    pub manhattan: Kernel,
+    pub dot_product_f16: HalfKernel,
+    pub squared_euclidean_f16: HalfKernel,
+    pub manhattan_f16: HalfKernel,
+    pub dot_product_i8: Int8Kernel,
+    pub squared_euclidean_i8: Int8Kernel,
+    pub manhattan_i8: Int8Kernel,
+    pub hamming: HammingKernel,
+}
+
+impl Kernels {
+    /// Kernels for a level; callers must check the CPU supports it
+    pub fn for_level(level: SimdLevel) -> Self {
+        assert!(level <= SimdLevel::detect(), "CPU does not support {:?}", level);
+        match level {
+            SimdLevel::Scalar => Self {
+                level,
+                dot_product: scalar::dot_product,
+                squared_euclidean: scalar::squared_euclidean,
+                manhattan: scalar::manhattan,
+                dot_product_f16: scalar::dot_product_f16,
+                squared_euclidean_f16: scalar::squared_euclidean_f16,
+                manhattan_f16: scalar::manhattan_f16,
+                dot_product_i8: scalar::dot_product_i8,
+                squared_euclidean_i8: scalar::squared_euclidean_i8,
+                manhattan_i8: scalar::manhattan_i8,
+                hamming: scalar::hamming,
+            },
+            #[cfg(target_arch = "x86_64")]
+            SimdLevel::Avx2 => Self::avx2(level),
+            #[cfg(target_arch = "x86_64")]
+            SimdLevel::Avx512 => {
+                let kernels = Self {
+                    level,
+                    // SAFETY: the CPU supports AVX-512F, checked above
+                    dot_product: |a, b| unsafe { avx512::dot_product(a, b) },
+                    squared_euclidean: |a, b| unsafe { avx512::squared_euclidean(a, b) },
+                    manhattan: |a, b| unsafe { avx512::manhattan(a, b) },
+                    ..Self::avx2(level)
+                };
+                if is_x86_feature_detected!("avx512vpopcntdq") {
+                    // SAFETY: VPOPCNTDQ was just detected
+                    Self { hamming: |a, b| unsafe { avx512::hamming(a, b) }, ..kernels }
+                } else {
+                    kernels
+                }
+            }
+            #[cfg(not(target_arch = "x86_64"))]
+            _ => unreachable!(),
+        }
+    }
+
+    /// AVX2 kernels, which the AVX-512 level keeps for compressed rows
+    ///
+    /// Widening the row, not the arithmetic, bounds those kernels, so
+    /// 512-bit registers would not make them faster.
+    #[cfg(target_arch = "x86_64")]
+    fn avx2(level: SimdLevel) -> Self {
+        Self {
+            level,
+            // SAFETY: both x86 levels require AVX2, FMA and F16C, and
+            // callers check the CPU supports the level
+            dot_product: |a, b| unsafe { avx2::dot_product(a, b) },
+            squared_euclidean: |a, b| unsafe { avx2::squared_euclidean(a, b) },
+            manhattan: |a, b| unsafe { avx2::manhattan(a, b) },
+            dot_product_f16: |a, b| unsafe { avx2::dot_product_f16(a, b) },
+            squared_euclidean_f16: |a, b| unsafe { avx2::squared_euclidean_f16(a, b) },
+            manhattan_f16: |a, b| unsafe { avx2::manhattan_f16(a, b) },
+            dot_product_i8: |a, b, scale| unsafe { avx2::dot_product_i8(a, b, scale) },
+            squared_euclidean_i8: |a, b, scale| unsafe { avx2::squared_euclidean_i8(a, b, scale) },
+            manhattan_i8: |a, b, scale| unsafe { avx2::manhattan_i8(a, b, scale) },
+            hamming: |a, b| unsafe { avx2::hamming(a, b) },
+        }
+    }
+
+    /// Kernels for the best level the running CPU supports
+    pub fn active() -> &'static Self {
+        static ACTIVE: OnceLock<Kernels> = OnceLock::new();
+        ACTIVE.get_or_init(|| Self::for_level(SimdLevel::detect()))
+    }
+}
 
 /// Calculate dot product between two vectors
 pub fn dot_product(a: &[f32], b: &[f32]) -> f32 {
     assert_eq!(a.len(), b.len());
-    
-    a.iter()
-        .zip(b.iter())
-        .map(|(x, y)| x * y)
-        .sum()
+    (Kernels::active().dot_product)(a, b)
 }
 
 /// Calculate magnitude of a vector
 pub fn magnitude(vector: &[f32]) -> f32 {
-    vector.iter()
-        .map(|x| x * x)
-        .sum::<f32>()
-        .sqrt()
+    (Kernels::active().dot_product)(vector, vector).sqrt()
+}
+
+/// Calculate squared Euclidean distance between two vectors
+pub fn squared_euclidean_distance(a: &[f32], b: &[f32]) -> f32 {
+    assert_eq!(a.len(), b.len());
+    (Kernels::active().squared_euclidean)(a, b)
 }
 
 /// Calculate Euclidean distance between two vectors
 pub fn euclidean_distance(a: &[f32], b: &[f32]) -> f32 {
-    assert_eq!(a.len(), b.len());
-    
-    a.iter()
-        .zip(b.iter())
-        .map(|(x, y)| {
-            let diff = x - y;
-            diff * diff
-        })
-        .sum::<f32>()
-        .sqrt()
+    squared_euclidean_distance(a, b).sqrt()
 }
 
 /// Calculate Manhattan distance between two vectors
 pub fn manhattan_distance(a: &[f32], b: &[f32]) -> f32 {
     assert_eq!(a.len(), b.len());
-    
-    a.iter()
-        .zip(b.iter())
-        .map(|(x, y)| (x - y).abs())
-        .sum()
+    (Kernels::active().manhattan)(a, b)
+}
+
+/// Dot product of a query and a float16 row
+pub fn dot_product_f16(a: &[f32], b: &[f16]) -> f32 {
+    assert_eq!(a.len(), b.len());
+    (Kernels::active().dot_product_f16)(a, b)
+}
+
+/// Squared Euclidean distance between a query and a float16 row
+pub fn squared_euclidean_distance_f16(a: &[f32], b: &[f16]) -> f32 {
+    assert_eq!(a.len(), b.len());
+    (Kernels::active().squared_euclidean_f16)(a, b)
+}
+
+/// Manhattan distance between a query and a float16 row
+pub fn manhattan_distance_f16(a: &[f32], b: &[f16]) -> f32 {
+    assert_eq!(a.len(), b.len());
+    (Kernels::active().manhattan_f16)(a, b)
+}
+
+/// Dot product of a query and an int8 row with the given scale
+pub fn dot_product_i8(a: &[f32], b: &[i8], scale: f32) -> f32 {
+    assert_eq!(a.len(), b.len());
+    (Kernels::active().dot_product_i8)(a, b, scale)
+}
+
+/// Squared Euclidean distance between a query and an int8 row with the given scale
+pub fn squared_euclidean_distance_i8(a: &[f32], b: &[i8], scale: f32) -> f32 {
+    assert_eq!(a.len(), b.len());
+    (Kernels::active().squared_euclidean_i8)(a, b, scale)
+}
+
+/// Manhattan distance between a query and an int8 row with the given scale
+pub fn manhattan_distance_i8(a: &[f32], b: &[i8], scale: f32) -> f32 {
+    assert_eq!(a.len(), b.len());
+    (Kernels::active().manhattan_i8)(a, b, scale)
+}
+
+/// Number of bits that differ between two bit-packed rows
+pub fn hamming_distance(a: &[u64], b: &[u64]) -> u32 {
+    assert_eq!(a.len(), b.len());
+    (Kernels::active().hamming)(a, b)
+}
+
+/// Portable kernels; independent accumulators let the compiler vectorize
+mod scalar {
+    use half::f16;
+
+    const LANES: usize = 8;
+
+    /// Sum `op(x, widen(y))` over both vectors
+    fn fold<B: Copy>(a: &[f32], b: &[B], widen: impl Fn(B) -> f32, op: impl Fn(f32, f32) -> f32) -> f32 {
+        let mut sums = [0.0f32; LANES];
+        let (a_chunks, b_chunks) = (a.chunks_exact(LANES), b.chunks_exact(LANES));
+        let tail: f32 = a_chunks
+            .remainder()
+            .iter()
+            .zip(b_chunks.remainder())
+            .map(|(x, y)| op(*x, widen(*y)))
+            .sum();
+        for (x, y) in a_chunks.zip(b_chunks) {
+            for lane in 0..LANES {
+                sums[lane] += op(x[lane], widen(y[lane]));
+            }
+        }
+        sums.iter().sum::<f32>() + tail
+    }
+
+    pub fn dot_product(a: &[f32], b: &[f32]) -> f32 {
+        fold(a, b, |y| y, |x, y| x * y)
+    }
+
+    pub fn squared_euclidean(a: &[f32], b: &[f32]) -> f32 {
+        fold(a, b, |y| y, |x, y| (x - y) * (x - y))
+    }
+
+    pub fn manhattan(a: &[f32], b: &[f32]) -> f32 {
+        fold(a, b, |y| y, |x, y| (x - y).abs())
+    }
+
+    pub fn dot_product_f16(a: &[f32], b: &[f16]) -> f32 {
+        fold(a, b, f16::to_f32, |x, y| x * y)
+    }
+
+    pub fn squared_euclidean_f16(a: &[f32], b: &[f16]) -> f32 {
+        fold(a, b, f16::to_f32, |x, y| (x - y) * (x - y))
+    }
+
+    pub fn manhattan_f16(a: &[f32], b: &[f16]) -> f32 {
+        fold(a, b, f16::to_f32, |x, y| (x - y).abs())
+    }
+
+    pub fn dot_product_i8(a: &[f32], b: &[i8], scale: f32) -> f32 {
+        scale * fold(a, b, |y| y as f32, |x, y| x * y)
+    }
+
+    pub fn squared_euclidean_i8(a: &[f32], b: &[i8], scale: f32) -> f32 {
+        fold(a, b, |y| y as f32 * scale, |x, y| (x - y) * (x - y))
+    }
+
+    pub fn manhattan_i8(a: &[f32], b: &[i8], scale: f32) -> f32 {
+        fold(a, b, |y| y as f32 * scale, |x, y| (x - y).abs())
+    }
+
+    pub fn hamming(a: &[u64], b: &[u64]) -> u32 {
+        a.iter().zip(b).map(|(x, y)| (x ^ y).count_ones()).sum()
+    }
+}
+
+#[cfg(target_arch = "x86_64")]
+mod avx2 {
+    use half::f16;
+    use std::arch::x86_64::*;
+
+    #[inline]
+    #[target_feature(enable = "avx2,fma")]
+    unsafe fn sum_lanes(v: __m256) -> f32 {
+        let halves = _mm_add_ps(_mm256_castps256_ps128(v), _mm256_extractf128_ps(v, 1));
+        let pairs = _mm_add_ps(halves, _mm_movehl_ps(halves, halves));
+        _mm_cvtss_f32(_mm_add_ss(pairs, _mm_shuffle_ps(pairs, pairs, 1)))
+    }
+
+    /// Sum `step(acc, x, y)` over 8-float blocks, where `load` reads 8
+    /// elements of `b` as floats, finishing the tail with `tail(x, y)`
+    #[inline]
+    #[target_feature(enable = "avx2,fma")]
+    unsafe fn fold<B: Copy>(
+        a: &[f32],
+        b: &[B],
+        load: impl Fn(*const B) -> __m256,
+        step: impl Fn(__m256, __m256, __m256) -> __m256,
+        tail: impl Fn(f32, B) -> f32,
+    ) -> f32 {
+        let len = a.len();
+        let (pa, pb) = (a.as_ptr(), b.as_ptr());
+        let mut acc = [_mm256_setzero_ps(); 4];
+        let mut i = 0;
+
+        // Four independent accumulators hide the FMA latency
+        while i + 32 <= len {
+            for (k, acc) in acc.iter_mut().enumerate() {
+                let offset = i + 8 * k;
+                *acc = step(*acc, _mm256_loadu_ps(pa.add(offset)), load(pb.add(offset)));
+            }
+            i += 32;
+        }
+        while i + 8 <= len {
+            acc[0] = step(acc[0], _mm256_loadu_ps(pa.add(i)), load(pb.add(i)));
+            i += 8;
+        }
+
+        let mut sum = sum_lanes(_mm256_add_ps(_mm256_add_ps(acc[0], acc[1]), _mm256_add_ps(acc[2], acc[3])));
+        for j in i..len {
+            sum += tail(*a.get_unchecked(j), *b.get_unchecked(j));
+        }
+        sum
+    }
+
+    #[inline]
+    #[target_feature(enable = "avx2,fma")]
+    unsafe fn dot_step(acc: __m256, x: __m256, y: __m256) -> __m256 {
+        _mm256_fmadd_ps(x, y, acc)
+    }
+
+    #[inline]
+    #[target_feature(enable = "avx2,fma")]
+    unsafe fn squared_step(acc: __m256, x: __m256, y: __m256) -> __m256 {
+        let diff = _mm256_sub_ps(x, y);
+        _mm256_fmadd_ps(diff, diff, acc)
+    }
+
+    #[inline]
+    #[target_feature(enable = "avx2,fma")]
+    unsafe fn abs_step(acc: __m256, x: __m256, y: __m256) -> __m256 {
+        _mm256_add_ps(acc, _mm256_andnot_ps(_mm256_set1_ps(-0.0), _mm256_sub_ps(x, y)))
+    }
+
+    #[inline]
+    #[target_feature(enable = "avx2,fma,f16c")]
+    unsafe fn load_f16(p: *const f16) -> __m256 {
+        _mm256_cvtph_ps(_mm_loadu_si128(p as *const __m128i))
+    }
+
+    #[inline]
+    #[target_feature(enable = "avx2,fma")]
+    unsafe fn load_i8(p: *const i8) -> __m256 {
+        _mm256_cvtepi32_ps(_mm256_cvtepi8_epi32(_mm_loadl_epi64(p as *const __m128i)))
+    }
+
+    #[target_feature(enable = "avx2,fma")]
+    pub unsafe fn dot_product(a: &[f32], b: &[f32]) -> f32 {
+        fold(a, b, |p| _mm256_loadu_ps(p), |acc, x, y| dot_step(acc, x, y), |x, y| x * y)
+    }
+
+    #[target_feature(enable = "avx2,fma")]
+    pub unsafe fn squared_euclidean(a: &[f32], b: &[f32]) -> f32 {
+        fold(a, b, |p| _mm256_loadu_ps(p), |acc, x, y| squared_step(acc, x, y), |x, y| (x - y) * (x - y))
+    }
+
+    #[target_feature(enable = "avx2,fma")]
+    pub unsafe fn manhattan(a: &[f32], b: &[f32]) -> f32 {
+        fold(a, b, |p| _mm256_loadu_ps(p), |acc, x, y| abs_step(acc, x, y), |x, y| (x - y).abs())
+    }
+
+    #[target_feature(enable = "avx2,fma,f16c")]
+    pub unsafe fn dot_product_f16(a: &[f32], b: &[f16]) -> f32 {
+        fold(a, b, |p| load_f16(p), |acc, x, y| dot_step(acc, x, y), |x, y| x * y.to_f32())
+    }
+
+    #[target_feature(enable = "avx2,fma,f16c")]
+    pub unsafe fn squared_euclidean_f16(a: &[f32], b: &[f16]) -> f32 {
+        fold(a, b, |p| load_f16(p), |acc, x, y| squared_step(acc, x, y), |x, y| (x - y.to_f32()).powi(2))
+    }
+
+    #[target_feature(enable = "avx2,fma,f16c")]
+    pub unsafe fn manhattan_f16(a: &[f32], b: &[f16]) -> f32 {
+        fold(a, b, |p| load_f16(p), |acc, x, y| abs_step(acc, x, y), |x, y| (x - y.to_f32()).abs())
+    }
+
+    /// The scale is applied once to the sum rather than to every code
+    #[target_feature(enable = "avx2,fma")]
+    pub unsafe fn dot_product_i8(a: &[f32], b: &[i8], scale: f32) -> f32 {
+        scale * fold(a, b, |p| load_i8(p), |acc, x, y| dot_step(acc, x, y), |x, y| x * y as f32)
+    }
+
+    #[target_feature(enable = "avx2,fma")]
+    pub unsafe fn squared_euclidean_i8(a: &[f32], b: &[i8], scale: f32) -> f32 {
+        let scales = _mm256_set1_ps(scale);
+        fold(
+            a,
+            b,
+            |p| _mm256_mul_ps(load_i8(p), scales),
+            |acc, x, y| squared_step(acc, x, y),
+            |x, y| (x - y as f32 * scale).powi(2),
+        )
+    }
+
+    #[target_feature(enable = "avx2,fma")]
+    pub unsafe fn manhattan_i8(a: &[f32], b: &[i8], scale: f32) -> f32 {
+        let scales = _mm256_set1_ps(scale);
+        fold(
+            a,
+            b,
+            |p| _mm256_mul_ps(load_i8(p), scales),
+            |acc, x, y| abs_step(acc, x, y),
+            |x, y| (x - y as f32 * scale).abs(),
+        )
+    }
+
+    /// Popcount by nibble lookup: each byte's two nibbles index a 16-entry
+    /// table with a shuffle, and byte counts are summed per 64-bit lane
+    #[target_feature(enable = "avx2")]
+    pub unsafe fn hamming(a: &[u64], b: &[u64]) -> u32 {
+        let len = a.len();
+        let (pa, pb) = (a.as_ptr() as *const __m256i, b.as_ptr() as *const __m256i);
+        let table = _mm256_setr_epi8(
+            0, 1, 1, 2, 1, 2, 2, 3, 1, 2, 2, 3, 2, 3, 3, 4,
+            0, 1, 1, 2, 1, 2, 2, 3, 1, 2, 2, 3, 2, 3, 3, 4,
+        );
+        let low_nibbles = _mm256_set1_epi8(0x0f);
+        let mut acc = _mm256_setzero_si256();
+        let mut i = 0;
+
+        while i + 4 <= len {
+            let block = i / 4;
+            let diff = _mm256_xor_si256(_mm256_loadu_si256(pa.add(block)), _mm256_loadu_si256(pb.add(block)));
+            let low = _mm256_shuffle_epi8(table, _mm256_and_si256(diff, low_nibbles));
+            let high = _mm256_shuffle_epi8(table, _mm256_and_si256(_mm256_srli_epi16(diff, 4), low_nibbles));
+            acc = _mm256_add_epi64(acc, _mm256_sad_epu8(_mm256_add_epi8(low, high), _mm256_setzero_si256()));
+            i += 4;
+        }
+
+        let mut lanes = [0u64; 4];
+        _mm256_storeu_si256(lanes.as_mut_ptr() as *mut __m256i, acc);
+        let mut count = lanes.iter().sum::<u64>() as u32;
+        for j in i..len {
+            count += (a.get_unchecked(j) ^ b.get_unchecked(j)).count_ones();
+        }
+        count
+    }
+}
+
+#[cfg(target_arch = "x86_64")]
+mod avx512 {
+    use std::arch::x86_64::*;
+
+    /// Sum `step(acc, x, y)` over 16-float blocks;
+    /// the tail is a masked load, so there is no scalar loop
+    #[inline]
+    #[target_feature(enable = "avx512f")]
+    unsafe fn fold(a: &[f32], b: &[f32], step: impl Fn(__m512, __m512, __m512) -> __m512) -> f32 {
+        let len = a.len();
+        let (pa, pb) = (a.as_ptr(), b.as_ptr());
+        let mut acc = [_mm512_setzero_ps(); 4];
+        let mut i = 0;
+
+        // Four independent accumulators hide the FMA latency
+        while i + 64 <= len {
+            for (k, acc) in acc.iter_mut().enumerate() {
+                let offset = i + 16 * k;
+                *acc = step(*acc, _mm512_loadu_ps(pa.add(offset)), _mm512_loadu_ps(pb.add(offset)));
+            }
+            i += 64;
+        }
+        while i + 16 <= len {
+            acc[0] = step(acc[0], _mm512_loadu_ps(pa.add(i)), _mm512_loadu_ps(pb.add(i)));
+            i += 16;
+        }
+        if i < len {
+            // Masked-off lanes load as zero, which every step maps to zero
+            let mask: __mmask16 = (1u16 << (len - i)) - 1;
+            acc[1] = step(acc[1], _mm512_maskz_loadu_ps(mask, pa.add(i)), _mm512_maskz_loadu_ps(mask, pb.add(i)));
+        }
+
+        _mm512_reduce_add_ps(_mm512_add_ps(_mm512_add_ps(acc[0], acc[1]), _mm512_add_ps(acc[2], acc[3])))
+    }
+
+    #[target_feature(enable = "avx512f")]
+    pub unsafe fn dot_product(a: &[f32], b: &[f32]) -> f32 {
+        fold(a, b, |acc, x, y| _mm512_fmadd_ps(x, y, acc))
+    }
+
+    #[target_feature(enable = "avx512f")]
+    pub unsafe fn squared_euclidean(a: &[f32], b: &[f32]) -> f32 {
+        fold(a, b, |acc, x, y| {
+            let diff = _mm512_sub_ps(x, y);
+            _mm512_fmadd_ps(diff, diff, acc)
+        })
+    }
+
+    #[target_feature(enable = "avx512f")]
+    pub unsafe fn manhattan(a: &[f32], b: &[f32]) -> f32 {
+        fold(a, b, |acc, x, y| _mm512_add_ps(acc, _mm512_abs_ps(_mm512_sub_ps(x, y))))
+    }
+
+    #[target_feature(enable = "avx512f,avx512vpopcntdq")]
+    pub unsafe fn hamming(a: &[u64], b: &[u64]) -> u32 {
+        let len = a.len();
+        let (pa, pb) = (a.as_ptr() as *const i64, b.as_ptr() as *const i64);
+        let mut acc = _mm512_setzero_si512();
+        let mut i = 0;
+
+        while i < len {
+            // The last block is a masked load, as in `fold`
+            let mask: __mmask8 = if len - i >= 8 { 0xff } else { (1u8 << (len - i)) - 1 };
+            let diff = _mm512_xor_si512(_mm512_maskz_loadu_epi64(mask, pa.add(i)), _mm512_maskz_loadu_epi64(mask, pb.add(i)));
+            acc = _mm512_add_epi64(acc, _mm512_popcnt_epi64(diff));
+            i += 8;
+        }
+        _mm512_reduce_add_epi64(acc) as u32
+    }
 }
 
 #[cfg(test)]
@@ -77,4 +568,52 @@ mod tests {
         let result = manhattan_distance(&a, &b);
         assert!((result - 7.0).abs() < 1e-6);
     }
-}
\ No newline at end of file
+
+    #[test]
+    #[should_panic]
+    fn test_hamming_distance_rejects_mismatched_rows() {
+        hamming_distance(&[0; 8], &[0; 2]);
+    }
+
+    #[test]
+    fn test_kernels_agree_on_every_length() {
+        let scalar = Kernels::for_level(SimdLevel::Scalar);
+        for level in SimdLevel::available() {
+            let kernels = Kernels::for_level(level);
+            // Covers full blocks, partial blocks and tails for every width
+            for len in 0..70 {
+                let a: Vec<f32> = (0..len).map(|i| (i as f32 * 0.37).sin()).collect();
+                let b: Vec<f32> = (0..len).map(|i| (i as f32 * 0.11).cos()).collect();
+                // Compressed rows, and the floats they decode to
+                let half_row: Vec<f16> = b.iter().map(|&x| f16::from_f32(x)).collect();
+                let halves: Vec<f32> = half_row.iter().map(|x| x.to_f32()).collect();
+                let codes: Vec<i8> = (0..len).map(|i| (i as i32 * 37 % 255 - 127) as i8).collect();
+                let scaled: Vec<f32> = codes.iter().map(|&c| c as f32 * 0.02).collect();
+                for (expected, actual) in [
+                    ((scalar.dot_product)(&a, &b), (kernels.dot_product)(&a, &b)),
+                    ((scalar.squared_euclidean)(&a, &b), (kernels.squared_euclidean)(&a, &b)),
+                    ((scalar.manhattan)(&a, &b), (kernels.manhattan)(&a, &b)),
+                    ((scalar.dot_product)(&a, &halves), (kernels.dot_product_f16)(&a, &half_row)),
+                    ((scalar.squared_euclidean)(&a, &halves), (kernels.squared_euclidean_f16)(&a, &half_row)),
+                    ((scalar.manhattan)(&a, &halves), (kernels.manhattan_f16)(&a, &half_row)),
+                    ((scalar.dot_product)(&a, &scaled), (kernels.dot_product_i8)(&a, &codes, 0.02)),
+                    ((scalar.squared_euclidean)(&a, &scaled), (kernels.squared_euclidean_i8)(&a, &codes, 0.02)),
+                    ((scalar.manhattan)(&a, &scaled), (kernels.manhattan_i8)(&a, &codes, 0.02)),
+                ] {
+                    assert!(
+                        (expected - actual).abs() <= 1e-4 * (1.0 + expected.abs()),
+                        "{:?} length {}: expected {}, got {}",
+                        level,
+                        len,
+                        expected,
+                        actual
+                    );
+                }
+
+                let words: Vec<u64> = (0..len as u64).map(|i| i.wrapping_mul(0x9e37_79b9_7f4a_7c15)).collect();
+                let others: Vec<u64> = words.iter().map(|w| w.rotate_left(17) ^ 0xff00).collect();
+                assert_eq!((scalar.hamming)(&words, &others), (kernels.hamming)(&words, &others), "{:?}", level);
+            }
+        }
+    }
+}
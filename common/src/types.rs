@@ -14,6 +14,8 @@ pub enum VectorType {
     Float32,
     Float16,
     Int8,
+    /// One sign bit per dimension, searched by Hamming distance
+    Binary,
 }
 
 /// Distance metrics for vector similarity
@@ -25,11 +27,75 @@ pub enum DistanceMetric {
     Manhattan,
 }
 
+/// How write-ahead log appends are made durable
+#[derive(Debug, Clone, Copy, PartialEq, Eq, Default, Serialize, Deserialize)]
+#[serde(try_from = "String", into = "String")]
+pub enum DurabilityMode {
+    /// Fsync after every operation, never batched with others
+    FsyncEach,
+    /// Batch concurrent appends into one write and one fsync
+    #[default]
+    Group,
+    /// Acknowledge after the write; fsync in the background every N milliseconds
+    IntervalMs(u64),
+    /// Acknowledge after the write; leave flushing to the OS
+    None,
+}
+
+impl std::fmt::Display for DurabilityMode {
+    fn fmt(&self, f: &mut std::fmt::Formatter<'_>) -> std::fmt::Result {
+        match self {
+            DurabilityMode::FsyncEach => write!(f, "fsync-each"),
+            DurabilityMode::Group => write!(f, "group"),
+            DurabilityMode::IntervalMs(ms) => write!(f, "interval-ms:{}", ms),
+            DurabilityMode::None => write!(f, "none"),
+        }
+    }
+}
+
+impl std::str::FromStr for DurabilityMode {
+    type Err = String;
+    
+    /// Parse `fsync-each`, `group`, `interval-ms:<ms>` or `none`
+    fn from_str(s: &str) -> std::result::Result<Self, Self::Err> {
+        match s.trim().to_lowercase().as_str() {
+            "fsync-each" => Ok(DurabilityMode::FsyncEach),
+            "group" => Ok(DurabilityMode::Group),
+            "none" => Ok(DurabilityMode::None),
+            other => other
+                .strip_prefix("interval-ms:")
+                .or_else(|| other.strip_prefix("interval-ms="))
+                .and_then(|ms| ms.parse().ok())
+                .filter(|&ms| ms > 0)
+                .map(DurabilityMode::IntervalMs)
+                .ok_or_else(|| format!(
+                    "Invalid durability mode '{}': expected fsync-each, group, interval-ms:<ms> or none",
+                    s
+                )),
+        }
+    }
+}
+
+impl TryFrom<String> for DurabilityMode {
+    type Error = String;
+    
+    fn try_from(value: String) -> std::result::Result<Self, Self::Error> {
+        value.parse()
+    }
+}
+
+impl From<DurabilityMode> for String {
+    fn from(mode: DurabilityMode) -> Self {
+        mode.to_string()
+    }
+}
+
 /// Vector data with metadata
 #[derive(Debug, Clone, Serialize, Deserialize)]
 pub struct Vector {
     pub id: VectorId,
     pub data: Vec<f32>,
+    #[serde(with = "crate::metadata")]
     pub metadata: Option<HashMap<String, serde_json::Value>>,
 }
 
@@ -41,15 +107,62 @@ pub struct CollectionConfig {
     pub distance_metric: DistanceMetric,
     pub vector_type: VectorType,
     pub index_config: IndexConfig,
+    /// WAL durability for writes to this collection (server default if unset)
+    #[serde(default)]
+    pub durability: Option<DurabilityMode>,
+    /// Metadata keys with an inverted index, used to plan filtered searches
+    #[serde(default)]
+    pub indexed_fields: Vec<String>,
+}
+
+/// Index structure a collection is searched with
+#[derive(Debug, Clone, Copy, PartialEq, Eq, Default, Serialize, Deserialize)]
+pub enum IndexType {
+    /// Graph over full vectors; highest recall, most memory
+    #[default]
+    Hnsw,
+    /// Inverted file over product-quantized codes; a few bytes per vector
+    IvfPq,
+    /// Every vector scanned exactly; no index overhead
+    Flat,
 }
 
-/// HNSW index configuration
+/// Index configuration
+///
+/// The HNSW parameters come first; the IVF-PQ ones only apply to
+/// `IndexType::IvfPq` collections.
 #[derive(Debug, Clone, Serialize, Deserialize)]
 pub struct IndexConfig {
     pub max_connections: usize,
     pub ef_construction: usize,
     pub ef_search: usize,
     pub max_layer: usize,
+    #[serde(default)]
+    pub index_type: IndexType,
+    /// Coarse clusters the vectors are partitioned into
+    #[serde(default = "default_nlist")]
+    pub nlist: usize,
+    /// Bytes per encoded vector, one per subvector; 0 picks dimension / 8
+    #[serde(default)]
+    pub pq_subvectors: usize,
+    /// Clusters scanned per query unless the query overrides it
+    #[serde(default = "default_nprobe")]
+    pub nprobe: usize,
+    /// Rescore results against the stored full-precision vectors
+    #[serde(default = "default_rerank")]
+    pub rerank: bool,
+}
+
+fn default_nlist() -> usize {
+    256
+}
+
+fn default_nprobe() -> usize {
+    8
+}
+
+fn default_rerank() -> bool {
+    true
 }
 
 impl Default for IndexConfig {
@@ -59,6 +172,11 @@ impl Default for IndexConfig {
             ef_construction: 200,
             ef_search: 50,
             max_layer: 16,
+            index_type: IndexType::default(),
+            nlist: default_nlist(),
+            pq_subvectors: 0,
+            nprobe: default_nprobe(),
+            rerank: default_rerank(),
         }
     }
 }
@@ -70,7 +188,21 @@ pub struct QueryRequest {
     pub vector: Vec<f32>,
     pub limit: usize,
     pub ef_search: Option<usize>,
+    /// IVF-PQ clusters to scan, overriding the collection's `nprobe`
+    #[serde(default)]
+    pub nprobe: Option<usize>,
+    /// Candidates fetched per result from a compressed index before exact
+    /// rescoring, overriding the collection's default
+    #[serde(default)]
+    pub oversampling: Option<f32>,
+    /// Compare the query with every vector instead of approximating
+    #[serde(default)]
+    pub exact: bool,
     pub filter: Option<HashMap<String, serde_json::Value>>,
+    /// Milliseconds the search may take; an HNSW walk still running near
+    /// the deadline returns the best results found so far
+    #[serde(default)]
+    pub deadline_ms: Option<u64>,
 }
 
 /// Query result
@@ -78,6 +210,7 @@ pub struct QueryRequest {
 pub struct QueryResult {
     pub id: VectorId,
     pub distance: f32,
+    #[serde(with = "crate::metadata")]
     pub metadata: Option<HashMap<String, serde_json::Value>>,
 }
 
@@ -128,6 +261,7 @@ impl From<VectorType> for i32 {
             VectorType::Float32 => 1,
             VectorType::Float16 => 2,
             VectorType::Int8 => 3,
+            VectorType::Binary => 4,
         }
     }
 }
@@ -138,7 +272,47 @@ impl From<i32> for VectorType {
             1 => VectorType::Float32,
             2 => VectorType::Float16,
             3 => VectorType::Int8,
+            4 => VectorType::Binary,
             _ => VectorType::Float32, // Default fallback
         }
     }
-}
\ No newline at end of file
+}
+
+impl From<IndexType> for i32 {
+    fn from(index_type: IndexType) -> Self {
+        match index_type {
+            IndexType::Hnsw => 1,
+            IndexType::IvfPq => 2,
+            IndexType::Flat => 3,
+        }
+    }
+}
+
+impl From<i32> for IndexType {
+    fn from(value: i32) -> Self {
+        match value {
+            2 => IndexType::IvfPq,
+            3 => IndexType::Flat,
+            _ => IndexType::Hnsw, // Default fallback
+        }
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    
+    #[test]
+    fn test_durability_mode_parsing() {
+        assert_eq!("fsync-each".parse::<DurabilityMode>().unwrap(), DurabilityMode::FsyncEach);
+        assert_eq!("GROUP".parse::<DurabilityMode>().unwrap(), DurabilityMode::Group);
+        assert_eq!("interval-ms:50".parse::<DurabilityMode>().unwrap(), DurabilityMode::IntervalMs(50));
+        assert_eq!("none".parse::<DurabilityMode>().unwrap(), DurabilityMode::None);
+        assert!("interval-ms:0".parse::<DurabilityMode>().is_err());
+        assert!("sometimes".parse::<DurabilityMode>().is_err());
+        
+        for mode in [DurabilityMode::FsyncEach, DurabilityMode::IntervalMs(7), DurabilityMode::None] {
+            assert_eq!(mode.to_string().parse::<DurabilityMode>().unwrap(), mode);
+        }
+    }
+}
@@ -10,6 +10,7 @@ __author__ = "Durai"
 __email__ = "durai@infinidatum.com"
 
 from .server import DVecDBServer
+from .cluster import DVecDBCluster
 from .cli import main
 
-__all__ = ["DVecDBServer", "main"]
\ No newline at end of file
+__all__ = ["DVecDBServer", "DVecDBCluster", "main"]
\ No newline at end of file
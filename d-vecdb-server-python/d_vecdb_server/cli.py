@@ -36,7 +36,12 @@ def cmd_start(args):
         grpc_port=args.grpc_port,
         data_dir=args.data_dir,
         log_level=args.log_level,
-        config_file=args.config
+        config_file=args.config,
+        log_file=args.log_file,
+        wal_durability=args.wal_durability,
+        query_cache_entries=args.query_cache_entries,
+        search_threads=args.search_threads,
+        search_queue_size=args.search_queue_size
     )
     
     # Setup signal handlers
@@ -49,6 +54,8 @@ def cmd_start(args):
     print(f"   gRPC API: {args.host}:{args.grpc_port}")
     print(f"   Data directory: {server.data_dir}")
     print(f"   Log level: {args.log_level}")
+    if args.log_file:
+        print(f"   Log file: {args.log_file}")
     print()
     
     try:
@@ -171,10 +178,20 @@ def cmd_logs(args):
     print("📋 d-vecDB Server Logs")
     print("=" * 30)
     
-    # This is a placeholder implementation
-    # In a real scenario, you'd read from actual log files
-    print("Log viewing not implemented in this version.")
-    print("Check system logs or run the server in foreground mode.")
+    if not args.log_file:
+        print("No log file configured.")
+        print("Start the server with --log-file PATH to capture its output.")
+        return 1
+    
+    log_path = Path(args.log_file)
+    if not log_path.exists():
+        print(f"❌ Log file not found: {log_path}")
+        return 1
+    
+    from collections import deque
+    with open(log_path, "r", encoding="utf-8", errors="replace") as f:
+        for line in deque(f, maxlen=args.lines):
+            print(line, end="")
     
     return 0
 
@@ -222,6 +239,7 @@ Examples:
   d-vecdb-server start --port 8081     # Start on custom port
   d-vecdb-server stop                  # Stop running server
   d-vecdb-server status                # Check server status
+  d-vecdb-server --log-file server.log logs --lines 50
         """
     )
     
@@ -239,6 +257,16 @@ Examples:
     parser.add_argument("--log-level", default="info", 
                        choices=["debug", "info", "warn", "error"],
                        help="Log level (default: info)")
+    parser.add_argument("--log-file",
+                       help="File to write server output to (rotated by size)")
+    parser.add_argument("--wal-durability",
+                       help="WAL durability: fsync-each, group, interval-ms:<ms> or none")
+    parser.add_argument("--query-cache-entries", type=int,
+                       help="Recent query results cached per collection, 0 to disable")
+    parser.add_argument("--search-threads", type=int,
+                       help="Worker threads for searches and index builds, 0 for one per core")
+    parser.add_argument("--search-queue-size", type=int,
+                       help="Jobs that may wait for a search worker before queries are rejected")
     
     # Subcommands
     subparsers = parser.add_subparsers(dest="command", help="Available commands")
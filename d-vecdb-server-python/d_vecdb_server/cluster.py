@@ -0,0 +1,212 @@
+"""
+d-vecDB Local Cluster
+
+Runs several d-vecDB server processes on one machine, e.g. for load-testing
+sharded topologies with the client's ShardedVectorDBClient.
+"""
+
+import os
+import shutil
+import socket
+import tempfile
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from typing import Optional, Dict, Any, List
+
+from .server import DVecDBServer
+
+logger = logging.getLogger(__name__)
+
+# Window over which stats() measures CPU usage, shared by all shards
+CPU_SAMPLE_SECONDS = 0.1
+
+
+def _allocate_ports(host: str, count: int) -> List[int]:
+    """Ask the OS for `count` distinct free TCP ports."""
+    with ExitStack() as stack:
+        ports = []
+        for _ in range(count):
+            # Keep every socket open until all ports are picked so none repeat
+            sock = stack.enter_context(socket.socket(socket.AF_INET, socket.SOCK_STREAM))
+            sock.bind((host, 0))
+            ports.append(sock.getsockname()[1])
+        return ports
+
+
+class DVecDBCluster:
+    """Manage N local d-vecDB server processes as one cluster."""
+
+    def __init__(self,
+                 num_shards: int = 3,
+                 host: str = "127.0.0.1",
+                 base_data_dir: Optional[str] = None,
+                 log_level: str = "info",
+                 cleanup: Optional[bool] = None):
+        """
+        Initialize a local cluster.
+
+        Args:
+            num_shards: Number of server processes
+            host: Host address all servers bind to
+            base_data_dir: Parent directory for per-shard data dirs (default: temporary)
+            log_level: Logging level (debug, info, warn, error)
+            cleanup: Remove data dirs on stop (default: only when using a temporary dir)
+        """
+        if num_shards < 1:
+            raise ValueError("num_shards must be at least 1")
+
+        self.num_shards = num_shards
+        self.host = host
+        self.log_level = log_level
+        self.base_data_dir = base_data_dir or tempfile.mkdtemp(prefix="d-vecdb-cluster-")
+        self.cleanup = cleanup if cleanup is not None else base_data_dir is None
+
+        self.servers: List[DVecDBServer] = []
+
+    def _create_servers(self) -> List[DVecDBServer]:
+        """Create server wrappers with fresh ports and separate data dirs."""
+        ports = _allocate_ports(self.host, 3 * self.num_shards)
+        servers = []
+        for i in range(self.num_shards):
+            rest_port, grpc_port, metrics_port = ports[3 * i:3 * i + 3]
+            servers.append(DVecDBServer(
+                host=self.host,
+                port=rest_port,
+                grpc_port=grpc_port,
+                metrics_port=metrics_port,
+                data_dir=os.path.join(self.base_data_dir, f"shard-{i}"),
+                log_level=self.log_level,
+            ))
+        return servers
+
+    def start(self, timeout: int = 30) -> bool:
+        """
+        Start all servers and wait for them in parallel.
+
+        Args:
+            timeout: Timeout in seconds for each server to become ready
+
+        Returns:
+            True if every server started; on failure all servers are stopped
+        """
+        if self.is_running():
+            logger.warning("Cluster is already running")
+            return True
+
+        self.servers = self._create_servers()
+        logger.info(f"Starting {self.num_shards}-shard d-vecDB cluster")
+
+        with ThreadPoolExecutor(max_workers=self.num_shards) as pool:
+            results = list(pool.map(lambda s: s.start(timeout=timeout), self.servers))
+
+        if not all(results):
+            failed = [s.port for s, ok in zip(self.servers, results) if not ok]
+            logger.error(f"Servers on ports {failed} failed to start, stopping cluster")
+            self.stop()
+            return False
+
+        logger.info(f"Cluster started: {', '.join(self.endpoints)}")
+        return True
+
+    def stop(self, timeout: int = 10) -> bool:
+        """
+        Stop all servers in parallel.
+
+        Args:
+            timeout: Timeout in seconds for each server's graceful shutdown
+
+        Returns:
+            True if every server stopped successfully
+        """
+        if not self.servers:
+            return True
+
+        with ThreadPoolExecutor(max_workers=len(self.servers)) as pool:
+            results = list(pool.map(lambda s: s.stop(timeout=timeout), self.servers))
+        self.servers = []
+
+        if self.cleanup and os.path.exists(self.base_data_dir):
+            shutil.rmtree(self.base_data_dir, ignore_errors=True)
+
+        return all(results)
+
+    def is_running(self) -> bool:
+        """Check if every server in the cluster is running."""
+        return bool(self.servers) and all(s.is_running() for s in self.servers)
+
+    @property
+    def endpoints(self) -> List[str]:
+        """REST endpoints as "host:port" strings, in shard order."""
+        return [f"{s.host}:{s.port}" for s in self.servers]
+
+    @property
+    def grpc_endpoints(self) -> List[str]:
+        """gRPC endpoints as "host:port" strings, in shard order."""
+        return [f"{s.host}:{s.grpc_port}" for s in self.servers]
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """
+        Get per-process resource usage.
+
+        Returns:
+            One entry per shard with pid, endpoint, RSS bytes and CPU percent.
+            RSS and CPU are None when psutil is not installed.
+        """
+        try:
+            import psutil
+        except ImportError:
+            psutil = None
+
+        stats = []
+        procs = {}
+        for i, server in enumerate(self.servers):
+            pid = server._process.pid if server.is_running() else None
+            entry = {
+                "shard": i,
+                "endpoint": f"{server.host}:{server.port}",
+                "pid": pid,
+                "running": pid is not None,
+                "rss_bytes": None,
+                "cpu_percent": None,
+            }
+            if psutil is not None and pid is not None:
+                try:
+                    proc = psutil.Process(pid)
+                    entry["rss_bytes"] = proc.memory_info().rss
+                    # The first call only starts the measurement
+                    proc.cpu_percent(None)
+                    procs[i] = proc
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    pass
+            stats.append(entry)
+
+        # One sampling window for every shard instead of one each
+        if procs:
+            time.sleep(CPU_SAMPLE_SECONDS)
+        for i, proc in procs.items():
+            try:
+                stats[i]["cpu_percent"] = proc.cpu_percent(None)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                pass
+        return stats
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get cluster status information."""
+        return {
+            "running": self.is_running(),
+            "num_shards": self.num_shards,
+            "base_data_dir": self.base_data_dir,
+            "shards": [s.get_status() for s in self.servers],
+        }
+
+    def __enter__(self):
+        """Context manager entry."""
+        if not self.start():
+            raise RuntimeError("Failed to start d-vecDB cluster")
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.stop()
@@ -12,12 +12,19 @@ import signal
 import time
 import tempfile
 import logging
+import logging.handlers
+from collections import deque
 from pathlib import Path
 from typing import Optional, Dict, Any, List
 import threading
 
 logger = logging.getLogger(__name__)
 
+# Log line the server prints once its REST listener is bound (after index rebuild)
+READY_MARKER = "REST server listening on"
+# Log lines describing startup index rebuild progress
+PROGRESS_MARKERS = ("Rebuilding index", "Rebuilt index", "Index rebuild completed")
+
 
 class DVecDBServer:
     """Python wrapper for the d-vecDB server binary."""
@@ -26,9 +33,18 @@ class DVecDBServer:
                  host: str = "127.0.0.1",
                  port: int = 8080,
                  grpc_port: int = 9090,
+                 metrics_port: Optional[int] = None,
                  data_dir: Optional[str] = None,
                  log_level: str = "info",
-                 config_file: Optional[str] = None):
+                 config_file: Optional[str] = None,
+                 log_file: Optional[str] = None,
+                 log_buffer_lines: int = 1000,
+                 log_file_max_bytes: int = 10 * 1024 * 1024,
+                 log_file_backups: int = 3,
+                 wal_durability: Optional[str] = None,
+                 query_cache_entries: Optional[int] = None,
+                 search_threads: Optional[int] = None,
+                 search_queue_size: Optional[int] = None):
         """
         Initialize d-vecDB server wrapper.
         
@@ -36,19 +52,51 @@ class DVecDBServer:
             host: Server host address
             port: REST API port
             grpc_port: gRPC port  
+            metrics_port: Prometheus metrics port (default: grpc_port + 1)
             data_dir: Directory for data storage
             log_level: Logging level (debug, info, warn, error)
             config_file: Path to configuration file
+            log_file: File to copy server output to, rotated by size (optional)
+            log_buffer_lines: Number of recent output lines kept in memory
+            log_file_max_bytes: Size at which the log file is rotated
+            log_file_backups: Number of rotated log files to keep
+            wal_durability: Default WAL durability ("fsync-each", "group",
+                "interval-ms:<ms>" or "none"; server default: "group")
+            query_cache_entries: Recent query results cached per collection,
+                0 to disable (server default: 0)
+            search_threads: Worker threads for searches and index builds,
+                0 for one per core (server default: 0)
+            search_queue_size: Jobs that may wait for a search worker before
+                queries are rejected (server default: 1024)
         """
         self.host = host
         self.port = port
         self.grpc_port = grpc_port
+        self.metrics_port = metrics_port if metrics_port is not None else grpc_port + 1
         self.data_dir = data_dir or tempfile.mkdtemp(prefix="d-vecdb-")
         self.log_level = log_level
         self.config_file = config_file
+        self.log_file = log_file
+        self.log_file_max_bytes = log_file_max_bytes
+        self.log_file_backups = log_file_backups
+        self.wal_durability = wal_durability
+        self.query_cache_entries = query_cache_entries
+        self.search_threads = search_threads
+        self.search_queue_size = search_queue_size
         
         self._process: Optional[subprocess.Popen] = None
-        self._temp_config: Optional[str] = None
+        
+        # Server output is drained by reader threads so the pipes never fill up
+        self._log_buffer: deque = deque(maxlen=log_buffer_lines)
+        self._log_lock = threading.Lock()
+        self._log_handler: Optional[logging.Handler] = None
+        self._log_threads: List[threading.Thread] = []
+        
+        # Startup tracking, fed by the log readers and the readiness probe
+        self._ready_event = threading.Event()
+        self._startup_progress: Optional[str] = None
+        self._startup_seconds: Optional[float] = None
+        self._last_restart_seconds: Optional[float] = None
         
         # Find the binary
         self._binary_path = self._find_binary()
@@ -125,32 +173,6 @@ class DVecDBServer:
         
         return None
     
-    def _create_config(self) -> str:
-        """Create a temporary configuration file."""
-        
-        config_content = f"""
-[server]
-host = "{self.host}"
-rest_port = {self.port}
-grpc_port = {self.grpc_port}
-metrics_port = 9091
-log_level = "{self.log_level}"
-
-[storage]
-data_dir = "{self.data_dir}"
-"""
-        
-        # Create temporary config file
-        fd, temp_path = tempfile.mkstemp(suffix='.toml', prefix='d-vecdb-')
-        try:
-            with os.fdopen(fd, 'w') as f:
-                f.write(config_content.strip())
-        except Exception:
-            os.close(fd)
-            raise
-        
-        return temp_path
-    
     def start(self, background: bool = True, timeout: int = 30) -> bool:
         """
         Start the d-vecDB server.
@@ -185,11 +207,21 @@ data_dir = "{self.data_dir}"
                 "--host", host_ip,
                 "--rest-port", str(self.port),
                 "--grpc-port", str(self.grpc_port),
-                "--metrics-port", str(self.grpc_port + 1),  # Use grpc_port + 1 for metrics
+                "--metrics-port", str(self.metrics_port),
                 "--data-dir", self.data_dir,
                 "--log-level", self.log_level,
             ]
         
+        # Tuning options override the config file as well
+        if self.wal_durability:
+            cmd += ["--wal-durability", self.wal_durability]
+        if self.query_cache_entries is not None:
+            cmd += ["--query-cache-entries", str(self.query_cache_entries)]
+        if self.search_threads is not None:
+            cmd += ["--search-threads", str(self.search_threads)]
+        if self.search_queue_size is not None:
+            cmd += ["--search-queue-size", str(self.search_queue_size)]
+        
         logger.info(f"Starting d-vecDB server: {' '.join(cmd)}")
         
         try:
@@ -201,6 +233,7 @@ data_dir = "{self.data_dir}"
                     stderr=subprocess.PIPE,
                     env={**os.environ, "RUST_LOG": self.log_level}
                 )
+                self._start_log_readers()
             else:
                 self._process = subprocess.Popen(
                     cmd,
@@ -219,28 +252,124 @@ data_dir = "{self.data_dir}"
             logger.error(f"Failed to start server: {e}")
             return False
     
+    def _start_log_readers(self):
+        """Start threads draining the server's stdout and stderr."""
+        self._log_buffer.clear()
+        self._ready_event.clear()
+        self._startup_progress = None
+        
+        if self.log_file:
+            os.makedirs(os.path.dirname(os.path.abspath(self.log_file)), exist_ok=True)
+            self._log_handler = logging.handlers.RotatingFileHandler(
+                self.log_file,
+                maxBytes=self.log_file_max_bytes,
+                backupCount=self.log_file_backups,
+                encoding="utf-8",
+            )
+            self._log_handler.setFormatter(logging.Formatter("%(message)s"))
+        
+        self._log_threads = [
+            threading.Thread(
+                target=self._drain_pipe,
+                args=(pipe,),
+                name=f"d-vecdb-{name}-reader",
+                daemon=True,
+            )
+            for name, pipe in (("stdout", self._process.stdout), ("stderr", self._process.stderr))
+        ]
+        for thread in self._log_threads:
+            thread.start()
+    
+    def _drain_pipe(self, pipe):
+        """Read lines from a pipe into the ring buffer until EOF."""
+        try:
+            for raw in iter(pipe.readline, b""):
+                line = raw.decode("utf-8", errors="replace").rstrip("\r\n")
+                if not self._ready_event.is_set():
+                    self._track_startup(line)
+                # Under the lock, so the log file cannot be closed mid-write
+                # by a stop that gave up waiting for this thread
+                with self._log_lock:
+                    self._log_buffer.append(line)
+                    if self._log_handler:
+                        self._log_handler.handle(logging.makeLogRecord({"msg": line}))
+        except (OSError, ValueError):
+            pass  # Pipe closed while reading
+        finally:
+            pipe.close()
+    
+    def _stop_log_readers(self, timeout: float = 2.0):
+        """Wait for reader threads to hit EOF and close the log file."""
+        for thread in self._log_threads:
+            thread.join(timeout)
+        self._log_threads = []
+        
+        with self._log_lock:
+            if self._log_handler:
+                self._log_handler.close()
+                self._log_handler = None
+    
+    def _track_startup(self, line: str):
+        """Record rebuild progress and readiness from a server log line."""
+        for marker in PROGRESS_MARKERS:
+            if marker in line:
+                self._startup_progress = line[line.index(marker):]
+                break
+        
+        if READY_MARKER in line:
+            self._ready_event.set()
+    
+    def _check_health(self, timeout: float = 1.0) -> bool:
+        """Check whether the REST /health endpoint answers successfully."""
+        import json
+        import urllib.request
+        import urllib.error
+        
+        host = "127.0.0.1" if self.host in ("localhost", "0.0.0.0") else self.host
+        try:
+            with urllib.request.urlopen(f"http://{host}:{self.port}/health", timeout=timeout) as response:
+                return response.status == 200 and json.load(response).get("success", False)
+        except (urllib.error.URLError, OSError, ValueError):
+            return False
+    
     def _wait_for_startup(self, timeout: int) -> bool:
-        """Wait for the server to start up and be ready."""
-        import time
-        import socket
+        """
+        Wait for the server to start up and be ready.
         
-        start_time = time.time()
+        The server only binds its REST port after rebuilding indexes, so a
+        successful /health response means it is ready to serve searches.
+        Polling starts at 10 ms and backs off exponentially; the ready line
+        in the server log wakes the wait early.
+        """
+        start_time = time.monotonic()
+        deadline = start_time + timeout
+        delay = 0.01
         
-        while time.time() - start_time < timeout:
+        while True:
             # Check if process is still running
             if self._process and self._process.poll() is not None:
                 logger.error("Server process terminated unexpectedly")
                 return False
             
-            # Try to connect to the server
-            try:
-                with socket.create_connection((self.host, self.port), timeout=1):
-                    logger.info("Server started successfully")
-                    return True
-            except (socket.error, OSError):
-                time.sleep(0.5)
+            if self._check_health():
+                self._startup_seconds = time.monotonic() - start_time
+                self._ready_event.set()
+                logger.info(f"Server started successfully in {self._startup_seconds:.3f}s")
+                return True
+            
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            
+            if self._ready_event.is_set():
+                time.sleep(min(delay, remaining))
+            else:
+                self._ready_event.wait(min(delay, remaining))
+            delay = min(delay * 2, 0.5)
         
         logger.error(f"Server failed to start within {timeout} seconds")
+        if self._startup_progress:
+            logger.error(f"Last startup progress: {self._startup_progress}")
         return False
     
     def stop(self, timeout: int = 10) -> bool:
@@ -273,13 +402,9 @@ data_dir = "{self.data_dir}"
                 self._process.wait()
                 logger.info("Server forcefully terminated")
             
+            self._stop_log_readers()
             self._process = None
             
-            # Clean up temporary config file
-            if self._temp_config and os.path.exists(self._temp_config):
-                os.unlink(self._temp_config)
-                self._temp_config = None
-            
             return True
             
         except Exception as e:
@@ -287,15 +412,26 @@ data_dir = "{self.data_dir}"
             return False
     
     def restart(self, timeout: int = 30) -> bool:
-        """Restart the server."""
+        """
+        Restart the server.
+        
+        The server snapshots its indexes on shutdown, so restart time is
+        dominated by replaying WAL entries written since the last snapshot.
+        The measured time is reported as `last_restart_seconds` in get_status().
+        """
         logger.info("Restarting d-vecDB server")
+        start_time = time.monotonic()
         
+        # stop() waits for the process to exit, so the ports are free again
         if not self.stop():
             return False
         
-        time.sleep(1)  # Brief pause
+        if not self.start(timeout=timeout):
+            return False
         
-        return self.start(timeout=timeout)
+        self._last_restart_seconds = time.monotonic() - start_time
+        logger.info(f"Server restarted in {self._last_restart_seconds:.3f}s")
+        return True
     
     def is_running(self) -> bool:
         """Check if the server is running."""
@@ -308,10 +444,19 @@ data_dir = "{self.data_dir}"
             "host": self.host,
             "port": self.port,
             "grpc_port": self.grpc_port,
+            "metrics_port": self.metrics_port,
             "data_dir": self.data_dir,
             "log_level": self.log_level,
+            "wal_durability": self.wal_durability,
+            "query_cache_entries": self.query_cache_entries,
+            "search_threads": self.search_threads,
+            "search_queue_size": self.search_queue_size,
             "binary_path": str(self._binary_path) if self._binary_path else None,
             "pid": self._process.pid if self._process else None,
+            "ready": self._ready_event.is_set(),
+            "startup_seconds": self._startup_seconds,
+            "startup_progress": self._startup_progress,
+            "last_restart_seconds": self._last_restart_seconds,
         }
         
         if self.is_running():
@@ -333,20 +478,20 @@ data_dir = "{self.data_dir}"
         return status
     
     def get_logs(self, lines: int = 100) -> List[str]:
-        """Get recent server logs."""
-        if not self.is_running() or not self._process:
-            return []
+        """
+        Get recent server output.
         
-        try:
-            # This is a simplified implementation
-            # In a real scenario, you'd want to read from log files
-            if self._process.stdout:
-                return ["Logs would be available here"]
-            else:
-                return ["Server running in foreground mode, no captured logs"]
-        except Exception as e:
-            logger.error(f"Failed to get logs: {e}")
-            return []
+        Args:
+            lines: Maximum number of most recent lines to return
+            
+        Returns:
+            Recent stdout/stderr lines, oldest first. Empty when the server
+            runs in foreground mode, where output is not captured.
+        """
+        with self._log_lock:
+            if lines <= 0:
+                return []
+            return list(self._log_buffer)[-lines:]
     
     def __enter__(self):
         """Context manager entry."""
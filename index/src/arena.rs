@@ -0,0 +1,470 @@
+use crate::node::NodeId;
+use vectordb_common::distance_with_norms;
+use vectordb_common::simd;
+use vectordb_common::types::{DistanceMetric, VectorType};
+use half::f16;
+use std::borrow::Cow;
+use std::marker::PhantomData;
+use std::sync::atomic::{AtomicU32, Ordering};
+
+/// Bytes per arena block; rows are padded to whole blocks
+const BLOCK_BYTES: usize = 32;
+
+/// Largest int8 code; codes span `-127..=127` so the scale is symmetric
+const INT8_MAX_CODE: f32 = 127.0;
+
+/// 32-byte aligned block, so every row starts on a SIMD boundary
+#[repr(C, align(32))]
+#[derive(Debug, Clone, Copy, Default)]
+struct Block([u8; BLOCK_BYTES]);
+
+/// Plain element types a row can hold; all-zero bytes are a valid zero
+trait Element: Copy + Default {}
+
+impl Element for f32 {}
+impl Element for f16 {}
+impl Element for i8 {}
+impl Element for u64 {}
+
+/// Fixed-width rows of `T` stored back to back in a single allocation
+#[derive(Debug, Clone)]
+struct Rows<T> {
+    blocks: Vec<Block>,
+    dimension: usize,
+    row_blocks: usize,
+    element: PhantomData<T>,
+}
+
+impl<T: Element> Rows<T> {
+    fn new(dimension: usize) -> Self {
+        let row_bytes = dimension * std::mem::size_of::<T>();
+        Self {
+            blocks: Vec::new(),
+            dimension,
+            row_blocks: (row_bytes + BLOCK_BYTES - 1) / BLOCK_BYTES,
+            element: PhantomData,
+        }
+    }
+    
+    /// Append a zeroed row
+    fn push(&mut self) {
+        self.blocks.resize(self.blocks.len() + self.row_blocks, Block::default());
+    }
+    
+    fn get(&self, node: NodeId) -> &[T] {
+        let start = node as usize * self.row_blocks;
+        let row = &self.blocks[start..start + self.row_blocks];
+        // SAFETY: the row is `row_blocks * BLOCK_BYTES` initialized bytes,
+        // enough for `dimension` elements, and `Element` types are plain
+        // values no more aligned than a block
+        unsafe { std::slice::from_raw_parts(row.as_ptr() as *const T, self.dimension) }
+    }
+    
+    fn get_mut(&mut self, node: NodeId) -> &mut [T] {
+        let start = node as usize * self.row_blocks;
+        let row = &mut self.blocks[start..start + self.row_blocks];
+        // SAFETY: as in `get`, and the borrow is exclusive
+        unsafe { std::slice::from_raw_parts_mut(row.as_mut_ptr() as *mut T, self.dimension) }
+    }
+    
+    fn memory_usage(&self) -> usize {
+        self.blocks.capacity() * std::mem::size_of::<Block>()
+    }
+}
+
+/// How the arena encodes each row
+#[derive(Debug, Clone)]
+enum Encoding {
+    Float32(Rows<f32>),
+    Float16(Rows<f16>),
+    /// Codes times a per-row scale of `max |x| / 127`, with each decoded
+    /// row's squared magnitude so Euclidean distance costs one dot product
+    Int8 { rows: Rows<i8>, scales: Vec<f32>, squares: Vec<f32> },
+    /// Sign bits packed 64 dimensions to a word, positive components set
+    Binary { rows: Rows<u64>, dimension: usize },
+}
+
+/// Number of 64-bit words holding one sign bit per dimension
+fn binary_words(dimension: usize) -> usize {
+    (dimension + 63) / 64
+}
+
+/// Pack the sign of each component, set for positive values
+fn binarize(vector: &[f32], bits: &mut [u64]) {
+    bits.fill(0);
+    for (i, &x) in vector.iter().enumerate() {
+        if x > 0.0 {
+            bits[i / 64] |= 1 << (i % 64);
+        }
+    }
+}
+
+/// A query vector prepared for comparison against an arena's rows
+///
+/// Holds the query's magnitude, and its sign bits when the arena is binary,
+/// so neither is recomputed for every row it is compared with.
+#[derive(Debug, Clone)]
+pub struct ArenaQuery<'a> {
+    vector: &'a [f32],
+    norm: f32,
+    bits: Vec<u64>,
+}
+
+
+/// Vectors of one dimension stored back to back in a single allocation
+///
+/// Node `n` owns row `n`. Each row is padded to a multiple of 32 bytes, so
+/// rows are aligned and a traversal touches memory in order instead of
+/// following one heap pointer per vector. Float16 and int8 arenas keep
+/// compressed rows and compare them to f32 queries as they are read, so
+/// their distances are approximate. Binary arenas keep one bit per
+/// dimension and rank rows by Hamming distance to the query's sign bits,
+/// whatever the metric; callers rescore their candidates.
+#[derive(Debug, Clone)]
+pub struct VectorArena {
+    encoding: Encoding,
+    len: usize,
+}
+
+impl VectorArena {
+    pub fn new(dimension: usize) -> Self {
+        Self::with_vector_type(dimension, VectorType::Float32)
+    }
+    
+    /// Arena storing rows in the given element type
+    pub fn with_vector_type(dimension: usize, vector_type: VectorType) -> Self {
+        let encoding = match vector_type {
+            VectorType::Float32 => Encoding::Float32(Rows::new(dimension)),
+            VectorType::Float16 => Encoding::Float16(Rows::new(dimension)),
+            VectorType::Int8 => Encoding::Int8 {
+                rows: Rows::new(dimension),
+                scales: Vec::new(),
+                squares: Vec::new(),
+            },
+            VectorType::Binary => Encoding::Binary {
+                rows: Rows::new(binary_words(dimension)),
+                dimension,
+            },
+        };
+        Self { encoding, len: 0 }
+    }
+    
+    pub fn vector_type(&self) -> VectorType {
+        match self.encoding {
+            Encoding::Float32(_) => VectorType::Float32,
+            Encoding::Float16(_) => VectorType::Float16,
+            Encoding::Int8 { .. } => VectorType::Int8,
+            Encoding::Binary { .. } => VectorType::Binary,
+        }
+    }
+    
+    pub fn len(&self) -> usize {
+        self.len
+    }
+    
+    pub fn is_empty(&self) -> bool {
+        self.len == 0
+    }
+    
+    /// Append a vector as a new row, returning its node id
+    pub fn push(&mut self, vector: &[f32]) -> NodeId {
+        let node = self.len as NodeId;
+        match &mut self.encoding {
+            Encoding::Float32(rows) => rows.push(),
+            Encoding::Float16(rows) => rows.push(),
+            Encoding::Int8 { rows, scales, squares } => {
+                rows.push();
+                scales.push(0.0);
+                squares.push(0.0);
+            }
+            Encoding::Binary { rows, .. } => rows.push(),
+        }
+        self.len += 1;
+        self.set(node, vector);
+        node
+    }
+    
+    /// Overwrite the row of an existing node
+    pub fn set(&mut self, node: NodeId, vector: &[f32]) {
+        match &mut self.encoding {
+            Encoding::Float32(rows) => rows.get_mut(node).copy_from_slice(vector),
+            Encoding::Float16(rows) => {
+                for (code, &x) in rows.get_mut(node).iter_mut().zip(vector) {
+                    *code = f16::from_f32(x);
+                }
+            }
+            Encoding::Int8 { rows, scales, squares } => {
+                let max = vector.iter().fold(0.0f32, |max, x| max.max(x.abs()));
+                let scale = max / INT8_MAX_CODE;
+                let row = rows.get_mut(node);
+                for (code, &x) in row.iter_mut().zip(vector) {
+                    *code = if scale > 0.0 { (x / scale).round() as i8 } else { 0 };
+                }
+                let codes: f32 = row.iter().map(|&code| code as f32 * code as f32).sum();
+                scales[node as usize] = scale;
+                squares[node as usize] = codes * scale * scale;
+            }
+            Encoding::Binary { rows, .. } => binarize(vector, rows.get_mut(node)),
+        }
+    }
+    
+    /// The vector stored for a node, decoded to f32 if compressed
+    pub fn get(&self, node: NodeId) -> Cow<'_, [f32]> {
+        match &self.encoding {
+            Encoding::Float32(rows) => Cow::Borrowed(rows.get(node)),
+            Encoding::Float16(rows) => Cow::Owned(rows.get(node).iter().map(|x| x.to_f32()).collect()),
+            Encoding::Int8 { rows, scales, .. } => {
+                let scale = scales[node as usize];
+                Cow::Owned(rows.get(node).iter().map(|&code| code as f32 * scale).collect())
+            }
+            // Only the signs survive, as unit components
+            Encoding::Binary { rows, dimension } => {
+                let bits = rows.get(node);
+                Cow::Owned((0..*dimension).map(|i| if bits[i / 64] >> (i % 64) & 1 == 1 { 1.0 } else { -1.0 }).collect())
+            }
+        }
+    }
+    
+    /// Prepare a query for `distance`
+    pub fn query<'a>(&self, vector: &'a [f32]) -> ArenaQuery<'a> {
+        let bits = match &self.encoding {
+            Encoding::Binary { dimension, .. } => {
+                let mut bits = vec![0; binary_words(*dimension)];
+                binarize(vector, &mut bits);
+                bits
+            }
+            _ => Vec::new(),
+        };
+        ArenaQuery { vector, norm: simd::magnitude(vector), bits }
+    }
+    
+    /// Distance from a prepared query to a node's row
+    ///
+    /// Only cosine uses the magnitudes, as in `distance_with_norms`.
+    pub fn distance(&self, query: &ArenaQuery<'_>, node: NodeId, node_norm: f32, metric: DistanceMetric) -> f32 {
+        let (query_norm, bits, query) = (query.norm, &query.bits, query.vector);
+        let cosine = |dot: f32| {
+            if query_norm == 0.0 || node_norm == 0.0 {
+                1.0
+            } else {
+                1.0 - dot / (query_norm * node_norm)
+            }
+        };
+        
+        match &self.encoding {
+            Encoding::Float32(rows) => distance_with_norms(query, rows.get(node), query_norm, node_norm, metric),
+            Encoding::Float16(rows) => {
+                let row = rows.get(node);
+                match metric {
+                    DistanceMetric::Cosine => cosine(simd::dot_product_f16(query, row)),
+                    DistanceMetric::Euclidean => simd::squared_euclidean_distance_f16(query, row).sqrt(),
+                    DistanceMetric::DotProduct => -simd::dot_product_f16(query, row),
+                    DistanceMetric::Manhattan => simd::manhattan_distance_f16(query, row),
+                }
+            }
+            Encoding::Int8 { rows, scales, squares } => {
+                let (row, scale) = (rows.get(node), scales[node as usize]);
+                match metric {
+                    DistanceMetric::Cosine => cosine(simd::dot_product_i8(query, row, scale)),
+                    DistanceMetric::Euclidean => {
+                        // |q - x|^2 = |q|^2 - 2 q.x + |x|^2, clamped against rounding
+                        let dot = simd::dot_product_i8(query, row, scale);
+                        (query_norm * query_norm - 2.0 * dot + squares[node as usize]).max(0.0).sqrt()
+                    }
+                    DistanceMetric::DotProduct => -simd::dot_product_i8(query, row, scale),
+                    DistanceMetric::Manhattan => simd::manhattan_distance_i8(query, row, scale),
+                }
+            }
+            Encoding::Binary { rows, .. } => simd::hamming_distance(bits, rows.get(node)) as f32,
+        }
+    }
+    
+    /// Bytes allocated for the arena
+    pub fn memory_usage(&self) -> usize {
+        match &self.encoding {
+            Encoding::Float32(rows) => rows.memory_usage(),
+            Encoding::Float16(rows) => rows.memory_usage(),
+            Encoding::Int8 { rows, scales, squares } => {
+                rows.memory_usage() + (scales.capacity() + squares.capacity()) * std::mem::size_of::<f32>()
+            }
+            Encoding::Binary { rows, .. } => rows.memory_usage(),
+        }
+    }
+}
+
+/// Fixed-capacity neighbor lists stored in one flat array
+///
+/// List `i` is a count followed by `capacity` node ids. Entries are atomics:
+/// searches read lists without locking while an insert rewrites a list
+/// under its node's link lock. A reader may see a list mid-rewrite, but
+/// every id it sees is a node that was linked at some point.
+#[derive(Debug)]
+pub struct LinkLists {
+    slots: Vec<AtomicU32>,
+    capacity: usize,
+}
+
+impl LinkLists {
+    pub fn new(capacity: usize) -> Self {
+        Self {
+            slots: Vec::new(),
+            capacity,
+        }
+    }
+    
+    fn stride(&self) -> usize {
+        self.capacity + 1
+    }
+    
+    /// Most neighbors a list holds
+    pub fn capacity(&self) -> usize {
+        self.capacity
+    }
+    
+    /// Number of lists
+    pub fn lists(&self) -> usize {
+        self.slots.len() / self.stride()
+    }
+    
+    /// Append `count` empty lists, returning the index of the first
+    pub fn push_lists(&mut self, count: usize) -> usize {
+        let first = self.lists();
+        self.slots.resize_with(self.slots.len() + count * self.stride(), || AtomicU32::new(0));
+        first
+    }
+    
+    /// Number of neighbors in a list
+    pub fn len(&self, list: usize) -> usize {
+        (self.slots[list * self.stride()].load(Ordering::Acquire) as usize).min(self.capacity)
+    }
+    
+    /// Copy a list's neighbors into `out`, replacing its contents
+    pub fn read(&self, list: usize, out: &mut Vec<NodeId>) {
+        let start = list * self.stride();
+        let len = self.len(list);
+        out.clear();
+        out.extend(self.slots[start + 1..start + 1 + len].iter().map(|slot| slot.load(Ordering::Relaxed)));
+    }
+    
+    /// Replace a list's neighbors, keeping at most `capacity` of them
+    ///
+    /// Callers serialize writers of the same list.
+    pub fn write(&self, list: usize, neighbors: &[NodeId]) {
+        let start = list * self.stride();
+        let len = neighbors.len().min(self.capacity);
+        for (slot, &neighbor) in self.slots[start + 1..start + 1 + len].iter().zip(neighbors) {
+            slot.store(neighbor, Ordering::Relaxed);
+        }
+        self.slots[start].store(len as u32, Ordering::Release);
+    }
+    
+    /// Bytes allocated for the lists
+    pub fn memory_usage(&self) -> usize {
+        self.slots.capacity() * std::mem::size_of::<AtomicU32>()
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    
+    #[test]
+    fn test_arena_rows_aligned() {
+        let mut arena = VectorArena::new(10);
+        let a = arena.push(&[1.0; 10]);
+        let b = arena.push(&(0..10).map(|i| i as f32).collect::<Vec<_>>());
+        
+        assert_eq!(arena.len(), 2);
+        assert_eq!(&arena.get(a)[..], &[1.0; 10]);
+        assert_eq!(arena.get(b)[9], 9.0);
+        assert_eq!(arena.get(b).as_ptr() as usize % 32, 0);
+        
+        arena.set(a, &[2.0; 10]);
+        assert_eq!(&arena.get(a)[..], &[2.0; 10]);
+        assert_eq!(arena.get(b)[0], 0.0);
+    }
+    
+    #[test]
+    fn test_compressed_arenas_approximate_distances() {
+        let vectors: Vec<Vec<f32>> = (0..20)
+            .map(|i| (0..37).map(|j| ((i * 37 + j) as f32 * 0.13).sin() * (1.0 + i as f32)).collect())
+            .collect();
+        let query: Vec<f32> = (0..37).map(|j| (j as f32 * 0.29).cos()).collect();
+        let query_norm = simd::magnitude(&query);
+        let exact = VectorArena::new(37);
+        
+        for (vector_type, tolerance) in [(VectorType::Float16, 1e-3), (VectorType::Int8, 2e-2)] {
+            let mut arena = VectorArena::with_vector_type(37, vector_type);
+            let mut exact = exact.clone();
+            for vector in &vectors {
+                arena.push(vector);
+                exact.push(vector);
+            }
+            assert_eq!(arena.vector_type(), vector_type);
+            assert!(arena.memory_usage() < exact.memory_usage());
+            
+            for node in 0..vectors.len() as NodeId {
+                let decoded = arena.get(node);
+                let norm = simd::magnitude(&vectors[node as usize]);
+                for (x, y) in decoded.iter().zip(&vectors[node as usize]) {
+                    assert!((x - y).abs() <= tolerance * norm);
+                }
+                for metric in [DistanceMetric::Cosine, DistanceMetric::Euclidean, DistanceMetric::DotProduct] {
+                    let expected = exact.distance(&exact.query(&query), node, norm, metric);
+                    let actual = arena.distance(&arena.query(&query), node, norm, metric);
+                    // Each decoded element is off by at most `tolerance * norm`
+                    assert!(
+                        (expected - actual).abs() <= 8.0 * tolerance * (1.0 + query_norm) * (1.0 + norm),
+                        "{:?} {:?}: expected {}, got {}",
+                        vector_type,
+                        metric,
+                        expected,
+                        actual
+                    );
+                }
+            }
+        }
+    }
+    
+    #[test]
+    fn test_binary_arena_hamming_distance() {
+        let mut arena = VectorArena::with_vector_type(100, VectorType::Binary);
+        let positive = vec![0.5; 100];
+        let mut flipped = positive.clone();
+        for x in flipped.iter_mut().step_by(10) {
+            *x = -2.0;
+        }
+        let a = arena.push(&positive);
+        let b = arena.push(&flipped);
+        
+        assert_eq!(arena.get(b)[10], -1.0);
+        assert_eq!(arena.get(b)[11], 1.0);
+        
+        let query = arena.query(&positive);
+        for metric in [DistanceMetric::Cosine, DistanceMetric::Euclidean] {
+            assert_eq!(arena.distance(&query, a, 1.0, metric), 0.0);
+            assert_eq!(arena.distance(&query, b, 1.0, metric), 10.0);
+        }
+        
+        // A bit per dimension against four bytes
+        let (mut exact, mut binary) = (VectorArena::new(1024), VectorArena::with_vector_type(1024, VectorType::Binary));
+        exact.push(&[1.0; 1024]);
+        binary.push(&[1.0; 1024]);
+        assert_eq!(exact.memory_usage(), 32 * binary.memory_usage());
+    }
+    
+    #[test]
+    fn test_link_lists_truncate_to_capacity() {
+        let mut links = LinkLists::new(3);
+        let first = links.push_lists(2);
+        assert_eq!(links.lists(), 2);
+        
+        let mut out = Vec::new();
+        links.write(first + 1, &[4, 5, 6, 7]);
+        links.read(first + 1, &mut out);
+        assert_eq!(out, vec![4, 5, 6]);
+        
+        links.read(first, &mut out);
+        assert!(out.is_empty());
+    }
+}
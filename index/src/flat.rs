@@ -0,0 +1,448 @@
+use crate::{VectorIndex, SearchParams, SearchResult, IndexStats};
+use crate::arena::VectorArena;
+use crate::node::{NodeId, SearchCandidate};
+use crate::payload::PayloadIndex;
+use vectordb_common::{Result, VectorDbError, MetadataFilter, simd, types::*};
+use std::collections::{BinaryHeap, HashMap};
+use parking_lot::RwLock;
+use serde::{Deserialize, Serialize};
+
+/// Fewest rows each scan thread is given; smaller scans stay on one thread
+const PARALLEL_SCAN_MIN: usize = 16_384;
+
+type Metadata = HashMap<String, serde_json::Value>;
+
+/// A vector as stored in index snapshots
+#[derive(Serialize, Deserialize)]
+struct SnapshotVector {
+    id: VectorId,
+    vector: Vec<f32>,
+    #[serde(with = "vectordb_common::metadata")]
+    metadata: Option<Metadata>,
+}
+
+/// Closest `limit` of `count` scored items, closest first
+///
+/// `score` maps an item to its candidate, or `None` to skip it. Large scans
+/// are split into contiguous ranges, one per thread, each keeping its own
+/// bounded heap.
+pub(crate) fn scan_top_k(
+    count: usize,
+    limit: usize,
+    score: impl Fn(usize) -> Option<SearchCandidate> + Sync,
+) -> Vec<SearchCandidate> {
+    let threads = std::thread::available_parallelism()
+        .map_or(1, |n| n.get())
+        .min(count / PARALLEL_SCAN_MIN)
+        .max(1);
+    scan_on_threads(threads, count, limit, score)
+}
+
+fn scan_on_threads(
+    threads: usize,
+    count: usize,
+    limit: usize,
+    score: impl Fn(usize) -> Option<SearchCandidate> + Sync,
+) -> Vec<SearchCandidate> {
+    let closest_in = |range: std::ops::Range<usize>| {
+        let mut closest = BinaryHeap::with_capacity(limit + 1);
+        for candidate in range.filter_map(&score) {
+            if closest.len() < limit {
+                closest.push(candidate);
+            } else if closest.peek().map_or(false, |worst: &SearchCandidate| candidate.distance < worst.distance) {
+                closest.pop();
+                closest.push(candidate);
+            }
+        }
+        closest
+    };
+    
+    if threads == 1 {
+        return closest_in(0..count).into_sorted_vec();
+    }
+    
+    let chunk = (count + threads - 1) / threads;
+    let mut merged: Vec<SearchCandidate> = std::thread::scope(|scope| {
+        let workers: Vec<_> = (0..threads)
+            .map(|t| {
+                let closest_in = &closest_in;
+                scope.spawn(move || closest_in(t * chunk..((t + 1) * chunk).min(count)))
+            })
+            .collect();
+        workers
+            .into_iter()
+            .flat_map(|worker| worker.join().expect("scan worker panicked"))
+            .collect()
+    });
+    merged.sort();
+    merged.truncate(limit);
+    merged
+}
+
+/// Rows keyed by dense node ids, as in the HNSW graph but without links
+#[derive(Debug)]
+struct FlatRows {
+    vectors: VectorArena,
+    /// Magnitude of each vector as inserted, for cosine distance
+    norms: Vec<f32>,
+    ids: Vec<VectorId>,
+    id_map: HashMap<VectorId, NodeId>,
+    live: Vec<bool>,
+    metadata: Vec<Option<Metadata>>,
+    /// Inverted index over the collection's indexed metadata fields
+    payload: PayloadIndex,
+    free: Vec<NodeId>,
+}
+
+impl FlatRows {
+    fn new(dimension: usize, vector_type: VectorType, fields: Vec<String>) -> Self {
+        Self {
+            vectors: VectorArena::with_vector_type(dimension, vector_type),
+            norms: Vec::new(),
+            ids: Vec::new(),
+            id_map: HashMap::new(),
+            live: Vec::new(),
+            metadata: Vec::new(),
+            payload: PayloadIndex::new(fields),
+            free: Vec::new(),
+        }
+    }
+    
+    /// Store a row, replacing any with the same id and reusing free slots
+    fn insert(&mut self, id: VectorId, vector: &[f32], metadata: Option<Metadata>) {
+        self.remove(&id);
+        let node = match self.free.pop() {
+            Some(node) => {
+                let slot = node as usize;
+                self.vectors.set(node, vector);
+                self.norms[slot] = simd::magnitude(vector);
+                self.ids[slot] = id;
+                self.metadata[slot] = metadata;
+                self.live[slot] = true;
+                node
+            }
+            None => {
+                let node = self.vectors.push(vector);
+                self.norms.push(simd::magnitude(vector));
+                self.ids.push(id);
+                self.metadata.push(metadata);
+                self.live.push(true);
+                node
+            }
+        };
+        self.id_map.insert(id, node);
+        self.payload.insert(node, self.metadata[node as usize].as_ref());
+    }
+    
+    fn remove(&mut self, id: &VectorId) -> bool {
+        let node = match self.id_map.remove(id) {
+            Some(node) => node,
+            None => return false,
+        };
+        let metadata = self.metadata[node as usize].take();
+        self.payload.remove(node, metadata.as_ref());
+        self.live[node as usize] = false;
+        self.free.push(node);
+        true
+    }
+    
+    fn memory_usage(&self) -> usize {
+        let slots = self.ids.capacity();
+        self.vectors.memory_usage()
+            + slots * (std::mem::size_of::<VectorId>() + std::mem::size_of::<bool>())
+            + self.norms.capacity() * std::mem::size_of::<f32>()
+            + self.metadata.capacity() * std::mem::size_of::<Option<Metadata>>()
+            + self.id_map.capacity() * (std::mem::size_of::<VectorId>() + std::mem::size_of::<NodeId>())
+            + self.payload.memory_usage()
+    }
+}
+
+/// Flat index that answers every query by scanning all vectors
+///
+/// Vectors sit in the same contiguous, block-aligned arena as the HNSW
+/// graph's, without any links, so results are exact and memory is the
+/// vectors alone. A scan reads rows in order with the SIMD distance
+/// kernels and splits large collections across threads. Suited to
+/// collections of up to some tens of thousands of vectors, or to jobs that
+/// cannot tolerate approximate results.
+#[derive(Debug)]
+pub struct FlatIndex {
+    rows: RwLock<FlatRows>,
+    distance_metric: DistanceMetric,
+    dimension: usize,
+}
+
+impl FlatIndex {
+    pub fn new(distance_metric: DistanceMetric, dimension: usize) -> Self {
+        Self {
+            rows: RwLock::new(FlatRows::new(dimension, VectorType::Float32, Vec::new())),
+            distance_metric,
+            dimension,
+        }
+    }
+    
+    /// Store vectors compressed; distances are then approximate
+    pub fn with_vector_type(mut self, vector_type: VectorType) -> Self {
+        let rows = self.rows.get_mut();
+        *rows = FlatRows::new(self.dimension, vector_type, rows.payload.fields());
+        self
+    }
+    
+    /// Keep an inverted index over these metadata fields for filtered search
+    pub fn with_indexed_fields(mut self, fields: &[String]) -> Self {
+        let rows = self.rows.get_mut();
+        *rows = FlatRows::new(self.dimension, rows.vectors.vector_type(), fields.to_vec());
+        self
+    }
+    
+    fn check_dimension(&self, vector: &[f32]) -> Result<()> {
+        if vector.len() != self.dimension {
+            return Err(VectorDbError::InvalidDimension {
+                expected: self.dimension,
+                actual: vector.len(),
+            });
+        }
+        Ok(())
+    }
+}
+
+impl VectorIndex for FlatIndex {
+    fn insert(&self, id: VectorId, vector: &[f32], metadata: Option<Metadata>) -> Result<()> {
+        self.check_dimension(vector)?;
+        self.rows.write().insert(id, vector, metadata);
+        Ok(())
+    }
+    
+    fn batch_insert(&self, vectors: &[Vector]) -> Result<()> {
+        for vector in vectors {
+            self.check_dimension(&vector.data)?;
+        }
+        let mut rows = self.rows.write();
+        for vector in vectors {
+            rows.insert(vector.id, &vector.data, vector.metadata.clone());
+        }
+        Ok(())
+    }
+    
+    fn search(&self, query: &[f32], limit: usize, ef: Option<usize>) -> Result<Vec<SearchResult>> {
+        self.search_with(query, limit, &SearchParams { ef_search: ef, ..SearchParams::default() }, None)
+    }
+    
+    fn search_filtered(
+        &self,
+        query: &[f32],
+        limit: usize,
+        ef: Option<usize>,
+        filter: &MetadataFilter,
+    ) -> Result<Vec<SearchResult>> {
+        self.search_with(query, limit, &SearchParams { ef_search: ef, ..SearchParams::default() }, Some(filter))
+    }
+    
+    fn search_with(
+        &self,
+        query: &[f32],
+        limit: usize,
+        _params: &SearchParams,
+        filter: Option<&MetadataFilter>,
+    ) -> Result<Vec<SearchResult>> {
+        self.check_dimension(query)?;
+        let filter = filter.filter(|filter| !filter.is_empty());
+        
+        let rows = self.rows.read();
+        let query = rows.vectors.query(query);
+        let score = |node: NodeId| {
+            let slot = node as usize;
+            if !rows.live[slot] || !filter.map_or(true, |filter| filter.matches(rows.metadata[slot].as_ref())) {
+                return None;
+            }
+            let distance = rows.vectors.distance(&query, node, rows.norms[slot], self.distance_metric);
+            Some(SearchCandidate { id: node, distance })
+        };
+        
+        // Indexed filter fields narrow the scan to matching rows, in row order
+        let candidates = match filter.and_then(|filter| rows.payload.candidates(filter)) {
+            Some(nodes) => {
+                let mut nodes: Vec<NodeId> = nodes.into_iter().collect();
+                nodes.sort_unstable();
+                scan_top_k(nodes.len(), limit, |i| score(nodes[i]))
+            }
+            None => scan_top_k(rows.ids.len(), limit, |i| score(i as NodeId)),
+        };
+        
+        Ok(candidates
+            .into_iter()
+            .map(|candidate| SearchResult {
+                id: rows.ids[candidate.id as usize],
+                distance: candidate.distance,
+                metadata: rows.metadata[candidate.id as usize].clone(),
+            })
+            .collect())
+    }
+    
+    fn delete(&self, id: &VectorId) -> Result<bool> {
+        Ok(self.rows.write().remove(id))
+    }
+    
+    fn contains(&self, id: &VectorId) -> bool {
+        self.rows.read().id_map.contains_key(id)
+    }
+    
+    fn stats(&self) -> IndexStats {
+        let rows = self.rows.read();
+        IndexStats {
+            vector_count: rows.id_map.len(),
+            memory_usage: rows.memory_usage(),
+            dimension: self.dimension,
+            max_layer: 0,
+            avg_connections: 0.0,
+        }
+    }
+    
+    fn serialize(&self) -> Result<Vec<u8>> {
+        #[derive(Serialize)]
+        struct SerializedIndex {
+            vectors: Vec<SnapshotVector>,
+            distance_metric: DistanceMetric,
+            dimension: usize,
+        }
+        
+        let rows = self.rows.read();
+        let vectors = rows
+            .id_map
+            .iter()
+            .map(|(&id, &node)| SnapshotVector {
+                id,
+                vector: rows.vectors.get(node).into_owned(),
+                metadata: rows.metadata[node as usize].clone(),
+            })
+            .collect();
+        bincode::serialize(&SerializedIndex {
+            vectors,
+            distance_metric: self.distance_metric,
+            dimension: self.dimension,
+        })
+        .map_err(|e| VectorDbError::Serialization(e.to_string()))
+    }
+    
+    fn deserialize(&mut self, data: &[u8]) -> Result<()> {
+        #[derive(Deserialize)]
+        struct SerializedIndex {
+            vectors: Vec<SnapshotVector>,
+            distance_metric: DistanceMetric,
+            dimension: usize,
+        }
+        
+        let serialized: SerializedIndex = bincode::deserialize(data)
+            .map_err(|e| VectorDbError::Serialization(e.to_string()))?;
+        if serialized.dimension != self.dimension {
+            return Err(VectorDbError::Serialization(format!(
+                "Snapshot has dimension {}, expected {}",
+                serialized.dimension, self.dimension
+            )));
+        }
+        
+        let rows = self.rows.get_mut();
+        let mut restored = FlatRows::new(self.dimension, rows.vectors.vector_type(), rows.payload.fields());
+        for SnapshotVector { id, vector, metadata } in serialized.vectors {
+            if vector.len() != self.dimension {
+                return Err(VectorDbError::Serialization(format!(
+                    "Vector {} has dimension {}, expected {}",
+                    id,
+                    vector.len(),
+                    self.dimension
+                )));
+            }
+            restored.insert(id, &vector, metadata);
+        }
+        *rows = restored;
+        self.distance_metric = serialized.distance_metric;
+        Ok(())
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use uuid::Uuid;
+    
+    #[test]
+    fn test_scan_merges_threads() {
+        let count = 10_007;
+        let score = |i: usize| {
+            // Every third item skipped; distances are a permutation, as 10007 is prime
+            (i % 3 != 0).then(|| SearchCandidate { id: i as NodeId, distance: (i * 7919 % count) as f32 })
+        };
+        let found = scan_on_threads(4, count, 5, score);
+        assert_eq!(found, scan_top_k(count, 5, score));
+        
+        let mut expected: Vec<SearchCandidate> = (0..count).filter_map(score).collect();
+        expected.sort();
+        expected.truncate(5);
+        assert_eq!(found, expected);
+    }
+    
+    #[test]
+    fn test_flat_index_exact() {
+        let index = FlatIndex::new(DistanceMetric::Euclidean, 2).with_indexed_fields(&["group".to_string()]);
+        let ids: Vec<VectorId> = (0..100).map(|_| Uuid::new_v4()).collect();
+        for (i, id) in ids.iter().enumerate() {
+            let metadata: Metadata = serde_json::from_value(serde_json::json!({"group": i % 4})).unwrap();
+            index.insert(*id, &[i as f32, 0.0], Some(metadata)).unwrap();
+        }
+        
+        let results = index.search(&[40.2, 0.0], 3, None).unwrap();
+        assert_eq!(results.iter().map(|r| r.id).collect::<Vec<_>>(), vec![ids[40], ids[41], ids[39]]);
+        assert!((results[0].distance - 0.2).abs() < 1e-5);
+        
+        let filter_values: Metadata = serde_json::from_value(serde_json::json!({"group": 1})).unwrap();
+        let results = index.search_filtered(&[40.2, 0.0], 2, None, &MetadataFilter::new(&filter_values)).unwrap();
+        assert_eq!(results.iter().map(|r| r.id).collect::<Vec<_>>(), vec![ids[41], ids[37]]);
+        
+        // Deleted slots are skipped, then reused
+        assert!(index.delete(&ids[40]).unwrap());
+        assert_eq!(index.search(&[40.2, 0.0], 1, None).unwrap()[0].id, ids[41]);
+        let replacement = Uuid::new_v4();
+        index.insert(replacement, &[40.0, 0.0], None).unwrap();
+        assert_eq!(index.search(&[40.2, 0.0], 1, None).unwrap()[0].id, replacement);
+        assert_eq!(index.stats().vector_count, 100);
+        
+        let mut restored = FlatIndex::new(DistanceMetric::Euclidean, 2);
+        restored.deserialize(&index.serialize().unwrap()).unwrap();
+        assert_eq!(restored.search(&[40.2, 0.0], 1, None).unwrap()[0].id, replacement);
+        assert_eq!(restored.stats().vector_count, 100);
+    }
+    
+    #[test]
+    fn test_filter_results_independent_of_payload_index() {
+        let indexed = FlatIndex::new(DistanceMetric::Euclidean, 2).with_indexed_fields(&["tag".to_string()]);
+        let plain = FlatIndex::new(DistanceMetric::Euclidean, 2);
+        let tags = [
+            serde_json::json!({"tag": "a"}),
+            serde_json::json!({"tag": null}),
+            serde_json::json!({"tag": {"k": 1}}),
+            serde_json::json!({"tag": ["a", null]}),
+            serde_json::json!({"tag": 1}),
+            serde_json::json!({}),
+        ];
+        for (i, tag) in tags.iter().enumerate() {
+            let id = Uuid::new_v4();
+            let metadata: Metadata = serde_json::from_value(tag.clone()).unwrap();
+            indexed.insert(id, &[i as f32, 0.0], Some(metadata.clone())).unwrap();
+            plain.insert(id, &[i as f32, 0.0], Some(metadata)).unwrap();
+        }
+        
+        for filter in [
+            serde_json::json!({"tag": "a"}),
+            serde_json::json!({"tag": null}),
+            serde_json::json!({"tag": {"k": 1}}),
+            serde_json::json!({"tag": ["1", null]}),
+        ] {
+            let filter = MetadataFilter::new(&serde_json::from_value(filter).unwrap());
+            let ids = |index: &FlatIndex| {
+                index.search_filtered(&[0.0, 0.0], 10, None, &filter).unwrap().iter().map(|r| r.id).collect::<Vec<_>>()
+            };
+            assert!(!ids(&plain).is_empty());
+            assert_eq!(ids(&indexed), ids(&plain), "{:?}", filter);
+        }
+    }
+}
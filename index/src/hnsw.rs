@@ -1,16 +1,276 @@
-use crate::{VectorIndex, SearchResult, IndexStats};
-use crate::node::{HnswNode, SearchCandidate, NearestCandidate};
-use vectordb_common::{Result, VectorDbError, distance, types::*};
-use std::collections::{HashMap, BinaryHeap, HashSet};
-use parking_lot::RwLock;
+use crate::{VectorIndex, SearchDeadline, SearchParams, SearchResult, IndexStats};
+use crate::flat::scan_top_k;
+use crate::arena::{ArenaQuery, LinkLists, VectorArena};
+use crate::node::{HnswNode, NodeId, SearchCandidate, NearestCandidate};
+use crate::payload::PayloadIndex;
+use vectordb_common::{Result, VectorDbError, MetadataFilter, simd, types::*};
+use std::collections::{BinaryHeap, HashMap, HashSet};
+use std::sync::atomic::{AtomicUsize, Ordering};
+use parking_lot::{Mutex, RwLock};
 use rand::prelude::*;
 use serde::{Deserialize, Serialize};
 
+/// Smallest batch worth spreading over several threads
+const PARALLEL_BATCH_MIN: usize = 64;
+
+/// Marks nodes without upper-layer neighbor lists
+const NO_UPPER_LINKS: u32 = u32::MAX;
+
+/// Graph expansions between checks of a search deadline
+const DEADLINE_CHECK_INTERVAL: usize = 16;
+
+/// Graph storage keyed by dense node ids
+///
+/// Vectors live in one contiguous arena and neighbor lists in flat arrays:
+/// layer 0 has one list per node, and a node on layers `1..=level` owns
+/// `level` consecutive lists of `upper_links`. The external UUIDs are only
+/// touched at the edges, through `ids` and `id_map`. Slots of deleted nodes
+/// are reused by later inserts.
+#[derive(Debug)]
+struct Graph {
+    vectors: VectorArena,
+    /// Magnitude of each vector as inserted, for cosine distance
+    norms: Vec<f32>,
+    ids: Vec<VectorId>,
+    id_map: HashMap<VectorId, NodeId>,
+    levels: Vec<u8>,
+    live: Vec<bool>,
+    metadata: Vec<Option<HashMap<String, serde_json::Value>>>,
+    /// Inverted index over the collection's indexed metadata fields
+    payload: PayloadIndex,
+    base_links: LinkLists,
+    upper_links: LinkLists,
+    /// First upper-layer list of each node, and how many it owns
+    upper_start: Vec<u32>,
+    upper_count: Vec<u8>,
+    /// Serializes rewrites of each node's neighbor lists
+    link_locks: Vec<Mutex<()>>,
+    free: Vec<NodeId>,
+    /// Entry node and its top layer
+    entry_point: Option<(NodeId, usize)>,
+}
+
+impl Graph {
+    fn new(dimension: usize, max_connections: usize, vector_type: VectorType) -> Self {
+        Self {
+            vectors: VectorArena::with_vector_type(dimension, vector_type),
+            norms: Vec::new(),
+            ids: Vec::new(),
+            id_map: HashMap::new(),
+            levels: Vec::new(),
+            live: Vec::new(),
+            metadata: Vec::new(),
+            payload: PayloadIndex::default(),
+            base_links: LinkLists::new(max_connections * 2),
+            upper_links: LinkLists::new(max_connections),
+            upper_start: Vec::new(),
+            upper_count: Vec::new(),
+            link_locks: Vec::new(),
+            free: Vec::new(),
+            entry_point: None,
+        }
+    }
+    
+    /// Store a node with empty neighbor lists, reusing a free slot if any
+    ///
+    /// A node already stored for `id` is removed first, under the same
+    /// lock, so concurrent inserts of one id leave a single node.
+    fn allocate(
+        &mut self,
+        id: VectorId,
+        vector: &[f32],
+        metadata: Option<HashMap<String, serde_json::Value>>,
+        level: usize,
+    ) -> NodeId {
+        self.remove(&id);
+        
+        let node = match self.free.pop() {
+            Some(node) => {
+                let slot = node as usize;
+                self.vectors.set(node, vector);
+                self.norms[slot] = simd::magnitude(vector);
+                self.ids[slot] = id;
+                self.metadata[slot] = metadata;
+                self.live[slot] = true;
+                self.base_links.write(slot, &[]);
+                
+                if level > self.upper_count[slot] as usize {
+                    self.upper_start[slot] = self.upper_links.push_lists(level) as u32;
+                    self.upper_count[slot] = level as u8;
+                }
+                for layer in 1..=level {
+                    self.upper_links.write(self.upper_list(node, layer), &[]);
+                }
+                node
+            }
+            None => {
+                let node = self.vectors.push(vector);
+                self.norms.push(simd::magnitude(vector));
+                self.ids.push(id);
+                self.metadata.push(metadata);
+                self.live.push(true);
+                self.levels.push(0);
+                self.base_links.push_lists(1);
+                self.upper_start.push(if level > 0 {
+                    self.upper_links.push_lists(level) as u32
+                } else {
+                    NO_UPPER_LINKS
+                });
+                self.upper_count.push(level as u8);
+                self.link_locks.push(Mutex::new(()));
+                node
+            }
+        };
+        
+        self.levels[node as usize] = level as u8;
+        self.id_map.insert(id, node);
+        self.payload.insert(node, self.metadata[node as usize].as_ref());
+        node
+    }
+    
+    /// Remove the node stored for `id` and every link to it
+    fn remove(&mut self, id: &VectorId) -> Option<NodeId> {
+        let node = self.id_map.remove(id)?;
+        
+        let metadata = self.metadata[node as usize].take();
+        self.payload.remove(node, metadata.as_ref());
+        self.live[node as usize] = false;
+        self.free.push(node);
+        
+        // Remove all connections to this node
+        let mut links = Vec::new();
+        let live: Vec<NodeId> = self.live_nodes().collect();
+        for other in live {
+            for layer in 0..=self.level(other) {
+                self.neighbors(other, layer, &mut links);
+                if links.contains(&node) {
+                    links.retain(|&linked| linked != node);
+                    self.set_neighbors(other, layer, &links);
+                }
+            }
+        }
+        
+        // Update entry point if necessary
+        if self.entry_point.map_or(false, |(entry, _)| entry == node) {
+            // Find new entry point (node with highest layer)
+            self.entry_point = self
+                .live_nodes()
+                .max_by_key(|&other| self.level(other))
+                .map(|other| (other, self.level(other)));
+        }
+        
+        Some(node)
+    }
+    
+    /// Index a set of metadata fields, replacing any indexed before
+    fn set_indexed_fields(&mut self, fields: Vec<String>) {
+        let mut payload = PayloadIndex::new(fields);
+        for &node in self.id_map.values() {
+            payload.insert(node, self.metadata[node as usize].as_ref());
+        }
+        self.payload = payload;
+    }
+    
+    fn upper_list(&self, node: NodeId, layer: usize) -> usize {
+        self.upper_start[node as usize] as usize + layer - 1
+    }
+    
+    fn level(&self, node: NodeId) -> usize {
+        self.levels[node as usize] as usize
+    }
+    
+    /// Whether a node slot still holds the given vector
+    fn holds(&self, node: NodeId, id: VectorId) -> bool {
+        self.live[node as usize] && self.ids[node as usize] == id
+    }
+    
+    /// Copy a node's neighbors at a layer into `out`
+    fn neighbors(&self, node: NodeId, layer: usize, out: &mut Vec<NodeId>) {
+        if layer == 0 {
+            self.base_links.read(node as usize, out);
+        } else if layer <= self.level(node) {
+            self.upper_links.read(self.upper_list(node, layer), out);
+        } else {
+            out.clear();
+        }
+    }
+    
+    /// Replace a node's neighbors at a layer; callers hold its link lock
+    fn set_neighbors(&self, node: NodeId, layer: usize, neighbors: &[NodeId]) {
+        if layer == 0 {
+            self.base_links.write(node as usize, neighbors);
+        } else if layer <= self.level(node) {
+            self.upper_links.write(self.upper_list(node, layer), neighbors);
+        }
+    }
+    
+    fn live_nodes(&self) -> impl Iterator<Item = NodeId> + '_ {
+        self.id_map.values().copied()
+    }
+    
+    fn memory_usage(&self) -> usize {
+        let slots = self.ids.capacity();
+        self.vectors.memory_usage()
+            + self.base_links.memory_usage()
+            + self.upper_links.memory_usage()
+            + slots * (std::mem::size_of::<VectorId>() + 2 * std::mem::size_of::<u8>() + std::mem::size_of::<bool>())
+            + self.upper_start.capacity() * std::mem::size_of::<u32>()
+            + self.norms.capacity() * std::mem::size_of::<f32>()
+            + self.link_locks.capacity() * std::mem::size_of::<Mutex<()>>()
+            + self.metadata.capacity() * std::mem::size_of::<Option<HashMap<String, serde_json::Value>>>()
+            + self.id_map.capacity() * (std::mem::size_of::<VectorId>() + std::mem::size_of::<NodeId>())
+            + self.payload.memory_usage()
+            + self.metadata.iter().flatten().map(|m| {
+                m.iter().map(|(k, v)| {
+                    k.len() + match v {
+                        serde_json::Value::String(s) => s.len(),
+                        _ => std::mem::size_of::<serde_json::Value>(),
+                    }
+                }).sum::<usize>()
+            }).sum::<usize>()
+    }
+}
+
+/// Nodes reached during a search, cleared in time proportional to the
+/// nodes visited rather than the size of the graph
+#[derive(Debug, Default)]
+struct VisitedSet {
+    words: Vec<u64>,
+    touched: Vec<usize>,
+}
+
+impl VisitedSet {
+    fn clear(&mut self) {
+        for word in self.touched.drain(..) {
+            self.words[word] = 0;
+        }
+    }
+    
+    /// Mark a node visited, returning false if it already was
+    fn insert(&mut self, node: NodeId) -> bool {
+        let (word, bit) = (node as usize / 64, 1u64 << (node % 64));
+        if word >= self.words.len() {
+            self.words.resize(word + 1, 0);
+        }
+        if self.words[word] & bit != 0 {
+            return false;
+        }
+        if self.words[word] == 0 {
+            self.touched.push(word);
+        }
+        self.words[word] |= bit;
+        true
+    }
+}
+
 /// HNSW (Hierarchical Navigable Small World) index implementation
+///
+/// Inserts take `&self`: the graph is write-locked only to store or remove
+/// a node, and linking locks one neighbor list at a time, so many inserts
+/// and searches run at once.
 #[derive(Debug)]
 pub struct HnswIndex {
-    nodes: RwLock<HashMap<VectorId, HnswNode>>,
-    entry_point: RwLock<Option<VectorId>>,
+    graph: RwLock<Graph>,
     config: IndexConfig,
     distance_metric: DistanceMetric,
     dimension: usize,
@@ -20,8 +280,7 @@ pub struct HnswIndex {
 impl HnswIndex {
     pub fn new(config: IndexConfig, distance_metric: DistanceMetric, dimension: usize) -> Self {
         Self {
-            nodes: RwLock::new(HashMap::new()),
-            entry_point: RwLock::new(None),
+            graph: RwLock::new(Graph::new(dimension, config.max_connections, VectorType::Float32)),
             config,
             distance_metric,
             dimension,
@@ -29,53 +288,89 @@ impl HnswIndex {
         }
     }
     
+    /// Store vectors compressed to float16 or int8
+    ///
+    /// Distances are then approximate; callers needing exact ones rescore
+    /// the results against the original vectors.
+    pub fn with_vector_type(mut self, vector_type: VectorType) -> Self {
+        let graph = self.graph.get_mut();
+        let fields = graph.payload.fields();
+        *graph = Graph::new(self.dimension, self.config.max_connections, vector_type);
+        graph.set_indexed_fields(fields);
+        self
+    }
+    
+    /// Whether stored vectors are compressed, making distances approximate
+    pub fn is_quantized(&self) -> bool {
+        self.graph.read().vectors.vector_type() != VectorType::Float32
+    }
+    
+    /// Keep an inverted index over these metadata fields for filtered search
+    pub fn with_indexed_fields(mut self, fields: &[String]) -> Self {
+        self.graph.get_mut().set_indexed_fields(fields.to_vec());
+        self
+    }
+    
     /// Select layer for a new node using exponential decay distribution
     fn select_layer(&self) -> usize {
         let mut rng = self.rng.write();
         let mut layer = 0;
-        let _ml = 1.0 / (2.0_f64).ln(); // Normalization factor
+        let max_layer = self.config.max_layer.min(u8::MAX as usize);
         
-        while rng.gen::<f64>() < 0.5 && layer < self.config.max_layer {
+        while rng.gen::<f64>() < 0.5 && layer < max_layer {
             layer += 1;
         }
         
         layer
     }
     
-    /// Calculate distance between two vectors
-    fn distance(&self, a: &[f32], b: &[f32]) -> f32 {
-        distance(a, b, self.distance_metric)
+    /// Calculate distance from a prepared query to a stored node
+    fn distance(&self, graph: &Graph, query: &ArenaQuery<'_>, node: NodeId) -> f32 {
+        graph.vectors.distance(query, node, graph.norms[node as usize], self.distance_metric)
+    }
+    
+    fn check_dimension(&self, vector: &[f32]) -> Result<()> {
+        if vector.len() != self.dimension {
+            return Err(VectorDbError::InvalidDimension {
+                expected: self.dimension,
+                actual: vector.len(),
+            });
+        }
+        Ok(())
     }
     
     /// Search for entry points at the given layer
     fn search_layer(
         &self,
-        query: &[f32],
-        entry_points: &[VectorId],
+        graph: &Graph,
+        query: &ArenaQuery<'_>,
+        entry_points: &[NodeId],
         num_closest: usize,
         layer: usize,
-    ) -> Result<Vec<SearchCandidate>> {
-        let nodes = self.nodes.read();
-        let mut visited = HashSet::new();
+        visited: &mut VisitedSet,
+        accept: Option<&dyn Fn(NodeId) -> bool>,
+        deadline: Option<&SearchDeadline>,
+    ) -> Vec<SearchCandidate> {
         let mut candidates = BinaryHeap::new(); // Max-heap for farthest candidates
         let mut dynamic_list = BinaryHeap::new(); // Min-heap for nearest candidates
+        let mut neighbors = Vec::new();
+        visited.clear();
+        
+        // Nodes failing `accept` are still walked through, but never returned
+        let accepted = |node: NodeId| accept.map_or(true, |accept| accept(node));
         
         // Initialize with entry points
-        for &entry_id in entry_points {
-            if let Some(entry_node) = nodes.get(&entry_id) {
-                let dist = self.distance(query, &entry_node.vector);
-                candidates.push(SearchCandidate {
-                    id: entry_id,
-                    distance: dist,
-                });
-                dynamic_list.push(NearestCandidate {
-                    id: entry_id,
-                    distance: dist,
-                });
-                visited.insert(entry_id);
+        for &entry in entry_points {
+            if visited.insert(entry) {
+                let dist = self.distance(graph, query, entry);
+                if accepted(entry) {
+                    candidates.push(SearchCandidate { id: entry, distance: dist });
+                }
+                dynamic_list.push(NearestCandidate { id: entry, distance: dist });
             }
         }
         
+        let mut expanded = 0usize;
         while let Some(current_candidate) = dynamic_list.pop() {
             // If current candidate is farther than the worst in candidates, stop
             if let Some(worst) = candidates.peek() {
@@ -84,60 +379,51 @@ impl HnswIndex {
                 }
             }
             
-            if let Some(current_node) = nodes.get(&current_candidate.id) {
-                // Explore neighbors
-                for &neighbor_id in current_node.get_connections(layer) {
-                    if visited.contains(&neighbor_id) {
-                        continue;
-                    }
-                    
-                    visited.insert(neighbor_id);
-                    
-                    if let Some(neighbor_node) = nodes.get(&neighbor_id) {
-                        let dist = self.distance(query, &neighbor_node.vector);
-                        
-                        let should_add = if candidates.len() < num_closest {
-                            true
-                        } else if let Some(worst) = candidates.peek() {
-                            dist < worst.distance
-                        } else {
-                            false
-                        };
+            // Past the deadline, return the closest found so far; the clock
+            // is read only every few expansions
+            expanded += 1;
+            if expanded % DEADLINE_CHECK_INTERVAL == 0 && deadline.map_or(false, |d| d.reached()) {
+                break;
+            }
+            
+            // Explore neighbors
+            graph.neighbors(current_candidate.id, layer, &mut neighbors);
+            for &neighbor in &neighbors {
+                if !visited.insert(neighbor) {
+                    continue;
+                }
+                
+                let dist = self.distance(graph, query, neighbor);
+                let should_add = if candidates.len() < num_closest {
+                    true
+                } else if let Some(worst) = candidates.peek() {
+                    dist < worst.distance
+                } else {
+                    false
+                };
+                
+                if should_add {
+                    dynamic_list.push(NearestCandidate { id: neighbor, distance: dist });
+                    if accepted(neighbor) {
+                        candidates.push(SearchCandidate { id: neighbor, distance: dist });
                         
-                        if should_add {
-                            candidates.push(SearchCandidate {
-                                id: neighbor_id,
-                                distance: dist,
-                            });
-                            dynamic_list.push(NearestCandidate {
-                                id: neighbor_id,
-                                distance: dist,
-                            });
-                            
-                            // Prune candidates if too many
-                            if candidates.len() > num_closest {
-                                candidates.pop();
-                            }
+                        // Prune candidates if too many
+                        if candidates.len() > num_closest {
+                            candidates.pop();
                         }
                     }
                 }
             }
         }
         
-        // Convert to sorted vector (closest first)
+        // Ascending by distance, so closest first
         let mut result: Vec<SearchCandidate> = candidates.into_sorted_vec();
-        result.reverse(); // Min distance first
         result.truncate(num_closest);
-        
-        Ok(result)
+        result
     }
     
     /// Select M neighbors using heuristic
-    fn select_neighbors(&self, candidates: &[SearchCandidate], m: usize) -> Vec<VectorId> {
-        if candidates.len() <= m {
-            return candidates.iter().map(|c| c.id).collect();
-        }
-        
+    fn select_neighbors(&self, candidates: &[SearchCandidate], m: usize) -> Vec<NodeId> {
         // Simple heuristic: select M closest candidates
         // More sophisticated heuristics could consider diversity
         candidates.iter().take(m).map(|c| c.id).collect()
@@ -151,198 +437,395 @@ impl HnswIndex {
             (self.config.max_connections, self.config.max_connections)
         }
     }
-}
-
-impl VectorIndex for HnswIndex {
-    fn insert(
-        &mut self,
-        id: VectorId,
-        vector: &[f32],
-        metadata: Option<std::collections::HashMap<String, serde_json::Value>>,
-    ) -> Result<()> {
-        if vector.len() != self.dimension {
-            return Err(VectorDbError::InvalidDimension {
-                expected: self.dimension,
-                actual: vector.len(),
-            });
+    
+    /// Connect a stored node to its selected neighbors at a layer
+    ///
+    /// Only one neighbor list is locked at a time. A neighbor that grows past
+    /// `max_m` keeps its closest links.
+    fn link(&self, graph: &Graph, id: VectorId, node: NodeId, layer: usize, selected: &[NodeId], max_m: usize) {
+        if !graph.holds(node, id) {
+            return; // Deleted while we searched
         }
         
-        let layer = self.select_layer();
-        let mut new_node = HnswNode::new(id, vector.to_vec(), metadata, layer);
+        let mut links = Vec::with_capacity(max_m + 1);
+        for &neighbor in selected {
+            if !graph.live[neighbor as usize] || graph.level(neighbor) < layer {
+                continue;
+            }
+            
+            let _lock = graph.link_locks[neighbor as usize].lock();
+            graph.neighbors(neighbor, layer, &mut links);
+            if !links.contains(&node) {
+                links.push(node);
+            }
+            if links.len() > max_m {
+                let base = graph.vectors.get(neighbor);
+                let base = graph.vectors.query(&base);
+                let mut scored: Vec<(f32, NodeId)> = links
+                    .iter()
+                    .map(|&other| (self.distance(graph, &base, other), other))
+                    .collect();
+                scored.sort_by(|a, b| a.0.partial_cmp(&b.0).unwrap_or(std::cmp::Ordering::Equal));
+                links = scored.into_iter().take(max_m).map(|(_, other)| other).collect();
+            }
+            graph.set_neighbors(neighbor, layer, &links);
+        }
         
-        let mut nodes = self.nodes.write();
-        let mut entry_point = self.entry_point.write();
+        let _lock = graph.link_locks[node as usize].lock();
+        graph.set_neighbors(node, layer, selected);
+    }
+}
+
+impl HnswIndex {
+    /// Descend the layers and search layer 0, closest first
+    fn graph_search(
+        &self,
+        graph: &Graph,
+        query: &[f32],
+        limit: usize,
+        ef_search: usize,
+        accept: Option<&dyn Fn(NodeId) -> bool>,
+        deadline: Option<&SearchDeadline>,
+    ) -> Vec<SearchCandidate> {
+        let (entry, entry_layer) = match graph.entry_point {
+            Some(entry) => entry,
+            None => return Vec::new(), // Empty index
+        };
         
-        // If this is the first node, make it the entry point
-        if entry_point.is_none() {
-            *entry_point = Some(id);
-            nodes.insert(id, new_node);
-            return Ok(());
+        // Search from top layer down to layer 1
+        let query = graph.vectors.query(query);
+        let mut visited = VisitedSet::default();
+        let mut current_closest = vec![entry];
+        for lc in (1..=entry_layer).rev() {
+            let candidates = self.search_layer(graph, &query, &current_closest, 1, lc, &mut visited, None, None);
+            current_closest = candidates.into_iter().map(|c| c.id).collect();
         }
         
-        let entry_id = entry_point.unwrap();
-        let entry_layer = nodes.get(&entry_id).unwrap().layer;
-        
+        // Search layer 0 with ef parameter
+        self.search_layer(
+            graph,
+            &query,
+            &current_closest,
+            std::cmp::max(ef_search, limit),
+            0,
+            &mut visited,
+            accept,
+            deadline,
+        )
+    }
+    
+    /// Exact nearest neighbors that pass `accept`, closest first
+    ///
+    /// Scans `nodes`, or every live node if `None`, in slot order so the
+    /// arena is read sequentially.
+    fn exact_search(
+        &self,
+        graph: &Graph,
+        query: &[f32],
+        nodes: Option<&HashSet<NodeId>>,
+        limit: usize,
+        accept: &(dyn Fn(NodeId) -> bool + Sync),
+    ) -> Vec<SearchCandidate> {
+        let query = graph.vectors.query(query);
+        let score = |node: NodeId| {
+            (graph.live[node as usize] && accept(node))
+                .then(|| SearchCandidate { id: node, distance: self.distance(graph, &query, node) })
+        };
+        match nodes {
+            Some(nodes) => {
+                let mut nodes: Vec<NodeId> = nodes.iter().copied().collect();
+                nodes.sort_unstable();
+                scan_top_k(nodes.len(), limit, |i| score(nodes[i]))
+            }
+            None => scan_top_k(graph.ids.len(), limit, |i| score(i as NodeId)),
+        }
+    }
+    
+    /// Link a stored node into the graph, descending from `entry`
+    fn connect(&self, id: VectorId, node: NodeId, vector: &[f32], layer: usize, entry: NodeId, entry_layer: usize) {
         // Search from top layer down to layer+1
-        let mut current_closest = vec![entry_id];
+        let query = self.graph.read().vectors.query(vector);
+        let mut visited = VisitedSet::default();
+        let mut current_closest = vec![entry];
         for lc in (layer + 1..=entry_layer).rev() {
-            drop(nodes); // Release write lock temporarily
-            let candidates = self.search_layer(vector, &current_closest, 1, lc)?;
-            nodes = self.nodes.write(); // Reacquire write lock
+            let graph = self.graph.read();
+            let candidates = self.search_layer(&graph, &query, &current_closest, 1, lc, &mut visited, None, None);
             current_closest = candidates.into_iter().map(|c| c.id).collect();
         }
         
         // Search and connect from layer down to 0
-        for lc in (0..=layer).rev() {
-            drop(nodes); // Release write lock temporarily
+        for lc in (0..=layer.min(entry_layer)).rev() {
             let ef = if lc == 0 {
                 std::cmp::max(self.config.ef_construction, self.config.max_connections)
             } else {
                 self.config.ef_construction
             };
-            let candidates = self.search_layer(vector, &current_closest, ef, lc)?;
-            nodes = self.nodes.write(); // Reacquire write lock
+            
+            let graph = self.graph.read();
+            let mut candidates = self.search_layer(&graph, &query, &current_closest, ef, lc, &mut visited, None, None);
+            // Concurrent inserts may already have linked to this node
+            candidates.retain(|c| c.id != node);
             
             let (m, max_m) = self.get_m_values(lc);
             let selected = self.select_neighbors(&candidates, m);
-            
-            // Add connections from new node to selected neighbors
-            for &neighbor_id in &selected {
-                new_node.add_connection(lc, neighbor_id);
-                
-                // Add reverse connection
-                if let Some(neighbor_node) = nodes.get_mut(&neighbor_id) {
-                    neighbor_node.add_connection(lc, id);
-                    
-                    // Prune connections if needed
-                    if neighbor_node.connection_count(lc) > max_m {
-                        let neighbor_vector = neighbor_node.vector.clone();
-                        drop(nodes); // Release write lock temporarily
-                        let neighbor_candidates = self.search_layer(
-                            &neighbor_vector,
-                            &[id],
-                            max_m + 1,
-                            lc,
-                        )?;
-                        nodes = self.nodes.write(); // Reacquire write lock
-                        
-                        if let Some(neighbor_node) = nodes.get_mut(&neighbor_id) {
-                            let new_connections = self.select_neighbors(&neighbor_candidates, max_m);
-                            neighbor_node.connections[lc] = new_connections;
-                        }
-                    }
-                }
+            self.link(&graph, id, node, lc, &selected, max_m);
+            if !selected.is_empty() {
+                current_closest = selected;
             }
-            
-            current_closest = selected;
         }
         
         // Update entry point if necessary
         if layer > entry_layer {
-            *entry_point = Some(id);
+            let mut graph = self.graph.write();
+            if graph.entry_point.map_or(true, |(_, top)| layer > top) && graph.holds(node, id) {
+                graph.entry_point = Some((node, layer));
+            }
         }
-        
-        nodes.insert(id, new_node);
-        Ok(())
     }
     
-    fn search(&self, query: &[f32], limit: usize, ef: Option<usize>) -> Result<Vec<SearchResult>> {
-        if query.len() != self.dimension {
-            return Err(VectorDbError::InvalidDimension {
-                expected: self.dimension,
-                actual: query.len(),
-            });
+    /// Store a whole batch, then link it on `threads` threads
+    ///
+    /// Storing every node under one write lock leaves the linking threads
+    /// only read locks to share, where `batch_insert` takes the write lock
+    /// once per vector. `built` counts the vectors done so far.
+    fn bulk_insert_on_threads(&self, vectors: &[Vector], built: &AtomicUsize, threads: usize) -> Result<()> {
+        for vector in vectors {
+            self.check_dimension(&vector.data)?;
         }
         
-        let entry_point = self.entry_point.read();
+        // Nodes already stored for these ids are replaced as they are allocated
+        let batch = last_copies(vectors);
+        built.fetch_add(vectors.len() - batch.len(), Ordering::Relaxed);
         
-        let entry_id = match *entry_point {
-            Some(id) => id,
-            None => return Ok(Vec::new()), // Empty index
+        let layers: Vec<usize> = batch.iter().map(|_| self.select_layer()).collect();
+        let (nodes, first) = {
+            let mut graph = self.graph.write();
+            let nodes: Vec<NodeId> = batch
+                .iter()
+                .zip(&layers)
+                .map(|(vector, &layer)| graph.allocate(vector.id, &vector.data, vector.metadata.clone(), layer))
+                .collect();
+            
+            // In an empty graph the first node becomes the entry point
+            let first = match (graph.entry_point, nodes.first()) {
+                (None, Some(&node)) => {
+                    graph.entry_point = Some((node, layers[0]));
+                    built.fetch_add(1, Ordering::Relaxed);
+                    1
+                }
+                _ => 0,
+            };
+            (nodes, first)
         };
         
-        let entry_layer = {
-            let nodes = self.nodes.read();
-            nodes.get(&entry_id).unwrap().layer
+        // Workers link the next stored node until the batch is drained
+        let next = AtomicUsize::new(first);
+        let link = || {
+            loop {
+                let i = next.fetch_add(1, Ordering::Relaxed);
+                if i >= batch.len() {
+                    break;
+                }
+                let (entry, entry_layer) = self.graph.read().entry_point.expect("bulk insert stored an entry point");
+                self.connect(batch[i].id, nodes[i], &batch[i].data, layers[i], entry, entry_layer);
+                built.fetch_add(1, Ordering::Relaxed);
+            }
         };
-        let ef_search = ef.unwrap_or(self.config.ef_search);
-        
-        // Search from top layer down to layer 1
-        let mut current_closest = vec![entry_id];
-        for lc in (1..=entry_layer).rev() {
-            let candidates = self.search_layer(query, &current_closest, 1, lc)?;
-            current_closest = candidates.into_iter().map(|c| c.id).collect();
+        if threads <= 1 {
+            link();
+        } else {
+            std::thread::scope(|scope| {
+                for _ in 0..threads {
+                    scope.spawn(&link);
+                }
+            });
         }
+        Ok(())
+    }
+    
+    /// Whether scanning `matching` nodes beats a graph walk
+    ///
+    /// A walk settles about `ef * M` nodes, scaled up by the inverse of the
+    /// share of nodes that match; a scan costs one distance per match. The
+    /// two break even around `matching^2 = ef * M * live`, so unfiltered
+    /// searches scan collections of up to `ef * M` vectors.
+    fn prefer_exact_scan(&self, matching: usize, live: usize, ef: usize) -> bool {
+        let walk_cost = (ef * self.config.max_connections.max(1)) as f64 * live as f64;
+        matching <= ef || (matching as f64).powi(2) <= walk_cost
+    }
+    
+    fn to_results(&self, graph: &Graph, candidates: Vec<SearchCandidate>, limit: usize) -> Vec<SearchResult> {
+        candidates
+            .into_iter()
+            .take(limit)
+            .map(|candidate| SearchResult {
+                id: graph.ids[candidate.id as usize],
+                distance: candidate.distance,
+                metadata: graph.metadata[candidate.id as usize].clone(),
+            })
+            .collect()
+    }
+}
+
+impl VectorIndex for HnswIndex {
+    fn insert(
+        &self,
+        id: VectorId,
+        vector: &[f32],
+        metadata: Option<std::collections::HashMap<String, serde_json::Value>>,
+    ) -> Result<()> {
+        self.check_dimension(vector)?;
         
-        // Search layer 0 with ef parameter
-        let candidates = self.search_layer(query, &current_closest, std::cmp::max(ef_search, limit), 0)?;
-        
-        // Convert to SearchResult and limit results
-        let mut results = Vec::new();
-        {
-            let nodes = self.nodes.read();
-            for candidate in candidates.into_iter().take(limit) {
-                if let Some(node) = nodes.get(&candidate.id) {
-                    results.push(SearchResult {
-                        id: candidate.id,
-                        distance: candidate.distance,
-                        metadata: node.metadata.clone(),
-                    });
+        let layer = self.select_layer();
+        
+        // Store the node, replacing any stored for the id; nothing links to
+        // it until it is connected below
+        let (node, entry, entry_layer) = {
+            let mut graph = self.graph.write();
+            let node = graph.allocate(id, vector, metadata, layer);
+            
+            match graph.entry_point {
+                Some((entry, entry_layer)) => (node, entry, entry_layer),
+                None => {
+                    // First node becomes the entry point
+                    graph.entry_point = Some((node, layer));
+                    return Ok(());
                 }
             }
+        };
+        
+        self.connect(id, node, vector, layer, entry, entry_layer);
+        Ok(())
+    }
+    
+    fn batch_insert(&self, vectors: &[Vector]) -> Result<()> {
+        for vector in vectors {
+            self.check_dimension(&vector.data)?;
+        }
+        let vectors = last_copies(vectors);
+        
+        let threads = std::thread::available_parallelism()
+            .map_or(1, |n| n.get())
+            .min(vectors.len() / PARALLEL_BATCH_MIN);
+        if threads <= 1 {
+            for vector in vectors {
+                self.insert(vector.id, &vector.data, vector.metadata.clone())?;
+            }
+            return Ok(());
         }
         
-        Ok(results)
+        // Workers pull the next vector until the batch is drained
+        let next = AtomicUsize::new(0);
+        std::thread::scope(|scope| {
+            let workers: Vec<_> = (0..threads)
+                .map(|_| {
+                    scope.spawn(|| -> Result<()> {
+                        while let Some(vector) = vectors.get(next.fetch_add(1, Ordering::Relaxed)) {
+                            self.insert(vector.id, &vector.data, vector.metadata.clone())?;
+                        }
+                        Ok(())
+                    })
+                })
+                .collect();
+            
+            workers
+                .into_iter()
+                .map(|worker| worker.join().expect("HNSW insert worker panicked"))
+                .collect()
+        })
+    }
+    
+    fn bulk_insert(&self, vectors: &[Vector], built: &AtomicUsize) -> Result<()> {
+        let threads = std::thread::available_parallelism()
+            .map_or(1, |n| n.get())
+            .min(vectors.len() / PARALLEL_BATCH_MIN);
+        self.bulk_insert_on_threads(vectors, built, threads)
     }
     
-    fn delete(&mut self, id: &VectorId) -> Result<bool> {
-        let mut nodes = self.nodes.write();
-        let mut entry_point = self.entry_point.write();
+    fn search(&self, query: &[f32], limit: usize, ef: Option<usize>) -> Result<Vec<SearchResult>> {
+        self.search_with(query, limit, &SearchParams { ef_search: ef, ..SearchParams::default() }, None)
+    }
+    
+    fn search_filtered(
+        &self,
+        query: &[f32],
+        limit: usize,
+        ef: Option<usize>,
+        filter: &MetadataFilter,
+    ) -> Result<Vec<SearchResult>> {
+        self.search_with(query, limit, &SearchParams { ef_search: ef, ..SearchParams::default() }, Some(filter))
+    }
+    
+    fn search_with(
+        &self,
+        query: &[f32],
+        limit: usize,
+        params: &SearchParams,
+        filter: Option<&MetadataFilter>,
+    ) -> Result<Vec<SearchResult>> {
+        self.check_dimension(query)?;
+        let filter = filter.filter(|filter| !filter.is_empty());
         
-        let _node = match nodes.remove(id) {
-            Some(node) => node,
-            None => return Ok(false),
+        let graph = self.graph.read();
+        let ef_search = params.ef_search.unwrap_or(self.config.ef_search);
+        let indexed = filter.and_then(|filter| graph.payload.candidates(filter));
+        let accept = |node: NodeId| {
+            indexed.as_ref().map_or(true, |nodes| nodes.contains(&node))
+                && filter.map_or(true, |filter| filter.matches(graph.metadata[node as usize].as_ref()))
         };
         
-        // Remove all connections to this node
-        for (_, other_node) in nodes.iter_mut() {
-            for layer in 0..other_node.connections.len() {
-                other_node.remove_connection(layer, id);
-            }
+        // Scan when asked to, or when the collection or the filter's
+        // matches are small enough that a scan is cheaper than a walk
+        // through mostly rejected nodes; a scan never misses a match
+        let matching = indexed.as_ref().map_or(graph.id_map.len(), |nodes| nodes.len());
+        if params.exact || self.prefer_exact_scan(matching, graph.id_map.len(), ef_search.max(limit)) {
+            let candidates = self.exact_search(&graph, query, indexed.as_ref(), limit, &accept);
+            return Ok(self.to_results(&graph, candidates, limit));
         }
         
-        // Update entry point if necessary
-        if entry_point.as_ref() == Some(id) {
-            // Find new entry point (node with highest layer)
-            let new_entry = nodes
-                .iter()
-                .max_by_key(|(_, node)| node.layer)
-                .map(|(&id, _)| id);
-            *entry_point = new_entry;
+        let deadline = params.deadline.as_ref();
+        let mut candidates = match filter {
+            Some(_) => self.graph_search(&graph, query, limit, ef_search, Some(&accept), deadline),
+            None => self.graph_search(&graph, query, limit, ef_search, None, deadline),
+        };
+        let cut_short = deadline.map_or(false, |d| d.cut_short());
+        if filter.is_some() && candidates.len() < limit.min(matching) && !cut_short {
+            // Matches cut off behind rejected nodes; scan for full recall
+            candidates = self.exact_search(&graph, query, indexed.as_ref(), limit, &accept);
         }
-        
-        Ok(true)
+        Ok(self.to_results(&graph, candidates, limit))
+    }
+    
+    fn delete(&self, id: &VectorId) -> Result<bool> {
+        Ok(self.graph.write().remove(id).is_some())
+    }
+    
+    fn contains(&self, id: &VectorId) -> bool {
+        self.graph.read().id_map.contains_key(id)
     }
     
     fn stats(&self) -> IndexStats {
-        let nodes = self.nodes.read();
-        let vector_count = nodes.len();
+        let graph = self.graph.read();
+        let vector_count = graph.id_map.len();
         
-        let memory_usage = nodes
-            .values()
-            .map(|node| node.memory_usage())
-            .sum::<usize>();
-        
-        let max_layer = nodes
-            .values()
-            .map(|node| node.layer)
+        let max_layer = graph
+            .live_nodes()
+            .map(|node| graph.level(node))
             .max()
             .unwrap_or(0);
         
         let avg_connections = if vector_count > 0 {
-            let total_connections: usize = nodes
-                .values()
-                .map(|node| node.connections.iter().map(|layer| layer.len()).sum::<usize>())
+            let mut links = Vec::new();
+            let total_connections: usize = graph
+                .live_nodes()
+                .map(|node| {
+                    (0..=graph.level(node))
+                        .map(|layer| {
+                            graph.neighbors(node, layer, &mut links);
+                            links.len()
+                        })
+                        .sum::<usize>()
+                })
                 .sum();
             total_connections as f32 / vector_count as f32
         } else {
@@ -351,7 +834,7 @@ impl VectorIndex for HnswIndex {
         
         IndexStats {
             vector_count,
-            memory_usage,
+            memory_usage: graph.memory_usage(),
             dimension: self.dimension,
             max_layer,
             avg_connections,
@@ -368,12 +851,34 @@ impl VectorIndex for HnswIndex {
             dimension: usize,
         }
         
-        let nodes = self.nodes.read();
-        let entry_point = self.entry_point.read();
+        // Snapshots keep the UUID-keyed node format, so they stay
+        // independent of how slots happen to be numbered
+        let graph = self.graph.read();
+        let mut links = Vec::new();
+        let nodes = graph
+            .live_nodes()
+            .map(|node| {
+                let id = graph.ids[node as usize];
+                let connections = (0..=graph.level(node))
+                    .map(|layer| {
+                        graph.neighbors(node, layer, &mut links);
+                        links.iter().map(|&other| graph.ids[other as usize]).collect()
+                    })
+                    .collect();
+                let node = HnswNode {
+                    id,
+                    vector: graph.vectors.get(node).into_owned(),
+                    metadata: graph.metadata[node as usize].clone(),
+                    layer: graph.level(node),
+                    connections,
+                };
+                (id, node)
+            })
+            .collect();
         
         let serialized = SerializedIndex {
-            nodes: nodes.clone(),
-            entry_point: *entry_point,
+            nodes,
+            entry_point: graph.entry_point.map(|(entry, _)| graph.ids[entry as usize]),
             config: self.config.clone(),
             distance_metric: self.distance_metric,
             dimension: self.dimension,
@@ -396,8 +901,41 @@ impl VectorIndex for HnswIndex {
         let serialized: SerializedIndex = bincode::deserialize(data)
             .map_err(|e| VectorDbError::Serialization(e.to_string()))?;
         
-        *self.nodes.write() = serialized.nodes;
-        *self.entry_point.write() = serialized.entry_point;
+        // Number the nodes first, then translate their links
+        let vector_type = self.graph.get_mut().vectors.vector_type();
+        let mut graph = Graph::new(serialized.dimension, serialized.config.max_connections, vector_type);
+        graph.set_indexed_fields(self.graph.get_mut().payload.fields());
+        let mut nodes = Vec::with_capacity(serialized.nodes.len());
+        for (id, node) in serialized.nodes {
+            if node.vector.len() != serialized.dimension {
+                return Err(VectorDbError::Serialization(format!(
+                    "Vector {} has dimension {}, expected {}",
+                    id,
+                    node.vector.len(),
+                    serialized.dimension
+                )));
+            }
+            let level = node.layer.min(u8::MAX as usize);
+            let slot = graph.allocate(id, &node.vector, node.metadata, level);
+            nodes.push((slot, node.connections));
+        }
+        
+        for (slot, connections) in nodes {
+            for (layer, neighbors) in connections.iter().enumerate() {
+                let neighbors: Vec<NodeId> = neighbors
+                    .iter()
+                    .filter_map(|neighbor| graph.id_map.get(neighbor).copied())
+                    .collect();
+                graph.set_neighbors(slot, layer, &neighbors);
+            }
+        }
+        
+        graph.entry_point = serialized
+            .entry_point
+            .and_then(|id| graph.id_map.get(&id).copied())
+            .map(|entry| (entry, graph.level(entry)));
+        
+        *self.graph.get_mut() = graph;
         self.config = serialized.config;
         self.distance_metric = serialized.distance_metric;
         self.dimension = serialized.dimension;
@@ -406,6 +944,18 @@ impl VectorIndex for HnswIndex {
     }
 }
 
+/// A batch with only the last copy of each id, as separate inserts would
+/// leave it
+fn last_copies(vectors: &[Vector]) -> Vec<&Vector> {
+    let latest: HashMap<VectorId, usize> = vectors.iter().enumerate().map(|(i, v)| (v.id, i)).collect();
+    vectors
+        .iter()
+        .enumerate()
+        .filter(|(i, vector)| latest[&vector.id] == *i)
+        .map(|(_, vector)| vector)
+        .collect()
+}
+
 #[cfg(test)]
 mod tests {
     use super::*;
@@ -417,13 +967,30 @@ mod tests {
             ef_construction: 200,
             ef_search: 50,
             max_layer: 16,
+            ..IndexConfig::default()
         };
         HnswIndex::new(config, DistanceMetric::Cosine, 3)
     }
     
+    /// Deterministic pseudo-random vectors
+    fn test_vectors(count: usize, dim: usize) -> Vec<Vector> {
+        let mut state = 0x2545_f491_4f6c_dd1du64;
+        (0..count)
+            .map(|_| {
+                let data = (0..dim)
+                    .map(|_| {
+                        state = state.wrapping_mul(6364136223846793005).wrapping_add(1442695040888963407);
+                        (state >> 40) as f32 / (1u64 << 24) as f32 - 0.5
+                    })
+                    .collect();
+                Vector { id: Uuid::new_v4(), data, metadata: None }
+            })
+            .collect()
+    }
+    
     #[test]
     fn test_insert_and_search() {
-        let mut index = create_test_index();
+        let index = create_test_index();
         
         // Insert some vectors
         let vectors = vec![
@@ -446,9 +1013,248 @@ mod tests {
         assert_eq!(results[0].id, ids[0]); // Should find the exact match first
     }
     
+    #[test]
+    fn test_results_ordered_closest_first() {
+        let index = create_test_index();
+        for vector in test_vectors(50, 3) {
+            index.insert(vector.id, &vector.data, None).unwrap();
+        }
+        
+        let results = index.search(&[0.3, -0.2, 0.1], 10, None).unwrap();
+        assert_eq!(results.len(), 10);
+        assert!(results.windows(2).all(|pair| pair[0].distance <= pair[1].distance));
+    }
+    
+    #[test]
+    fn test_deadline_returns_best_so_far() {
+        let index = HnswIndex::new(IndexConfig::default(), DistanceMetric::Euclidean, 8);
+        let vectors = test_vectors(1000, 8);
+        index.batch_insert(&vectors).unwrap();
+        let search = |deadline: &SearchDeadline| {
+            let params = SearchParams {
+                ef_search: Some(32),
+                deadline: Some(deadline.clone()),
+                ..SearchParams::default()
+            };
+            index.search_with(&vectors[7].data, 10, &params, None).unwrap()
+        };
+        
+        let relaxed = SearchDeadline::after(std::time::Duration::from_secs(60));
+        assert_eq!(search(&relaxed)[0].id, vectors[7].id);
+        assert!(!relaxed.cut_short());
+        
+        // An expired deadline still returns what the first expansions found
+        let expired = SearchDeadline::at(std::time::Instant::now());
+        assert!(!search(&expired).is_empty());
+        assert!(expired.cut_short());
+    }
+    
+    #[test]
+    fn test_parallel_batch_insert() {
+        let config = IndexConfig {
+            max_connections: 16,
+            ef_construction: 100,
+            ef_search: 64,
+            max_layer: 16,
+            ..IndexConfig::default()
+        };
+        let index = HnswIndex::new(config, DistanceMetric::Euclidean, 8);
+        let vectors = test_vectors(1000, 8);
+        index.batch_insert(&vectors).unwrap();
+        assert_eq!(index.stats().vector_count, vectors.len());
+        
+        // Every sampled vector should find itself; an ef this small keeps
+        // the planner walking the graph rather than scanning
+        let found = vectors
+            .iter()
+            .step_by(10)
+            .filter(|v| index.search(&v.data, 1, Some(16)).unwrap()[0].id == v.id)
+            .count();
+        assert!(found >= 95, "only {} of 100 vectors found themselves", found);
+        
+        // Snapshots carry the graph built concurrently
+        let mut restored = HnswIndex::new(IndexConfig::default(), DistanceMetric::Cosine, 8);
+        restored.deserialize(&index.serialize().unwrap()).unwrap();
+        let query = &vectors[7].data;
+        let ids = |index: &HnswIndex| index.search(query, 5, None).unwrap().iter().map(|r| r.id).collect::<Vec<_>>();
+        assert_eq!(ids(&restored), ids(&index));
+    }
+    
+    #[test]
+    fn test_bulk_insert() {
+        let config = IndexConfig { ef_construction: 100, ..IndexConfig::default() };
+        let index = HnswIndex::new(config, DistanceMetric::Euclidean, 8);
+        let mut vectors = test_vectors(1000, 8);
+        index.batch_insert(&vectors[..10]).unwrap();
+        
+        // A repeated id keeps its last vector
+        let mut moved = vectors[3].clone();
+        moved.data = vec![9.0; 8];
+        vectors.push(moved);
+        
+        let built = AtomicUsize::new(0);
+        index.bulk_insert_on_threads(&vectors[5..], &built, 4).unwrap();
+        assert_eq!(built.load(Ordering::Relaxed), vectors.len() - 5);
+        assert_eq!(index.stats().vector_count, 1000);
+        assert_eq!(index.search(&[9.0; 8], 1, Some(16)).unwrap()[0].id, vectors[3].id);
+        
+        let found = vectors[..1000]
+            .iter()
+            .step_by(10)
+            .filter(|v| index.search(&v.data, 1, Some(16)).unwrap()[0].id == v.id)
+            .count();
+        assert!(found >= 95, "only {} of 100 vectors found themselves", found);
+    }
+    
+    #[test]
+    fn test_planner_and_exact_search() {
+        let config = IndexConfig { max_connections: 4, ef_search: 10, ..IndexConfig::default() };
+        let index = HnswIndex::new(config, DistanceMetric::Euclidean, 8);
+        let vectors = test_vectors(600, 8);
+        let query = &vectors[0].data;
+        let brute_force = |count: usize| {
+            let mut all: Vec<(f32, VectorId)> = vectors[..count]
+                .iter()
+                .map(|v| (vectordb_common::distance(query, &v.data, DistanceMetric::Euclidean), v.id))
+                .collect();
+            all.sort_by(|a, b| a.0.partial_cmp(&b.0).unwrap());
+            all.into_iter().take(10).map(|(_, id)| id).collect::<Vec<_>>()
+        };
+        let ids = |results: Vec<SearchResult>| results.into_iter().map(|r| r.id).collect::<Vec<_>>();
+        
+        // Up to ef * M = 40 vectors, searches scan and are exact
+        index.batch_insert(&vectors[..40]).unwrap();
+        assert_eq!(ids(index.search(query, 10, None).unwrap()), brute_force(40));
+        
+        // Past it they walk the graph, unless asked to be exact
+        index.batch_insert(&vectors[40..]).unwrap();
+        let exact = SearchParams { exact: true, ..SearchParams::default() };
+        assert_eq!(ids(index.search_with(query, 10, &exact, None).unwrap()), brute_force(600));
+    }
+    
+    #[test]
+    fn test_search_during_inserts() {
+        let index = create_test_index();
+        let vectors = test_vectors(400, 3);
+        index.insert(vectors[0].id, &vectors[0].data, None).unwrap();
+        
+        std::thread::scope(|scope| {
+            for chunk in vectors[1..].chunks(100) {
+                let index = &index;
+                scope.spawn(move || {
+                    for vector in chunk {
+                        index.insert(vector.id, &vector.data, None).unwrap();
+                    }
+                });
+            }
+            scope.spawn(|| {
+                for _ in 0..200 {
+                    assert!(!index.search(&vectors[0].data, 5, None).unwrap().is_empty());
+                }
+            });
+        });
+        
+        assert_eq!(index.stats().vector_count, vectors.len());
+        // Approximate search: the vector should rank among its closest matches
+        let results = index.search(&vectors[42].data, 5, None).unwrap();
+        assert!(results.iter().any(|r| r.id == vectors[42].id));
+    }
+    
+    #[test]
+    fn test_concurrent_reinsert_keeps_one_node() {
+        let index = HnswIndex::new(IndexConfig::default(), DistanceMetric::Euclidean, 8);
+        let vectors = test_vectors(50, 8);
+        let exact = SearchParams { exact: true, ..SearchParams::default() };
+        let all_ids = |index: &HnswIndex| {
+            let mut ids: Vec<VectorId> =
+                index.search_with(&vectors[0].data, 1000, &exact, None).unwrap().into_iter().map(|r| r.id).collect();
+            ids.sort_unstable();
+            ids
+        };
+        
+        // Every thread writes every id, racing the others
+        std::thread::scope(|scope| {
+            for _ in 0..4 {
+                scope.spawn(|| {
+                    for vector in &vectors {
+                        index.insert(vector.id, &vector.data, None).unwrap();
+                    }
+                });
+            }
+        });
+        
+        // A parallel batch repeating its ids
+        let repeated: Vec<Vector> = vectors.iter().cycle().take(4 * PARALLEL_BATCH_MIN).cloned().collect();
+        index.batch_insert(&repeated).unwrap();
+        
+        let mut expected: Vec<VectorId> = vectors.iter().map(|v| v.id).collect();
+        expected.sort_unstable();
+        assert_eq!(all_ids(&index), expected);
+        assert_eq!(index.graph.read().live_nodes().count(), vectors.len());
+        
+        for vector in &vectors {
+            assert!(index.delete(&vector.id).unwrap());
+        }
+        assert!(all_ids(&index).is_empty());
+    }
+    
+    #[test]
+    fn test_filtered_search_matches_exact() {
+        let config = IndexConfig {
+            max_connections: 16,
+            ef_construction: 100,
+            ef_search: 64,
+            max_layer: 16,
+            ..IndexConfig::default()
+        };
+        let index = HnswIndex::new(config.clone(), DistanceMetric::Euclidean, 8)
+            .with_indexed_fields(&["bucket".to_string()]);
+        let vectors = test_vectors(1000, 8);
+        for (i, vector) in vectors.iter().enumerate() {
+            let metadata = serde_json::json!({"bucket": i % 7, "parity": i % 2});
+            index.insert(vector.id, &vector.data, serde_json::from_value(metadata).unwrap()).unwrap();
+        }
+        
+        let query = &vectors[3].data;
+        for (filter, keep) in [
+            (serde_json::json!({"bucket": 3}), Box::new(|i: usize| i % 7 == 3) as Box<dyn Fn(usize) -> bool>),
+            (serde_json::json!({"parity": "1"}), Box::new(|i: usize| i % 2 == 1)),
+        ] {
+            let filter = MetadataFilter::new(&serde_json::from_value(filter).unwrap());
+            let found: Vec<VectorId> = index
+                .search_filtered(query, 5, None, &filter)
+                .unwrap()
+                .iter()
+                .map(|r| r.id)
+                .collect();
+            
+            let mut exact: Vec<(f32, VectorId)> = vectors
+                .iter()
+                .enumerate()
+                .filter(|(i, _)| keep(*i))
+                .map(|(_, v)| (vectordb_common::distance(query, &v.data, DistanceMetric::Euclidean), v.id))
+                .collect();
+            exact.sort_by(|a, b| a.0.partial_cmp(&b.0).unwrap());
+            let exact: Vec<VectorId> = exact.into_iter().take(5).map(|(_, id)| id).collect();
+            assert_eq!(found, exact);
+        }
+        
+        // Metadata survives a snapshot and filters the restored index alike
+        let mut restored = HnswIndex::new(config, DistanceMetric::Euclidean, 8)
+            .with_indexed_fields(&["bucket".to_string()]);
+        restored.deserialize(&index.serialize().unwrap()).unwrap();
+        let filter = MetadataFilter::new(&serde_json::from_value(serde_json::json!({"bucket": 3})).unwrap());
+        let before = index.search_filtered(query, 5, None, &filter).unwrap();
+        let after = restored.search_filtered(query, 5, None, &filter).unwrap();
+        assert_eq!(
+            after.iter().map(|r| (r.id, r.metadata.clone())).collect::<Vec<_>>(),
+            before.iter().map(|r| (r.id, r.metadata.clone())).collect::<Vec<_>>()
+        );
+    }
+    
     #[test]
     fn test_delete() {
-        let mut index = create_test_index();
+        let index = create_test_index();
         
         let id = Uuid::new_v4();
         let vector = vec![1.0, 0.0, 0.0];
@@ -0,0 +1,767 @@
+use crate::{VectorIndex, SearchParams, SearchResult, IndexStats};
+use vectordb_common::{Result, VectorDbError, MetadataFilter, distance, normalize, simd, types::*};
+use std::borrow::Cow;
+use std::collections::{BinaryHeap, HashMap};
+use std::sync::atomic::{AtomicBool, Ordering};
+use parking_lot::RwLock;
+use rand::prelude::*;
+use serde::{Deserialize, Serialize};
+
+/// Codewords per subvector codebook, so every code fits in one byte
+const PQ_CODEWORDS: usize = 256;
+
+/// Training vectors wanted per coarse cluster
+const TRAINING_POINTS_PER_LIST: usize = 32;
+
+/// Lloyd iterations when training centroids and codebooks
+const KMEANS_ITERATIONS: usize = 12;
+
+/// Fewest points worth spreading a k-means assignment step over threads
+const PARALLEL_ASSIGN_MIN: usize = 1024;
+
+type Metadata = HashMap<String, serde_json::Value>;
+
+/// Vectors assigned to one coarse cluster
+#[derive(Debug, Default, Serialize, Deserialize)]
+struct InvertedList {
+    ids: Vec<VectorId>,
+    /// One byte per subvector for each vector, back to back
+    codes: Vec<u8>,
+    #[serde(with = "vectordb_common::metadata::seq")]
+    metadata: Vec<Option<Metadata>>,
+}
+
+/// Trained coarse centroids and product-quantization codebooks
+///
+/// A vector is stored as the nearest centroid's list plus its residual from
+/// that centroid, split into subvectors that are each replaced by the index
+/// of their nearest codeword.
+#[derive(Debug, Serialize, Deserialize)]
+struct Quantizer {
+    dimension: usize,
+    /// `nlist` centroids of `dimension` floats
+    centroids: Vec<f32>,
+    /// Subvector `j` spans dimensions `bounds[j]..bounds[j + 1]`
+    bounds: Vec<usize>,
+    /// Each subvector's codewords, back to back
+    codebooks: Vec<Vec<f32>>,
+}
+
+impl Quantizer {
+    /// Train on `samples`, `dimension` floats each
+    fn train(samples: &[f32], dimension: usize, nlist: usize, subvectors: usize, rng: &mut StdRng) -> Self {
+        let centroids = kmeans(samples, dimension, nlist, rng);
+        let bounds: Vec<usize> = (0..=subvectors).map(|j| j * dimension / subvectors).collect();
+        
+        // Codebooks are trained on residuals, which is what gets encoded
+        let mut residuals = samples.to_vec();
+        for residual in residuals.chunks_exact_mut(dimension) {
+            let centroid = nearest(&centroids, dimension, residual);
+            for (x, c) in residual.iter_mut().zip(&centroids[centroid * dimension..]) {
+                *x -= c;
+            }
+        }
+        let codebooks = bounds
+            .windows(2)
+            .map(|span| {
+                let sub: Vec<f32> = residuals
+                    .chunks_exact(dimension)
+                    .flat_map(|residual| residual[span[0]..span[1]].iter().copied())
+                    .collect();
+                kmeans(&sub, span[1] - span[0], PQ_CODEWORDS, rng)
+            })
+            .collect();
+        
+        Self { dimension, centroids, bounds, codebooks }
+    }
+    
+    fn nlist(&self) -> usize {
+        self.centroids.len() / self.dimension
+    }
+    
+    fn subvectors(&self) -> usize {
+        self.codebooks.len()
+    }
+    
+    fn centroid(&self, list: usize) -> &[f32] {
+        &self.centroids[list * self.dimension..(list + 1) * self.dimension]
+    }
+    
+    /// Append a vector's codes for the given list to `codes`
+    fn encode(&self, vector: &[f32], list: usize, codes: &mut Vec<u8>) {
+        let residual: Vec<f32> = vector.iter().zip(self.centroid(list)).map(|(x, c)| x - c).collect();
+        for (span, codebook) in self.bounds.windows(2).zip(&self.codebooks) {
+            codes.push(nearest(codebook, span[1] - span[0], &residual[span[0]..span[1]]) as u8);
+        }
+    }
+    
+    /// Fill `table` with each subvector's distance term to each of its
+    /// codewords, returning the term shared by the whole list
+    ///
+    /// Euclidean-style metrics compare the query's residual from the list
+    /// centroid with the codewords; dot product splits `q.x` into `q.c` plus
+    /// the query's dot product with each codeword.
+    fn lookup_table(&self, query: &[f32], list: usize, metric: DistanceMetric, table: &mut Vec<f32>) -> f32 {
+        let centroid = self.centroid(list);
+        let (target, base): (Cow<[f32]>, f32) = match metric {
+            DistanceMetric::DotProduct => (Cow::Borrowed(query), simd::dot_product(query, centroid)),
+            _ => (Cow::Owned(query.iter().zip(centroid).map(|(q, c)| q - c).collect()), 0.0),
+        };
+        
+        table.clear();
+        for (span, codebook) in self.bounds.windows(2).zip(&self.codebooks) {
+            let piece = &target[span[0]..span[1]];
+            table.extend(codebook.chunks_exact(piece.len()).map(|codeword| match metric {
+                DistanceMetric::DotProduct => dot(piece, codeword),
+                DistanceMetric::Manhattan => piece.iter().zip(codeword).map(|(x, y)| (x - y).abs()).sum(),
+                _ => squared_euclidean(piece, codeword),
+            }));
+            // Short codebooks are padded so codes index `j * PQ_CODEWORDS + code`
+            table.resize(table.len() + PQ_CODEWORDS - codebook.len() / piece.len(), f32::INFINITY);
+        }
+        base
+    }
+}
+
+/// Sum of a vector's table entries, turned into the metric's distance
+fn adc_distance(table: &[f32], codes: &[u8], base: f32, metric: DistanceMetric) -> f32 {
+    let sum: f32 = codes
+        .iter()
+        .enumerate()
+        .map(|(j, &code)| table[j * PQ_CODEWORDS + code as usize])
+        .sum();
+    match metric {
+        // Vectors are unit length, so `1 - cos = |q - x|^2 / 2`
+        DistanceMetric::Cosine => sum / 2.0,
+        DistanceMetric::Euclidean => sum.max(0.0).sqrt(),
+        DistanceMetric::DotProduct => -(base + sum),
+        DistanceMetric::Manhattan => sum,
+    }
+}
+
+/// Subvectors are a handful of floats, too short for the dispatched kernels
+fn squared_euclidean(a: &[f32], b: &[f32]) -> f32 {
+    a.iter().zip(b).map(|(x, y)| (x - y) * (x - y)).sum()
+}
+
+fn dot(a: &[f32], b: &[f32]) -> f32 {
+    a.iter().zip(b).map(|(x, y)| x * y).sum()
+}
+
+/// Index of the point in `points` closest to `vector`
+fn nearest(points: &[f32], dimension: usize, vector: &[f32]) -> usize {
+    let mut best = (0, f32::INFINITY);
+    for (i, point) in points.chunks_exact(dimension).enumerate() {
+        let dist = if dimension >= 16 {
+            simd::squared_euclidean_distance(vector, point)
+        } else {
+            squared_euclidean(vector, point)
+        };
+        if dist < best.1 {
+            best = (i, dist);
+        }
+    }
+    best.0
+}
+
+/// Lloyd's k-means over `points` of `dimension` floats
+///
+/// Returns up to `k` centroids back to back, fewer if there are fewer points.
+fn kmeans(points: &[f32], dimension: usize, k: usize, rng: &mut StdRng) -> Vec<f32> {
+    let n = points.len() / dimension;
+    let k = k.min(n);
+    let point = |i: usize| &points[i * dimension..(i + 1) * dimension];
+    
+    // Start from k distinct points
+    let mut order: Vec<usize> = (0..n).collect();
+    order.shuffle(rng);
+    let mut centroids: Vec<f32> = order[..k].iter().flat_map(|&i| point(i).iter().copied()).collect();
+    
+    let mut assignment = vec![0usize; n];
+    for _ in 0..KMEANS_ITERATIONS {
+        assign(points, dimension, &centroids, &mut assignment);
+        
+        let mut sums = vec![0.0f32; k * dimension];
+        let mut counts = vec![0usize; k];
+        for (i, &cluster) in assignment.iter().enumerate() {
+            counts[cluster] += 1;
+            for (sum, x) in sums[cluster * dimension..(cluster + 1) * dimension].iter_mut().zip(point(i)) {
+                *sum += x;
+            }
+        }
+        
+        for (cluster, &count) in counts.iter().enumerate() {
+            let centroid = &mut centroids[cluster * dimension..(cluster + 1) * dimension];
+            if count == 0 {
+                // Reseed an empty cluster at a random point
+                centroid.copy_from_slice(point(rng.gen_range(0..n)));
+            } else {
+                for (c, sum) in centroid.iter_mut().zip(&sums[cluster * dimension..]) {
+                    *c = sum / count as f32;
+                }
+            }
+        }
+    }
+    centroids
+}
+
+/// Assign every point to its nearest centroid, spreading large sets over threads
+fn assign(points: &[f32], dimension: usize, centroids: &[f32], assignment: &mut [usize]) {
+    let threads = std::thread::available_parallelism()
+        .map_or(1, |n| n.get())
+        .min(assignment.len() / PARALLEL_ASSIGN_MIN)
+        .max(1);
+    let chunk = (assignment.len() + threads - 1) / threads;
+    
+    std::thread::scope(|scope| {
+        for (part, slots) in assignment.chunks_mut(chunk.max(1)).enumerate() {
+            scope.spawn(move || {
+                for (offset, slot) in slots.iter_mut().enumerate() {
+                    let i = part * chunk + offset;
+                    *slot = nearest(centroids, dimension, &points[i * dimension..(i + 1) * dimension]);
+                }
+            });
+        }
+    });
+}
+
+/// A scanned vector, ordered by distance so the heap keeps the closest
+#[derive(Debug, Clone, Copy)]
+struct Scored {
+    distance: f32,
+    list: u32,
+    position: u32,
+}
+
+impl PartialEq for Scored {
+    fn eq(&self, other: &Self) -> bool {
+        self.distance == other.distance
+    }
+}
+
+impl Eq for Scored {}
+
+impl PartialOrd for Scored {
+    fn partial_cmp(&self, other: &Self) -> Option<std::cmp::Ordering> {
+        Some(self.cmp(other))
+    }
+}
+
+impl Ord for Scored {
+    fn cmp(&self, other: &Self) -> std::cmp::Ordering {
+        self.distance.total_cmp(&other.distance)
+    }
+}
+
+/// A vector kept whole until the index is trained
+#[derive(Debug, Serialize, Deserialize)]
+struct PendingVector {
+    vector: Vec<f32>,
+    #[serde(with = "vectordb_common::metadata")]
+    metadata: Option<Metadata>,
+}
+
+/// Index contents, behind one lock
+#[derive(Debug, Default, Serialize, Deserialize)]
+struct IvfPq {
+    /// Vectors kept whole, and searched exactly, until there are enough to train on
+    pending: HashMap<VectorId, PendingVector>,
+    quantizer: Option<Quantizer>,
+    lists: Vec<InvertedList>,
+    /// List and position of every encoded vector
+    locations: HashMap<VectorId, (u32, u32)>,
+}
+
+impl IvfPq {
+    fn len(&self) -> usize {
+        self.pending.len() + self.locations.len()
+    }
+    
+    /// Encode a vector into its list; the quantizer must be trained
+    fn add_encoded(&mut self, id: VectorId, vector: &[f32], metadata: Option<Metadata>) {
+        let quantizer = self.quantizer.as_ref().expect("IVF-PQ quantizer is trained");
+        let list = nearest(&quantizer.centroids, quantizer.dimension, vector);
+        let entries = &mut self.lists[list];
+        quantizer.encode(vector, list, &mut entries.codes);
+        entries.ids.push(id);
+        entries.metadata.push(metadata);
+        self.locations.insert(id, (list as u32, entries.ids.len() as u32 - 1));
+    }
+    
+    /// Switch to the trained quantizer, encoding every pending vector
+    fn install(&mut self, quantizer: Quantizer) {
+        self.lists = (0..quantizer.nlist()).map(|_| InvertedList::default()).collect();
+        self.locations.clear();
+        self.quantizer = Some(quantizer);
+        for (id, pending) in std::mem::take(&mut self.pending) {
+            self.add_encoded(id, &pending.vector, pending.metadata);
+        }
+    }
+    
+    fn remove(&mut self, id: &VectorId) -> bool {
+        if self.pending.remove(id).is_some() {
+            return true;
+        }
+        let (list, position) = match self.locations.remove(id) {
+            Some((list, position)) => (list as usize, position as usize),
+            None => return false,
+        };
+        
+        // Move the list's last vector into the hole
+        let subvectors = self.quantizer.as_ref().map_or(0, Quantizer::subvectors);
+        let entries = &mut self.lists[list];
+        let last = entries.ids.len() - 1;
+        entries.ids.swap_remove(position);
+        entries.metadata.swap_remove(position);
+        entries.codes.copy_within(last * subvectors..(last + 1) * subvectors, position * subvectors);
+        entries.codes.truncate(last * subvectors);
+        if position < last {
+            self.locations.insert(entries.ids[position], (list as u32, position as u32));
+        }
+        true
+    }
+}
+
+/// IVF-PQ (inverted file with product quantization) index
+///
+/// Vectors are partitioned into `nlist` clusters and stored as a few bytes
+/// of product-quantization codes each, so memory grows with
+/// `pq_subvectors` bytes per vector instead of the full vector plus graph
+/// links. A search scans the `nprobe` clusters whose centroids are closest
+/// to the query, scoring codes with per-cluster lookup tables (asymmetric
+/// distance computation). Distances are approximate; callers rescore
+/// against stored vectors when `rerank` is set.
+///
+/// The index trains itself once it holds `nlist * 32` vectors and searches
+/// them exactly until then. Training runs outside the lock.
+#[derive(Debug)]
+pub struct IvfPqIndex {
+    state: RwLock<IvfPq>,
+    config: IndexConfig,
+    distance_metric: DistanceMetric,
+    dimension: usize,
+    training: AtomicBool,
+}
+
+impl IvfPqIndex {
+    pub fn new(config: IndexConfig, distance_metric: DistanceMetric, dimension: usize) -> Self {
+        Self {
+            state: RwLock::new(IvfPq::default()),
+            config,
+            distance_metric,
+            dimension,
+            training: AtomicBool::new(false),
+        }
+    }
+    
+    /// Check IVF-PQ parameters against a collection's dimension
+    pub fn validate_config(config: &IndexConfig, dimension: usize) -> Result<()> {
+        if config.nlist == 0 || config.nprobe == 0 {
+            return Err(VectorDbError::ConfigError {
+                message: "IVF-PQ nlist and nprobe must be positive".to_string(),
+            });
+        }
+        if config.pq_subvectors > dimension {
+            return Err(VectorDbError::ConfigError {
+                message: format!(
+                    "IVF-PQ pq_subvectors is {}, more than the dimension {}",
+                    config.pq_subvectors, dimension
+                ),
+            });
+        }
+        Ok(())
+    }
+    
+    /// Whether centroids and codebooks have been trained
+    pub fn is_trained(&self) -> bool {
+        self.state.read().quantizer.is_some()
+    }
+    
+    fn subvectors(&self) -> usize {
+        match self.config.pq_subvectors {
+            0 => (self.dimension / 8).max(1),
+            subvectors => subvectors.min(self.dimension),
+        }
+    }
+    
+    /// Vectors held before the index trains itself
+    fn training_size(&self) -> usize {
+        (self.config.nlist * TRAINING_POINTS_PER_LIST).max(PQ_CODEWORDS)
+    }
+    
+    fn check_dimension(&self, vector: &[f32]) -> Result<()> {
+        if vector.len() != self.dimension {
+            return Err(VectorDbError::InvalidDimension {
+                expected: self.dimension,
+                actual: vector.len(),
+            });
+        }
+        Ok(())
+    }
+    
+    /// Cosine compares unit vectors, so codes and queries are normalized
+    fn prepare<'a>(&self, vector: &'a [f32]) -> Cow<'a, [f32]> {
+        match self.distance_metric {
+            DistanceMetric::Cosine => {
+                let mut vector = vector.to_vec();
+                normalize(&mut vector);
+                Cow::Owned(vector)
+            }
+            _ => Cow::Borrowed(vector),
+        }
+    }
+    
+    /// Train centroids and codebooks on the pending vectors, then encode them
+    fn train(&self, samples: Vec<f32>) {
+        let quantizer = Quantizer::train(
+            &samples,
+            self.dimension,
+            self.config.nlist,
+            self.subvectors(),
+            &mut StdRng::from_entropy(),
+        );
+        self.state.write().install(quantizer);
+        self.training.store(false, Ordering::Release);
+    }
+    
+    /// Closest pending vectors, scored exactly
+    fn search_pending(
+        &self,
+        state: &IvfPq,
+        query: &[f32],
+        limit: usize,
+        filter: Option<&MetadataFilter>,
+    ) -> Vec<SearchResult> {
+        let mut results: Vec<SearchResult> = state
+            .pending
+            .iter()
+            .filter(|(_, pending)| filter.map_or(true, |filter| filter.matches(pending.metadata.as_ref())))
+            .map(|(id, pending)| SearchResult {
+                id: *id,
+                distance: distance(query, &pending.vector, self.distance_metric),
+                metadata: pending.metadata.clone(),
+            })
+            .collect();
+        results.sort_by(|a, b| a.distance.total_cmp(&b.distance));
+        results.truncate(limit);
+        results
+    }
+    
+    /// Closest encoded vectors among the probed lists
+    ///
+    /// Lists are probed nearest centroid first. With a filter, probing goes
+    /// past `nprobe` until `limit` matches are found.
+    fn search_lists(
+        &self,
+        state: &IvfPq,
+        query: &[f32],
+        limit: usize,
+        nprobe: usize,
+        filter: Option<&MetadataFilter>,
+    ) -> Vec<SearchResult> {
+        let quantizer = match &state.quantizer {
+            Some(quantizer) => quantizer,
+            None => return Vec::new(),
+        };
+        
+        let mut order: Vec<(f32, usize)> = (0..quantizer.nlist())
+            .map(|list| {
+                let centroid = quantizer.centroid(list);
+                let dist = match self.distance_metric {
+                    DistanceMetric::DotProduct => -simd::dot_product(query, centroid),
+                    _ => simd::squared_euclidean_distance(query, centroid),
+                };
+                (dist, list)
+            })
+            .collect();
+        order.sort_by(|a, b| a.0.total_cmp(&b.0));
+        
+        let subvectors = quantizer.subvectors();
+        let mut closest: BinaryHeap<Scored> = BinaryHeap::with_capacity(limit + 1);
+        let mut table = Vec::with_capacity(subvectors * PQ_CODEWORDS);
+        for (probed, &(_, list)) in order.iter().enumerate() {
+            if probed >= nprobe && (filter.is_none() || closest.len() >= limit) {
+                break;
+            }
+            
+            let entries = &state.lists[list];
+            if entries.ids.is_empty() {
+                continue;
+            }
+            let base = quantizer.lookup_table(query, list, self.distance_metric, &mut table);
+            for (position, codes) in entries.codes.chunks_exact(subvectors).enumerate() {
+                if let Some(filter) = filter {
+                    if !filter.matches(entries.metadata[position].as_ref()) {
+                        continue;
+                    }
+                }
+                let dist = adc_distance(&table, codes, base, self.distance_metric);
+                if closest.len() < limit {
+                    closest.push(Scored { distance: dist, list: list as u32, position: position as u32 });
+                } else if closest.peek().map_or(false, |worst| dist < worst.distance) {
+                    closest.pop();
+                    closest.push(Scored { distance: dist, list: list as u32, position: position as u32 });
+                }
+            }
+        }
+        
+        closest
+            .into_sorted_vec()
+            .into_iter()
+            .map(|scored| {
+                let entries = &state.lists[scored.list as usize];
+                SearchResult {
+                    id: entries.ids[scored.position as usize],
+                    distance: scored.distance,
+                    metadata: entries.metadata[scored.position as usize].clone(),
+                }
+            })
+            .collect()
+    }
+}
+
+impl VectorIndex for IvfPqIndex {
+    fn insert(
+        &self,
+        id: VectorId,
+        vector: &[f32],
+        metadata: Option<HashMap<String, serde_json::Value>>,
+    ) -> Result<()> {
+        self.check_dimension(vector)?;
+        let vector = self.prepare(vector);
+        
+        let samples = {
+            let mut state = self.state.write();
+            state.remove(&id);
+            if state.quantizer.is_some() {
+                state.add_encoded(id, &vector, metadata);
+                return Ok(());
+            }
+            
+            state.pending.insert(id, PendingVector { vector: vector.into_owned(), metadata });
+            if state.pending.len() < self.training_size() || self.training.swap(true, Ordering::AcqRel) {
+                return Ok(());
+            }
+            state
+                .pending
+                .values()
+                .flat_map(|pending| pending.vector.iter().copied())
+                .collect::<Vec<f32>>()
+        };
+        
+        // Searches and inserts carry on against the pending vectors meanwhile
+        self.train(samples);
+        Ok(())
+    }
+    
+    fn search(&self, query: &[f32], limit: usize, ef: Option<usize>) -> Result<Vec<SearchResult>> {
+        self.search_with(query, limit, &SearchParams { ef_search: ef, ..SearchParams::default() }, None)
+    }
+    
+    fn search_filtered(
+        &self,
+        query: &[f32],
+        limit: usize,
+        ef: Option<usize>,
+        filter: &MetadataFilter,
+    ) -> Result<Vec<SearchResult>> {
+        self.search_with(query, limit, &SearchParams { ef_search: ef, ..SearchParams::default() }, Some(filter))
+    }
+    
+    fn search_with(
+        &self,
+        query: &[f32],
+        limit: usize,
+        params: &SearchParams,
+        filter: Option<&MetadataFilter>,
+    ) -> Result<Vec<SearchResult>> {
+        self.check_dimension(query)?;
+        let query = self.prepare(query);
+        let filter = filter.filter(|filter| !filter.is_empty());
+        // An exact search scans every list
+        let nprobe = match params.exact {
+            true => usize::MAX,
+            false => params.nprobe.unwrap_or(self.config.nprobe).max(1),
+        };
+        
+        let state = self.state.read();
+        let mut results = self.search_lists(&state, &query, limit, nprobe, filter);
+        if !state.pending.is_empty() {
+            results.extend(self.search_pending(&state, &query, limit, filter));
+            results.sort_by(|a, b| a.distance.total_cmp(&b.distance));
+            results.truncate(limit);
+        }
+        Ok(results)
+    }
+    
+    fn delete(&self, id: &VectorId) -> Result<bool> {
+        Ok(self.state.write().remove(id))
+    }
+    
+    fn contains(&self, id: &VectorId) -> bool {
+        let state = self.state.read();
+        state.pending.contains_key(id) || state.locations.contains_key(id)
+    }
+    
+    fn stats(&self) -> IndexStats {
+        let state = self.state.read();
+        let quantizer = state.quantizer.as_ref().map_or(0, |quantizer| {
+            (quantizer.centroids.capacity() + quantizer.codebooks.iter().map(Vec::capacity).sum::<usize>())
+                * std::mem::size_of::<f32>()
+        });
+        let lists: usize = state
+            .lists
+            .iter()
+            .map(|list| {
+                list.ids.capacity() * std::mem::size_of::<VectorId>()
+                    + list.codes.capacity()
+                    + list.metadata.capacity() * std::mem::size_of::<Option<Metadata>>()
+            })
+            .sum();
+        let locations = state.locations.capacity()
+            * (std::mem::size_of::<VectorId>() + std::mem::size_of::<(u32, u32)>());
+        let pending = state.pending.len()
+            * (std::mem::size_of::<VectorId>() + self.dimension * std::mem::size_of::<f32>());
+        
+        IndexStats {
+            vector_count: state.len(),
+            memory_usage: quantizer + lists + locations + pending,
+            dimension: self.dimension,
+            max_layer: 0,
+            avg_connections: 0.0,
+        }
+    }
+    
+    fn serialize(&self) -> Result<Vec<u8>> {
+        #[derive(Serialize)]
+        struct SerializedIndex<'a> {
+            state: &'a IvfPq,
+            config: &'a IndexConfig,
+            distance_metric: DistanceMetric,
+            dimension: usize,
+        }
+        
+        let state = self.state.read();
+        bincode::serialize(&SerializedIndex {
+            state: &state,
+            config: &self.config,
+            distance_metric: self.distance_metric,
+            dimension: self.dimension,
+        })
+        .map_err(|e| VectorDbError::Serialization(e.to_string()))
+    }
+    
+    fn deserialize(&mut self, data: &[u8]) -> Result<()> {
+        #[derive(Deserialize)]
+        struct SerializedIndex {
+            state: IvfPq,
+            config: IndexConfig,
+            distance_metric: DistanceMetric,
+            dimension: usize,
+        }
+        
+        let serialized: SerializedIndex = bincode::deserialize(data)
+            .map_err(|e| VectorDbError::Serialization(e.to_string()))?;
+        if serialized.dimension != self.dimension || serialized.distance_metric != self.distance_metric {
+            return Err(VectorDbError::Serialization(format!(
+                "Snapshot is for {:?} vectors of dimension {}, expected {:?} of dimension {}",
+                serialized.distance_metric, serialized.dimension, self.distance_metric, self.dimension
+            )));
+        }
+        
+        *self.state.get_mut() = serialized.state;
+        self.config = serialized.config;
+        Ok(())
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use uuid::Uuid;
+    
+    fn random_vectors(count: usize, dimension: usize, seed: u64) -> Vec<Vec<f32>> {
+        let mut rng = StdRng::seed_from_u64(seed);
+        (0..count)
+            .map(|_| (0..dimension).map(|_| rng.gen::<f32>() - 0.5).collect())
+            .collect()
+    }
+    
+    fn ivfpq_config(nlist: usize, nprobe: usize) -> IndexConfig {
+        IndexConfig {
+            index_type: IndexType::IvfPq,
+            nlist,
+            pq_subvectors: 8,
+            nprobe,
+            ..IndexConfig::default()
+        }
+    }
+    
+    #[test]
+    fn test_ivfpq_trains_and_recalls() {
+        let index = IvfPqIndex::new(ivfpq_config(16, 4), DistanceMetric::Euclidean, 32);
+        let vectors = random_vectors(2000, 32, 1);
+        let ids: Vec<VectorId> = vectors.iter().map(|_| Uuid::new_v4()).collect();
+        
+        // Exact until the training threshold of 16 * 32 vectors
+        for (id, vector) in ids.iter().zip(&vectors).take(100) {
+            index.insert(*id, vector, None).unwrap();
+        }
+        assert!(!index.is_trained());
+        assert_eq!(index.search(&vectors[7], 1, None).unwrap()[0].id, ids[7]);
+        
+        for (id, vector) in ids.iter().zip(&vectors).skip(100) {
+            index.insert(*id, vector, None).unwrap();
+        }
+        assert!(index.is_trained());
+        assert_eq!(index.stats().vector_count, 2000);
+        
+        // Codes are coarse, but a stored vector ranks among its own top hits
+        let found = (0..100)
+            .filter(|&i| index.search(&vectors[i], 10, None).unwrap().iter().any(|r| r.id == ids[i]))
+            .count();
+        assert!(found >= 90, "found {} of 100", found);
+        
+        // Scanning every list finds at least as much as the default nprobe
+        let params = SearchParams { nprobe: Some(16), ..SearchParams::default() };
+        let all = index.search_with(&vectors[3], 10, &params, None).unwrap();
+        assert_eq!(all.len(), 10);
+        
+        // Deleting moves another vector into the hole; both stay consistent
+        assert!(index.delete(&ids[5]).unwrap());
+        assert!(!index.contains(&ids[5]));
+        for i in 0..50 {
+            if i != 5 {
+                assert!(index.contains(&ids[i]));
+            }
+        }
+        assert_eq!(index.stats().vector_count, 1999);
+    }
+    
+    #[test]
+    fn test_ivfpq_filtered_search_and_snapshot() {
+        let index = IvfPqIndex::new(ivfpq_config(8, 1), DistanceMetric::Cosine, 16);
+        let vectors = random_vectors(600, 16, 2);
+        for (i, vector) in vectors.iter().enumerate() {
+            let metadata: Metadata = serde_json::from_value(serde_json::json!({"shard": i % 50})).unwrap();
+            index.insert(Uuid::new_v4(), vector, Some(metadata)).unwrap();
+        }
+        assert!(index.is_trained());
+        
+        // A selective filter probes past nprobe until it has enough matches
+        let filter_values: HashMap<String, serde_json::Value> =
+            serde_json::from_value(serde_json::json!({"shard": 7})).unwrap();
+        let filter = MetadataFilter::new(&filter_values);
+        let results = index.search_filtered(&vectors[0], 5, None, &filter).unwrap();
+        assert_eq!(results.len(), 5);
+        assert!(results.iter().all(|r| r.metadata.as_ref().unwrap()["shard"] == 7));
+        
+        let data = index.serialize().unwrap();
+        let mut restored = IvfPqIndex::new(IndexConfig::default(), DistanceMetric::Cosine, 16);
+        restored.deserialize(&data).unwrap();
+        assert!(restored.is_trained());
+        let before: Vec<VectorId> = index.search(&vectors[1], 5, None).unwrap().iter().map(|r| r.id).collect();
+        let after: Vec<VectorId> = restored.search(&vectors[1], 5, None).unwrap().iter().map(|r| r.id).collect();
+        assert_eq!(before, after);
+    }
+}
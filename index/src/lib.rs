@@ -1,11 +1,25 @@
+pub mod arena;
+pub mod flat;
 pub mod hnsw;
+pub mod ivfpq;
 pub mod node;
+pub mod payload;
 
-use vectordb_common::Result;
+use vectordb_common::{MetadataFilter, Result};
 use vectordb_common::types::*;
+use std::sync::Arc;
+use std::sync::atomic::{AtomicBool, AtomicUsize, Ordering};
+use std::time::{Duration, Instant};
 
+pub use arena::*;
+pub use flat::*;
 pub use hnsw::*;
+pub use ivfpq::*;
 pub use node::*;
+pub use payload::*;
+
+/// Vectors inserted between progress updates by the default `bulk_insert`
+const BULK_PROGRESS_CHUNK: usize = 1024;
 
 /// Search result with distance and metadata
 #[derive(Debug, Clone)]
@@ -36,19 +50,112 @@ impl Ord for SearchResult {
     }
 }
 
+/// Query-time knobs; each index reads the ones it has
+#[derive(Debug, Clone, Default)]
+pub struct SearchParams {
+    /// HNSW candidate list size
+    pub ef_search: Option<usize>,
+    /// IVF-PQ clusters to scan
+    pub nprobe: Option<usize>,
+    /// Compare the query with every vector instead of approximating
+    pub exact: bool,
+    /// Stop an HNSW graph walk here and return the best found so far
+    pub deadline: Option<SearchDeadline>,
+}
+
+/// Time by which a search should stop expanding and return what it has
+///
+/// Clones share whether the deadline cut a search short, so the caller
+/// keeps one to learn if the results are partial.
+#[derive(Debug, Clone)]
+pub struct SearchDeadline {
+    at: Instant,
+    cut_short: Arc<AtomicBool>,
+}
+
+impl SearchDeadline {
+    pub fn at(at: Instant) -> Self {
+        Self {
+            at,
+            cut_short: Arc::new(AtomicBool::new(false)),
+        }
+    }
+    
+    pub fn after(budget: Duration) -> Self {
+        Self::at(Instant::now() + budget)
+    }
+    
+    /// Whether the deadline has passed; a search that stops because of it
+    /// is recorded as cut short
+    pub fn reached(&self) -> bool {
+        let reached = Instant::now() >= self.at;
+        if reached {
+            self.cut_short.store(true, Ordering::Relaxed);
+        }
+        reached
+    }
+    
+    /// Whether a search stopped early at the deadline
+    pub fn cut_short(&self) -> bool {
+        self.cut_short.load(Ordering::Relaxed)
+    }
+}
+
 /// Trait for vector index implementations
 pub trait VectorIndex: Send + Sync {
-    /// Insert a vector into the index
-    fn insert(&mut self, id: VectorId, vector: &[f32], metadata: Option<std::collections::HashMap<String, serde_json::Value>>) -> Result<()>;
+    /// Insert a vector into the index; safe to call concurrently with
+    /// other inserts and searches
+    fn insert(&self, id: VectorId, vector: &[f32], metadata: Option<std::collections::HashMap<String, serde_json::Value>>) -> Result<()>;
+    
+    /// Insert several vectors, which implementations may build in parallel
+    fn batch_insert(&self, vectors: &[Vector]) -> Result<()> {
+        for vector in vectors {
+            self.insert(vector.id, &vector.data, vector.metadata.clone())?;
+        }
+        Ok(())
+    }
+    
+    /// Insert a large batch while loading a collection, counting the
+    /// vectors finished so far in `built`
+    ///
+    /// Implementations may build faster than `batch_insert` at the cost of
+    /// concurrent searches seeing the batch before it is fully linked.
+    fn bulk_insert(&self, vectors: &[Vector], built: &AtomicUsize) -> Result<()> {
+        for chunk in vectors.chunks(BULK_PROGRESS_CHUNK) {
+            self.batch_insert(chunk)?;
+            built.fetch_add(chunk.len(), Ordering::Relaxed);
+        }
+        Ok(())
+    }
     
     /// Search for nearest neighbors
     fn search(&self, query: &[f32], limit: usize, ef: Option<usize>) -> Result<Vec<SearchResult>>;
     
+    /// Search for nearest neighbors whose metadata satisfies a filter
+    fn search_filtered(&self, query: &[f32], limit: usize, ef: Option<usize>, filter: &MetadataFilter) -> Result<Vec<SearchResult>>;
+    
+    /// Search with every query-time knob, optionally filtered
+    fn search_with(
+        &self,
+        query: &[f32],
+        limit: usize,
+        params: &SearchParams,
+        filter: Option<&MetadataFilter>,
+    ) -> Result<Vec<SearchResult>> {
+        match filter {
+            Some(filter) => self.search_filtered(query, limit, params.ef_search, filter),
+            None => self.search(query, limit, params.ef_search),
+        }
+    }
+    
     /// Delete a vector from the index
-    fn delete(&mut self, id: &VectorId) -> Result<bool>;
+    fn delete(&self, id: &VectorId) -> Result<bool>;
+    
+    /// Check whether a vector is in the index
+    fn contains(&self, id: &VectorId) -> bool;
     
     /// Update a vector in the index
-    fn update(&mut self, id: VectorId, vector: &[f32], metadata: Option<std::collections::HashMap<String, serde_json::Value>>) -> Result<()> {
+    fn update(&self, id: VectorId, vector: &[f32], metadata: Option<std::collections::HashMap<String, serde_json::Value>>) -> Result<()> {
         self.delete(&id)?;
         self.insert(id, vector, metadata)?;
         Ok(())
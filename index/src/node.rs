@@ -2,11 +2,15 @@ use vectordb_common::types::VectorId;
 use serde::{Deserialize, Serialize};
 use std::collections::HashMap;
 
-/// Node in the HNSW graph
+/// Dense internal id of a node in an HNSW graph
+pub type NodeId = u32;
+
+/// Node in the HNSW graph, as stored in index snapshots
 #[derive(Debug, Clone, Serialize, Deserialize)]
 pub struct HnswNode {
     pub id: VectorId,
     pub vector: Vec<f32>,
+    #[serde(with = "vectordb_common::metadata")]
     pub metadata: Option<HashMap<String, serde_json::Value>>,
     pub layer: usize,
     pub connections: Vec<Vec<VectorId>>, // Connections per layer
@@ -111,7 +115,7 @@ impl HnswNode {
 /// Priority queue entry for search operations
 #[derive(Debug, Clone, PartialEq)]
 pub struct SearchCandidate {
-    pub id: VectorId,
+    pub id: NodeId,
     pub distance: f32,
 }
 
@@ -133,7 +137,7 @@ impl Ord for SearchCandidate {
 /// Min-heap variant for nearest neighbors
 #[derive(Debug, Clone, PartialEq)]
 pub struct NearestCandidate {
-    pub id: VectorId,
+    pub id: NodeId,
     pub distance: f32,
 }
 
@@ -0,0 +1,146 @@
+use crate::node::NodeId;
+use vectordb_common::filter::{value_key, value_keys, MetadataFilter};
+use std::collections::{HashMap, HashSet};
+
+/// Inverted index from metadata values to the nodes carrying them
+///
+/// Only the fields a collection chose to index are tracked. Filters on
+/// those fields resolve to a candidate set without touching the graph,
+/// which is what lets a search tell how selective a filter is.
+#[derive(Debug, Clone, Default)]
+pub struct PayloadIndex {
+    /// Field → value key → nodes
+    postings: HashMap<String, HashMap<String, HashSet<NodeId>>>,
+}
+
+impl PayloadIndex {
+    pub fn new<I: IntoIterator<Item = String>>(fields: I) -> Self {
+        Self {
+            postings: fields.into_iter().map(|field| (field, HashMap::new())).collect(),
+        }
+    }
+    
+    /// Indexed metadata fields
+    pub fn fields(&self) -> Vec<String> {
+        self.postings.keys().cloned().collect()
+    }
+    
+    pub fn is_indexed(&self, field: &str) -> bool {
+        self.postings.contains_key(field)
+    }
+    
+    /// Index a node's metadata
+    pub fn insert(&mut self, node: NodeId, metadata: Option<&HashMap<String, serde_json::Value>>) {
+        self.update(node, metadata, |nodes, node| {
+            nodes.insert(node);
+        });
+    }
+    
+    /// Drop a node's metadata from the index
+    pub fn remove(&mut self, node: NodeId, metadata: Option<&HashMap<String, serde_json::Value>>) {
+        self.update(node, metadata, |nodes, node| {
+            nodes.remove(&node);
+        });
+    }
+    
+    fn update(
+        &mut self,
+        node: NodeId,
+        metadata: Option<&HashMap<String, serde_json::Value>>,
+        apply: impl Fn(&mut HashSet<NodeId>, NodeId),
+    ) {
+        let metadata = match metadata {
+            Some(metadata) => metadata,
+            None => return,
+        };
+        
+        for (field, values) in self.postings.iter_mut() {
+            if let Some(value) = metadata.get(field) {
+                for key in value_keys(value) {
+                    let nodes = values.entry(key.clone()).or_default();
+                    apply(nodes, node);
+                    if nodes.is_empty() {
+                        values.remove(&key);
+                    }
+                }
+            }
+        }
+    }
+    
+    /// Nodes that satisfy the filter's conditions on indexed fields
+    ///
+    /// Returns `None` when no condition is on an indexed field. Conditions
+    /// on other fields still have to be checked against each candidate, as
+    /// do conditions allowing a null, object or nested array value: those
+    /// have no index key, so the index cannot narrow them.
+    pub fn candidates(&self, filter: &MetadataFilter) -> Option<HashSet<NodeId>> {
+        let mut matches: Vec<HashSet<NodeId>> = filter
+            .conditions()
+            .filter_map(|(field, allowed)| {
+                let values = self.postings.get(field)?;
+                let keys: Option<Vec<String>> = allowed.iter().map(value_key).collect();
+                let mut nodes = HashSet::new();
+                for key in keys? {
+                    if let Some(posting) = values.get(&key) {
+                        nodes.extend(posting);
+                    }
+                }
+                Some(nodes)
+            })
+            .collect();
+        
+        // Intersect starting from the smallest set
+        matches.sort_by_key(|nodes| nodes.len());
+        let mut matches = matches.into_iter();
+        let mut result = matches.next()?;
+        for nodes in matches {
+            result.retain(|node| nodes.contains(node));
+        }
+        Some(result)
+    }
+    
+    /// Approximate bytes held by the postings
+    pub fn memory_usage(&self) -> usize {
+        self.postings
+            .values()
+            .flat_map(|values| values.iter())
+            .map(|(key, nodes)| key.len() + nodes.capacity() * std::mem::size_of::<NodeId>())
+            .sum()
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use serde_json::json;
+    
+    fn metadata(value: serde_json::Value) -> HashMap<String, serde_json::Value> {
+        serde_json::from_value(value).unwrap()
+    }
+    
+    #[test]
+    fn test_candidates_intersect_indexed_fields() {
+        let mut index = PayloadIndex::new(vec!["category".to_string(), "year".to_string()]);
+        index.insert(0, Some(&metadata(json!({"category": "news", "year": 2024}))));
+        index.insert(1, Some(&metadata(json!({"category": "news", "year": 2023}))));
+        index.insert(2, Some(&metadata(json!({"category": ["sports", "news"], "year": 2024}))));
+        
+        let filter = |value| MetadataFilter::new(&metadata(value));
+        let sorted = |nodes: HashSet<NodeId>| {
+            let mut nodes: Vec<_> = nodes.into_iter().collect();
+            nodes.sort();
+            nodes
+        };
+        
+        assert_eq!(sorted(index.candidates(&filter(json!({"category": "news"}))).unwrap()), vec![0, 1, 2]);
+        assert_eq!(sorted(index.candidates(&filter(json!({"category": "news", "year": "2024"}))).unwrap()), vec![0, 2]);
+        assert_eq!(sorted(index.candidates(&filter(json!({"year": [2023, 2025], "author": "x"}))).unwrap()), vec![1]);
+        assert!(index.candidates(&filter(json!({"author": "x"}))).is_none());
+        assert!(index.candidates(&filter(json!({"category": null}))).is_none());
+        assert_eq!(sorted(index.candidates(&filter(json!({"category": [null, "x"], "year": 2023}))).unwrap()), vec![1]);
+        
+        index.remove(2, Some(&metadata(json!({"category": ["sports", "news"], "year": 2024}))));
+        assert_eq!(sorted(index.candidates(&filter(json!({"year": 2024}))).unwrap()), vec![0]);
+        assert!(index.candidates(&filter(json!({"category": "sports"}))).unwrap().is_empty());
+    }
+}
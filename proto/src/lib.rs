@@ -36,6 +36,7 @@ impl From<types::VectorType> for VectorType {
             types::VectorType::Float32 => VectorType::Float32,
             types::VectorType::Float16 => VectorType::Float16,
             types::VectorType::Int8 => VectorType::Int8,
+            types::VectorType::Binary => VectorType::Binary,
         }
     }
 }
@@ -46,7 +47,68 @@ impl From<VectorType> for types::VectorType {
             VectorType::Float32 => types::VectorType::Float32,
             VectorType::Float16 => types::VectorType::Float16,
             VectorType::Int8 => types::VectorType::Int8,
+            VectorType::Binary => types::VectorType::Binary,
             _ => types::VectorType::Float32, // Default fallback
         }
     }
-}
\ No newline at end of file
+}
+
+impl From<types::IndexType> for IndexType {
+    fn from(index_type: types::IndexType) -> Self {
+        match index_type {
+            types::IndexType::Hnsw => IndexType::Hnsw,
+            types::IndexType::IvfPq => IndexType::IvfPq,
+            types::IndexType::Flat => IndexType::Flat,
+        }
+    }
+}
+
+impl From<IndexType> for types::IndexType {
+    fn from(index_type: IndexType) -> Self {
+        match index_type {
+            IndexType::IvfPq => types::IndexType::IvfPq,
+            IndexType::Flat => types::IndexType::Flat,
+            _ => types::IndexType::Hnsw, // Default fallback
+        }
+    }
+}
+
+impl From<types::IndexConfig> for IndexConfig {
+    fn from(config: types::IndexConfig) -> Self {
+        Self {
+            max_connections: config.max_connections as u32,
+            ef_construction: config.ef_construction as u32,
+            ef_search: config.ef_search as u32,
+            max_layer: config.max_layer as u32,
+            index_type: config.index_type.into(),
+            nlist: config.nlist as u32,
+            pq_subvectors: config.pq_subvectors as u32,
+            nprobe: config.nprobe as u32,
+            rerank: Some(config.rerank),
+        }
+    }
+}
+
+impl From<IndexConfig> for types::IndexConfig {
+    /// Unset IVF-PQ fields, zero in proto3, take the defaults
+    fn from(config: IndexConfig) -> Self {
+        let defaults = types::IndexConfig::default();
+        Self {
+            max_connections: config.max_connections as usize,
+            ef_construction: config.ef_construction as usize,
+            ef_search: config.ef_search as usize,
+            max_layer: config.max_layer as usize,
+            index_type: config.index_type().into(),
+            nlist: match config.nlist {
+                0 => defaults.nlist,
+                nlist => nlist as usize,
+            },
+            pq_subvectors: config.pq_subvectors as usize,
+            nprobe: match config.nprobe {
+                0 => defaults.nprobe,
+                nprobe => nprobe as usize,
+            },
+            rerank: config.rerank.unwrap_or(defaults.rerank),
+        }
+    }
+}
@@ -16,7 +16,10 @@ import time
 import socket
 
 from vectordb_client import VectorDBClient, AsyncVectorDBClient
-from vectordb_client.types import CollectionConfig, Vector, DistanceMetric
+from vectordb_client.types import (
+    CollectionConfig, CollectionResponse, Vector, DistanceMetric, IndexConfig, IndexType,
+    QueryResult, SearchResponse, server_vector_id
+)
 
 # Try to import the embedded server package
 try:
@@ -478,4 +481,33 @@ def assert_query_results_valid(results: list, expected_count: int = None):
     
     # Results should be sorted by distance (ascending)
     distances = [r.distance for r in results]
-    assert distances == sorted(distances)
\ No newline at end of file
+    assert distances == sorted(distances)
+
+
+class FakeTuningServer:
+    """Stand-in REST client whose recall grows with ef_search: ef // 4 true neighbors per query."""
+    
+    def __init__(self, vectors: list[Vector], index_type: IndexType = IndexType.HNSW):
+        self.vectors = vectors
+        self.config = CollectionConfig(
+            name="docs", dimension=8, distance_metric=DistanceMetric.EUCLIDEAN,
+            index_config=IndexConfig(index_type=index_type)
+        )
+        self.searches = 0
+        self.reindexed = None
+    
+    def get_collection(self, name):
+        return CollectionResponse(success=True, data=[self.config.model_dump(), {}])
+    
+    def search(self, collection_name, query_vector, limit=10, ef_search=None, filter=None,
+               nprobe=None, oversampling=None, exact=False, deadline_ms=None):
+        self.searches += 1
+        data = np.array([v.data for v in self.vectors])
+        order = np.argsort(((data - np.asarray(query_vector)) ** 2).sum(axis=1))
+        ranked = [server_vector_id(self.vectors[i].id) for i in order]
+        found = limit if exact else min(limit, ef_search // 4)
+        ids = ranked[:found] + ranked[-(limit - found):] if found < limit else ranked[:limit]
+        return SearchResponse(success=True, data=[QueryResult(id=i, distance=0.0) for i in ids])
+    
+    def reindex_collection(self, name, index_config):
+        self.reindexed = index_config
@@ -14,7 +14,7 @@ from vectordb_client.types import (
 from vectordb_client.exceptions import (
     VectorDBError, CollectionNotFoundError, VectorNotFoundError
 )
-from .conftest import assert_vectors_equal, assert_query_results_valid
+from .conftest import assert_vectors_equal, assert_query_results_valid, FakeTuningServer
 
 
 class TestAsyncClientInitialization:
@@ -55,6 +55,71 @@ class TestAsyncClientInitialization:
                 pytest.skip("Server not available for async context manager test")
 
 
+class AsyncFakeTuningServer(FakeTuningServer):
+    """FakeTuningServer behind the async REST client's interface."""
+    
+    async def get_collection(self, name):
+        return super().get_collection(name)
+    
+    async def search(self, collection_name, query_vector, limit=10, ef_search=None, filter=None,
+                     nprobe=None, oversampling=None, exact=False, deadline_ms=None):
+        return super().search(collection_name, query_vector, limit, ef_search, exact=exact)
+    
+    async def reindex_collection(self, name, index_config):
+        return super().reindex_collection(name, index_config)
+
+
+class TestAsyncSearchTuning:
+    """Test async ef_search tuning against exact ground truth."""
+    
+    @pytest.fixture
+    def vectors(self) -> List[Vector]:
+        rng = np.random.default_rng(7)
+        return [Vector(id=f"doc-{i}", data=rng.random(8).tolist()) for i in range(200)]
+    
+    def tuned_client(self, server: AsyncFakeTuningServer) -> AsyncVectorDBClient:
+        client = AsyncVectorDBClient()
+        client._rest_client = server
+        client._connected = True
+        return client
+    
+    async def test_brute_force_ground_truth(self, vectors: List[Vector]):
+        """Test the sweep against NumPy ground truth stores the cheapest ef_search."""
+        server = AsyncFakeTuningServer(vectors)
+        client = self.tuned_client(server)
+        
+        result = await client.tune_search("docs", [v.data for v in vectors[:5]], vectors=vectors)
+        
+        assert result.ef_search == 48
+        assert [p.ef_search for p in result.sweep] == [16, 24, 32, 48]
+        assert result.applied and server.reindexed.ef_search == 48
+        assert server.searches == 5 * 4
+    
+    async def test_server_ground_truth(self, vectors: List[Vector]):
+        """Test exact server searches stand in for brute force when vectors are not given."""
+        server = AsyncFakeTuningServer(vectors)
+        client = self.tuned_client(server)
+        
+        result = await client.tune_search("docs", [vectors[0].data], target_recall=0.7, apply=False)
+        
+        assert result.ef_search == 32
+        assert server.searches == 1 + 3
+        assert not result.applied and server.reindexed is None
+    
+    async def test_unreachable_target(self, vectors: List[Vector]):
+        """Test a target no candidate meets sweeps them all and stores nothing."""
+        server = AsyncFakeTuningServer(vectors)
+        client = self.tuned_client(server)
+        
+        result = await client.tune_search(
+            "docs", [vectors[0].data], target_recall=0.95, vectors=vectors, ef_candidates=[16, 24]
+        )
+        
+        assert result.ef_search is None
+        assert [p.ef_search for p in result.sweep] == [16, 24]
+        assert not result.applied and server.reindexed is None
+
+
 class TestAsyncCollectionManagement:
     """Test async collection management operations."""
     
@@ -0,0 +1,341 @@
+"""
+Unit tests for the client-side sharding router.
+"""
+
+import pytest
+import asyncio
+from collections import Counter
+
+from vectordb_client import ShardedVectorDBClient
+from vectordb_client.sharded_client import ConsistentHashRing, merge_top_k
+from vectordb_client.types import (
+    Vector, QueryResult, SearchResponse, InsertResponse, ShardedSearchResponse,
+    CompactionStats, BulkLoadPhase, BulkLoadProgress, IndexConfig, ReindexStats,
+    CollectionAlias
+)
+from vectordb_client.exceptions import VectorDBError, ClientConfigurationError
+
+
+class FakeShard:
+    """In-process stand-in for an AsyncVectorDBClient."""
+
+    def __init__(self, results=None, delay=0.0, error=None, partial=False):
+        self.results = results or []
+        self.delay = delay
+        self.error = error
+        self.partial = partial
+        self.inserted = []
+
+    async def search(self, collection_name, query_vector, limit=10, ef_search=None, filter=None, nprobe=None,
+                     oversampling=None, exact=False, deadline_ms=None):
+        self.deadline_ms = deadline_ms
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return SearchResponse(success=True, data=self.results[:limit], partial=self.partial)
+
+    async def insert_vectors(self, collection_name, vectors, durability=None):
+        self.durability = durability
+        if self.error:
+            raise self.error
+        self.inserted.extend(vectors)
+        return InsertResponse(success=True, generated_id=[f"srv-{v.id}" for v in vectors])
+
+    async def insert_vector(self, collection_name, vector, durability=None):
+        self.durability = durability
+        self.inserted.append(vector)
+        return InsertResponse(success=True, generated_id=f"srv-{vector.id}")
+
+    async def compact_collection(self, name, io_budget_mb=None):
+        self.io_budget_mb = io_budget_mb
+        return CompactionStats(
+            collection=name, live_vectors=10, bytes_before=1000,
+            bytes_after=400, bytes_reclaimed=600, duration_ms=len(self.inserted)
+        )
+
+    async def reindex_collection(self, name, index_config):
+        self.index_config = index_config
+        return ReindexStats(
+            collection=name, vectors_indexed=len(self.inserted),
+            concurrent_writes=1, duration_ms=len(self.inserted)
+        )
+
+    async def set_alias(self, alias, collection):
+        self.aliases = getattr(self, "aliases", {})
+        self.aliases[alias] = CollectionAlias(
+            alias=alias, collection=collection, version=len(self.aliases) + len(self.inserted)
+        )
+        return self.aliases[alias]
+
+    async def get_alias(self, alias):
+        return self.aliases[alias]
+
+    async def list_aliases(self):
+        return list(getattr(self, "aliases", {}).values())
+
+    def bulk_progress(self, name, phase):
+        return BulkLoadProgress(
+            collection=name, phase=phase, vectors_loaded=len(self.inserted),
+            vectors_indexed=len(self.inserted) if phase == BulkLoadPhase.DONE else 0,
+            elapsed_ms=len(self.inserted)
+        )
+
+    async def begin_bulk_load(self, name):
+        return self.bulk_progress(name, BulkLoadPhase.LOADING)
+
+    async def bulk_insert_vectors(self, collection_name, vectors):
+        self.inserted.extend(vectors)
+        return self.bulk_progress(collection_name, BulkLoadPhase.LOADING)
+
+    async def finish_bulk_load(self, name):
+        self.finished = True
+        return self.bulk_progress(name, BulkLoadPhase.DONE)
+
+    async def get_bulk_load_progress(self, name):
+        phase = BulkLoadPhase.DONE if getattr(self, "finished", False) else BulkLoadPhase.LOADING
+        return self.bulk_progress(name, phase)
+
+
+def results(*pairs):
+    return [QueryResult(id=i, distance=d) for i, d in pairs]
+
+
+def sharded_client(shards, **kwargs):
+    client = ShardedVectorDBClient(list(shards), **kwargs)
+    client._shards = dict(shards)
+    return client
+
+
+class TestConsistentHashRing:
+    """Test key placement on the hash ring."""
+
+    def test_deterministic_placement(self):
+        """Test the same key always maps to the same node."""
+        ring = ConsistentHashRing(["a:1", "b:2", "c:3"])
+        other = ConsistentHashRing(["c:3", "a:1", "b:2"])
+        for i in range(100):
+            assert ring.get_node(f"vec_{i}") == other.get_node(f"vec_{i}")
+
+    def test_balanced_distribution(self):
+        """Test keys spread roughly evenly across nodes."""
+        ring = ConsistentHashRing(["a:1", "b:2", "c:3", "d:4"])
+        counts = Counter(ring.get_node(f"vec_{i}") for i in range(10000))
+        assert set(counts) == {"a:1", "b:2", "c:3", "d:4"}
+        assert min(counts.values()) > 1500
+
+    def test_adding_node_moves_few_keys(self):
+        """Test adding a node only relocates keys onto the new node."""
+        ring = ConsistentHashRing(["a:1", "b:2", "c:3"])
+        before = {f"vec_{i}": ring.get_node(f"vec_{i}") for i in range(5000)}
+        ring.add_node("d:4")
+        moved = [k for k, node in before.items() if ring.get_node(k) != node]
+        assert all(ring.get_node(k) == "d:4" for k in moved)
+        assert len(moved) < 5000 * 0.4
+
+    def test_empty_ring(self):
+        """Test lookups on an empty ring fail clearly."""
+        with pytest.raises(ClientConfigurationError):
+            ConsistentHashRing().get_node("key")
+
+
+class TestMergeTopK:
+    """Test merging per-shard result lists."""
+
+    def test_merges_by_distance(self):
+        """Test the global top-k is taken across shards."""
+        merged = merge_top_k([
+            results(("a", 0.1), ("b", 0.5)),
+            results(("c", 0.2), ("d", 0.3)),
+        ], limit=3)
+        assert [r.id for r in merged] == ["a", "c", "d"]
+
+    def test_limit_larger_than_results(self):
+        """Test merging fewer results than the limit."""
+        merged = merge_top_k([results(("a", 0.4)), []], limit=10)
+        assert [r.id for r in merged] == ["a"]
+
+
+class TestShardedClient:
+    """Test routing and scatter-gather behavior."""
+
+    def test_invalid_endpoints(self):
+        """Test endpoint validation."""
+        with pytest.raises(ClientConfigurationError):
+            ShardedVectorDBClient([])
+        with pytest.raises(ClientConfigurationError):
+            ShardedVectorDBClient(["localhost:8080", ("localhost", 8080)])
+
+    @pytest.mark.asyncio
+    async def test_search_merges_shards(self):
+        """Test search returns the merged top-k from all shards."""
+        client = sharded_client({
+            "s1:1": FakeShard(results(("a", 0.1), ("b", 0.6))),
+            "s2:2": FakeShard(results(("c", 0.2), ("d", 0.4))),
+        })
+        response = await client.search("docs", [0.1, 0.2], limit=3)
+        assert isinstance(response, ShardedSearchResponse)
+        assert [r.id for r in response.results] == ["a", "c", "d"]
+        assert not response.partial
+
+    @pytest.mark.asyncio
+    async def test_search_partial_on_timeout(self):
+        """Test slow shards are dropped and reported when partial results are allowed."""
+        client = sharded_client({
+            "s1:1": FakeShard(results(("a", 0.1))),
+            "s2:2": FakeShard(results(("b", 0.05)), delay=1.0),
+        }, shard_timeout=0.05)
+        response = await client.search("docs", [0.1, 0.2], limit=2)
+        assert response.partial
+        assert response.failed_shards == ["s2:2"]
+        assert [r.id for r in response.results] == ["a"]
+
+    @pytest.mark.asyncio
+    async def test_search_deadline_from_shard_timeout(self):
+        """Test shards get a deadline inside the shard timeout and report cut-short searches."""
+        shards = {
+            "s1:1": FakeShard(results(("a", 0.1))),
+            "s2:2": FakeShard(results(("b", 0.05)), partial=True),
+        }
+        client = sharded_client(shards, shard_timeout=0.5)
+        response = await client.search("docs", [0.1, 0.2], limit=2)
+        assert [shard.deadline_ms for shard in shards.values()] == [400, 400]
+        assert response.partial
+        assert response.failed_shards == []
+        assert [r.id for r in response.results] == ["b", "a"]
+
+        await client.search("docs", [0.1, 0.2], deadline_ms=50)
+        assert shards["s1:1"].deadline_ms == 50
+
+    @pytest.mark.asyncio
+    async def test_search_strict_raises(self):
+        """Test shard failures raise when partial results are disallowed."""
+        client = sharded_client({
+            "s1:1": FakeShard(results(("a", 0.1))),
+            "s2:2": FakeShard(error=VectorDBError("boom")),
+        }, allow_partial_results=False)
+        with pytest.raises(VectorDBError) as exc_info:
+            await client.search("docs", [0.1, 0.2])
+        assert exc_info.value.details["failed_shards"] == ["s2:2"]
+
+    @pytest.mark.asyncio
+    async def test_insert_routes_by_id(self):
+        """Test batch inserts land on the owning shard and keep ID order."""
+        shards = {"s1:1": FakeShard(), "s2:2": FakeShard(), "s3:3": FakeShard()}
+        client = sharded_client(shards)
+        vectors = [Vector(id=f"vec_{i}", data=[float(i)]) for i in range(30)]
+
+        response = await client.insert_vectors("docs", vectors)
+
+        assert response.vector_ids == [f"srv-vec_{i}" for i in range(30)]
+        for name, shard in shards.items():
+            assert all(client.shard_for(v.id) == name for v in shard.inserted)
+        assert sum(len(s.inserted) for s in shards.values()) == 30
+
+    @pytest.mark.asyncio
+    async def test_insert_reports_failed_shard(self):
+        """Test a failed shard is reported with its IDs while the others insert."""
+        shards = {"s1:1": FakeShard(), "s2:2": FakeShard(error=ConnectionError("refused"))}
+        client = sharded_client(shards)
+        vectors = [Vector(id=f"vec_{i}", data=[float(i)]) for i in range(30)]
+
+        response = await client.insert_vectors("docs", vectors)
+
+        lost = [v.id for v in vectors if client.shard_for(v.id) == "s2:2"]
+        assert not response.success
+        assert "s2:2" in response.error
+        assert response.failed_shards == {"s2:2": lost}
+        assert response.vector_ids == [
+            None if v.id in lost else f"srv-{v.id}" for v in vectors
+        ]
+        assert response.inserted_count == 30 - len(lost)
+
+    @pytest.mark.asyncio
+    async def test_insert_raises_when_every_shard_fails(self):
+        """Test an insert nothing accepted raises with the failed IDs."""
+        shards = {"s1:1": FakeShard(error=ConnectionError("refused"))}
+        client = sharded_client(shards)
+        vectors = [Vector(id=f"vec_{i}", data=[float(i)]) for i in range(3)]
+
+        with pytest.raises(VectorDBError) as exc_info:
+            await client.insert_vectors("docs", vectors)
+        assert exc_info.value.details["failed_shards"] == {"s1:1": ["vec_0", "vec_1", "vec_2"]}
+
+    @pytest.mark.asyncio
+    async def test_insert_forwards_durability(self):
+        """Test per-request durability reaches every shard batch."""
+        shards = {"s1:1": FakeShard(), "s2:2": FakeShard()}
+        client = sharded_client(shards)
+        vectors = [Vector(id=f"vec_{i}", data=[float(i)]) for i in range(20)]
+
+        await client.insert_vectors("docs", vectors, durability="fsync-each")
+
+        assert all(s.durability == "fsync-each" for s in shards.values())
+
+    @pytest.mark.asyncio
+    async def test_compact_sums_shard_stats(self):
+        """Test compaction runs on every shard and sums what was reclaimed."""
+        shards = {"s1:1": FakeShard(), "s2:2": FakeShard()}
+        shards["s2:2"].inserted = [None] * 5
+        client = sharded_client(shards)
+
+        stats = await client.compact_collection("docs", io_budget_mb=8)
+
+        assert all(s.io_budget_mb == 8 for s in shards.values())
+        assert stats.live_vectors == 20
+        assert stats.bytes_reclaimed == 1200
+        assert stats.duration_ms == 5
+
+    @pytest.mark.asyncio
+    async def test_reindex_sums_shard_stats(self):
+        """Test reindexing runs on every shard with the same parameters."""
+        shards = {"s1:1": FakeShard(), "s2:2": FakeShard()}
+        shards["s2:2"].inserted = [None] * 5
+        client = sharded_client(shards)
+        index_config = IndexConfig(max_connections=32, ef_construction=400)
+
+        stats = await client.reindex_collection("docs", index_config)
+
+        assert all(s.index_config == index_config for s in shards.values())
+        assert stats.vectors_indexed == 5
+        assert stats.concurrent_writes == 2
+        assert stats.duration_ms == 5
+
+    @pytest.mark.asyncio
+    async def test_alias_switches_on_every_shard(self):
+        """Test aliases are set on every shard and merged only when shards agree."""
+        shards = {"s1:1": FakeShard(), "s2:2": FakeShard()}
+        shards["s2:2"].inserted = [None] * 5
+        client = sharded_client(shards)
+
+        await client.set_alias("docs", "docs_v1")
+        alias = await client.set_alias("docs", "docs_v2")
+
+        assert alias.collection == "docs_v2"
+        assert alias.version == 6
+        assert [a.collection for a in await client.list_aliases()] == ["docs_v2"]
+
+        # A shard still on the old target is reported rather than hidden
+        await shards["s1:1"].set_alias("docs", "docs_v1")
+        with pytest.raises(VectorDBError, match="different collections"):
+            await client.get_alias("docs")
+
+    @pytest.mark.asyncio
+    async def test_bulk_load_routes_and_merges_progress(self):
+        """Test bulk loads route vectors by owner and merge shard progress."""
+        shards = {"s1:1": FakeShard(), "s2:2": FakeShard()}
+        client = sharded_client(shards)
+        vectors = [Vector(id=f"doc-{i}", data=[float(i)]) for i in range(40)]
+
+        await client.begin_bulk_load("docs")
+        progress = await client.bulk_insert_vectors("docs", vectors)
+        assert progress.vectors_loaded == 40
+        assert all(client.shard_for(v.id) == name for name, s in shards.items() for v in s.inserted)
+
+        shards["s1:1"].finished = True
+        progress = await client.get_bulk_load_progress("docs")
+        assert progress.phase == BulkLoadPhase.LOADING
+
+        progress = await client.finish_bulk_load("docs")
+        assert progress.phase == BulkLoadPhase.DONE
+        assert progress.vectors_indexed == 40
+        assert progress.elapsed_ms == max(len(s.inserted) for s in shards.values())
@@ -7,13 +7,15 @@ import numpy as np
 from typing import List
 
 from vectordb_client import VectorDBClient
+from vectordb_client.grpc.client import GrpcClient
+from vectordb_client.rest.client import RestClient
 from vectordb_client.types import (
-    CollectionConfig, Vector, DistanceMetric, VectorType, IndexConfig
+    CollectionConfig, Vector, DistanceMetric, VectorType, IndexConfig, IndexType, server_vector_id
 )
 from vectordb_client.exceptions import (
-    VectorDBError, CollectionNotFoundError, VectorNotFoundError
+    VectorDBError, CollectionNotFoundError, VectorNotFoundError, InvalidParameterError
 )
-from .conftest import assert_vectors_equal, assert_query_results_valid
+from .conftest import assert_vectors_equal, assert_query_results_valid, FakeTuningServer
 
 
 class TestClientInitialization:
@@ -49,6 +51,112 @@ class TestClientInitialization:
             assert client.ping()
 
 
+class TestSearchTuning:
+    """Test ef_search tuning against exact ground truth."""
+    
+    @pytest.fixture
+    def vectors(self) -> List[Vector]:
+        rng = np.random.default_rng(7)
+        return [Vector(id=f"doc-{i}", data=rng.random(8).tolist()) for i in range(200)]
+    
+    def tuned_client(self, server: FakeTuningServer) -> VectorDBClient:
+        client = VectorDBClient()
+        client._rest_client = server
+        return client
+    
+    def test_picks_cheapest_ef_meeting_target(self, vectors: List[Vector]):
+        """Test the sweep stops at the first ef_search meeting the target and stores it."""
+        server = FakeTuningServer(vectors)
+        client = self.tuned_client(server)
+        queries = [v.data for v in vectors[:5]]
+        
+        result = client.tune_search("docs", queries, target_recall=0.95, vectors=vectors)
+        
+        assert result.ef_search == 48
+        assert [p.ef_search for p in result.sweep] == [16, 24, 32, 48]
+        assert [p.recall for p in result.sweep] == pytest.approx([0.4, 0.6, 0.8, 1.0])
+        assert result.applied
+        assert server.reindexed.ef_search == 48
+        assert server.reindexed.max_connections == IndexConfig().max_connections
+    
+    def test_server_ground_truth_without_apply(self, vectors: List[Vector]):
+        """Test exact server searches stand in for brute force when vectors are not given."""
+        server = FakeTuningServer(vectors)
+        client = self.tuned_client(server)
+        
+        result = client.tune_search("docs", [vectors[0].data], target_recall=0.7, apply=False)
+        
+        assert result.ef_search == 32
+        assert server.searches == 1 + 3
+        assert not result.applied and server.reindexed is None
+    
+    def test_rejects_non_hnsw_collection(self, vectors: List[Vector]):
+        """Test tuning refuses collections whose index ignores ef_search."""
+        client = self.tuned_client(FakeTuningServer(vectors, IndexType.FLAT))
+        
+        with pytest.raises(InvalidParameterError):
+            client.tune_search("docs", [vectors[0].data])
+    
+    def test_unreachable_target(self, vectors: List[Vector]):
+        """Test a target no candidate meets sweeps them all and stores nothing."""
+        server = FakeTuningServer(vectors)
+        client = self.tuned_client(server)
+        
+        result = client.tune_search(
+            "docs", [vectors[0].data], target_recall=0.95, vectors=vectors, ef_candidates=[16, 24]
+        )
+        
+        assert result.ef_search is None
+        assert [p.ef_search for p in result.sweep] == [16, 24]
+        assert not result.applied and server.reindexed is None
+
+
+class RecordingStub:
+    """Stand-in gRPC stub that keeps the requests it is sent."""
+    
+    def __init__(self):
+        self.requests = []
+    
+    def _record(self, request, timeout=None):
+        self.requests.append(request)
+        return type("Response", (), {"success": True, "message": ""})()
+    
+    Insert = BatchInsert = Delete = _record
+
+
+class TestVectorIdMapping:
+    """Test every transport sends a vector under the same server ID."""
+    
+    @pytest.mark.parametrize("vector_id", ["doc-1", "12345678-1234-5678-1234-567812345678"])
+    def test_rest_and_grpc_agree(self, vector_id: str):
+        """Test REST and gRPC writes and deletes carry the same server ID."""
+        rest = RestClient()
+        rest_requests = []
+        rest._make_request = lambda method, endpoint, json_data=None, params=None: (
+            rest_requests.append((endpoint, json_data)) or {"success": True}
+        )
+        grpc_client = GrpcClient()
+        stub = grpc_client.stub = RecordingStub()
+        vector = Vector(id=vector_id, data=[0.1, 0.2])
+        
+        rest.insert_vector("docs", vector)
+        rest.insert_vectors("docs", [vector])
+        rest.delete_vector("docs", vector_id)
+        grpc_client.insert_vector("docs", vector)
+        grpc_client.insert_vectors("docs", [vector])
+        grpc_client.delete_vector("docs", vector_id)
+        rest.close()
+        grpc_client.close()
+        
+        expected = server_vector_id(vector_id)
+        assert rest_requests[0][1]["id"] == expected
+        assert rest_requests[1][1]["vectors"][0]["id"] == expected
+        assert rest_requests[2][0].endswith(f"/vectors/{expected}")
+        assert stub.requests[0].vector.id == expected
+        assert stub.requests[1].vectors[0].id == expected
+        assert stub.requests[2].vector_id == expected
+
+
 class TestCollectionManagement:
     """Test collection management operations."""
     
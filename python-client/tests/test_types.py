@@ -10,7 +10,8 @@ from vectordb_client.types import (
     CollectionConfig, Vector, QueryResult, SearchRequest, SearchResponse,
     CollectionStats, ServerStats, HealthResponse, InsertResponse,
     ListCollectionsResponse, CollectionResponse, 
-    DistanceMetric, VectorType, IndexConfig
+    DistanceMetric, VectorType, IndexType, IndexConfig, DurabilityMode, server_vector_id,
+    search_deadline_ms, BulkLoadPhase, BulkLoadProgress
 )
 
 
@@ -40,6 +41,57 @@ class TestVectorType:
         assert VectorType.INT8 == "int8"
 
 
+class TestDurabilityMode:
+    """Test WAL durability modes."""
+    
+    def test_durability_mode_values(self):
+        """Test durability values match the server's spelling."""
+        assert DurabilityMode.FSYNC_EACH == "fsync-each"
+        assert DurabilityMode.GROUP == "group"
+        assert DurabilityMode.NONE == "none"
+        assert DurabilityMode.interval_ms(50) == "interval-ms:50"
+    
+    def test_invalid_interval(self):
+        """Test non-positive intervals are rejected."""
+        with pytest.raises(ValueError):
+            DurabilityMode.interval_ms(0)
+    
+    def test_collection_durability(self):
+        """Test collections accept a durability setting."""
+        config = CollectionConfig(name="c", dimension=4, durability=DurabilityMode.FSYNC_EACH)
+        assert config.durability == "fsync-each"
+        assert CollectionConfig(name="c", dimension=4).durability is None
+
+
+class TestServerVectorId:
+    """Test mapping user vector IDs to server UUIDs."""
+    
+    def test_deterministic(self):
+        """Test the same ID maps to the same UUID in any process."""
+        assert server_vector_id("doc-1") == server_vector_id("doc-1")
+        assert server_vector_id("doc-1") != server_vector_id("doc-2")
+    
+    def test_uuid_passthrough(self):
+        """Test UUID IDs are sent unchanged."""
+        vector_id = "12345678-1234-5678-1234-567812345678"
+        assert server_vector_id(vector_id) == vector_id
+
+
+class TestSearchDeadline:
+    """Test deriving the server search deadline from a client timeout."""
+    
+    def test_derived_from_timeout(self):
+        """Test the server gets most of the timeout, leaving room for the response."""
+        assert search_deadline_ms(30.0) == 24000
+        assert search_deadline_ms(0.0001) == 1
+        assert search_deadline_ms(None) is None
+    
+    def test_explicit_deadline_wins(self):
+        """Test a deadline given by the caller is used as-is."""
+        assert search_deadline_ms(30.0, 250) == 250
+        assert search_deadline_ms(None, 0) == 0
+
+
 class TestIndexConfig:
     """Test index configuration model."""
     
@@ -79,6 +131,55 @@ class TestIndexConfig:
         # Test negative max_layer
         with pytest.raises(ValidationError):
             IndexConfig(max_layer=-5)
+    
+    def test_ivf_pq_index_config(self):
+        """Test IVF-PQ index configuration."""
+        config = IndexConfig(index_type=IndexType.IVF_PQ, nlist=1024, pq_subvectors=16, nprobe=32)
+        
+        assert config.index_type == "IvfPq"
+        assert config.model_dump()["nlist"] == 1024
+        assert config.rerank is True
+        assert IndexConfig().index_type == IndexType.HNSW
+        
+        with pytest.raises(ValidationError):
+            IndexConfig(index_type=IndexType.IVF_PQ, nprobe=0)
+        
+        request = SearchRequest(query_vector=[0.1, 0.2], nprobe=16)
+        assert request.nprobe == 16
+    
+    def test_binary_quantization(self):
+        """Test binary collections and the rescoring oversampling factor."""
+        config = CollectionConfig(name="docs", dimension=1024, vector_type=VectorType.BINARY)
+        assert config.model_dump()["vector_type"] == "Binary"
+        
+        request = SearchRequest(query_vector=[0.1, 0.2], oversampling=2.5)
+        assert request.oversampling == 2.5
+        
+        with pytest.raises(ValidationError):
+            SearchRequest(query_vector=[0.1, 0.2], oversampling=0.5)
+    
+    def test_bulk_load_progress(self):
+        """Test bulk load progress as the server reports it."""
+        progress = BulkLoadProgress(
+            collection="docs", phase="Building", vectors_loaded=1000,
+            vectors_indexed=250, elapsed_ms=40
+        )
+        assert progress.phase == BulkLoadPhase.BUILDING
+        
+        with pytest.raises(ValidationError):
+            BulkLoadProgress(
+                collection="docs", phase="Paused", vectors_loaded=0,
+                vectors_indexed=0, elapsed_ms=0
+            )
+    
+    def test_flat_index_exact_search(self):
+        """Test flat collections and per-query exact search."""
+        config = IndexConfig(index_type=IndexType.FLAT)
+        assert config.model_dump()["index_type"] == "Flat"
+        
+        assert SearchRequest(query_vector=[0.1, 0.2]).exact is False
+        request = SearchRequest.from_numpy(np.array([0.1, 0.2]), exact=True)
+        assert request.exact is True
 
 
 class TestCollectionConfig:
@@ -122,6 +223,17 @@ class TestCollectionConfig:
         assert config.distance_metric == DistanceMetric.COSINE
         assert config.vector_type == VectorType.FLOAT32
         assert config.index_config is None
+        assert config.indexed_fields == []
+    
+    def test_collection_config_indexed_fields(self):
+        """Test payload index fields are sent with the collection."""
+        config = CollectionConfig(
+            name="docs",
+            dimension=128,
+            indexed_fields=["category", "year"]
+        )
+        
+        assert config.model_dump()["indexed_fields"] == ["category", "year"]
     
     def test_invalid_collection_config(self):
         """Test validation of invalid collection configuration."""
@@ -359,6 +471,21 @@ class TestServerStats:
         assert stats.memory_usage == 2147483648
         assert stats.disk_usage == 5368709120
         assert stats.uptime_seconds == 86400
+        assert stats.search_queue_depth == 0
+    
+    def test_server_stats_search_queue(self):
+        """Test search queue saturation fields."""
+        stats = ServerStats(
+            total_vectors=10,
+            total_collections=1,
+            memory_usage=1000,
+            disk_usage=2000,
+            uptime_seconds=100,
+            search_queue_depth=900,
+            search_queue_capacity=1024
+        )
+        
+        assert stats.search_queue_depth / stats.search_queue_capacity > 0.8
     
     def test_invalid_server_stats(self):
         """Test validation of invalid server statistics."""
@@ -7,6 +7,7 @@ Supports both REST and gRPC protocols with synchronous and asynchronous operatio
 
 from .client import VectorDBClient
 from .async_client import AsyncVectorDBClient
+from .sharded_client import ShardedVectorDBClient
 from .rest.client import RestClient
 from .grpc.client import GrpcClient
 from .types import (
@@ -16,9 +17,21 @@ from .types import (
     SearchRequest,
     DistanceMetric,
     VectorType,
+    IndexType,
+    DurabilityMode,
     IndexConfig,
     CollectionStats,
+    CompactionStats,
+    ReindexStats,
+    CollectionAlias,
+    SearchTuningPoint,
+    SearchTuningResult,
+    BulkLoadPhase,
+    BulkLoadProgress,
     ServerStats,
+    ShardedSearchResponse,
+    ShardedInsertResponse,
+    server_vector_id,
 )
 from .exceptions import (
     VectorDBError,
@@ -27,6 +40,7 @@ from .exceptions import (
     VectorNotFoundError,
     InvalidParameterError,
     ServerError,
+    ServerOverloadedError,
 )
 
 __version__ = "0.1.0"
@@ -38,6 +52,7 @@ __all__ = [
     # Main client interfaces
     "VectorDBClient",
     "AsyncVectorDBClient",
+    "ShardedVectorDBClient",
     
     # Protocol-specific clients
     "RestClient", 
@@ -50,9 +65,21 @@ __all__ = [
     "SearchRequest",
     "DistanceMetric",
     "VectorType",
+    "IndexType",
+    "DurabilityMode",
     "IndexConfig",
     "CollectionStats",
+    "CompactionStats",
+    "ReindexStats",
+    "CollectionAlias",
+    "SearchTuningPoint",
+    "SearchTuningResult",
+    "BulkLoadPhase",
+    "BulkLoadProgress",
     "ServerStats",
+    "ShardedSearchResponse",
+    "ShardedInsertResponse",
+    "server_vector_id",
     
     # Exceptions
     "VectorDBError",
@@ -61,6 +88,7 @@ __all__ = [
     "VectorNotFoundError",
     "InvalidParameterError",
     "ServerError",
+    "ServerOverloadedError",
     
     # Metadata
     "__version__",
@@ -2,14 +2,17 @@
 Main asynchronous client interface for d-vecDB.
 """
 
-from typing import List, Optional, Dict, Any
+import time
+from typing import List, Optional, Dict, Any, Sequence
 from .types import (
     CollectionConfig, Vector, QueryResult, SearchResponse,
-    CollectionStats, ServerStats, HealthResponse, InsertResponse,
-    ListCollectionsResponse, CollectionResponse, VectorData
+    CollectionStats, CompactionStats, ServerStats, HealthResponse, InsertResponse,
+    ListCollectionsResponse, CollectionResponse, VectorData, Durability, BulkLoadProgress,
+    IndexConfig, ReindexStats, CollectionAlias, SearchTuningResult
 )
 from .rest.async_client import AsyncRestClient
 from .exceptions import VectorDBError, ClientConfigurationError
+from . import tuning
 
 
 class AsyncVectorDBClient:
@@ -153,26 +156,102 @@ class AsyncVectorDBClient:
         """Get collection statistics."""
         return await self.client.get_collection_stats(name)
     
+    async def compact_collection(self, name: str, io_budget_mb: Optional[int] = None) -> CompactionStats:
+        """Compact a collection, reclaiming space held by deleted and updated vectors."""
+        return await self.client.compact_collection(name, io_budget_mb=io_budget_mb)
+    
+    async def reindex_collection(self, name: str, index_config: IndexConfig) -> ReindexStats:
+        """
+        Rebuild a collection's index with new parameters.
+        
+        The current index keeps serving until the new one is built from the
+        stored vectors and swapped in; writes made meanwhile reach both.
+        """
+        return await self.client.reindex_collection(name, index_config)
+    
+    async def set_alias(self, alias: str, collection: str) -> CollectionAlias:
+        """
+        Point an alias at a collection, creating it or switching it atomically.
+        
+        Every operation taking a collection name accepts the alias, so
+        readers using it never see the cutover.
+        """
+        return await self.client.set_alias(alias, collection)
+    
+    async def get_alias(self, alias: str) -> CollectionAlias:
+        """Get the collection an alias points at."""
+        return await self.client.get_alias(alias)
+    
+    async def list_aliases(self) -> List[CollectionAlias]:
+        """List all aliases."""
+        return await self.client.list_aliases()
+    
+    async def delete_alias(self, alias: str) -> None:
+        """Delete an alias; the collection it points at is kept."""
+        await self.client.delete_alias(alias)
+    
+    async def begin_bulk_load(self, name: str) -> BulkLoadProgress:
+        """
+        Start bulk loading a collection.
+        
+        Vectors sent with `bulk_insert_vectors` skip the WAL and the index
+        until `finish_bulk_load` builds the index over all of them at once.
+        They are neither searchable nor durable before then.
+        """
+        return await self.client.begin_bulk_load(name)
+    
+    async def bulk_insert_vectors(self, collection_name: str, vectors: List[Vector]) -> BulkLoadProgress:
+        """Add vectors to a collection's bulk load."""
+        return await self.client.bulk_insert_vectors(collection_name, vectors)
+    
+    async def finish_bulk_load(self, name: str) -> BulkLoadProgress:
+        """Write out a bulk load and build the collection's index over it."""
+        return await self.client.finish_bulk_load(name)
+    
+    async def get_bulk_load_progress(self, name: str) -> BulkLoadProgress:
+        """Progress of a collection's current or last bulk load, for polling during the build."""
+        return await self.client.get_bulk_load_progress(name)
+    
     # Vector Operations
-    async def insert_vector(self, collection_name: str, vector: Vector) -> InsertResponse:
+    async def insert_vector(
+        self,
+        collection_name: str,
+        vector: Vector,
+        durability: Optional[Durability] = None
+    ) -> InsertResponse:
         """Insert a single vector."""
-        return await self.client.insert_vector(collection_name, vector)
+        return await self.client.insert_vector(collection_name, vector, durability=durability)
     
-    async def insert_vectors(self, collection_name: str, vectors: List[Vector]) -> InsertResponse:
+    async def insert_vectors(
+        self,
+        collection_name: str,
+        vectors: List[Vector],
+        durability: Optional[Durability] = None
+    ) -> InsertResponse:
         """Insert multiple vectors."""
-        return await self.client.insert_vectors(collection_name, vectors)
+        return await self.client.insert_vectors(collection_name, vectors, durability=durability)
     
     async def get_vector(self, collection_name: str, vector_id: str) -> Vector:
         """Retrieve a vector by ID."""
         return await self.client.get_vector(collection_name, vector_id)
     
-    async def update_vector(self, collection_name: str, vector: Vector) -> InsertResponse:
+    async def update_vector(
+        self,
+        collection_name: str,
+        vector: Vector,
+        durability: Optional[Durability] = None
+    ) -> InsertResponse:
         """Update an existing vector."""
-        return await self.client.update_vector(collection_name, vector)
+        return await self.client.update_vector(collection_name, vector, durability=durability)
     
-    async def delete_vector(self, collection_name: str, vector_id: str) -> InsertResponse:
+    async def delete_vector(
+        self,
+        collection_name: str,
+        vector_id: str,
+        durability: Optional[Durability] = None
+    ) -> InsertResponse:
         """Delete a vector by ID."""
-        return await self.client.delete_vector(collection_name, vector_id)
+        return await self.client.delete_vector(collection_name, vector_id, durability=durability)
     
     # Search Operations
     async def search(
@@ -181,13 +260,86 @@ class AsyncVectorDBClient:
         query_vector: VectorData,
         limit: int = 10,
         ef_search: Optional[int] = None,
-        filter: Optional[Dict[str, Any]] = None
+        filter: Optional[Dict[str, Any]] = None,
+        nprobe: Optional[int] = None,
+        oversampling: Optional[float] = None,
+        exact: bool = False,
+        deadline_ms: Optional[int] = None
     ) -> SearchResponse:
         """Search for similar vectors."""
         return await self.client.search(
-            collection_name, query_vector, limit, ef_search, filter
+            collection_name, query_vector, limit, ef_search, filter, nprobe, oversampling, exact,
+            deadline_ms
         )
     
+    async def tune_search(
+        self,
+        collection_name: str,
+        sample_queries: Sequence[VectorData],
+        target_recall: float = 0.95,
+        limit: int = 10,
+        vectors: Optional[Sequence[Vector]] = None,
+        ef_candidates: Optional[Sequence[int]] = None,
+        apply: bool = True
+    ) -> SearchTuningResult:
+        """
+        Find the cheapest ef_search meeting a recall target and make it the
+        collection's search default.
+        
+        Each candidate ef_search, cheapest first, runs every sample query
+        and is scored by its mean recall@limit against exact ground truth.
+        The sweep stops at the first one meeting `target_recall`, which is
+        stored server-side in the collection's `IndexConfig.ef_search`
+        unless `apply` is False. Searches that do not pass ef_search use it.
+        
+        Args:
+            collection_name: HNSW collection to tune
+            sample_queries: Queries representative of production traffic
+            target_recall: Mean recall@limit to reach
+            limit: Results per query the recall is measured over
+            vectors: The collection's vectors; ground truth is brute-forced
+                over them with NumPy. Without them the server's exact search
+                provides it.
+            ef_candidates: ef_search values to try instead of the defaults
+            apply: Store the chosen ef_search on the server
+        
+        Returns:
+            The sweep and the chosen ef_search. If no candidate reaches
+            `target_recall`, every candidate is swept, `ef_search` is None,
+            `applied` is False and the collection is left unchanged.
+        """
+        config = tuning.tunable_config(collection_name, await self.get_collection(collection_name))
+        queries = tuning.as_matrix(sample_queries)
+        if vectors is not None:
+            truth = tuning.exact_neighbors(vectors, queries, config.distance_metric, limit)
+        else:
+            truth = []
+            for query in queries:
+                response = await self.search(collection_name, query, limit, exact=True)
+                truth.append({r.id for r in response.results})
+        
+        result = SearchTuningResult(collection=collection_name, target_recall=target_recall)
+        for ef_search in tuning.ef_candidates(limit, ef_candidates):
+            recalls, latencies = [], []
+            for query, expected in zip(queries, truth):
+                started = time.perf_counter()
+                response = await self.search(collection_name, query, limit, ef_search=ef_search)
+                latencies.append(time.perf_counter() - started)
+                recalls.append(tuning.recall([r.id for r in response.results], expected))
+            point = tuning.sweep_point(ef_search, recalls, latencies)
+            result.sweep.append(point)
+            if point.recall >= target_recall:
+                result.ef_search = ef_search
+                break
+        
+        if apply and result.ef_search is not None:
+            index_config = (config.index_config or IndexConfig()).model_copy(
+                update={"ef_search": result.ef_search}
+            )
+            await self.reindex_collection(collection_name, index_config)
+            result.applied = True
+        return result
+    
     # Server Operations
     async def get_server_stats(self) -> ServerStats:
         """Get server statistics."""
@@ -91,6 +91,11 @@ class ServerError(VectorDBError):
     pass
 
 
+class ServerOverloadedError(ServerError):
+    """Raised when the server's search queue is full; retry after backing off."""
+    pass
+
+
 class RateLimitError(VectorDBError):
     """Raised when rate limit is exceeded."""
     pass
@@ -112,7 +117,7 @@ HTTP_EXCEPTION_MAP = {
     429: RateLimitError,
     500: ServerError,
     502: ServerError,
-    503: ServerError,
+    503: ServerOverloadedError,
     504: TimeoutError,
 }
 
@@ -138,7 +143,7 @@ def create_exception_from_grpc_error(grpc_error) -> VectorDBError:
             grpc.StatusCode.INVALID_ARGUMENT: InvalidParameterError,
             grpc.StatusCode.UNAUTHENTICATED: AuthenticationError,
             grpc.StatusCode.PERMISSION_DENIED: AuthorizationError,
-            grpc.StatusCode.RESOURCE_EXHAUSTED: QuotaExceededError,
+            grpc.StatusCode.RESOURCE_EXHAUSTED: ServerOverloadedError,
             grpc.StatusCode.DEADLINE_EXCEEDED: TimeoutError,
             grpc.StatusCode.INTERNAL: ServerError,
             grpc.StatusCode.UNAVAILABLE: ConnectionError,
@@ -9,10 +9,12 @@ from ..types import (
     CollectionConfig, Vector, QueryResult, SearchRequest, SearchResponse,
     CollectionStats, ServerStats, HealthResponse, InsertResponse,
     ListCollectionsResponse, CollectionResponse, VectorData, DistanceMetric,
-    VectorType, IndexConfig
+    VectorType, IndexType, IndexConfig, Durability, search_deadline_ms,
+    server_vector_id
 )
 from ..exceptions import (
-    VectorDBError, ConnectionError, create_exception_from_grpc_error
+    VectorDBError, ConnectionError, InvalidParameterError,
+    create_exception_from_grpc_error
 )
 
 # Import generated protobuf stubs (would be generated from .proto files)
@@ -175,9 +177,19 @@ class GrpcClient:
             VectorType.FLOAT32: 1,
             VectorType.FLOAT16: 2,
             VectorType.INT8: 3,
+            VectorType.BINARY: 4,
         }
         return type_map.get(vtype, 1)  # Default to float32
     
+    def _convert_index_type(self, index_type: IndexType) -> int:
+        """Convert Python index type to protobuf enum."""
+        type_map = {
+            IndexType.HNSW: 1,
+            IndexType.IVF_PQ: 2,
+            IndexType.FLAT: 3,
+        }
+        return type_map.get(index_type, 1)  # Default to HNSW
+    
     def _make_collection_config_proto(self, config: CollectionConfig) -> vectordb_pb2.CollectionConfig:
         """Convert Python CollectionConfig to protobuf."""
         index_config = None
@@ -186,7 +198,12 @@ class GrpcClient:
                 max_connections=config.index_config.max_connections,
                 ef_construction=config.index_config.ef_construction,
                 ef_search=config.index_config.ef_search,
-                max_layer=config.index_config.max_layer
+                max_layer=config.index_config.max_layer,
+                index_type=self._convert_index_type(config.index_config.index_type),
+                nlist=config.index_config.nlist,
+                pq_subvectors=config.index_config.pq_subvectors,
+                nprobe=config.index_config.nprobe,
+                rerank=config.index_config.rerank
             )
         
         return vectordb_pb2.CollectionConfig(
@@ -194,7 +211,8 @@ class GrpcClient:
             dimension=config.dimension,
             distance_metric=self._convert_distance_metric(config.distance_metric),
             vector_type=self._convert_vector_type(config.vector_type),
-            index_config=index_config
+            index_config=index_config,
+            indexed_fields=config.indexed_fields
         )
     
     def _make_vector_proto(self, vector: Vector) -> vectordb_pb2.Vector:
@@ -204,8 +222,9 @@ class GrpcClient:
             # Convert all metadata values to strings for protobuf
             metadata = {k: str(v) for k, v in vector.metadata.items()}
         
+        # Server IDs are UUIDs derived from the user ID
         return vectordb_pb2.Vector(
-            id=vector.id,
+            id=server_vector_id(vector.id),
             data=vector.data,
             metadata=metadata
         )
@@ -278,9 +297,80 @@ class GrpcClient:
         except grpc.RpcError as e:
             raise create_exception_from_grpc_error(e)
     
+    def compact_collection(self, name: str, io_budget_mb: Optional[int] = None):
+        """Compaction is an admin operation only exposed over REST."""
+        raise InvalidParameterError(
+            "Collection compaction is not supported over gRPC; use the REST protocol"
+        )
+    
+    def reindex_collection(self, name: str, index_config: IndexConfig):
+        """Reindexing is an admin operation only exposed over REST."""
+        raise InvalidParameterError(
+            "Collection reindexing is not supported over gRPC; use the REST protocol"
+        )
+    
+    def set_alias(self, alias: str, collection: str):
+        """Alias management is an admin operation only exposed over REST."""
+        self._aliases_unsupported()
+    
+    def get_alias(self, alias: str):
+        """Alias management is an admin operation only exposed over REST."""
+        self._aliases_unsupported()
+    
+    def list_aliases(self):
+        """Alias management is an admin operation only exposed over REST."""
+        self._aliases_unsupported()
+    
+    def delete_alias(self, alias: str):
+        """Alias management is an admin operation only exposed over REST."""
+        self._aliases_unsupported()
+    
+    @staticmethod
+    def _aliases_unsupported() -> None:
+        raise InvalidParameterError(
+            "Alias management is not supported over gRPC; use the REST protocol"
+        )
+    
+    def begin_bulk_load(self, name: str):
+        """Bulk loading is an admin operation only exposed over REST."""
+        self._bulk_load_unsupported()
+    
+    def bulk_insert_vectors(self, collection_name: str, vectors: List[Vector]):
+        """Bulk loading is an admin operation only exposed over REST."""
+        self._bulk_load_unsupported()
+    
+    def finish_bulk_load(self, name: str):
+        """Bulk loading is an admin operation only exposed over REST."""
+        self._bulk_load_unsupported()
+    
+    def get_bulk_load_progress(self, name: str):
+        """Bulk loading is an admin operation only exposed over REST."""
+        self._bulk_load_unsupported()
+    
+    @staticmethod
+    def _bulk_load_unsupported() -> None:
+        raise InvalidParameterError(
+            "Bulk loading is not supported over gRPC; use the REST protocol"
+        )
+    
+    @staticmethod
+    def _check_durability(durability: Optional[Durability]) -> None:
+        """Per-request durability overrides are only supported over REST."""
+        if durability is not None:
+            raise InvalidParameterError(
+                "Per-request durability is not supported over gRPC; "
+                "set it on the collection or use the REST protocol"
+            )
+    
     # Vector Operations
-    def insert_vector(self, collection_name: str, vector: Vector) -> InsertResponse:
+    def insert_vector(
+        self,
+        collection_name: str,
+        vector: Vector,
+        durability: Optional[Durability] = None
+    ) -> InsertResponse:
         """Insert a single vector."""
+        self._check_durability(durability)
         try:
             request = vectordb_pb2.InsertRequest(
                 collection_name=collection_name,
@@ -291,14 +381,20 @@ class GrpcClient:
             
             return InsertResponse(
                 success=response.success,
-                message=response.message
+                error=None if response.success else response.message
             )
             
         except grpc.RpcError as e:
             raise create_exception_from_grpc_error(e)
     
-    def insert_vectors(self, collection_name: str, vectors: List[Vector]) -> InsertResponse:
+    def insert_vectors(
+        self,
+        collection_name: str,
+        vectors: List[Vector],
+        durability: Optional[Durability] = None
+    ) -> InsertResponse:
         """Insert multiple vectors."""
+        self._check_durability(durability)
         try:
             proto_vectors = [self._make_vector_proto(v) for v in vectors]
             request = vectordb_pb2.BatchInsertRequest(
@@ -310,26 +406,31 @@ class GrpcClient:
             
             return InsertResponse(
                 success=response.success,
-                message=response.message,
-                inserted_count=getattr(response, 'inserted_count', len(vectors))
+                error=None if response.success else response.message
             )
             
         except grpc.RpcError as e:
             raise create_exception_from_grpc_error(e)
     
-    def delete_vector(self, collection_name: str, vector_id: str) -> InsertResponse:
+    def delete_vector(
+        self,
+        collection_name: str,
+        vector_id: str,
+        durability: Optional[Durability] = None
+    ) -> InsertResponse:
         """Delete a vector by ID."""
+        self._check_durability(durability)
         try:
             request = vectordb_pb2.DeleteRequest(
                 collection_name=collection_name,
-                vector_id=vector_id
+                vector_id=server_vector_id(vector_id)
             )
             
             response = self.stub.Delete(request, timeout=self.timeout)
             
             return InsertResponse(
                 success=response.success,
-                message=response.message
+                error=None if response.success else response.message
             )
             
         except grpc.RpcError as e:
@@ -342,9 +443,19 @@ class GrpcClient:
         query_vector: VectorData,
         limit: int = 10,
         ef_search: Optional[int] = None,
-        filter: Optional[Dict[str, Any]] = None
+        filter: Optional[Dict[str, Any]] = None,
+        nprobe: Optional[int] = None,
+        oversampling: Optional[float] = None,
+        exact: bool = False,
+        deadline_ms: Optional[int] = None
     ) -> SearchResponse:
-        """Search for similar vectors."""
+        """
+        Search for similar vectors.
+        
+        `deadline_ms` bounds the server's search, after which it returns the
+        best results found and marks the response partial; by default it is
+        most of the client timeout.
+        """
         try:
             if hasattr(query_vector, 'tolist'):
                 query_vector = query_vector.tolist()
@@ -359,7 +470,11 @@ class GrpcClient:
                 query_vector=query_vector,
                 limit=limit,
                 ef_search=ef_search,
-                filter=proto_filter
+                filter=proto_filter,
+                nprobe=nprobe,
+                oversampling=oversampling,
+                exact=exact,
+                deadline_ms=search_deadline_ms(self.timeout, deadline_ms)
             )
             
             response = self.stub.Query(request, timeout=self.timeout)
@@ -369,7 +484,8 @@ class GrpcClient:
             return SearchResponse(
                 success=True,
                 results=results,
-                query_time_ms=getattr(response, 'query_time_ms', None)
+                query_time_ms=getattr(response, 'query_time_ms', None),
+                partial=getattr(response, 'partial', False)
             )
             
         except grpc.RpcError as e:
@@ -388,7 +504,9 @@ class GrpcClient:
                 total_collections=stats.total_collections,
                 memory_usage=stats.memory_usage,
                 disk_usage=stats.disk_usage,
-                uptime_seconds=stats.uptime_seconds
+                uptime_seconds=stats.uptime_seconds,
+                search_queue_depth=stats.search_queue_depth,
+                search_queue_capacity=stats.search_queue_capacity
             )
             
         except grpc.RpcError as e:
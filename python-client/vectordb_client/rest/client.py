@@ -9,8 +9,9 @@ import httpx
 
 from ..types import (
     CollectionConfig, Vector, QueryResult, SearchRequest, SearchResponse,
-    CollectionStats, ServerStats, HealthResponse, InsertResponse,
-    ListCollectionsResponse, CollectionResponse, VectorData
+    CollectionStats, CompactionStats, ServerStats, HealthResponse, InsertResponse,
+    ListCollectionsResponse, CollectionResponse, VectorData, Durability, BulkLoadProgress,
+    IndexConfig, ReindexStats, CollectionAlias, search_deadline_ms, server_vector_id
 )
 from ..exceptions import (
     VectorDBError, ConnectionError, CollectionNotFoundError, 
@@ -69,9 +70,6 @@ class RestClient:
             auth=auth,
             follow_redirects=True
         )
-        
-        # Client-side ID mapping: user_id -> (server_id, vector_data, metadata)
-        self._id_mapping: Dict[str, tuple] = {}
     
     def __enter__(self):
         """Context manager entry."""
@@ -127,6 +125,13 @@ class RestClient:
         except httpx.TimeoutException:
             raise VectorDBError("Request timed out")
     
+    @staticmethod
+    def _write_params(durability: Optional[Durability]) -> Optional[Dict[str, str]]:
+        """Query parameters carrying a per-request WAL durability override."""
+        if durability is None:
+            return None
+        return {"durability": getattr(durability, "value", durability)}
+    
     # Collection Management
     def create_collection(self, config: CollectionConfig) -> CollectionResponse:
         """Create a new vector collection."""
@@ -157,96 +162,216 @@ class RestClient:
         response_data = self._make_request("GET", f"/collections/{name}/stats")
         return CollectionStats(**response_data["data"])
     
+    def compact_collection(
+        self,
+        name: str,
+        io_budget_mb: Optional[int] = None
+    ) -> CompactionStats:
+        """
+        Compact a collection, reclaiming space held by deleted and updated vectors.
+        
+        Args:
+            name: Collection name
+            io_budget_mb: Megabytes per second the compaction may write,
+                overriding the server's budget; 0 for unthrottled
+        """
+        params = {"io_budget_mb": io_budget_mb} if io_budget_mb is not None else None
+        response_data = self._make_request(
+            "POST",
+            f"/collections/{name}/compact",
+            params=params
+        )
+        if not response_data.get("success"):
+            raise VectorDBError(response_data.get("error") or f"Failed to compact collection {name}")
+        return CompactionStats(**response_data["data"])
+    
+    def reindex_collection(self, name: str, index_config: IndexConfig) -> ReindexStats:
+        """
+        Rebuild a collection's index with new parameters.
+        
+        The server builds the new index from the stored vectors while the
+        current one keeps serving, applies writes made meanwhile to both and
+        swaps the new one in when it is done. The index type cannot change.
+        """
+        response_data = self._make_request(
+            "POST",
+            f"/collections/{name}/reindex",
+            json_data=index_config.model_dump()
+        )
+        if not response_data.get("success"):
+            raise VectorDBError(response_data.get("error") or f"Failed to reindex collection {name}")
+        return ReindexStats(**response_data["data"])
+    
+    # Aliases
+    def set_alias(self, alias: str, collection: str) -> CollectionAlias:
+        """
+        Point an alias at a collection, creating it or switching it atomically.
+        
+        The server resolves aliases on every read and write, so clients using
+        the alias move to the new collection with their next request.
+        """
+        data = self._alias_request("PUT", f"/aliases/{alias}", {"collection": collection})
+        return CollectionAlias(**data)
+    
+    def get_alias(self, alias: str) -> CollectionAlias:
+        """Get the collection an alias points at."""
+        return CollectionAlias(**self._alias_request("GET", f"/aliases/{alias}"))
+    
+    def list_aliases(self) -> List[CollectionAlias]:
+        """List all aliases."""
+        return [CollectionAlias(**a) for a in self._alias_request("GET", "/aliases")]
+    
+    def delete_alias(self, alias: str) -> None:
+        """Delete an alias; the collection it points at is kept."""
+        self._alias_request("DELETE", f"/aliases/{alias}")
+    
+    def _alias_request(
+        self,
+        method: str,
+        path: str,
+        json_data: Optional[Dict[str, Any]] = None
+    ) -> Any:
+        response_data = self._make_request(method, path, json_data=json_data)
+        if not response_data.get("success"):
+            raise VectorDBError(response_data.get("error") or f"Alias request failed: {method} {path}")
+        return response_data.get("data")
+    
+    def begin_bulk_load(self, name: str) -> BulkLoadProgress:
+        """
+        Start bulk loading a collection.
+        
+        Vectors sent with `bulk_insert_vectors` skip the WAL and the index
+        until `finish_bulk_load` builds the index over all of them at once.
+        They are neither searchable nor durable before then.
+        """
+        return self._bulk_request("POST", name)
+    
+    def bulk_insert_vectors(self, collection_name: str, vectors: List[Vector]) -> BulkLoadProgress:
+        """Add vectors to a collection's bulk load."""
+        return self._bulk_request(
+            "POST", collection_name, "/vectors", json_data=self._batch_payload(vectors)
+        )
+    
+    def finish_bulk_load(self, name: str) -> BulkLoadProgress:
+        """Write out a bulk load and build the collection's index over it."""
+        return self._bulk_request("POST", name, "/finish")
+    
+    def get_bulk_load_progress(self, name: str) -> BulkLoadProgress:
+        """Progress of a collection's current or last bulk load."""
+        return self._bulk_request("GET", name)
+    
+    def _bulk_request(
+        self,
+        method: str,
+        name: str,
+        path: str = "",
+        json_data: Optional[Dict[str, Any]] = None
+    ) -> BulkLoadProgress:
+        response_data = self._make_request(
+            method, f"/collections/{name}/bulk{path}", json_data=json_data
+        )
+        if not response_data.get("success"):
+            raise VectorDBError(response_data.get("error") or f"Bulk load request failed for {name}")
+        return BulkLoadProgress(**response_data["data"])
+    
+    @staticmethod
+    def _batch_payload(vectors: List[Vector]) -> Dict[str, Any]:
+        """Body of a batch insert: {"vectors": [{"id": ..., "data": [...]}, ...]}"""
+        vector_data = []
+        for v in vectors:
+            vec_data = {"id": server_vector_id(v.id), "data": v.data}
+            if v.metadata:
+                vec_data["metadata"] = v.metadata
+            vector_data.append(vec_data)
+        return {"vectors": vector_data}
+    
     # Vector Operations
-    def insert_vector(self, collection_name: str, vector: Vector) -> InsertResponse:
+    def insert_vector(
+        self,
+        collection_name: str,
+        vector: Vector,
+        durability: Optional[Durability] = None
+    ) -> InsertResponse:
         """Insert a single vector."""
-        # Server expects {"data": [...]} and generates its own ID
-        request_data = {"data": vector.data}
+        # Server IDs are UUIDs derived from the user ID
+        request_data = {"id": server_vector_id(vector.id), "data": vector.data}
         if vector.metadata:
             request_data["metadata"] = vector.metadata
             
         response_data = self._make_request(
             "POST",
             f"/collections/{collection_name}/vectors",
-            json_data=request_data
+            json_data=request_data,
+            params=self._write_params(durability)
         )
         
-        # Create response with the server-generated ID
+        # The server returns the stored ID in the data field
         result = InsertResponse(**response_data)
         if response_data.get("success") and response_data.get("data"):
-            # The server returns the generated ID in the data field
-            server_id = response_data["data"]
-            result.generated_id = server_id
-            
-            # Store mapping: user_id -> (server_id, vector_data, metadata)
-            self._id_mapping[vector.id] = (server_id, vector.data, vector.metadata)
+            result.generated_id = response_data["data"]
         
         return result
     
-    def insert_vectors(self, collection_name: str, vectors: List[Vector]) -> InsertResponse:
+    def insert_vectors(
+        self,
+        collection_name: str,
+        vectors: List[Vector],
+        durability: Optional[Durability] = None
+    ) -> InsertResponse:
         """Insert multiple vectors."""
-        # Server expects {"vectors": [{"data": [...]}, ...]} format
-        vector_data = []
-        for v in vectors:
-            vec_data = {"data": v.data}
-            if v.metadata:
-                vec_data["metadata"] = v.metadata
-            vector_data.append(vec_data)
-            
         response_data = self._make_request(
             "POST",
             f"/collections/{collection_name}/vectors/batch",
-            json_data={"vectors": vector_data}
+            json_data=self._batch_payload(vectors),
+            params=self._write_params(durability)
         )
         
-        # Server returns array of generated IDs in data field
+        # Server returns array of stored IDs in data field
         result = InsertResponse(**response_data)
         if response_data.get("success") and isinstance(response_data.get("data"), list):
-            server_ids = response_data["data"]
-            result.generated_id = server_ids  # Array of IDs
-            
-            # Store mappings for each vector: user_id -> (server_id, vector_data, metadata)
-            for i, vector in enumerate(vectors):
-                if i < len(server_ids):
-                    server_id = server_ids[i]
-                    self._id_mapping[vector.id] = (server_id, vector.data, vector.metadata)
+            result.generated_id = response_data["data"]  # Array of IDs
         
         return result
     
     def get_vector(self, collection_name: str, vector_id: str) -> Vector:
         """Retrieve a vector by ID."""
-        # First check if this is a user-provided ID in our mapping
-        if vector_id in self._id_mapping:
-            server_id, vector_data, metadata = self._id_mapping[vector_id]
-            return Vector(id=vector_id, data=vector_data, metadata=metadata)
-        
-        # If not in mapping, try direct server retrieval (assuming it's a server ID)
         response_data = self._make_request(
             "GET", 
-            f"/collections/{collection_name}/vectors/{vector_id}"
+            f"/collections/{collection_name}/vectors/{server_vector_id(vector_id)}"
         )
-        # Server returns data in "data" field, not "vector" field
-        if response_data.get("data"):
-            return Vector(**response_data["data"])
-        else:
-            # If server doesn't return vector data, we need to handle this case
+        # Server returns data in "data" field, null when the ID is unknown
+        vector = response_data.get("data")
+        if not vector:
             from ..exceptions import VectorNotFoundError
-            raise VectorNotFoundError(f"Vector {vector_id} not found or server doesn't return vector data")
+            raise VectorNotFoundError(f"Vector {vector_id} not found")
+        return Vector(id=vector_id, data=vector["data"], metadata=vector.get("metadata"))
     
-    def update_vector(self, collection_name: str, vector: Vector) -> InsertResponse:
+    def update_vector(
+        self,
+        collection_name: str,
+        vector: Vector,
+        durability: Optional[Durability] = None
+    ) -> InsertResponse:
         """Update an existing vector."""
         response_data = self._make_request(
             "PUT",
-            f"/collections/{collection_name}/vectors/{vector.id}",
-            json_data=vector.model_dump()
+            f"/collections/{collection_name}/vectors/{server_vector_id(vector.id)}",
+            json_data={"data": vector.data, "metadata": vector.metadata},
+            params=self._write_params(durability)
         )
         return InsertResponse(**response_data)
     
-    def delete_vector(self, collection_name: str, vector_id: str) -> InsertResponse:
+    def delete_vector(
+        self,
+        collection_name: str,
+        vector_id: str,
+        durability: Optional[Durability] = None
+    ) -> InsertResponse:
         """Delete a vector by ID."""
         response_data = self._make_request(
             "DELETE",
-            f"/collections/{collection_name}/vectors/{vector_id}"
+            f"/collections/{collection_name}/vectors/{server_vector_id(vector_id)}",
+            params=self._write_params(durability)
         )
         return InsertResponse(**response_data)
     
@@ -257,9 +382,19 @@ class RestClient:
         query_vector: VectorData,
         limit: int = 10,
         ef_search: Optional[int] = None,
-        filter: Optional[Dict[str, Any]] = None
+        filter: Optional[Dict[str, Any]] = None,
+        nprobe: Optional[int] = None,
+        oversampling: Optional[float] = None,
+        exact: bool = False,
+        deadline_ms: Optional[int] = None
     ) -> SearchResponse:
-        """Search for similar vectors."""
+        """
+        Search for similar vectors.
+        
+        `deadline_ms` bounds the server's search, after which it returns the
+        best results found and marks the response partial; by default it is
+        most of the client timeout.
+        """
         if hasattr(query_vector, 'tolist'):
             query_vector = query_vector.tolist()
         
@@ -272,6 +407,15 @@ class RestClient:
             search_data["ef_search"] = ef_search
         if filter is not None:
             search_data["filter"] = filter
+        if nprobe is not None:
+            search_data["nprobe"] = nprobe
+        if oversampling is not None:
+            search_data["oversampling"] = oversampling
+        if exact:
+            search_data["exact"] = True
+        deadline_ms = search_deadline_ms(self.timeout, deadline_ms)
+        if deadline_ms is not None:
+            search_data["deadline_ms"] = deadline_ms
         
         response_data = self._make_request(
             "POST",
@@ -284,7 +428,8 @@ class RestClient:
         return SearchResponse(
             success=response_data["success"],
             data=results,
-            error=response_data.get("error")
+            error=response_data.get("error"),
+            partial=response_data.get("partial", False)
         )
     
     # Server Operations
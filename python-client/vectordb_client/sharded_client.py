@@ -0,0 +1,579 @@
+"""
+Client-side sharding router for d-vecDB.
+
+Spreads one logical collection over several d-vecDB servers. Writes are
+partitioned by consistent hashing on the vector ID, searches are fanned out
+to every shard concurrently and the per-shard top-k lists are merged.
+"""
+
+import asyncio
+import bisect
+import hashlib
+import heapq
+from typing import List, Optional, Dict, Any, Tuple, Union
+
+from .async_client import AsyncVectorDBClient
+from .types import (
+    CollectionConfig, Vector, QueryResult, ShardedSearchResponse, ShardedInsertResponse,
+    CollectionStats, CompactionStats, InsertResponse, ListCollectionsResponse,
+    CollectionResponse, VectorData, Durability, BulkLoadPhase, BulkLoadProgress,
+    IndexConfig, ReindexStats, CollectionAlias, search_deadline_ms
+)
+from .exceptions import (
+    VectorDBError, ClientConfigurationError, TimeoutError
+)
+
+Endpoint = Union[str, Tuple[str, int]]
+
+
+class ConsistentHashRing:
+    """
+    Consistent hash ring mapping keys to shard names.
+
+    Each shard is placed on the ring many times (virtual nodes) so that keys
+    spread evenly and adding or removing a shard only moves about 1/N of them.
+    """
+
+    def __init__(self, nodes: Optional[List[str]] = None, virtual_nodes: int = 128):
+        """
+        Initialize the hash ring.
+
+        Args:
+            nodes: Initial shard names
+            virtual_nodes: Number of ring positions per shard
+        """
+        if virtual_nodes < 1:
+            raise ValueError("virtual_nodes must be at least 1")
+
+        self.virtual_nodes = virtual_nodes
+        self._ring: List[int] = []
+        self._owners: Dict[int, str] = {}
+        self._nodes: List[str] = []
+
+        for node in nodes or []:
+            self.add_node(node)
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        """Hash a key to a 64-bit ring position."""
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+        return int.from_bytes(digest, "big")
+
+    @property
+    def nodes(self) -> List[str]:
+        """Shard names currently on the ring."""
+        return list(self._nodes)
+
+    def add_node(self, node: str):
+        """Place a shard on the ring."""
+        if node in self._nodes:
+            return
+
+        self._nodes.append(node)
+        for i in range(self.virtual_nodes):
+            position = self._hash(f"{node}#{i}")
+            if position in self._owners:
+                continue  # Astronomically unlikely collision, first owner wins
+            bisect.insort(self._ring, position)
+            self._owners[position] = node
+
+    def remove_node(self, node: str):
+        """Remove a shard from the ring."""
+        if node not in self._nodes:
+            return
+
+        self._nodes.remove(node)
+        self._ring = [p for p in self._ring if self._owners[p] != node]
+        self._owners = {p: n for p, n in self._owners.items() if n != node}
+
+    def get_node(self, key: str) -> str:
+        """Get the shard owning a key."""
+        if not self._ring:
+            raise ClientConfigurationError("Hash ring has no shards")
+
+        index = bisect.bisect(self._ring, self._hash(key))
+        if index == len(self._ring):
+            index = 0
+        return self._owners[self._ring[index]]
+
+
+def merge_top_k(shard_results: List[List[QueryResult]], limit: int) -> List[QueryResult]:
+    """
+    Merge per-shard top-k lists into a global top-k list.
+
+    d-vecDB reports every metric as a distance where smaller means closer
+    (dot product is negated server-side), so the merge keeps the `limit`
+    smallest distances. Ties are broken by ID for deterministic output.
+    """
+    candidates = (result for results in shard_results for result in results)
+    return heapq.nsmallest(limit, candidates, key=lambda r: (r.distance, r.id))
+
+
+def _parse_endpoint(endpoint: Endpoint) -> Tuple[str, int]:
+    """Parse a "host:port" string or (host, port) tuple."""
+    if isinstance(endpoint, (tuple, list)):
+        host, port = endpoint
+        return str(host), int(port)
+
+    address = endpoint.split("://", 1)[-1].rstrip("/")
+    host, sep, port = address.rpartition(":")
+    if not sep or not host:
+        raise ClientConfigurationError(
+            f"Invalid shard endpoint: {endpoint}. Use 'host:port' or (host, port)"
+        )
+    return host, int(port)
+
+
+class ShardedVectorDBClient:
+    """
+    Asynchronous client that spreads a logical collection over N servers.
+
+    Every shard holds a collection with the same name and configuration.
+    Vectors are placed by consistent hashing on their ID, so single-vector
+    operations touch exactly one shard while searches touch all of them.
+    """
+
+    def __init__(
+        self,
+        endpoints: List[Endpoint],
+        ssl: bool = False,
+        timeout: float = 30.0,
+        shard_timeout: Optional[float] = None,
+        allow_partial_results: bool = True,
+        virtual_nodes: int = 128,
+        connection_pool_size: int = 10,
+        **kwargs
+    ):
+        """
+        Initialize sharded client.
+
+        Args:
+            endpoints: Shard REST endpoints as "host:port" strings or (host, port) tuples
+            ssl: Use secure connections
+            timeout: Request timeout in seconds for each shard client
+            shard_timeout: Per-shard search timeout in seconds (default: no extra limit)
+            allow_partial_results: Return merged results from the shards that answered
+                when some shards fail or time out, instead of raising
+            virtual_nodes: Ring positions per shard for consistent hashing
+            connection_pool_size: Connection pool size for each shard's HTTP client
+            **kwargs: Additional parameters passed to each AsyncVectorDBClient
+        """
+        if not endpoints:
+            raise ClientConfigurationError("At least one shard endpoint is required")
+
+        self.ssl = ssl
+        self.timeout = timeout
+        self.shard_timeout = shard_timeout
+        self.allow_partial_results = allow_partial_results
+
+        self._shards: Dict[str, AsyncVectorDBClient] = {}
+        for endpoint in endpoints:
+            host, port = _parse_endpoint(endpoint)
+            name = f"{host}:{port}"
+            if name in self._shards:
+                raise ClientConfigurationError(f"Duplicate shard endpoint: {name}")
+            self._shards[name] = AsyncVectorDBClient(
+                host=host,
+                port=port,
+                protocol="rest",
+                ssl=ssl,
+                timeout=timeout,
+                connection_pool_size=connection_pool_size,
+                **kwargs
+            )
+
+        self.ring = ConsistentHashRing(list(self._shards), virtual_nodes=virtual_nodes)
+
+    async def __aenter__(self):
+        """Async context manager entry."""
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        await self.close()
+
+    async def connect(self):
+        """Connect to every shard."""
+        await asyncio.gather(*(shard.connect() for shard in self._shards.values()))
+
+    async def close(self):
+        """Close all shard connections."""
+        await asyncio.gather(
+            *(shard.close() for shard in self._shards.values()),
+            return_exceptions=True
+        )
+
+    @property
+    def shards(self) -> List[str]:
+        """Names ("host:port") of all shards."""
+        return list(self._shards)
+
+    def shard_for(self, vector_id: str) -> str:
+        """Get the name of the shard owning a vector ID."""
+        return self.ring.get_node(vector_id)
+
+    def _client_for(self, vector_id: str) -> AsyncVectorDBClient:
+        return self._shards[self.shard_for(vector_id)]
+
+    async def _broadcast(self, method: str, *args) -> Dict[str, Any]:
+        """Call a method on every shard, raising the first failure."""
+        names = list(self._shards)
+        results = await asyncio.gather(
+            *(getattr(self._shards[name], method)(*args) for name in names),
+            return_exceptions=True
+        )
+
+        failed = {name: r for name, r in zip(names, results) if isinstance(r, BaseException)}
+        if failed:
+            name, error = next(iter(failed.items()))
+            raise VectorDBError(
+                f"{method} failed on {len(failed)} of {len(names)} shards: {error}",
+                details={"failed_shards": list(failed)}
+            ) from error
+
+        return dict(zip(names, results))
+
+    # Collection Management
+    async def create_collection(self, config: CollectionConfig) -> CollectionResponse:
+        """Create the collection on every shard."""
+        responses = await self._broadcast("create_collection", config)
+        errors = [r.error for r in responses.values() if not r.success and r.error]
+        return CollectionResponse(
+            success=all(r.success for r in responses.values()),
+            error="; ".join(errors) or None
+        )
+
+    async def delete_collection(self, name: str) -> CollectionResponse:
+        """Delete the collection from every shard."""
+        responses = await self._broadcast("delete_collection", name)
+        errors = [r.error for r in responses.values() if not r.success and r.error]
+        return CollectionResponse(
+            success=all(r.success for r in responses.values()),
+            error="; ".join(errors) or None
+        )
+
+    async def list_collections(self) -> ListCollectionsResponse:
+        """List collections present on any shard."""
+        responses = await self._broadcast("list_collections")
+        names = set()
+        for response in responses.values():
+            names.update(response.collections)
+        return ListCollectionsResponse(success=True, data=sorted(names))
+
+    async def get_collection_stats(self, name: str) -> CollectionStats:
+        """Get collection statistics summed over all shards."""
+        stats = list((await self._broadcast("get_collection_stats", name)).values())
+        return CollectionStats(
+            name=name,
+            vector_count=sum(s.vector_count for s in stats),
+            dimension=stats[0].dimension,
+            index_size=sum(s.index_size for s in stats),
+            memory_usage=sum(s.memory_usage for s in stats),
+        )
+
+    async def compact_collection(
+        self,
+        name: str,
+        io_budget_mb: Optional[int] = None
+    ) -> CompactionStats:
+        """Compact the collection on every shard, summing what was reclaimed."""
+        stats = list((await self._broadcast("compact_collection", name, io_budget_mb)).values())
+        return CompactionStats(
+            collection=name,
+            live_vectors=sum(s.live_vectors for s in stats),
+            bytes_before=sum(s.bytes_before for s in stats),
+            bytes_after=sum(s.bytes_after for s in stats),
+            bytes_reclaimed=sum(s.bytes_reclaimed for s in stats),
+            duration_ms=max(s.duration_ms for s in stats),
+        )
+
+    async def reindex_collection(self, name: str, index_config: IndexConfig) -> ReindexStats:
+        """Rebuild the collection's index on every shard, summing the counts."""
+        stats = list((await self._broadcast("reindex_collection", name, index_config)).values())
+        return ReindexStats(
+            collection=name,
+            vectors_indexed=sum(s.vectors_indexed for s in stats),
+            concurrent_writes=sum(s.concurrent_writes for s in stats),
+            duration_ms=max(s.duration_ms for s in stats),
+        )
+
+    # Aliases
+    async def set_alias(self, alias: str, collection: str) -> CollectionAlias:
+        """
+        Point the alias at the collection on every shard.
+        
+        Each shard switches atomically, but not all at the same instant;
+        `get_alias` reports an error until every shard agrees.
+        """
+        return self._merge_alias(alias, await self._broadcast("set_alias", alias, collection))
+
+    async def get_alias(self, alias: str) -> CollectionAlias:
+        """Get the collection the alias points at on every shard."""
+        return self._merge_alias(alias, await self._broadcast("get_alias", alias))
+
+    async def list_aliases(self) -> List[CollectionAlias]:
+        """List aliases present on any shard."""
+        by_alias: Dict[str, Dict[str, CollectionAlias]] = {}
+        for name, aliases in (await self._broadcast("list_aliases")).items():
+            for alias in aliases:
+                by_alias.setdefault(alias.alias, {})[name] = alias
+        return [self._merge_alias(alias, shards) for alias, shards in sorted(by_alias.items())]
+
+    async def delete_alias(self, alias: str) -> None:
+        """Delete the alias from every shard."""
+        await self._broadcast("delete_alias", alias)
+
+    @staticmethod
+    def _merge_alias(alias: str, per_shard: Dict[str, CollectionAlias]) -> CollectionAlias:
+        """Combine per-shard views of an alias, which must agree on its target."""
+        targets = {a.collection for a in per_shard.values()}
+        if len(targets) > 1:
+            raise VectorDBError(
+                f"Alias {alias} points at different collections across shards: {sorted(targets)}",
+                details={"shards": {name: a.collection for name, a in per_shard.items()}}
+            )
+        return CollectionAlias(
+            alias=alias,
+            collection=targets.pop(),
+            version=max(a.version for a in per_shard.values()),
+        )
+
+    async def begin_bulk_load(self, name: str) -> BulkLoadProgress:
+        """Start a bulk load of the collection on every shard."""
+        return self._merge_bulk_progress(name, await self._broadcast("begin_bulk_load", name))
+
+    async def bulk_insert_vectors(self, collection_name: str, vectors: List[Vector]) -> BulkLoadProgress:
+        """
+        Add vectors to the bulk load of their owning shards.
+
+        The returned progress covers the shards that received vectors.
+        """
+        batches: Dict[str, List[Vector]] = {}
+        for vector in vectors:
+            batches.setdefault(self.shard_for(vector.id), []).append(vector)
+
+        names = list(batches)
+        responses = await asyncio.gather(*(
+            self._shards[name].bulk_insert_vectors(collection_name, batches[name])
+            for name in names
+        ))
+        return self._merge_bulk_progress(collection_name, dict(zip(names, responses)))
+
+    async def finish_bulk_load(self, name: str) -> BulkLoadProgress:
+        """Finish the bulk load on every shard, building their indexes concurrently."""
+        return self._merge_bulk_progress(name, await self._broadcast("finish_bulk_load", name))
+
+    async def get_bulk_load_progress(self, name: str) -> BulkLoadProgress:
+        """Bulk load progress summed over all shards."""
+        return self._merge_bulk_progress(name, await self._broadcast("get_bulk_load_progress", name))
+
+    @staticmethod
+    def _merge_bulk_progress(name: str, progress: Dict[str, BulkLoadProgress]) -> BulkLoadProgress:
+        """Combine per-shard progress; the shard furthest behind sets the phase."""
+        stats = list(progress.values())
+        phases = list(BulkLoadPhase)
+        return BulkLoadProgress(
+            collection=name,
+            phase=min((s.phase for s in stats), key=phases.index),
+            vectors_loaded=sum(s.vectors_loaded for s in stats),
+            vectors_indexed=sum(s.vectors_indexed for s in stats),
+            elapsed_ms=max(s.elapsed_ms for s in stats),
+        )
+
+    # Vector Operations
+    async def insert_vector(
+        self,
+        collection_name: str,
+        vector: Vector,
+        durability: Optional[Durability] = None
+    ) -> InsertResponse:
+        """Insert a single vector on its owning shard."""
+        return await self._client_for(vector.id).insert_vector(
+            collection_name, vector, durability=durability
+        )
+
+    async def insert_vectors(
+        self,
+        collection_name: str,
+        vectors: List[Vector],
+        durability: Optional[Durability] = None
+    ) -> ShardedInsertResponse:
+        """
+        Insert multiple vectors, sending one batch per shard concurrently.
+
+        A shard failing does not stop the others. The response then has
+        success=False, lists the IDs each failed shard did not store in
+        failed_shards, and keeps None in their generated_id positions.
+        Raises if every shard failed.
+        """
+        batches: Dict[str, List[int]] = {}
+        for i, vector in enumerate(vectors):
+            batches.setdefault(self.shard_for(vector.id), []).append(i)
+
+        names = list(batches)
+        responses = await asyncio.gather(*(
+            self._shards[name].insert_vectors(
+                collection_name, [vectors[i] for i in batches[name]],
+                durability=durability
+            )
+            for name in names
+        ), return_exceptions=True)
+
+        # Reassemble generated IDs in the caller's order
+        generated_ids: List[Optional[str]] = [None] * len(vectors)
+        failures: Dict[str, BaseException] = {}
+        for name, response in zip(names, responses):
+            if isinstance(response, BaseException):
+                failures[name] = response
+            elif not response.success:
+                failures[name] = VectorDBError(response.error or f"Insert failed on shard {name}")
+            else:
+                for i, server_id in zip(batches[name], response.vector_ids):
+                    generated_ids[i] = server_id
+
+        failed_ids = {name: [vectors[i].id for i in batches[name]] for name in failures}
+        if failures and len(failures) == len(names):
+            name, error = next(iter(failures.items()))
+            raise VectorDBError(
+                f"Insert failed on all {len(names)} shards: {error}",
+                details={"failed_shards": failed_ids}
+            ) from error
+
+        return ShardedInsertResponse(
+            success=not failures,
+            error="; ".join(f"{name}: {error}" for name, error in failures.items()) or None,
+            generated_id=generated_ids,
+            failed_shards=failed_ids
+        )
+
+    async def get_vector(self, collection_name: str, vector_id: str) -> Vector:
+        """Retrieve a vector from its owning shard."""
+        return await self._client_for(vector_id).get_vector(collection_name, vector_id)
+
+    async def update_vector(
+        self,
+        collection_name: str,
+        vector: Vector,
+        durability: Optional[Durability] = None
+    ) -> InsertResponse:
+        """Update a vector on its owning shard."""
+        return await self._client_for(vector.id).update_vector(
+            collection_name, vector, durability=durability
+        )
+
+    async def delete_vector(
+        self,
+        collection_name: str,
+        vector_id: str,
+        durability: Optional[Durability] = None
+    ) -> InsertResponse:
+        """Delete a vector from its owning shard."""
+        return await self._client_for(vector_id).delete_vector(
+            collection_name, vector_id, durability=durability
+        )
+
+    # Search Operations
+    async def search(
+        self,
+        collection_name: str,
+        query_vector: VectorData,
+        limit: int = 10,
+        ef_search: Optional[int] = None,
+        filter: Optional[Dict[str, Any]] = None,
+        shard_timeout: Optional[float] = None,
+        nprobe: Optional[int] = None,
+        oversampling: Optional[float] = None,
+        exact: bool = False,
+        deadline_ms: Optional[int] = None
+    ) -> ShardedSearchResponse:
+        """
+        Search all shards concurrently and merge their top-k results.
+
+        Args:
+            collection_name: Logical collection to search
+            query_vector: Query vector
+            limit: Number of results to return
+            ef_search: HNSW search width on each shard
+            filter: Metadata filter applied on each shard
+            shard_timeout: Per-shard timeout in seconds (overrides the client default)
+            nprobe: IVF-PQ clusters scanned on each shard
+            oversampling: Candidates per result rescored on each shard
+            exact: Scan every vector on each shard instead of searching its index
+            deadline_ms: Search deadline on each shard; by default most of the
+                shard timeout, or of each shard client's timeout without one
+
+        Returns:
+            Merged response; `partial` is set when a shard's deadline cut its
+            search short, and `failed_shards` lists the shards that errored or
+            timed out when partial results are allowed.
+        """
+        if hasattr(query_vector, 'tolist'):
+            query_vector = query_vector.tolist()
+
+        timeout = shard_timeout if shard_timeout is not None else self.shard_timeout
+        if timeout is not None:
+            deadline_ms = search_deadline_ms(timeout, deadline_ms)
+
+        async def search_shard(client: AsyncVectorDBClient):
+            call = client.search(
+                collection_name, query_vector, limit, ef_search, filter, nprobe, oversampling, exact,
+                deadline_ms
+            )
+            if timeout is None:
+                return await call
+            return await asyncio.wait_for(call, timeout)
+
+        names = list(self._shards)
+        responses = await asyncio.gather(
+            *(search_shard(self._shards[name]) for name in names),
+            return_exceptions=True
+        )
+
+        shard_results = []
+        cut_short = False
+        failures: Dict[str, BaseException] = {}
+        for name, response in zip(names, responses):
+            if isinstance(response, asyncio.TimeoutError):
+                failures[name] = TimeoutError(f"Shard {name} timed out after {timeout}s")
+            elif isinstance(response, BaseException):
+                failures[name] = response
+            elif not response.success:
+                failures[name] = VectorDBError(response.error or f"Search failed on shard {name}")
+            else:
+                shard_results.append(response.results)
+                cut_short = cut_short or response.partial
+
+        if failures and (not shard_results or not self.allow_partial_results):
+            name, error = next(iter(failures.items()))
+            raise VectorDBError(
+                f"Search failed on {len(failures)} of {len(names)} shards: {error}",
+                details={"failed_shards": list(failures)}
+            ) from error
+
+        return ShardedSearchResponse(
+            success=True,
+            data=merge_top_k(shard_results, limit),
+            partial=bool(failures) or cut_short,
+            failed_shards=list(failures)
+        )
+
+    async def search_simple(
+        self,
+        collection_name: str,
+        query_vector: VectorData,
+        limit: int = 10
+    ) -> List[QueryResult]:
+        """Simple sharded search returning just results."""
+        response = await self.search(collection_name, query_vector, limit)
+        return response.results
+
+    # Server Operations
+    async def ping(self) -> Dict[str, bool]:
+        """Check which shards are reachable."""
+        names = list(self._shards)
+        results = await asyncio.gather(
+            *(self._shards[name].ping() for name in names),
+            return_exceptions=True
+        )
+        return {name: result is True for name, result in zip(names, results)}
@@ -0,0 +1,89 @@
+"""
+Helpers for tuning a collection's search parameters against a recall target.
+
+Ground truth comes from a NumPy brute-force scan over the collection's
+vectors, or from the server's exact search when the vectors are not at hand.
+"""
+
+from typing import List, Optional, Sequence, Set
+
+import numpy as np
+
+from .types import (
+    CollectionConfig, CollectionResponse, DistanceMetric, IndexType, SearchTuningPoint,
+    Vector, VectorData, server_vector_id
+)
+from .exceptions import InvalidParameterError
+
+# ef_search values tried, cheapest first
+DEFAULT_EF_CANDIDATES = (16, 24, 32, 48, 64, 96, 128, 192, 256, 384, 512)
+
+
+def tunable_config(name: str, response: CollectionResponse) -> CollectionConfig:
+    """Config of a collection whose ef_search can be tuned."""
+    if not response.success or not response.data:
+        raise InvalidParameterError(
+            f"Collection {name} config is unavailable; tuning needs the REST protocol"
+        )
+    config = CollectionConfig(**response.data[0])
+    index_type = config.index_config.index_type if config.index_config else IndexType.HNSW
+    if index_type != IndexType.HNSW:
+        raise InvalidParameterError(
+            f"Collection {name} uses a {index_type.value} index; only HNSW searches use ef_search"
+        )
+    return config
+
+
+def ef_candidates(limit: int, candidates: Optional[Sequence[int]] = None) -> List[int]:
+    """ef_search values to sweep; the server never searches with ef below the limit."""
+    return sorted({max(ef, limit) for ef in (candidates or DEFAULT_EF_CANDIDATES)})
+
+
+def as_matrix(vectors: Sequence[VectorData]) -> np.ndarray:
+    """Stack vectors into a float32 matrix, one per row."""
+    return np.asarray([np.asarray(v, dtype=np.float32) for v in vectors], dtype=np.float32)
+
+
+def exact_neighbors(
+    vectors: Sequence[Vector],
+    queries: np.ndarray,
+    metric: DistanceMetric,
+    limit: int
+) -> List[Set[str]]:
+    """Server IDs of each query's true nearest neighbors, by brute force."""
+    ids = np.asarray([server_vector_id(v.id) for v in vectors])
+    data = as_matrix([v.data for v in vectors])
+    k = min(limit, len(ids))
+
+    truth = []
+    for query in queries:
+        if metric == DistanceMetric.EUCLIDEAN:
+            distances = ((data - query) ** 2).sum(axis=1)
+        elif metric == DistanceMetric.MANHATTAN:
+            distances = np.abs(data - query).sum(axis=1)
+        elif metric == DistanceMetric.DOT_PRODUCT:
+            distances = -(data @ query)
+        else:
+            norms = np.linalg.norm(data, axis=1) * np.linalg.norm(query)
+            distances = 1.0 - (data @ query) / np.maximum(norms, 1e-12)
+        nearest = np.argpartition(distances, k - 1)[:k] if k < len(ids) else np.arange(len(ids))
+        truth.append(set(ids[nearest].tolist()))
+    return truth
+
+
+def recall(found: Sequence[str], truth: Set[str]) -> float:
+    """Fraction of the true neighbors a search returned."""
+    if not truth:
+        return 1.0
+    return len(truth.intersection(found)) / len(truth)
+
+
+def sweep_point(ef_search: int, recalls: List[float], latencies: List[float]) -> SearchTuningPoint:
+    """Summarize one ef_search setting's searches; latencies are in seconds."""
+    latency_ms = np.asarray(latencies) * 1000.0
+    return SearchTuningPoint(
+        ef_search=ef_search,
+        recall=float(np.mean(recalls)),
+        mean_latency_ms=float(latency_ms.mean()),
+        p95_latency_ms=float(np.percentile(latency_ms, 95)),
+    )
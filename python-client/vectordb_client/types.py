@@ -2,6 +2,7 @@
 Type definitions for d-vecDB Python client.
 """
 
+import uuid
 from enum import Enum
 from typing import Dict, List, Optional, Any, Union
 from pydantic import BaseModel, Field, ConfigDict
@@ -21,16 +22,49 @@ class VectorType(str, Enum):
     FLOAT32 = "Float32"
     FLOAT16 = "Float16"
     INT8 = "Int8"
+    BINARY = "Binary"
+
+
+class IndexType(str, Enum):
+    """Supported index structures."""
+    HNSW = "Hnsw"
+    IVF_PQ = "IvfPq"
+    FLAT = "Flat"
+
+
+class DurabilityMode(str, Enum):
+    """WAL durability modes, from safest to fastest."""
+    FSYNC_EACH = "fsync-each"
+    GROUP = "group"
+    NONE = "none"
+
+    @staticmethod
+    def interval_ms(ms: int) -> str:
+        """Durability value that fsyncs the WAL at most every `ms` milliseconds."""
+        if ms <= 0:
+            raise ValueError("interval must be positive")
+        return f"interval-ms:{ms}"
+
+
+Durability = Union[DurabilityMode, str]
 
 
 class IndexConfig(BaseModel):
-    """Configuration for HNSW index parameters."""
+    """Configuration for index parameters."""
     model_config = ConfigDict(extra="forbid")
     
+    index_type: IndexType = IndexType.HNSW
+    # HNSW
     max_connections: int = Field(default=16, ge=2, le=512)
     ef_construction: int = Field(default=200, ge=16, le=2000)
     ef_search: int = Field(default=50, ge=1, le=1000)
     max_layer: int = Field(default=16, ge=1, le=32)
+    # IVF-PQ: clusters, bytes per vector (0 = dimension / 8), clusters scanned
+    # per query, and whether results are rescored against stored vectors
+    nlist: int = Field(default=256, ge=1)
+    pq_subvectors: int = Field(default=0, ge=0)
+    nprobe: int = Field(default=8, ge=1)
+    rerank: bool = True
 
 
 class CollectionConfig(BaseModel):
@@ -42,6 +76,45 @@ class CollectionConfig(BaseModel):
     distance_metric: DistanceMetric = DistanceMetric.COSINE
     vector_type: VectorType = VectorType.FLOAT32
     index_config: Optional[IndexConfig] = None
+    durability: Optional[str] = None
+    # Metadata fields with a payload index, so filters on them stay fast
+    indexed_fields: List[str] = Field(default_factory=list)
+
+
+# Namespace for deriving server-side UUIDs from user vector IDs
+VECTOR_ID_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "d-vecdb:vector-id")
+
+
+def server_vector_id(vector_id: str) -> str:
+    """
+    Map a user vector ID to the UUID the server stores it under.
+    
+    UUIDs are used as-is; other IDs map to a name-based UUID, so every
+    client process finds the same vector without shared state.
+    """
+    try:
+        return str(uuid.UUID(vector_id))
+    except ValueError:
+        return str(uuid.uuid5(VECTOR_ID_NAMESPACE, vector_id))
+
+
+# Share of a request timeout a search may spend on the server; the rest
+# covers the network and decoding the response
+SEARCH_DEADLINE_SHARE = 0.8
+
+
+def search_deadline_ms(timeout: Optional[float], deadline_ms: Optional[int] = None) -> Optional[int]:
+    """
+    Server-side search deadline for a request with the given timeout.
+    
+    An explicit deadline wins; otherwise the server gets most of the
+    timeout, so a slow search comes back partial instead of timing out.
+    """
+    if deadline_ms is not None:
+        return deadline_ms
+    if timeout is None:
+        return None
+    return max(1, int(timeout * 1000 * SEARCH_DEADLINE_SHARE))
 
 
 class Vector(BaseModel):
@@ -88,6 +161,13 @@ class SearchRequest(BaseModel):
     limit: int = Field(default=10, ge=1, le=10000)
     ef_search: Optional[int] = Field(default=None, ge=1, le=1000)
     filter: Optional[Dict[str, Any]] = None
+    nprobe: Optional[int] = Field(default=None, ge=1)
+    # Candidates per result rescored exactly from a compressed collection
+    oversampling: Optional[float] = Field(default=None, ge=1.0, le=100.0)
+    # Scan every vector instead of searching the index
+    exact: bool = False
+    # Milliseconds the server may search before returning the best results so far
+    deadline_ms: Optional[int] = Field(default=None, ge=0)
     
     @classmethod
     def from_numpy(
@@ -95,7 +175,10 @@ class SearchRequest(BaseModel):
         query_vector: np.ndarray,
         limit: int = 10,
         ef_search: Optional[int] = None,
-        filter: Optional[Dict[str, Any]] = None
+        filter: Optional[Dict[str, Any]] = None,
+        nprobe: Optional[int] = None,
+        oversampling: Optional[float] = None,
+        exact: bool = False
     ) -> "SearchRequest":
         """Create a SearchRequest from a numpy array."""
         if not isinstance(query_vector, np.ndarray):
@@ -106,7 +189,10 @@ class SearchRequest(BaseModel):
             query_vector=query_vector.tolist(),
             limit=limit,
             ef_search=ef_search,
-            filter=filter
+            filter=filter,
+            nprobe=nprobe,
+            oversampling=oversampling,
+            exact=exact
         )
 
 
@@ -142,6 +228,81 @@ class CollectionStats(BaseModel):
     memory_usage: int = Field(ge=0)
 
 
+class CompactionStats(BaseModel):
+    """Outcome of compacting a collection."""
+    model_config = ConfigDict(extra="forbid")
+    
+    collection: str
+    live_vectors: int = Field(ge=0)
+    bytes_before: int = Field(ge=0)
+    bytes_after: int = Field(ge=0)
+    bytes_reclaimed: int = Field(ge=0)
+    duration_ms: int = Field(ge=0)
+
+
+class ReindexStats(BaseModel):
+    """Outcome of rebuilding a collection's index with new parameters."""
+    model_config = ConfigDict(extra="forbid")
+    
+    collection: str
+    vectors_indexed: int = Field(ge=0)
+    # Vectors written or deleted while the new index was being built
+    concurrent_writes: int = Field(ge=0)
+    duration_ms: int = Field(ge=0)
+
+
+class SearchTuningPoint(BaseModel):
+    """Recall and latency measured at one ef_search setting."""
+    model_config = ConfigDict(extra="forbid")
+    
+    ef_search: int = Field(ge=1)
+    recall: float = Field(ge=0.0, le=1.0)
+    mean_latency_ms: float = Field(ge=0.0)
+    p95_latency_ms: float = Field(ge=0.0)
+
+
+class SearchTuningResult(BaseModel):
+    """Outcome of tuning a collection's ef_search to a recall target."""
+    model_config = ConfigDict(extra="forbid")
+    
+    collection: str
+    target_recall: float = Field(gt=0.0, le=1.0)
+    # Cheapest setting meeting the target; None if no setting swept did
+    ef_search: Optional[int] = None
+    # Whether ef_search was stored as the collection's search default
+    applied: bool = False
+    sweep: List[SearchTuningPoint] = Field(default_factory=list)
+
+
+class CollectionAlias(BaseModel):
+    """A name that resolves to a collection on the server."""
+    model_config = ConfigDict(extra="forbid")
+    
+    alias: str
+    collection: str
+    # Changes whenever the alias is switched; anything cached under the
+    # alias with an older version is stale
+    version: int = Field(ge=0)
+
+
+class BulkLoadPhase(str, Enum):
+    """Stages of a collection's bulk load."""
+    LOADING = "Loading"
+    BUILDING = "Building"
+    DONE = "Done"
+
+
+class BulkLoadProgress(BaseModel):
+    """Where a collection's bulk load stands."""
+    model_config = ConfigDict(extra="forbid")
+    
+    collection: str
+    phase: BulkLoadPhase
+    vectors_loaded: int = Field(ge=0)
+    vectors_indexed: int = Field(ge=0)
+    elapsed_ms: int = Field(ge=0)
+
+
 class ServerStats(BaseModel):
     """Statistics for the vector database server."""
     model_config = ConfigDict(extra="forbid")
@@ -151,6 +312,10 @@ class ServerStats(BaseModel):
     memory_usage: int = Field(ge=0)
     disk_usage: int = Field(ge=0)
     uptime_seconds: int = Field(ge=0)
+    # Searches waiting for a server worker; near capacity means queries
+    # are about to be rejected as overloaded
+    search_queue_depth: int = Field(default=0, ge=0)
+    search_queue_capacity: int = Field(default=0, ge=0)
 
 
 class HealthResponse(BaseModel):
@@ -189,6 +354,8 @@ class SearchResponse(BaseModel):
     success: bool
     data: List[QueryResult] = Field(default_factory=list)
     error: Optional[str] = None
+    # True when the search deadline cut the search short
+    partial: bool = False
     
     @property
     def results(self) -> List[QueryResult]:
@@ -196,6 +363,13 @@ class SearchResponse(BaseModel):
         return self.data
 
 
+class ShardedSearchResponse(SearchResponse):
+    """Response from a search fanned out over several shards."""
+
+    # Also true when some shards failed or timed out
+    failed_shards: List[str] = Field(default_factory=list)
+
+
 class InsertResponse(BaseModel):
     """Response from vector insert operation."""
     model_config = ConfigDict(extra="forbid")
@@ -227,6 +401,20 @@ class InsertResponse(BaseModel):
         return len(self.vector_ids)
 
 
+class ShardedInsertResponse(InsertResponse):
+    """Response from a batch insert spread over several shards."""
+    
+    # One ID per input vector, in input order; None where its shard failed
+    generated_id: Optional[List[Optional[str]]] = None
+    # IDs of the vectors each failed shard did not store, by shard name
+    failed_shards: Dict[str, List[str]] = Field(default_factory=dict)
+    
+    @property
+    def inserted_count(self) -> int:
+        """Get the number of vectors that were inserted."""
+        return sum(1 for i in self.vector_ids if i is not None)
+
+
 class CollectionResponse(BaseModel):
     """Response from collection operations."""
     model_config = ConfigDict(extra="forbid")
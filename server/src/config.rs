@@ -1,4 +1,5 @@
 use serde::{Deserialize, Serialize};
+use vectordb_common::types::DurabilityMode;
 use std::path::PathBuf;
 
 /// Server configuration
@@ -33,6 +34,61 @@ pub struct ServerConfig {
     
     /// Enable CORS for REST API
     pub enable_cors: bool,
+    
+    /// Seconds between index snapshots and storage checkpoints (0 disables them)
+    #[serde(default = "default_snapshot_interval_secs")]
+    pub snapshot_interval_secs: u64,
+    
+    /// Default WAL durability for collections that don't set their own
+    #[serde(default)]
+    pub wal_durability: DurabilityMode,
+    
+    /// Seconds between checks for collections worth compacting (0 disables them)
+    #[serde(default = "default_compaction_interval_secs")]
+    pub compaction_interval_secs: u64,
+    
+    /// Share of a data file held by deleted or overwritten vectors that
+    /// triggers background compaction
+    #[serde(default = "default_compaction_min_garbage_ratio")]
+    pub compaction_min_garbage_ratio: f64,
+    
+    /// Megabytes per second compaction may write (0 for unthrottled)
+    #[serde(default = "default_compaction_io_budget_mb")]
+    pub compaction_io_budget_mb: u64,
+    
+    /// Worker threads for searches and index builds (0 for one per core)
+    #[serde(default)]
+    pub search_threads: usize,
+    
+    /// Searches and index builds that may wait for a worker before new
+    /// searches are rejected as overloaded
+    #[serde(default = "default_search_queue_size")]
+    pub search_queue_size: usize,
+    
+    /// Recent query results cached per collection and served until the
+    /// collection is next written to (0 disables the cache)
+    #[serde(default)]
+    pub query_cache_entries: usize,
+}
+
+fn default_snapshot_interval_secs() -> u64 {
+    300
+}
+
+fn default_compaction_interval_secs() -> u64 {
+    600
+}
+
+fn default_compaction_min_garbage_ratio() -> f64 {
+    0.5
+}
+
+fn default_compaction_io_budget_mb() -> u64 {
+    64
+}
+
+fn default_search_queue_size() -> usize {
+    1024
 }
 
 impl Default for ServerConfig {
@@ -48,6 +104,14 @@ impl Default for ServerConfig {
             enable_logging: true,
             log_level: "info".to_string(),
             enable_cors: true,
+            snapshot_interval_secs: default_snapshot_interval_secs(),
+            wal_durability: DurabilityMode::default(),
+            compaction_interval_secs: default_compaction_interval_secs(),
+            compaction_min_garbage_ratio: default_compaction_min_garbage_ratio(),
+            compaction_io_budget_mb: default_compaction_io_budget_mb(),
+            search_threads: 0,
+            search_queue_size: default_search_queue_size(),
+            query_cache_entries: 0,
         }
     }
 }
@@ -81,6 +145,10 @@ impl ServerConfig {
             return Err(anyhow::anyhow!("request_timeout must be greater than 0"));
         }
         
+        if !(0.0..=1.0).contains(&self.compaction_min_garbage_ratio) {
+            return Err(anyhow::anyhow!("compaction_min_garbage_ratio must be between 0 and 1"));
+        }
+        
         // Validate log level
         match self.log_level.to_lowercase().as_str() {
             "trace" | "debug" | "info" | "warn" | "error" => {}
@@ -11,7 +11,7 @@ use vectordb_vectorstore::VectorStore;
 use std::sync::Arc;
 use std::collections::HashMap;
 use tonic::{Request, Response, Status};
-use tracing::{info, error, instrument};
+use tracing::{info, warn, error, instrument};
 use uuid::Uuid;
 use std::net::SocketAddr;
 
@@ -44,14 +44,9 @@ impl VectorDb for VectorDbService {
             dimension: config.dimension as usize,
             distance_metric: config.distance_metric().into(),
             vector_type: config.vector_type().into(),
-            index_config: config.index_config.map_or(vectordb_common::types::IndexConfig::default(), |ic| {
-                vectordb_common::types::IndexConfig {
-                    max_connections: ic.max_connections as usize,
-                    ef_construction: ic.ef_construction as usize,
-                    ef_search: ic.ef_search as usize,
-                    max_layer: ic.max_layer as usize,
-                }
-            }),
+            index_config: config.index_config.map_or(vectordb_common::types::IndexConfig::default(), Into::into),
+            durability: None,
+            indexed_fields: config.indexed_fields,
         };
         
         match self.store.create_collection(&collection_config).await {
@@ -133,12 +128,8 @@ impl VectorDb for VectorDbService {
             dimension: config.dimension as u32,
             distance_metric: config.distance_metric.into(),
             vector_type: config.vector_type.into(),
-            index_config: Some(vectordb_proto::IndexConfig {
-                max_connections: config.index_config.max_connections as u32,
-                ef_construction: config.index_config.ef_construction as u32,
-                ef_search: config.index_config.ef_search as u32,
-                max_layer: config.index_config.max_layer as u32,
-            }),
+            index_config: Some(config.index_config.into()),
+            indexed_fields: config.indexed_fields,
         };
         
         let proto_stats = vectordb_proto::CollectionStats {
@@ -313,14 +304,18 @@ impl VectorDb for VectorDbService {
             vector: req.query_vector,
             limit: req.limit as usize,
             ef_search: req.ef_search.map(|ef| ef as usize),
+            nprobe: req.nprobe.map(|nprobe| nprobe as usize),
+            oversampling: req.oversampling,
+            exact: req.exact,
             filter,
+            deadline_ms: req.deadline_ms,
         };
         
-        match self.store.query(&query_request).await {
-            Ok(results) => {
+        match self.store.query_with_deadline(&query_request).await {
+            Ok(outcome) => {
                 let query_time_ms = start_time.elapsed().as_millis() as u64;
                 
-                let proto_results: Vec<QueryResult> = results
+                let proto_results: Vec<QueryResult> = outcome.results
                     .into_iter()
                     .map(|r| QueryResult {
                         id: r.id.to_string(),
@@ -336,8 +331,13 @@ impl VectorDb for VectorDbService {
                 Ok(Response::new(QueryResponse {
                     results: proto_results,
                     query_time_ms,
+                    partial: outcome.partial,
                 }))
             }
+            Err(e @ vectordb_common::VectorDbError::Overloaded { .. }) => {
+                warn!("Rejected query: {}", e);
+                Err(Status::resource_exhausted(e.to_string()))
+            }
             Err(e) => {
                 error!("Failed to query vectors: {}", e);
                 Err(Status::internal(e.to_string()))
@@ -407,6 +407,8 @@ impl VectorDb for VectorDbService {
                     memory_usage: stats.memory_usage,
                     disk_usage: stats.disk_usage,
                     uptime_seconds: stats.uptime_seconds,
+                    search_queue_depth: stats.search_queue_depth,
+                    search_queue_capacity: stats.search_queue_capacity,
                 };
                 
                 Ok(Response::new(GetStatsResponse {
@@ -3,7 +3,8 @@ pub mod rest;
 pub mod config;
 pub mod metrics;
 
-use vectordb_vectorstore::VectorStore;
+use vectordb_vectorstore::{VectorStore, WorkerPoolOptions};
+use vectordb_storage::StorageOptions;
 use std::sync::Arc;
 use anyhow::Result;
 use tracing::{info, error};
@@ -25,13 +26,31 @@ impl VectorDbServer {
         info!("Initializing VectorDB server");
         
         // Create vector store
-        let store = Arc::new(VectorStore::new(&config.data_dir).await?);
+        let options = StorageOptions {
+            wal_durability: config.wal_durability,
+            compaction_io_budget: Some(config.compaction_io_budget_mb * 1024 * 1024),
+            ..StorageOptions::default()
+        };
+        let pool_options = WorkerPoolOptions {
+            threads: config.search_threads,
+            queue_capacity: config.search_queue_size,
+        };
+        let store = Arc::new(
+            VectorStore::with_worker_pool(&config.data_dir, options, pool_options)
+                .await?
+                .with_query_cache(config.query_cache_entries)
+        );
         
         info!("VectorDB server initialized successfully");
         
         Ok(Self { config, store })
     }
     
+    /// Shared handle to the vector store, e.g. for a final snapshot on shutdown
+    pub fn store(&self) -> Arc<VectorStore> {
+        Arc::clone(&self.store)
+    }
+    
     /// Start the server (both gRPC and REST)
     pub async fn start(self) -> Result<()> {
         info!("Starting VectorDB server on {}:{}", self.config.host, self.config.grpc_port);
@@ -39,6 +58,43 @@ impl VectorDbServer {
         // Initialize metrics exporter
         let metrics_handle = self.start_metrics_server().await?;
         
+        // Periodically snapshot indexes and checkpoint storage so restarts only
+        // replay the WAL tail and old WAL segments can be deleted
+        if self.config.snapshot_interval_secs > 0 {
+            let store = Arc::clone(&self.store);
+            let interval = std::time::Duration::from_secs(self.config.snapshot_interval_secs);
+            
+            tokio::spawn(async move {
+                let mut ticker = tokio::time::interval(interval);
+                ticker.tick().await; // First tick completes immediately
+                loop {
+                    ticker.tick().await;
+                    if let Err(e) = store.snapshot_indexes().await {
+                        error!("Index snapshot failed: {}", e);
+                    }
+                }
+            });
+        }
+        
+        // Periodically compact collections dominated by deleted and
+        // overwritten vectors, within the configured I/O budget
+        if self.config.compaction_interval_secs > 0 {
+            let store = Arc::clone(&self.store);
+            let interval = std::time::Duration::from_secs(self.config.compaction_interval_secs);
+            let min_garbage_ratio = self.config.compaction_min_garbage_ratio;
+            
+            tokio::spawn(async move {
+                let mut ticker = tokio::time::interval(interval);
+                ticker.tick().await; // First tick completes immediately
+                loop {
+                    ticker.tick().await;
+                    if let Err(e) = store.compact_garbage(min_garbage_ratio, None).await {
+                        error!("Background compaction failed: {}", e);
+                    }
+                }
+            });
+        }
+        
         // Start gRPC server
         let grpc_handle = {
             let store = Arc::clone(&self.store);
@@ -1,5 +1,5 @@
 use vectordb_server::{VectorDbServer, ServerConfig};
-use clap::{Arg, Command};
+use clap::{parser::ValueSource, Arg, ArgMatches, Command};
 use tracing::{info, error};
 use tracing_subscriber::{layer::SubscriberExt, util::SubscriberInitExt};
 use anyhow::Result;
@@ -59,36 +59,89 @@ async fn main() -> Result<()> {
                 .help("Log level (trace, debug, info, warn, error)")
                 .default_value("info")
         )
+        .arg(
+            Arg::new("snapshot-interval")
+                .long("snapshot-interval")
+                .value_name("SECONDS")
+                .help("Seconds between index snapshots, 0 to disable (default: 300)")
+        )
+        .arg(
+            Arg::new("wal-durability")
+                .long("wal-durability")
+                .value_name("MODE")
+                .help("WAL durability: fsync-each, group, interval-ms:<ms> or none (default: group)")
+        )
+        .arg(
+            Arg::new("compaction-io-budget")
+                .long("compaction-io-budget")
+                .value_name("MB_PER_SEC")
+                .help("Megabytes per second compaction may write, 0 for unthrottled (default: 64)")
+        )
+        .arg(
+            Arg::new("search-threads")
+                .long("search-threads")
+                .value_name("COUNT")
+                .help("Worker threads for searches and index builds, 0 for one per core (default: 0)")
+        )
+        .arg(
+            Arg::new("search-queue-size")
+                .long("search-queue-size")
+                .value_name("COUNT")
+                .help("Jobs that may wait for a search worker before queries are rejected (default: 1024)")
+        )
+        .arg(
+            Arg::new("query-cache-entries")
+                .long("query-cache-entries")
+                .value_name("COUNT")
+                .help("Recent query results cached per collection, 0 to disable (default: 0)")
+        )
         .get_matches();
 
     // Load configuration
-    let config = if let Some(config_path) = matches.get_one::<String>("config") {
-        ServerConfig::from_file(config_path)?
-    } else {
-        let mut config = ServerConfig::default();
-        
-        // Override with command line arguments
-        if let Some(data_dir) = matches.get_one::<String>("data-dir") {
-            config.data_dir = data_dir.into();
-        }
-        if let Some(host) = matches.get_one::<String>("host") {
-            config.host = host.clone();
-        }
-        if let Some(grpc_port) = matches.get_one::<String>("grpc-port") {
-            config.grpc_port = grpc_port.parse()?;
-        }
-        if let Some(rest_port) = matches.get_one::<String>("rest-port") {
-            config.rest_port = rest_port.parse()?;
-        }
-        if let Some(metrics_port) = matches.get_one::<String>("metrics-port") {
-            config.metrics_port = metrics_port.parse()?;
-        }
-        if let Some(log_level) = matches.get_one::<String>("log-level") {
-            config.log_level = log_level.clone();
-        }
-        
-        config
+    let config_file = matches.get_one::<String>("config");
+    let mut config = match config_file {
+        Some(config_path) => ServerConfig::from_file(config_path)?,
+        None => ServerConfig::default(),
     };
+    let from_file = config_file.is_some();
+    
+    // Override with command line arguments
+    if let Some(data_dir) = cli_value(&matches, "data-dir", from_file) {
+        config.data_dir = data_dir.into();
+    }
+    if let Some(host) = cli_value(&matches, "host", from_file) {
+        config.host = host.clone();
+    }
+    if let Some(grpc_port) = cli_value(&matches, "grpc-port", from_file) {
+        config.grpc_port = grpc_port.parse()?;
+    }
+    if let Some(rest_port) = cli_value(&matches, "rest-port", from_file) {
+        config.rest_port = rest_port.parse()?;
+    }
+    if let Some(metrics_port) = cli_value(&matches, "metrics-port", from_file) {
+        config.metrics_port = metrics_port.parse()?;
+    }
+    if let Some(log_level) = cli_value(&matches, "log-level", from_file) {
+        config.log_level = log_level.clone();
+    }
+    if let Some(interval) = cli_value(&matches, "snapshot-interval", from_file) {
+        config.snapshot_interval_secs = interval.parse()?;
+    }
+    if let Some(mode) = cli_value(&matches, "wal-durability", from_file) {
+        config.wal_durability = mode.parse().map_err(anyhow::Error::msg)?;
+    }
+    if let Some(budget) = cli_value(&matches, "compaction-io-budget", from_file) {
+        config.compaction_io_budget_mb = budget.parse()?;
+    }
+    if let Some(threads) = cli_value(&matches, "search-threads", from_file) {
+        config.search_threads = threads.parse()?;
+    }
+    if let Some(size) = cli_value(&matches, "search-queue-size", from_file) {
+        config.search_queue_size = size.parse()?;
+    }
+    if let Some(entries) = cli_value(&matches, "query-cache-entries", from_file) {
+        config.query_cache_entries = entries.parse()?;
+    }
 
     // Validate configuration
     config.validate()?;
@@ -124,12 +177,30 @@ async fn main() -> Result<()> {
     match VectorDbServer::new(config).await {
         Ok(server) => {
             info!("Server initialized successfully");
+            let store = server.store();
             
-            // Handle graceful shutdown
+            // Handle graceful shutdown on Ctrl+C or SIGTERM
             let shutdown_signal = async {
-                tokio::signal::ctrl_c()
-                    .await
-                    .expect("Failed to listen for ctrl-c signal");
+                let ctrl_c = async {
+                    tokio::signal::ctrl_c()
+                        .await
+                        .expect("Failed to listen for ctrl-c signal");
+                };
+                
+                #[cfg(unix)]
+                let terminate = async {
+                    tokio::signal::unix::signal(tokio::signal::unix::SignalKind::terminate())
+                        .expect("Failed to listen for SIGTERM")
+                        .recv()
+                        .await;
+                };
+                #[cfg(not(unix))]
+                let terminate = std::future::pending::<()>();
+                
+                tokio::select! {
+                    _ = ctrl_c => {}
+                    _ = terminate => {}
+                }
                 info!("Shutdown signal received");
             };
             
@@ -142,6 +213,11 @@ async fn main() -> Result<()> {
                 }
                 _ = shutdown_signal => {
                     info!("Graceful shutdown initiated");
+                    
+                    // Snapshot indexes so the next start only replays new WAL entries
+                    if let Err(e) = store.snapshot_indexes().await {
+                        error!("Failed to snapshot indexes on shutdown: {}", e);
+                    }
                 }
             }
         }
@@ -155,6 +231,17 @@ async fn main() -> Result<()> {
     Ok(())
 }
 
+/// A command line value that should override the configuration
+///
+/// With a config file, only values actually given on the command line
+/// override it; the flags' defaults stand in only when there is no file.
+fn cli_value<'a>(matches: &'a ArgMatches, name: &str, from_file: bool) -> Option<&'a String> {
+    if from_file && matches.value_source(name) != Some(ValueSource::CommandLine) {
+        return None;
+    }
+    matches.get_one::<String>(name)
+}
+
 fn print_banner(config: &ServerConfig) {
     println!(r#"
  _    _           _             ____  ____        ____   _____ 
@@ -67,6 +67,18 @@ async fn metrics_index() -> Html<&'static str> {
             <li><strong>vectorstore_batch_insert_duration_seconds</strong> - Batch insertion duration</li>
             <li><strong>vectorstore_query_duration_seconds</strong> - Query duration</li>
             <li><strong>vectorstore_query_results</strong> - Number of results per query</li>
+            <li><strong>vectorstore_queries_partial_total</strong> - Queries cut short by their deadline</li>
+            <li><strong>vectorstore_query_cache_hits_total</strong> - Queries answered from the result cache</li>
+            <li><strong>vectorstore_query_cache_misses_total</strong> - Queries the result cache could not answer</li>
+            <li><strong>vectorstore_snapshots_written_total</strong> - Total index snapshots written</li>
+            <li><strong>vectorstore_snapshot_duration_seconds</strong> - Index snapshot duration</li>
+            <li><strong>vectorstore_wal_segments_removed_total</strong> - WAL segments deleted after checkpoints</li>
+            <li><strong>vectorstore_compactions_total</strong> - Total collection compactions</li>
+            <li><strong>vectorstore_compaction_bytes_reclaimed_total</strong> - Bytes reclaimed by compaction</li>
+            <li><strong>vectorstore_compaction_duration_seconds</strong> - Collection compaction duration</li>
+            <li><strong>vectorstore_pool_queue_depth</strong> - Searches and index builds waiting for a worker</li>
+            <li><strong>vectorstore_pool_wait_seconds</strong> - Time jobs waited for a worker</li>
+            <li><strong>vectorstore_pool_rejected_total</strong> - Searches rejected because the queue was full</li>
             <li><strong>vectorstore_collections_total</strong> - Total number of collections</li>
             <li><strong>vectorstore_vectors_total</strong> - Total number of vectors</li>
             <li><strong>vectorstore_memory_usage</strong> - Memory usage in bytes</li>
@@ -80,6 +92,11 @@ scrape_configs:
     static_configs:
       - targets: ['localhost:9091']
         </pre>
+        <p>With <code>query_cache_entries</code> set, the result cache hit rate is:</p>
+        <pre style="background: #f4f4f4; padding: 10px; border-radius: 5px;">
+rate(vectorstore_query_cache_hits_total[5m])
+  / (rate(vectorstore_query_cache_hits_total[5m]) + rate(vectorstore_query_cache_misses_total[5m]))
+        </pre>
     </body>
     </html>
     "#)
@@ -116,6 +133,38 @@ pub fn init_metrics() {
         "vectorstore.vectors.updated",
         "Number of vectors updated"
     );
+    metrics::describe_counter!(
+        "vectorstore.snapshots.written",
+        "Number of index snapshots written"
+    );
+    metrics::describe_counter!(
+        "vectorstore.wal.segments_removed",
+        "Number of WAL segments deleted after checkpoints"
+    );
+    metrics::describe_counter!(
+        "vectorstore.compactions",
+        "Number of collection compactions"
+    );
+    metrics::describe_counter!(
+        "vectorstore.compaction.bytes_reclaimed",
+        "Bytes of data and id index files reclaimed by compaction"
+    );
+    metrics::describe_counter!(
+        "vectorstore.pool.rejected",
+        "Number of searches rejected because the worker queue was full"
+    );
+    metrics::describe_counter!(
+        "vectorstore.queries.partial",
+        "Number of queries whose deadline cut the search short"
+    );
+    metrics::describe_counter!(
+        "vectorstore.query_cache.hits",
+        "Number of queries answered from the result cache"
+    );
+    metrics::describe_counter!(
+        "vectorstore.query_cache.misses",
+        "Number of queries the result cache could not answer"
+    );
     
     metrics::describe_histogram!(
         "vectorstore.insert.duration",
@@ -133,6 +182,18 @@ pub fn init_metrics() {
         "vectorstore.query.results",
         "Number of results per query"
     );
+    metrics::describe_histogram!(
+        "vectorstore.snapshot.duration",
+        "Index snapshot duration"
+    );
+    metrics::describe_histogram!(
+        "vectorstore.compaction.duration",
+        "Collection compaction duration"
+    );
+    metrics::describe_histogram!(
+        "vectorstore.pool.wait",
+        "Time searches and index builds waited for a worker"
+    );
     
     metrics::describe_gauge!(
         "vectorstore.collections.total",
@@ -146,4 +207,8 @@ pub fn init_metrics() {
         "vectorstore.memory.usage",
         "Memory usage in bytes"
     );
+    metrics::describe_gauge!(
+        "vectorstore.pool.queue_depth",
+        "Searches and index builds waiting for a worker"
+    );
 }
\ No newline at end of file
@@ -1,4 +1,4 @@
-use vectordb_vectorstore::VectorStore;
+use vectordb_vectorstore::{BulkLoadProgress, CollectionAlias, ReindexStats, VectorStore};
 use vectordb_common::types::*;
 use std::sync::Arc;
 use std::collections::HashMap;
@@ -10,7 +10,7 @@ use axum::{
     Router,
 };
 use serde::{Deserialize, Serialize};
-use tracing::{info, error, instrument};
+use tracing::{info, warn, error, instrument};
 use uuid::Uuid;
 use std::net::SocketAddr;
 
@@ -20,6 +20,9 @@ struct ApiResponse<T> {
     success: bool,
     data: Option<T>,
     error: Option<String>,
+    /// A deadline cut the search short; `data` holds the best results found
+    #[serde(skip_serializing_if = "std::ops::Not::not")]
+    partial: bool,
 }
 
 impl<T> ApiResponse<T> {
@@ -28,14 +31,21 @@ impl<T> ApiResponse<T> {
             success: true,
             data: Some(data),
             error: None,
+            partial: false,
         }
     }
     
+    fn partial(mut self, partial: bool) -> Self {
+        self.partial = partial;
+        self
+    }
+    
     fn error(message: String) -> Self {
         Self {
             success: false,
             data: None,
             error: Some(message),
+            partial: false,
         }
     }
 }
@@ -48,6 +58,9 @@ struct CreateCollectionRequest {
     distance_metric: DistanceMetric,
     vector_type: VectorType,
     index_config: Option<IndexConfig>,
+    durability: Option<DurabilityMode>,
+    #[serde(default)]
+    indexed_fields: Vec<String>,
 }
 
 /// Vector insertion request
@@ -70,7 +83,11 @@ struct QueryVectorsRequest {
     vector: Vec<f32>,
     limit: Option<usize>,
     ef_search: Option<usize>,
+    nprobe: Option<usize>,
+    oversampling: Option<f32>,
+    exact: Option<bool>,
     filter: Option<HashMap<String, serde_json::Value>>,
+    deadline_ms: Option<u64>,
 }
 
 /// Query parameters for search
@@ -78,6 +95,31 @@ struct QueryVectorsRequest {
 struct QueryParams {
     limit: Option<usize>,
     ef_search: Option<usize>,
+    nprobe: Option<usize>,
+    oversampling: Option<f32>,
+    exact: Option<bool>,
+    deadline_ms: Option<u64>,
+}
+
+/// Query parameters for write operations
+#[derive(Deserialize, Debug)]
+struct WriteParams {
+    /// Per-request WAL durability override, e.g. `?durability=fsync-each`
+    durability: Option<DurabilityMode>,
+}
+
+/// Query parameters for compaction
+#[derive(Deserialize, Debug)]
+struct CompactParams {
+    /// Megabytes per second the compaction may write, overriding the server
+    /// budget; 0 for unthrottled
+    io_budget_mb: Option<u64>,
+}
+
+/// Body of a request pointing an alias at a collection
+#[derive(Deserialize, Debug)]
+struct SetAliasRequest {
+    collection: String,
 }
 
 type AppState = Arc<VectorStore>;
@@ -94,6 +136,8 @@ async fn create_collection(
         distance_metric: payload.distance_metric,
         vector_type: payload.vector_type,
         index_config: payload.index_config.unwrap_or_default(),
+        durability: payload.durability,
+        indexed_fields: payload.indexed_fields,
     };
     
     match state.create_collection(&config).await {
@@ -155,6 +199,7 @@ async fn delete_collection(
 async fn insert_vector(
     State(state): State<AppState>,
     Path(collection_name): Path<String>,
+    Query(params): Query<WriteParams>,
     Json(payload): Json<InsertVectorRequest>,
 ) -> Result<Json<ApiResponse<String>>, StatusCode> {
     let vector_id = if let Some(id_str) = payload.id {
@@ -170,7 +215,7 @@ async fn insert_vector(
         metadata: payload.metadata,
     };
     
-    match state.insert(&collection_name, &vector).await {
+    match state.insert_with_durability(&collection_name, &vector, params.durability).await {
         Ok(()) => Ok(Json(ApiResponse::success(vector_id.to_string()))),
         Err(e) => {
             error!("Failed to insert vector: {}", e);
@@ -184,6 +229,7 @@ async fn insert_vector(
 async fn batch_insert_vectors(
     State(state): State<AppState>,
     Path(collection_name): Path<String>,
+    Query(params): Query<WriteParams>,
     Json(payload): Json<BatchInsertRequest>,
 ) -> Result<Json<ApiResponse<Vec<String>>>, StatusCode> {
     let mut vectors = Vec::new();
@@ -205,7 +251,7 @@ async fn batch_insert_vectors(
         });
     }
     
-    match state.batch_insert(&collection_name, &vectors).await {
+    match state.batch_insert_with_durability(&collection_name, &vectors, params.durability).await {
         Ok(()) => Ok(Json(ApiResponse::success(vector_ids))),
         Err(e) => {
             error!("Failed to batch insert vectors: {}", e);
@@ -227,11 +273,19 @@ async fn query_vectors(
         vector: payload.vector,
         limit: payload.limit.or(params.limit).unwrap_or(10),
         ef_search: payload.ef_search.or(params.ef_search),
+        nprobe: payload.nprobe.or(params.nprobe),
+        oversampling: payload.oversampling.or(params.oversampling),
+        exact: payload.exact.or(params.exact).unwrap_or(false),
         filter: payload.filter,
+        deadline_ms: payload.deadline_ms.or(params.deadline_ms),
     };
     
-    match state.query(&query_request).await {
-        Ok(results) => Ok(Json(ApiResponse::success(results))),
+    match state.query_with_deadline(&query_request).await {
+        Ok(outcome) => Ok(Json(ApiResponse::success(outcome.results).partial(outcome.partial))),
+        Err(e @ vectordb_common::VectorDbError::Overloaded { .. }) => {
+            warn!("Rejected query: {}", e);
+            Err(StatusCode::SERVICE_UNAVAILABLE)
+        }
         Err(e) => {
             error!("Failed to query vectors: {}", e);
             Ok(Json(ApiResponse::error(e.to_string())))
@@ -262,11 +316,12 @@ async fn get_vector(
 async fn delete_vector(
     State(state): State<AppState>,
     Path((collection_name, vector_id)): Path<(String, String)>,
+    Query(params): Query<WriteParams>,
 ) -> Result<Json<ApiResponse<bool>>, StatusCode> {
     let uuid = Uuid::parse_str(&vector_id)
         .map_err(|_| StatusCode::BAD_REQUEST)?;
     
-    match state.delete(&collection_name, &uuid).await {
+    match state.delete_with_durability(&collection_name, &uuid, params.durability).await {
         Ok(deleted) => Ok(Json(ApiResponse::success(deleted))),
         Err(e) => {
             error!("Failed to delete vector: {}", e);
@@ -280,6 +335,7 @@ async fn delete_vector(
 async fn update_vector(
     State(state): State<AppState>,
     Path((collection_name, vector_id)): Path<(String, String)>,
+    Query(params): Query<WriteParams>,
     Json(payload): Json<InsertVectorRequest>,
 ) -> Result<Json<ApiResponse<()>>, StatusCode> {
     let uuid = Uuid::parse_str(&vector_id)
@@ -291,7 +347,7 @@ async fn update_vector(
         metadata: payload.metadata,
     };
     
-    match state.update(&collection_name, &vector).await {
+    match state.update_with_durability(&collection_name, &vector, params.durability).await {
         Ok(()) => Ok(Json(ApiResponse::success(()))),
         Err(e) => {
             error!("Failed to update vector: {}", e);
@@ -300,6 +356,165 @@ async fn update_vector(
     }
 }
 
+/// Compact a collection, reclaiming space held by deleted and updated vectors
+#[instrument(skip(state))]
+async fn compact_collection(
+    State(state): State<AppState>,
+    Path(collection_name): Path<String>,
+    Query(params): Query<CompactParams>,
+) -> Result<Json<ApiResponse<vectordb_storage::CompactionStats>>, StatusCode> {
+    let io_budget = params.io_budget_mb.map(|mb| mb * 1024 * 1024);
+    
+    match state.compact_collection(&collection_name, io_budget).await {
+        Ok(stats) => Ok(Json(ApiResponse::success(stats))),
+        Err(e) => {
+            error!("Failed to compact collection: {}", e);
+            Ok(Json(ApiResponse::error(e.to_string())))
+        }
+    }
+}
+
+/// Rebuild a collection's index with new parameters, swapping it in once built
+#[instrument(skip(state))]
+async fn reindex_collection(
+    State(state): State<AppState>,
+    Path(collection_name): Path<String>,
+    Json(index_config): Json<IndexConfig>,
+) -> Result<Json<ApiResponse<ReindexStats>>, StatusCode> {
+    match state.reindex_collection(&collection_name, index_config).await {
+        Ok(stats) => Ok(Json(ApiResponse::success(stats))),
+        Err(e) => {
+            error!("Failed to reindex collection: {}", e);
+            Ok(Json(ApiResponse::error(e.to_string())))
+        }
+    }
+}
+
+/// List aliases
+#[instrument(skip(state))]
+async fn list_aliases(
+    State(state): State<AppState>,
+) -> Result<Json<ApiResponse<Vec<CollectionAlias>>>, StatusCode> {
+    Ok(Json(ApiResponse::success(state.list_aliases())))
+}
+
+/// Get the collection an alias points at
+#[instrument(skip(state))]
+async fn get_alias(
+    State(state): State<AppState>,
+    Path(alias): Path<String>,
+) -> Result<Json<ApiResponse<CollectionAlias>>, StatusCode> {
+    match state.get_alias(&alias) {
+        Some(alias) => Ok(Json(ApiResponse::success(alias))),
+        None => Ok(Json(ApiResponse::error(format!("Alias {} not found", alias)))),
+    }
+}
+
+/// Create an alias or atomically switch it to another collection
+#[instrument(skip(state))]
+async fn set_alias(
+    State(state): State<AppState>,
+    Path(alias): Path<String>,
+    Json(payload): Json<SetAliasRequest>,
+) -> Result<Json<ApiResponse<CollectionAlias>>, StatusCode> {
+    match state.set_alias(&alias, &payload.collection).await {
+        Ok(alias) => Ok(Json(ApiResponse::success(alias))),
+        Err(e) => {
+            error!("Failed to set alias: {}", e);
+            Ok(Json(ApiResponse::error(e.to_string())))
+        }
+    }
+}
+
+/// Delete an alias
+#[instrument(skip(state))]
+async fn delete_alias(
+    State(state): State<AppState>,
+    Path(alias): Path<String>,
+) -> Result<Json<ApiResponse<()>>, StatusCode> {
+    match state.delete_alias(&alias).await {
+        Ok(true) => Ok(Json(ApiResponse::success(()))),
+        Ok(false) => Ok(Json(ApiResponse::error(format!("Alias {} not found", alias)))),
+        Err(e) => {
+            error!("Failed to delete alias: {}", e);
+            Ok(Json(ApiResponse::error(e.to_string())))
+        }
+    }
+}
+
+/// Start bulk loading a collection
+#[instrument(skip(state))]
+async fn begin_bulk_load(
+    State(state): State<AppState>,
+    Path(collection_name): Path<String>,
+) -> Result<Json<ApiResponse<BulkLoadProgress>>, StatusCode> {
+    match state.begin_bulk_load(&collection_name).await {
+        Ok(progress) => Ok(Json(ApiResponse::success(progress))),
+        Err(e) => {
+            error!("Failed to begin bulk load: {}", e);
+            Ok(Json(ApiResponse::error(e.to_string())))
+        }
+    }
+}
+
+/// Add vectors to a collection's bulk load
+#[instrument(skip(state, payload))]
+async fn bulk_insert_vectors(
+    State(state): State<AppState>,
+    Path(collection_name): Path<String>,
+    Json(payload): Json<BatchInsertRequest>,
+) -> Result<Json<ApiResponse<BulkLoadProgress>>, StatusCode> {
+    let mut vectors = Vec::with_capacity(payload.vectors.len());
+    for vector_req in payload.vectors {
+        let vector_id = match vector_req.id {
+            Some(id_str) => Uuid::parse_str(&id_str).map_err(|_| StatusCode::BAD_REQUEST)?,
+            None => Uuid::new_v4(),
+        };
+        vectors.push(Vector {
+            id: vector_id,
+            data: vector_req.data,
+            metadata: vector_req.metadata,
+        });
+    }
+    
+    match state.bulk_insert(&collection_name, &vectors).await {
+        Ok(progress) => Ok(Json(ApiResponse::success(progress))),
+        Err(e) => {
+            error!("Failed to add vectors to bulk load: {}", e);
+            Ok(Json(ApiResponse::error(e.to_string())))
+        }
+    }
+}
+
+/// Finish a collection's bulk load, building its index
+#[instrument(skip(state))]
+async fn finish_bulk_load(
+    State(state): State<AppState>,
+    Path(collection_name): Path<String>,
+) -> Result<Json<ApiResponse<BulkLoadProgress>>, StatusCode> {
+    match state.finish_bulk_load(&collection_name).await {
+        Ok(progress) => Ok(Json(ApiResponse::success(progress))),
+        Err(e) => {
+            error!("Failed to finish bulk load: {}", e);
+            Ok(Json(ApiResponse::error(e.to_string())))
+        }
+    }
+}
+
+/// Progress of a collection's current or last bulk load
+#[instrument(skip(state))]
+async fn get_bulk_load_progress(
+    State(state): State<AppState>,
+    Path(collection_name): Path<String>,
+) -> Result<Json<ApiResponse<BulkLoadProgress>>, StatusCode> {
+    match state.bulk_load_progress(&collection_name) {
+        Some(progress) => Ok(Json(ApiResponse::success(progress))),
+        None => Ok(Json(ApiResponse::error(format!(
+            "Collection {} has no bulk load", collection_name
+        )))),
+    }
+}
+
 /// Get server stats
 #[instrument(skip(state))]
 async fn get_stats(
@@ -328,6 +543,16 @@ pub fn create_router(state: AppState) -> Router {
         .route("/collections", get(list_collections))
         .route("/collections/:collection", get(get_collection_info))
         .route("/collections/:collection", delete(delete_collection))
+        .route("/collections/:collection/compact", post(compact_collection))
+        .route("/collections/:collection/reindex", post(reindex_collection))
+        .route("/aliases", get(list_aliases))
+        .route("/aliases/:alias", get(get_alias))
+        .route("/aliases/:alias", put(set_alias))
+        .route("/aliases/:alias", delete(delete_alias))
+        .route("/collections/:collection/bulk", post(begin_bulk_load))
+        .route("/collections/:collection/bulk", get(get_bulk_load_progress))
+        .route("/collections/:collection/bulk/vectors", post(bulk_insert_vectors))
+        .route("/collections/:collection/bulk/finish", post(finish_bulk_load))
         
         // Vector operations
         .route("/collections/:collection/vectors", post(insert_vector))
@@ -351,6 +576,8 @@ pub async fn start_rest_server(addr: SocketAddr, store: Arc<VectorStore>) -> any
     info!("Starting REST server on {}", addr);
     
     let listener = tokio::net::TcpListener::bind(addr).await?;
+    // Indexes are rebuilt before the server starts, so this line marks readiness
+    info!("REST server listening on {}", listener.local_addr()?);
     axum::serve(listener, app).await?;
     
     Ok(())
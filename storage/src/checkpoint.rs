@@ -0,0 +1,175 @@
+use vectordb_common::{Result, VectorDbError};
+use vectordb_common::types::*;
+use serde::{Deserialize, Serialize};
+use std::fs::{File, OpenOptions};
+use std::io::Write;
+use std::path::Path;
+
+/// Checkpoint file name inside the data directory
+pub const CHECKPOINT_FILE: &str = "checkpoint.json";
+
+/// Durable storage state as of a WAL position
+///
+/// Recovery opens the listed collections with their data files cut at the
+/// recorded lengths and replays only WAL entries after `lsn`.
+#[derive(Debug, Clone, Serialize, Deserialize)]
+pub struct Checkpoint {
+    /// WAL position covered by the checkpoint
+    pub lsn: u64,
+    pub collections: Vec<CollectionCheckpoint>,
+}
+
+/// A collection's state within a checkpoint
+#[derive(Debug, Clone, Serialize, Deserialize)]
+pub struct CollectionCheckpoint {
+    pub config: CollectionConfig,
+    /// Data file generation, advanced each time the collection is compacted
+    #[serde(default)]
+    pub generation: u64,
+    /// Bytes of the data file written by operations at or before the checkpoint
+    pub data_len: u64,
+    /// Bytes of the id index file at the checkpoint
+    #[serde(default)]
+    pub index_len: u64,
+}
+
+impl Checkpoint {
+    /// Load the checkpoint from a data directory, if one has been written
+    pub fn load(dir: &Path) -> Result<Option<Self>> {
+        let path = dir.join(CHECKPOINT_FILE);
+        if !path.exists() {
+            return Ok(None);
+        }
+
+        let content = std::fs::read(&path)?;
+        let checkpoint = serde_json::from_slice(&content).map_err(|e| VectorDbError::StorageError {
+            message: format!("Invalid checkpoint {}: {}", path.display(), e),
+        })?;
+        Ok(Some(checkpoint))
+    }
+
+    /// Write the checkpoint atomically: to a temporary file, fsync, then rename
+    pub fn write(&self, dir: &Path) -> Result<()> {
+        let path = dir.join(CHECKPOINT_FILE);
+        let tmp_path = dir.join(format!("{}.tmp", CHECKPOINT_FILE));
+        let content = serde_json::to_vec_pretty(self)
+            .map_err(|e| VectorDbError::Serialization(e.to_string()))?;
+
+        {
+            let mut file = OpenOptions::new()
+                .create(true)
+                .write(true)
+                .truncate(true)
+                .open(&tmp_path)?;
+            file.write_all(&content)?;
+            file.sync_all()?;
+        }
+
+        std::fs::rename(&tmp_path, &path)?;
+        File::open(dir)?.sync_all()?;
+        Ok(())
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use crate::{StorageEngine, StorageOptions};
+    use tempfile::tempdir;
+
+    fn test_config(name: &str) -> CollectionConfig {
+        CollectionConfig {
+            name: name.to_string(),
+            dimension: 4,
+            distance_metric: DistanceMetric::Cosine,
+            vector_type: VectorType::Float32,
+            index_config: IndexConfig::default(),
+            durability: None,
+            indexed_fields: Vec::new(),
+        }
+    }
+
+    fn test_vector() -> Vector {
+        Vector {
+            id: uuid::Uuid::new_v4(),
+            data: vec![0.5; 4],
+            metadata: None,
+        }
+    }
+
+    #[tokio::test]
+    async fn test_checkpoint_bounds_recovery() {
+        let temp_dir = tempdir().unwrap();
+        let options = StorageOptions {
+            wal_segment_size: 256,
+            ..StorageOptions::default()
+        };
+
+        let (lsn, data_len) = {
+            let engine = StorageEngine::with_options(temp_dir.path(), options.clone()).await.unwrap();
+            engine.create_collection(&test_config("docs")).await.unwrap();
+            for _ in 0..20 {
+                engine.insert_vector("docs", &test_vector()).await.unwrap();
+            }
+
+            let lsn = engine.wal_lsn().await.unwrap();
+            let checkpoint = engine.capture_checkpoint(lsn).await.unwrap();
+            assert!(engine.write_checkpoint(&checkpoint, lsn).await.unwrap() > 0);
+
+            // Logged after the checkpoint, so recovery must replay it
+            engine.create_collection(&test_config("late")).await.unwrap();
+            engine.insert_vector("docs", &test_vector()).await.unwrap();
+            (lsn, checkpoint.collections[0].data_len)
+        };
+
+        let loaded = Checkpoint::load(temp_dir.path()).unwrap().unwrap();
+        assert_eq!(loaded.lsn, lsn);
+        assert_eq!(loaded.collections.len(), 1);
+
+        let engine = StorageEngine::with_options(temp_dir.path(), options).await.unwrap();
+        let mut names = engine.list_collections();
+        names.sort();
+        assert_eq!(names, vec!["docs".to_string(), "late".to_string()]);
+
+        // Only the tail after the checkpoint was appended again
+        let recovered = engine.capture_checkpoint(engine.wal_lsn().await.unwrap()).await.unwrap();
+        let docs = recovered.collections.iter().find(|c| c.config.name == "docs").unwrap();
+        assert!(docs.data_len > data_len);
+        assert!(docs.data_len < 2 * data_len);
+    }
+
+    #[tokio::test]
+    async fn test_bulk_insert_durable_from_checkpoint() {
+        let temp_dir = tempdir().unwrap();
+        let (logged, lost, kept) = (test_vector(), test_vector(), test_vector());
+
+        {
+            let engine = StorageEngine::new(temp_dir.path()).await.unwrap();
+            engine.create_collection(&test_config("docs")).await.unwrap();
+            engine.insert_vector("docs", &logged).await.unwrap();
+            let lsn = engine.wal_lsn().await.unwrap();
+            let checkpoint = engine.capture_checkpoint(lsn).await.unwrap();
+            engine.write_checkpoint(&checkpoint, lsn).await.unwrap();
+
+            // Neither the WAL nor a checkpoint covers this one
+            engine.bulk_insert("docs", &[lost.clone()]).await.unwrap();
+            assert!(engine.get_vector("docs", &lost.id).await.unwrap().is_some());
+        }
+
+        {
+            let engine = StorageEngine::new(temp_dir.path()).await.unwrap();
+            assert!(engine.get_vector("docs", &logged.id).await.unwrap().is_some());
+            assert!(engine.get_vector("docs", &lost.id).await.unwrap().is_none());
+
+            // A checkpoint at the same WAL position still records the load
+            engine.bulk_insert("docs", &[kept.clone()]).await.unwrap();
+            let lsn = engine.wal_lsn().await.unwrap();
+            let checkpoint = engine.capture_checkpoint(lsn).await.unwrap();
+            engine.write_checkpoint(&checkpoint, lsn).await.unwrap();
+        }
+
+        let engine = StorageEngine::new(temp_dir.path()).await.unwrap();
+        assert!(engine.get_vector("docs", &kept.id).await.unwrap().is_some());
+        assert!(engine.get_vector("docs", &lost.id).await.unwrap().is_none());
+    }
+}
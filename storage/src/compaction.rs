@@ -0,0 +1,271 @@
+use vectordb_common::Result;
+use crate::{CollectionFiles, CollectionStorage};
+use serde::{Deserialize, Serialize};
+use std::path::{Path, PathBuf};
+use std::sync::Arc;
+use std::time::{Duration, Instant};
+
+/// Shortest pause the throttle bothers sleeping for
+const MIN_THROTTLE_SLEEP: Duration = Duration::from_millis(10);
+
+/// Outcome of compacting a collection
+#[derive(Debug, Clone, PartialEq, Eq, Serialize, Deserialize)]
+pub struct CompactionStats {
+    pub collection: String,
+    /// Vectors carried over into the new files
+    pub live_vectors: usize,
+    /// Bytes of the data and id index files in use before compaction
+    pub bytes_before: u64,
+    /// Bytes of the data and id index files in use after compaction
+    pub bytes_after: u64,
+    pub bytes_reclaimed: u64,
+    pub duration_ms: u64,
+}
+
+/// Data and id index file paths of a collection generation
+///
+/// Generation 0 keeps the original `vectors.bin`/`index.bin` names; each
+/// compaction writes the next generation alongside the current one.
+pub fn generation_paths(dir: &Path, generation: u64) -> (PathBuf, PathBuf) {
+    if generation == 0 {
+        (dir.join("vectors.bin"), dir.join("index.bin"))
+    } else {
+        (
+            dir.join(format!("vectors.{}.bin", generation)),
+            dir.join(format!("index.{}.bin", generation)),
+        )
+    }
+}
+
+/// Generation of a collection data or id index file name
+pub fn generation_of(file_name: &str) -> Option<u64> {
+    let rest = file_name
+        .strip_prefix("vectors")
+        .or_else(|| file_name.strip_prefix("index"))?
+        .strip_suffix(".bin")?;
+    match rest {
+        "" => Some(0),
+        _ => rest.strip_prefix('.')?.parse().ok(),
+    }
+}
+
+/// Whether a directory holds collection data files of any generation
+pub fn has_collection_files(dir: &Path) -> bool {
+    std::fs::read_dir(dir)
+        .map(|entries| {
+            entries
+                .filter_map(|entry| entry.ok())
+                .any(|entry| entry.file_name().to_str().and_then(generation_of).is_some())
+        })
+        .unwrap_or(false)
+}
+
+/// Delete the files of every generation for which `remove` returns true
+pub(crate) fn remove_generations<F: Fn(u64) -> bool>(dir: &Path, remove: F) -> Result<usize> {
+    if !dir.exists() {
+        return Ok(0);
+    }
+
+    let mut removed = 0;
+    for entry in std::fs::read_dir(dir)? {
+        let entry = entry?;
+        let generation = entry.file_name().to_str().and_then(generation_of);
+        if generation.map_or(false, &remove) {
+            std::fs::remove_file(entry.path())?;
+            removed += 1;
+        }
+    }
+    Ok(removed)
+}
+
+/// Paces writes to a byte rate; `None` or 0 means unthrottled
+struct IoThrottle {
+    bytes_per_sec: Option<u64>,
+    started: Instant,
+    bytes: u64,
+}
+
+impl IoThrottle {
+    fn new(bytes_per_sec: Option<u64>) -> Self {
+        Self {
+            bytes_per_sec: bytes_per_sec.filter(|rate| *rate > 0),
+            started: Instant::now(),
+            bytes: 0,
+        }
+    }
+
+    async fn consume(&mut self, bytes: u64) {
+        let rate = match self.bytes_per_sec {
+            Some(rate) => rate,
+            None => return,
+        };
+
+        self.bytes += bytes;
+        let due = Duration::from_secs_f64(self.bytes as f64 / rate as f64);
+        let elapsed = self.started.elapsed();
+        if due > elapsed + MIN_THROTTLE_SLEEP {
+            tokio::time::sleep(due - elapsed).await;
+        }
+    }
+}
+
+impl CollectionStorage {
+    /// Rewrite the live records into a new generation of files and swap it in
+    ///
+    /// Records are copied while writers carry on against the current files;
+    /// writers are then paused only to copy what changed meanwhile and swap.
+    /// The previous generation stays on disk until a checkpoint records the
+    /// new one, so recovery never sees a checkpoint pointing at missing data.
+    pub(crate) async fn compact(&self, io_budget_bytes_per_sec: Option<u64>) -> Result<CompactionStats> {
+        let _compacting = self.compaction_lock.lock().await;
+        let started = Instant::now();
+
+        let old = self.files();
+        let bytes_before = old.data_file.position().await? + old.id_index.file_len().await?;
+
+        // Leftovers of an interrupted compaction are never referenced
+        let generation = old.generation + 1;
+        remove_generations(&self.dir, |g| g == generation)?;
+        let new = CollectionFiles::open(&self.dir, generation, 0, 0).await?;
+
+        let mut throttle = IoThrottle::new(io_budget_bytes_per_sec);
+        let mut record = Vec::new();
+
+        let copied = old.id_index.entries();
+        for (id, location) in &copied {
+            new.copy_record(&old, *id, *location, &mut record).await?;
+            throttle.consume(record.len() as u64).await;
+        }
+
+        // Catch up on writes made during the copy, then swap
+        let _swap = self.swap_gate.write().await;
+        let live = old.id_index.entries();
+        for (id, location) in &live {
+            if copied.get(id) != Some(location) {
+                new.copy_record(&old, *id, *location, &mut record).await?;
+            }
+        }
+        for id in copied.keys() {
+            if !live.contains_key(id) {
+                new.id_index.remove(id).await?;
+            }
+        }
+
+        // A checkpoint captured before the swap may still name the old files
+        old.sync().await?;
+        new.sync().await?;
+        let bytes_after = new.data_file.position().await? + new.id_index.file_len().await?;
+        let live_vectors = new.id_index.len();
+        *self.files.write() = Arc::new(new);
+
+        Ok(CompactionStats {
+            collection: self.config().name.clone(),
+            live_vectors,
+            bytes_before,
+            bytes_after,
+            bytes_reclaimed: bytes_before.saturating_sub(bytes_after),
+            duration_ms: started.elapsed().as_millis() as u64,
+        })
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use crate::StorageEngine;
+    use vectordb_common::types::*;
+    use tempfile::tempdir;
+
+    fn test_config(name: &str) -> CollectionConfig {
+        CollectionConfig {
+            name: name.to_string(),
+            dimension: 4,
+            distance_metric: DistanceMetric::Cosine,
+            vector_type: VectorType::Float32,
+            index_config: IndexConfig::default(),
+            durability: None,
+            indexed_fields: Vec::new(),
+        }
+    }
+
+    fn test_vector(value: f32) -> Vector {
+        Vector {
+            id: uuid::Uuid::new_v4(),
+            data: vec![value; 4],
+            metadata: None,
+        }
+    }
+
+    #[test]
+    fn test_generation_file_names() {
+        assert_eq!(generation_of("vectors.bin"), Some(0));
+        assert_eq!(generation_of("index.3.bin"), Some(3));
+        assert_eq!(generation_of("vectors.x.bin"), None);
+        assert_eq!(generation_of("index.snapshot"), None);
+
+        let (data, index) = generation_paths(Path::new("c"), 2);
+        assert_eq!(generation_of(data.file_name().unwrap().to_str().unwrap()), Some(2));
+        assert_eq!(generation_of(index.file_name().unwrap().to_str().unwrap()), Some(2));
+    }
+
+    #[tokio::test]
+    async fn test_compaction_reclaims_deleted_records() {
+        let temp_dir = tempdir().unwrap();
+        let vectors: Vec<Vector> = (0..50).map(|i| test_vector(i as f32)).collect();
+
+        {
+            let engine = StorageEngine::new(temp_dir.path()).await.unwrap();
+            engine.create_collection(&test_config("docs")).await.unwrap();
+            engine.batch_insert("docs", &vectors).await.unwrap();
+            for vector in &vectors[10..] {
+                assert!(engine.delete_vector("docs", &vector.id).await.unwrap());
+            }
+
+            let stats = engine.compact_collection("docs", None).await.unwrap();
+            assert_eq!(stats.live_vectors, 10);
+            assert!(stats.bytes_reclaimed > stats.bytes_after);
+
+            // Served from the new generation; deleted ids stay deleted
+            let kept = engine.get_vector("docs", &vectors[3].id).await.unwrap().unwrap();
+            assert_eq!(kept.data, vectors[3].data);
+            assert!(engine.get_vector("docs", &vectors[30].id).await.unwrap().is_none());
+            engine.insert_vector("docs", &vectors[30]).await.unwrap();
+
+            // The old generation goes once a checkpoint records the new one
+            let dir = engine.collection_dir("docs");
+            assert!(dir.join("vectors.bin").exists());
+            let lsn = engine.wal_lsn().await.unwrap();
+            let checkpoint = engine.capture_checkpoint(lsn).await.unwrap();
+            assert_eq!(checkpoint.collections[0].generation, 1);
+            engine.write_checkpoint(&checkpoint, 0).await.unwrap();
+            assert!(!dir.join("vectors.bin").exists());
+            assert!(dir.join("vectors.1.bin").exists());
+        }
+
+        let engine = StorageEngine::new(temp_dir.path()).await.unwrap();
+        let stats = engine.get_collection_stats("docs").await.unwrap().unwrap();
+        assert_eq!(stats.vector_count, 11);
+        let reinserted = engine.get_vector("docs", &vectors[30].id).await.unwrap().unwrap();
+        assert_eq!(reinserted.data, vectors[30].data);
+        assert!(engine.get_vector("docs", &vectors[40].id).await.unwrap().is_none());
+    }
+
+    #[tokio::test]
+    async fn test_compaction_throttled_to_io_budget() {
+        let temp_dir = tempdir().unwrap();
+        let engine = StorageEngine::new(temp_dir.path()).await.unwrap();
+        engine.create_collection(&test_config("docs")).await.unwrap();
+        let vectors: Vec<Vector> = (0..20).map(|i| test_vector(i as f32)).collect();
+        engine.batch_insert("docs", &vectors).await.unwrap();
+
+        let started = Instant::now();
+        let stats = engine.compact_collection("docs", Some(2000)).await.unwrap();
+        assert_eq!(stats.live_vectors, 20);
+        assert_eq!(stats.bytes_reclaimed, 0);
+
+        // Copying the records has to take as long as the budget allows
+        let copied = stats.bytes_after - engine.capture_checkpoint(0).await.unwrap().collections[0].index_len;
+        let expected = Duration::from_secs_f64(copied as f64 / 2000.0);
+        assert!(started.elapsed() + MIN_THROTTLE_SLEEP >= expected);
+    }
+}
@@ -0,0 +1,171 @@
+use vectordb_common::Result;
+use vectordb_common::types::VectorId;
+use crate::mmap::MMapStorage;
+use std::collections::HashMap;
+use std::path::Path;
+use std::sync::atomic::{AtomicU64, Ordering};
+use parking_lot::RwLock;
+use uuid::Uuid;
+
+/// Entry layout: id (16), record offset (8), record length (4), flags (1)
+const ENTRY_SIZE: usize = 16 + 8 + 4 + 1;
+const FLAG_TOMBSTONE: u8 = 1;
+
+/// Where a vector's record lives in a collection data file
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+pub struct RecordLocation {
+    pub offset: u64,
+    pub length: u32,
+}
+
+/// Persistent id → record location index for a collection data file
+///
+/// Every insert and delete appends a fixed-size entry to the index file, a
+/// delete being a tombstone entry; the latest entry for an id wins. The
+/// entries are folded into a hash map on open, so lookups are O(1).
+pub struct IdIndex {
+    file: MMapStorage,
+    entries: RwLock<HashMap<VectorId, RecordLocation>>,
+    /// Sum of the record lengths of live vectors
+    live_bytes: AtomicU64,
+    /// Keeps file entries in the same order as map updates
+    write_lock: tokio::sync::Mutex<()>,
+}
+
+impl IdIndex {
+    /// Open the index, folding the first `len` bytes of entries into memory
+    pub async fn open<P: AsRef<Path>>(path: P, len: u64) -> Result<Self> {
+        let file = MMapStorage::new(path).await?;
+        file.set_position(len - len % ENTRY_SIZE as u64)?;
+
+        let mut entries = HashMap::new();
+        let mut offset = 0;
+        while offset < file.position().await? {
+            let entry = file.read_ref(offset, ENTRY_SIZE)?;
+            let (id, location, flags) = decode_entry(&entry);
+            if flags & FLAG_TOMBSTONE != 0 {
+                entries.remove(&id);
+            } else {
+                entries.insert(id, location);
+            }
+            offset += ENTRY_SIZE as u64;
+        }
+
+        let live_bytes = entries.values().map(|l| l.length as u64).sum();
+        Ok(Self {
+            file,
+            entries: RwLock::new(entries),
+            live_bytes: AtomicU64::new(live_bytes),
+            write_lock: tokio::sync::Mutex::new(()),
+        })
+    }
+
+    /// Record the location of a vector, replacing any previous one
+    pub async fn insert(&self, id: VectorId, location: RecordLocation) -> Result<()> {
+        let _write = self.write_lock.lock().await;
+        self.file.append(&encode_entry(&id, location, 0)).await?;
+        let previous = self.entries.write().insert(id, location);
+        self.live_bytes.fetch_add(location.length as u64, Ordering::Relaxed);
+        if let Some(previous) = previous {
+            self.live_bytes.fetch_sub(previous.length as u64, Ordering::Relaxed);
+        }
+        Ok(())
+    }
+
+    /// Tombstone a vector, returning its last location if it was live
+    pub async fn remove(&self, id: &VectorId) -> Result<Option<RecordLocation>> {
+        let _write = self.write_lock.lock().await;
+        if !self.entries.read().contains_key(id) {
+            return Ok(None);
+        }
+
+        let tombstone = RecordLocation { offset: 0, length: 0 };
+        self.file.append(&encode_entry(id, tombstone, FLAG_TOMBSTONE)).await?;
+        let removed = self.entries.write().remove(id);
+        if let Some(location) = removed {
+            self.live_bytes.fetch_sub(location.length as u64, Ordering::Relaxed);
+        }
+        Ok(removed)
+    }
+
+    /// Look up a live vector's location
+    pub fn get(&self, id: &VectorId) -> Option<RecordLocation> {
+        self.entries.read().get(id).copied()
+    }
+
+    /// Number of live vectors
+    pub fn len(&self) -> usize {
+        self.entries.read().len()
+    }
+
+    pub fn is_empty(&self) -> bool {
+        self.len() == 0
+    }
+
+    /// Sum of the record lengths of live vectors
+    pub fn live_bytes(&self) -> u64 {
+        self.live_bytes.load(Ordering::Relaxed)
+    }
+
+    /// Copy of the live entries
+    pub fn entries(&self) -> HashMap<VectorId, RecordLocation> {
+        self.entries.read().clone()
+    }
+
+    /// Bytes of the index file in use
+    pub async fn file_len(&self) -> Result<u64> {
+        self.file.position().await
+    }
+
+    pub async fn sync(&self) -> Result<()> {
+        self.file.sync().await
+    }
+}
+
+fn encode_entry(id: &VectorId, location: RecordLocation, flags: u8) -> [u8; ENTRY_SIZE] {
+    let mut entry = [0u8; ENTRY_SIZE];
+    entry[..16].copy_from_slice(id.as_bytes());
+    entry[16..24].copy_from_slice(&location.offset.to_le_bytes());
+    entry[24..28].copy_from_slice(&location.length.to_le_bytes());
+    entry[28] = flags;
+    entry
+}
+
+fn decode_entry(entry: &[u8]) -> (VectorId, RecordLocation, u8) {
+    let id = Uuid::from_slice(&entry[..16]).expect("16-byte id");
+    let location = RecordLocation {
+        offset: u64::from_le_bytes(entry[16..24].try_into().unwrap()),
+        length: u32::from_le_bytes(entry[24..28].try_into().unwrap()),
+    };
+    (id, location, entry[28])
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use tempfile::tempdir;
+
+    #[tokio::test]
+    async fn test_id_index_reopen_with_tombstones() {
+        let temp_dir = tempdir().unwrap();
+        let path = temp_dir.path().join("index.bin");
+        let (a, b) = (Uuid::new_v4(), Uuid::new_v4());
+
+        let len = {
+            let index = IdIndex::open(&path, 0).await.unwrap();
+            index.insert(a, RecordLocation { offset: 0, length: 10 }).await.unwrap();
+            index.insert(b, RecordLocation { offset: 14, length: 20 }).await.unwrap();
+            index.insert(a, RecordLocation { offset: 38, length: 12 }).await.unwrap();
+            assert!(index.remove(&b).await.unwrap().is_some());
+            assert!(index.remove(&b).await.unwrap().is_none());
+            index.sync().await.unwrap();
+            index.file_len().await.unwrap()
+        };
+
+        let index = IdIndex::open(&path, len).await.unwrap();
+        assert_eq!(index.len(), 1);
+        assert_eq!(index.live_bytes(), 12);
+        assert_eq!(index.get(&a), Some(RecordLocation { offset: 38, length: 12 }));
+        assert_eq!(index.get(&b), None);
+    }
+}
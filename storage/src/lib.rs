@@ -1,37 +1,78 @@
 pub mod wal;
 pub mod mmap;
 pub mod recovery;
+pub mod checkpoint;
+pub mod id_index;
+pub mod compaction;
 
 use vectordb_common::{Result, VectorDbError};
 use vectordb_common::types::*;
 use std::path::{Path, PathBuf};
-use std::collections::HashMap;
+use std::collections::{HashMap, HashSet};
 use std::sync::Arc;
-use parking_lot::RwLock;
+use parking_lot::{Mutex, RwLock};
 
 pub use wal::*;
 pub use mmap::*;
 pub use recovery::*;
+pub use checkpoint::*;
+pub use id_index::*;
+pub use compaction::*;
+
+/// Storage engine options
+#[derive(Debug, Clone)]
+pub struct StorageOptions {
+    /// WAL durability for collections and requests that do not choose one
+    pub wal_durability: DurabilityMode,
+    /// Size in bytes at which the WAL starts a new segment
+    pub wal_segment_size: u64,
+    /// Bytes per second compaction may write unless a call sets its own
+    /// budget; `None` or 0 leaves it unthrottled
+    pub compaction_io_budget: Option<u64>,
+}
+
+impl Default for StorageOptions {
+    fn default() -> Self {
+        Self {
+            wal_durability: DurabilityMode::default(),
+            wal_segment_size: DEFAULT_SEGMENT_SIZE,
+            compaction_io_budget: None,
+        }
+    }
+}
 
 /// Storage engine for persistent vector storage with WAL
 pub struct StorageEngine {
     data_dir: PathBuf,
     collections: RwLock<HashMap<CollectionId, Arc<CollectionStorage>>>,
     wal: WriteAheadLog,
+    /// WAL position of the last checkpoint written or loaded
+    checkpoint_lsn: Mutex<Option<u64>>,
+    compaction_io_budget: Option<u64>,
 }
 
 impl StorageEngine {
     pub async fn new<P: AsRef<Path>>(data_dir: P) -> Result<Self> {
+        Self::with_options(data_dir, StorageOptions::default()).await
+    }
+    
+    pub async fn with_options<P: AsRef<Path>>(data_dir: P, options: StorageOptions) -> Result<Self> {
         let data_dir = data_dir.as_ref().to_path_buf();
         std::fs::create_dir_all(&data_dir)?;
         
         let wal_path = data_dir.join("wal");
-        let wal = WriteAheadLog::new(wal_path).await?;
+        let wal_options = WalOptions {
+            durability: options.wal_durability,
+            segment_size: options.wal_segment_size,
+        };
+        let wal = WriteAheadLog::with_options(wal_path, wal_options).await?;
         
-        let mut engine = Self {
+        let engine = Self {
             data_dir,
             collections: RwLock::new(HashMap::new()),
             wal,
+            checkpoint_lsn: Mutex::new(None),
+            compaction_io_budget: options.compaction_io_budget,
         };
         
         // Recover from WAL on startup
@@ -95,6 +136,16 @@ impl StorageEngine {
     }
     
     pub async fn insert_vector(&self, collection: &str, vector: &Vector) -> Result<()> {
+        self.insert_vector_with_durability(collection, vector, None).await
+    }
+    
+    /// Insert a vector, overriding the collection's WAL durability if given
+    pub async fn insert_vector_with_durability(
+        &self,
+        collection: &str,
+        vector: &Vector,
+        durability: Option<DurabilityMode>,
+    ) -> Result<()> {
         // Clone the storage reference to avoid holding the lock across await points
         let storage = {
             let collections = self.collections.read();
@@ -111,7 +162,7 @@ impl StorageEngine {
             collection: collection.to_string(),
             vector: vector.clone(),
         };
-        self.wal.append(&op).await?;
+        self.wal.append_with(&op, durability.or(storage.config().durability)).await?;
         
         storage.insert(vector).await?;
         
@@ -119,6 +170,16 @@ impl StorageEngine {
     }
     
     pub async fn batch_insert(&self, collection: &str, vectors: &[Vector]) -> Result<()> {
+        self.batch_insert_with_durability(collection, vectors, None).await
+    }
+    
+    /// Insert vectors, overriding the collection's WAL durability if given
+    pub async fn batch_insert_with_durability(
+        &self,
+        collection: &str,
+        vectors: &[Vector],
+        durability: Option<DurabilityMode>,
+    ) -> Result<()> {
         // Clone the storage reference to avoid holding the lock across await points
         let storage = {
             let collections = self.collections.read();
@@ -135,10 +196,35 @@ impl StorageEngine {
             collection: collection.to_string(),
             vectors: vectors.to_vec(),
         };
-        self.wal.append(&op).await?;
+        self.wal.append_with(&op, durability.or(storage.config().durability)).await?;
+        
+        storage.batch_insert(vectors).await?;
+        
+        Ok(())
+    }
+    
+    /// Write vectors to a collection's data files without logging them
+    ///
+    /// For bulk loads, which make the vectors durable with the next
+    /// checkpoint instead of the WAL. Until then a crash loses them:
+    /// recovery reads the data files only up to the last checkpoint.
+    pub async fn bulk_insert(&self, collection: &str, vectors: &[Vector]) -> Result<()> {
+        // Clone the storage reference to avoid holding the lock across await points
+        let storage = {
+            let collections = self.collections.read();
+            collections
+                .get(collection)
+                .ok_or_else(|| VectorDbError::CollectionNotFound {
+                    name: collection.to_string(),
+                })?
+                .clone()
+        };
         
         storage.batch_insert(vectors).await?;
         
+        // No logged operation marks these records, so the next checkpoint
+        // must be written even if the WAL has not moved
+        *self.checkpoint_lsn.lock() = None;
         Ok(())
     }
     
@@ -158,6 +244,16 @@ impl StorageEngine {
     }
     
     pub async fn delete_vector(&self, collection: &str, id: &VectorId) -> Result<bool> {
+        self.delete_vector_with_durability(collection, id, None).await
+    }
+    
+    /// Delete a vector, overriding the collection's WAL durability if given
+    pub async fn delete_vector_with_durability(
+        &self,
+        collection: &str,
+        id: &VectorId,
+        durability: Option<DurabilityMode>,
+    ) -> Result<bool> {
         // Clone the storage reference to avoid holding the lock across await points
         let storage = {
             let collections = self.collections.read();
@@ -174,7 +270,7 @@ impl StorageEngine {
             collection: collection.to_string(),
             id: *id,
         };
-        self.wal.append(&op).await?;
+        self.wal.append_with(&op, durability.or(storage.config().durability)).await?;
         
         storage.delete(id).await
     }
@@ -186,29 +282,45 @@ impl StorageEngine {
     
     pub fn get_collection_config(&self, name: &str) -> Result<Option<CollectionConfig>> {
         let collections = self.collections.read();
-        Ok(collections.get(name).map(|s| s.config().clone()))
+        Ok(collections.get(name).map(|s| s.config().as_ref().clone()))
+    }
+    
+    /// Replace the index parameters recorded for a collection
+    ///
+    /// Takes effect on disk with the next checkpoint, which is written even
+    /// if the WAL has not moved since the last one.
+    pub fn set_index_config(&self, name: &str, index_config: IndexConfig) -> Result<()> {
+        let collections = self.collections.read();
+        let storage = collections.get(name).ok_or_else(|| VectorDbError::CollectionNotFound {
+            name: name.to_string(),
+        })?;
+        
+        let mut config = storage.config().as_ref().clone();
+        config.index_config = index_config;
+        *storage.config.write() = Arc::new(config);
+        *self.checkpoint_lsn.lock() = None;
+        Ok(())
+    }
+    
+    /// Ids of the vectors stored in a collection
+    pub fn vector_ids(&self, collection: &str) -> Result<Vec<VectorId>> {
+        let collections = self.collections.read();
+        let storage = collections.get(collection).ok_or_else(|| VectorDbError::CollectionNotFound {
+            name: collection.to_string(),
+        })?;
+        Ok(storage.files().id_index.entries().into_keys().collect())
     }
     
     pub async fn get_collection_stats(&self, name: &str) -> Result<Option<CollectionStats>> {
-        // We need to restructure this to avoid holding the lock across the await
-        // For now, let's get the config synchronously and compute stats differently
-        let config = {
+        // Clone the storage reference to avoid holding the lock across await points
+        let storage = {
             let collections = self.collections.read();
-            collections.get(name).map(|s| s.config().clone())
+            collections.get(name).cloned()
         };
         
-        if let Some(_config) = config {
-            // TODO: Implement proper async stats collection without holding locks
-            // For now return a basic stats structure
-            Ok(Some(CollectionStats {
-                name: name.to_string(),
-                vector_count: 0,  // TODO: get actual count
-                dimension: _config.dimension,
-                index_size: 0,   // TODO: get actual size
-                memory_usage: 0, // TODO: get actual usage
-            }))
-        } else {
-            Ok(None)
+        match storage {
+            Some(storage) => Ok(Some(storage.stats().await?)),
+            None => Ok(None),
         }
     }
     
@@ -228,20 +340,179 @@ impl StorageEngine {
         Ok(())
     }
     
-    async fn recover(&mut self) -> Result<()> {
-        let recovery = RecoveryManager::new(&self.data_dir);
-        let operations = recovery.recover_from_wal(&self.wal).await?;
+    /// Current WAL position; every operation logged so far has an LSN at or below it
+    pub async fn wal_lsn(&self) -> Result<u64> {
+        self.wal.current_lsn().await
+    }
+    
+    /// LSN at which the retained WAL starts; above 0 once old segments
+    /// have been removed after a checkpoint
+    pub async fn wal_oldest_lsn(&self) -> Result<u64> {
+        self.wal.oldest_lsn().await
+    }
+    
+    /// Stream logged operations after the given LSN, paired with their LSNs
+    pub async fn wal_reader_from(&self, lsn: u64) -> Result<WalReader> {
+        self.wal.reader_from(lsn).await
+    }
+    
+    /// Total size of the retained WAL segments
+    pub async fn wal_size(&self) -> Result<u64> {
+        self.wal.size().await
+    }
+    
+    /// Directory holding a collection's files
+    pub fn collection_dir(&self, name: &str) -> PathBuf {
+        self.data_dir.join(name)
+    }
+    
+    /// Record how much of each data file belongs to operations up to `lsn`
+    ///
+    /// Writers must be paused so no operation after `lsn` has reached a
+    /// data file yet; the result is made durable by `write_checkpoint`.
+    pub async fn capture_checkpoint(&self, lsn: u64) -> Result<Checkpoint> {
+        let storages: Vec<Arc<CollectionStorage>> = {
+            let collections = self.collections.read();
+            collections.values().cloned().collect()
+        };
         
-        tracing::info!("Recovering {} operations from WAL", operations.len());
+        let mut collections = Vec::with_capacity(storages.len());
+        for storage in storages {
+            let (generation, data_len, index_len) = storage.checkpoint_state().await?;
+            collections.push(CollectionCheckpoint {
+                config: storage.config().as_ref().clone(),
+                generation,
+                data_len,
+                index_len,
+            });
+        }
         
-        for op in operations {
-            self.apply_operation(op).await?;
+        Ok(Checkpoint { lsn, collections })
+    }
+    
+    /// Sync data files, persist `checkpoint` and delete WAL segments that
+    /// only hold entries at or before `retain_from`
+    ///
+    /// `retain_from` lets callers keep entries that other state, such as
+    /// index snapshots, still needs; it is capped at the checkpoint's LSN.
+    /// Returns the number of WAL segments removed.
+    pub async fn write_checkpoint(&self, checkpoint: &Checkpoint, retain_from: u64) -> Result<usize> {
+        if *self.checkpoint_lsn.lock() != Some(checkpoint.lsn) {
+            let storages: Vec<(&CollectionCheckpoint, Arc<CollectionStorage>)> = {
+                let collections = self.collections.read();
+                checkpoint
+                    .collections
+                    .iter()
+                    .filter_map(|c| collections.get(&c.config.name).map(|s| (c, Arc::clone(s))))
+                    .collect()
+            };
+            for (_, storage) in &storages {
+                storage.sync().await?;
+            }
+            
+            let to_write = checkpoint.clone();
+            let data_dir = self.data_dir.clone();
+            tokio::task::spawn_blocking(move || to_write.write(&data_dir))
+                .await
+                .map_err(|e| VectorDbError::Internal { message: e.to_string() })??;
+            *self.checkpoint_lsn.lock() = Some(checkpoint.lsn);
+            
+            // Generations compacted away are no longer needed by recovery
+            for (collection, storage) in &storages {
+                if storage.files().generation >= collection.generation {
+                    remove_generations(&storage.dir, |g| g < collection.generation)?;
+                }
+            }
         }
         
+        self.wal.remove_segments_before(retain_from.min(checkpoint.lsn)).await
+    }
+    
+    /// Rewrite a collection's live vectors into fresh files, dropping the
+    /// space held by deleted and overwritten records
+    ///
+    /// Copying is paced to `io_budget_bytes_per_sec`, or to the configured
+    /// budget when not given; 0 means unthrottled. The freed files are
+    /// deleted by the next `write_checkpoint`.
+    pub async fn compact_collection(
+        &self,
+        name: &str,
+        io_budget_bytes_per_sec: Option<u64>,
+    ) -> Result<CompactionStats> {
+        // Clone the storage reference to avoid holding the lock across await points
+        let storage = {
+            let collections = self.collections.read();
+            collections
+                .get(name)
+                .ok_or_else(|| VectorDbError::CollectionNotFound {
+                    name: name.to_string(),
+                })?
+                .clone()
+        };
+        
+        let stats = storage.compact(io_budget_bytes_per_sec.or(self.compaction_io_budget)).await?;
+        
+        // The last checkpoint names the old generation, so the next one
+        // must be written even if no operation was logged since
+        *self.checkpoint_lsn.lock() = None;
+        
+        tracing::info!(
+            "Compacted collection {}: {} live vectors, {} bytes reclaimed",
+            name,
+            stats.live_vectors,
+            stats.bytes_reclaimed
+        );
+        Ok(stats)
+    }
+    
+    /// Share of a collection's data file held by deleted or overwritten records
+    pub async fn garbage_ratio(&self, name: &str) -> Result<f64> {
+        // Clone the storage reference to avoid holding the lock across await points
+        let storage = {
+            let collections = self.collections.read();
+            collections
+                .get(name)
+                .ok_or_else(|| VectorDbError::CollectionNotFound {
+                    name: name.to_string(),
+                })?
+                .clone()
+        };
+        
+        storage.garbage_ratio().await
+    }
+    
+    async fn recover(&self) -> Result<()> {
+        let recovery = RecoveryManager::new(&self.data_dir);
+        
+        // Start from the last checkpoint so only the WAL tail is replayed
+        let from_lsn = match Checkpoint::load(&self.data_dir)? {
+            Some(checkpoint) => {
+                for collection in &checkpoint.collections {
+                    let dir = self.data_dir.join(&collection.config.name);
+                    let storage = CollectionStorage::open(dir, collection).await?;
+                    self.collections.write().insert(collection.config.name.clone(), Arc::new(storage));
+                }
+                tracing::info!(
+                    "Loaded checkpoint at LSN {} with {} collections",
+                    checkpoint.lsn,
+                    checkpoint.collections.len()
+                );
+                *self.checkpoint_lsn.lock() = Some(checkpoint.lsn);
+                checkpoint.lsn
+            }
+            None => 0,
+        };
+        
+        let existing: HashSet<String> = self.collections.read().keys().cloned().collect();
+        let applied = recovery
+            .recover_from_wal(&self.wal, from_lsn, existing, |op| self.apply_operation(op))
+            .await?;
+        
+        tracing::info!("Recovered {} operations from WAL after LSN {}", applied, from_lsn);
         Ok(())
     }
     
-    async fn apply_operation(&mut self, op: WALOperation) -> Result<()> {
+    async fn apply_operation(&self, op: WALOperation) -> Result<()> {
         match op {
             WALOperation::CreateCollection(config) => {
                 let collection_dir = self.data_dir.join(&config.name);
@@ -250,6 +521,12 @@ impl StorageEngine {
             }
             WALOperation::DeleteCollection(name) => {
                 self.collections.write().remove(&name);
+                
+                // The directory may outlive the delete if we crashed mid-way
+                let collection_dir = self.data_dir.join(&name);
+                if collection_dir.exists() {
+                    std::fs::remove_dir_all(collection_dir)?;
+                }
             }
             WALOperation::InsertVector { collection, vector } => {
                 // Clone the storage reference to avoid holding the lock across await points
@@ -292,81 +569,286 @@ impl StorageEngine {
 
 /// Storage for a single collection
 pub struct CollectionStorage {
-    config: CollectionConfig,
+    dir: PathBuf,
+    /// Replaced when the collection's index is rebuilt with new parameters
+    config: RwLock<Arc<CollectionConfig>>,
+    /// Current generation of files; compaction swaps in a new one
+    files: RwLock<Arc<CollectionFiles>>,
+    /// Held shared by writers and exclusively by compaction while it swaps files
+    swap_gate: tokio::sync::RwLock<()>,
+    /// Keeps compactions of the collection from overlapping
+    compaction_lock: tokio::sync::Mutex<()>,
+}
+
+/// A generation of a collection's data file and the id index over it
+struct CollectionFiles {
+    generation: u64,
     data_file: MMapStorage,
-    index_file: MMapStorage,
+    /// Locations of live vectors in `data_file`
+    id_index: IdIndex,
+}
+
+impl CollectionFiles {
+    async fn open(dir: &Path, generation: u64, data_len: u64, index_len: u64) -> Result<Self> {
+        let (data_path, index_path) = generation_paths(dir, generation);
+        
+        let data_file = MMapStorage::new(data_path).await?;
+        data_file.set_position(data_len)?;
+        let id_index = IdIndex::open(index_path, index_len).await?;
+        
+        Ok(Self {
+            generation,
+            data_file,
+            id_index,
+        })
+    }
+    
+    /// Append a length-prefixed record, as `StorageIterator` expects, and index it
+    async fn append_record(&self, id: VectorId, payload: &[u8], record: &mut Vec<u8>) -> Result<()> {
+        record.clear();
+        record.extend_from_slice(&(payload.len() as u32).to_le_bytes());
+        record.extend_from_slice(payload);
+        
+        let offset = self.data_file.append(record).await?;
+        self.id_index.insert(id, RecordLocation {
+            offset: offset + 4,
+            length: payload.len() as u32,
+        }).await
+    }
+    
+    /// Append a record of another generation, reusing `record` as the buffer
+    async fn copy_record(
+        &self,
+        from: &CollectionFiles,
+        id: VectorId,
+        location: RecordLocation,
+        record: &mut Vec<u8>,
+    ) -> Result<()> {
+        let payload = from.data_file.read_ref(location.offset, location.length as usize)?.to_vec();
+        self.append_record(id, &payload, record).await
+    }
+    
+    async fn sync(&self) -> Result<()> {
+        self.data_file.sync().await?;
+        self.id_index.sync().await?;
+        Ok(())
+    }
 }
 
 impl CollectionStorage {
     async fn new<P: AsRef<Path>>(dir: P, config: CollectionConfig) -> Result<Self> {
-        let dir = dir.as_ref();
-        std::fs::create_dir_all(dir)?;
+        Self::create(dir.as_ref(), config, 0, 0, 0).await
+    }
+    
+    /// Open a collection as recorded by a checkpoint
+    async fn open<P: AsRef<Path>>(dir: P, checkpoint: &CollectionCheckpoint) -> Result<Self> {
+        let storage = Self::create(
+            dir.as_ref(),
+            checkpoint.config.clone(),
+            checkpoint.generation,
+            checkpoint.data_len,
+            checkpoint.index_len,
+        ).await?;
+        
+        // Checkpoints written before the id index existed only cover data
+        if checkpoint.index_len == 0 && checkpoint.data_len > 0 {
+            storage.rebuild_id_index().await?;
+        }
         
-        let data_path = dir.join("vectors.bin");
-        let index_path = dir.join("index.bin");
+        Ok(storage)
+    }
+    
+    async fn create(
+        dir: &Path,
+        config: CollectionConfig,
+        generation: u64,
+        data_len: u64,
+        index_len: u64,
+    ) -> Result<Self> {
+        std::fs::create_dir_all(dir)?;
         
-        let data_file = MMapStorage::new(data_path).await?;
-        let index_file = MMapStorage::new(index_path).await?;
+        // Other generations are either superseded or from an unfinished compaction
+        remove_generations(dir, |g| g != generation)?;
+        let files = CollectionFiles::open(dir, generation, data_len, index_len).await?;
         
         Ok(Self {
-            config,
-            data_file,
-            index_file,
+            dir: dir.to_path_buf(),
+            config: RwLock::new(Arc::new(config)),
+            files: RwLock::new(Arc::new(files)),
+            swap_gate: tokio::sync::RwLock::new(()),
+            compaction_lock: tokio::sync::Mutex::new(()),
         })
     }
     
-    fn config(&self) -> &CollectionConfig {
-        &self.config
+    /// Current generation of files; stays usable after a compaction swaps it out
+    fn files(&self) -> Arc<CollectionFiles> {
+        Arc::clone(&self.files.read())
     }
     
-    async fn insert(&self, vector: &Vector) -> Result<()> {
-        if vector.data.len() != self.config.dimension {
+    /// Index every record in the data file; later records win
+    async fn rebuild_id_index(&self) -> Result<()> {
+        let files = self.files();
+        let mut locations = Vec::new();
+        {
+            let mut records = files.data_file.iter().await?;
+            while let Some(record) = records.next_ref() {
+                let vector: Vector = bincode::deserialize(&record)
+                    .map_err(|e| VectorDbError::Serialization(e.to_string()))?;
+                let location = RecordLocation {
+                    offset: records.position() - record.len() as u64,
+                    length: record.len() as u32,
+                };
+                locations.push((vector.id, location));
+            }
+        }
+        
+        for (id, location) in locations {
+            files.id_index.insert(id, location).await?;
+        }
+        
+        tracing::info!("Rebuilt id index for {} ({} vectors)", self.config().name, files.id_index.len());
+        Ok(())
+    }
+    
+    fn config(&self) -> Arc<CollectionConfig> {
+        Arc::clone(&self.config.read())
+    }
+    
+    /// Generation and bytes in use of the data and id index files, read together
+    async fn checkpoint_state(&self) -> Result<(u64, u64, u64)> {
+        let files = self.files();
+        Ok((
+            files.generation,
+            files.data_file.position().await?,
+            files.id_index.file_len().await?,
+        ))
+    }
+    
+    /// Share of the data file held by deleted or overwritten records
+    async fn garbage_ratio(&self) -> Result<f64> {
+        let files = self.files();
+        let data_len = files.data_file.position().await?;
+        if data_len == 0 {
+            return Ok(0.0);
+        }
+        
+        let live = files.id_index.live_bytes() + 4 * files.id_index.len() as u64;
+        Ok(data_len.saturating_sub(live) as f64 / data_len as f64)
+    }
+    
+    /// Check a vector's dimension and serialize it as a record payload
+    fn encode(&self, vector: &Vector) -> Result<Vec<u8>> {
+        let dimension = self.config().dimension;
+        if vector.data.len() != dimension {
             return Err(VectorDbError::InvalidDimension {
-                expected: self.config.dimension,
+                expected: dimension,
                 actual: vector.data.len(),
             });
         }
         
-        let serialized = bincode::serialize(vector)
-            .map_err(|e| VectorDbError::Serialization(e.to_string()))?;
-        
-        self.data_file.append(&serialized).await?;
+        bincode::serialize(vector).map_err(|e| VectorDbError::Serialization(e.to_string()))
+    }
+    
+    async fn insert(&self, vector: &Vector) -> Result<()> {
+        let serialized = self.encode(vector)?;
         
-        Ok(())
+        let _swap = self.swap_gate.read().await;
+        let mut record = Vec::with_capacity(4 + serialized.len());
+        self.files().append_record(vector.id, &serialized, &mut record).await
     }
     
     async fn batch_insert(&self, vectors: &[Vector]) -> Result<()> {
+        let _swap = self.swap_gate.read().await;
+        let files = self.files();
+        let mut record = Vec::new();
         for vector in vectors {
-            self.insert(vector).await?;
+            let serialized = self.encode(vector)?;
+            files.append_record(vector.id, &serialized, &mut record).await?;
         }
         Ok(())
     }
     
-    async fn get(&self, _id: &VectorId) -> Result<Option<Vector>> {
-        // TODO: Implement efficient lookup using index
-        // For now, this is a placeholder
-        Ok(None)
+    async fn get(&self, id: &VectorId) -> Result<Option<Vector>> {
+        let files = self.files();
+        let location = match files.id_index.get(id) {
+            Some(location) => location,
+            None => return Ok(None),
+        };
+        
+        // Deserialize straight from the mapping
+        let record = files.data_file.read_ref(location.offset, location.length as usize)?;
+        let vector = bincode::deserialize(&record)
+            .map_err(|e| VectorDbError::Serialization(e.to_string()))?;
+        Ok(Some(vector))
     }
     
-    async fn delete(&self, _id: &VectorId) -> Result<bool> {
-        // TODO: Implement deletion with tombstone markers
-        // For now, this is a placeholder
-        Ok(false)
+    async fn delete(&self, id: &VectorId) -> Result<bool> {
+        // The record stays in the data file until the collection is compacted
+        let _swap = self.swap_gate.read().await;
+        Ok(self.files().id_index.remove(id).await?.is_some())
     }
     
     async fn stats(&self) -> Result<CollectionStats> {
+        let files = self.files();
+        let index_size = files.id_index.file_len().await?;
         Ok(CollectionStats {
-            name: self.config.name.clone(),
-            vector_count: 0, // TODO: Track count
-            dimension: self.config.dimension,
-            index_size: self.index_file.size().await? as usize,
-            memory_usage: (self.data_file.size().await? + self.index_file.size().await?) as usize,
+            name: self.config().name.clone(),
+            vector_count: files.id_index.len(),
+            dimension: self.config().dimension,
+            index_size: index_size as usize,
+            memory_usage: (files.data_file.size().await? + index_size) as usize,
         })
     }
     
     async fn sync(&self) -> Result<()> {
-        self.data_file.sync().await?;
-        self.index_file.sync().await?;
-        Ok(())
+        self.files().sync().await
     }
-}
\ No newline at end of file
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use tempfile::tempdir;
+    
+    #[tokio::test]
+    async fn test_vector_metadata_round_trip() {
+        let temp_dir = tempdir().unwrap();
+        let config = CollectionConfig {
+            name: "docs".to_string(),
+            dimension: 2,
+            distance_metric: DistanceMetric::Cosine,
+            vector_type: VectorType::Float32,
+            index_config: IndexConfig::default(),
+            durability: None,
+            indexed_fields: Vec::new(),
+        };
+        let vector = Vector {
+            id: uuid::Uuid::new_v4(),
+            data: vec![0.5, 1.0],
+            metadata: serde_json::from_value(serde_json::json!({
+                "title": "intro",
+                "tags": ["a", "b"],
+                "score": 0.75,
+            })).unwrap(),
+        };
+        
+        {
+            let engine = StorageEngine::new(temp_dir.path()).await.unwrap();
+            engine.create_collection(&config).await.unwrap();
+            engine.insert_vector("docs", &vector).await.unwrap();
+            let stored = engine.get_vector("docs", &vector.id).await.unwrap().unwrap();
+            assert_eq!(stored.metadata, vector.metadata);
+            
+            // Leave a checkpoint without an id index, so reopening rebuilds
+            // it from the records
+            let lsn = engine.wal_lsn().await.unwrap();
+            let mut checkpoint = engine.capture_checkpoint(lsn).await.unwrap();
+            checkpoint.collections[0].index_len = 0;
+            engine.write_checkpoint(&checkpoint, lsn).await.unwrap();
+        }
+        
+        let engine = StorageEngine::new(temp_dir.path()).await.unwrap();
+        let stored = engine.get_vector("docs", &vector.id).await.unwrap().unwrap();
+        assert_eq!(stored.metadata, vector.metadata);
+    }
+}
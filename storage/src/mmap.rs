@@ -1,19 +1,27 @@
 use vectordb_common::{Result, VectorDbError};
 use std::path::{Path, PathBuf};
 use std::fs::{File, OpenOptions};
+use std::sync::atomic::{AtomicU64, Ordering};
 use memmap2::{MmapMut, MmapOptions};
-use parking_lot::Mutex;
+use parking_lot::{MappedRwLockReadGuard, Mutex, RwLock, RwLockReadGuard};
 
 const INITIAL_SIZE: u64 = 1024 * 1024; // 1MB initial size
 const GROWTH_FACTOR: f64 = 2.0;
 
 /// Memory-mapped file storage with automatic growth
+///
+/// Reads share a read lock on the mapping and can borrow bytes in place
+/// (`read_ref`, `StorageIterator::next_ref`); appends and growth take the
+/// write lock only while copying or remapping.
 pub struct MMapStorage {
     path: PathBuf,
     file: Mutex<File>,
-    mmap: Mutex<Option<MmapMut>>,
-    size: Mutex<u64>,
-    position: Mutex<u64>,
+    mmap: RwLock<MmapMut>,
+    /// Serializes appends so each one reserves a distinct range
+    append_lock: Mutex<()>,
+    size: AtomicU64,
+    /// End of the written data; reads never go past it
+    position: AtomicU64,
 }
 
 impl MMapStorage {
@@ -46,107 +54,119 @@ impl MMapStorage {
         Ok(Self {
             path,
             file: Mutex::new(file),
-            mmap: Mutex::new(Some(mmap)),
-            size: Mutex::new(size),
-            position: Mutex::new(0),
+            mmap: RwLock::new(mmap),
+            append_lock: Mutex::new(()),
+            size: AtomicU64::new(size),
+            position: AtomicU64::new(0),
         })
     }
     
     /// Append data to the storage
     pub async fn append(&self, data: &[u8]) -> Result<u64> {
-        let (current_position, need_grow) = {
-            let position = self.position.lock();
-            let size = self.size.lock();
-            (*position, *position + data.len() as u64 > *size)
-        };
+        let _append = self.append_lock.lock();
+        let start = self.position.load(Ordering::Acquire);
+        let end = start + data.len() as u64;
         
         // Check if we need to grow the file
-        if need_grow {
-            self.grow((current_position + data.len() as u64) * 2).await?;
+        if end > self.size.load(Ordering::Acquire) {
+            self.grow(end * 2)?;
         }
         
-        // Write data to memory map and update position
-        let old_position = {
-            let mut position = self.position.lock();
-            let mut mmap_guard = self.mmap.lock();
-            if let Some(mmap) = mmap_guard.as_mut() {
-                let start = *position as usize;
-                let end = start + data.len();
-                mmap[start..end].copy_from_slice(data);
-            }
-            
-            let old_position = *position;
-            *position += data.len() as u64;
-            old_position
-        };
+        // Readers never look past `position`, so they cannot see a partial copy
+        self.mmap.write()[start as usize..end as usize].copy_from_slice(data);
+        self.position.store(end, Ordering::Release);
         
-        Ok(old_position)
+        Ok(start)
     }
     
-    /// Read data at a specific offset
+    /// Read data at a specific offset into an owned buffer
     pub async fn read(&self, offset: u64, length: usize) -> Result<Vec<u8>> {
-        let mmap_guard = self.mmap.lock();
-        if let Some(mmap) = mmap_guard.as_ref() {
-            let start = offset as usize;
-            let end = start + length;
-            
-            if end > mmap.len() {
-                return Err(VectorDbError::StorageError {
-                    message: "Read beyond file boundary".to_string(),
-                });
-            }
-            
-            Ok(mmap[start..end].to_vec())
-        } else {
-            Err(VectorDbError::StorageError {
-                message: "Memory map not available".to_string(),
-            })
+        Ok(self.read_ref(offset, length)?.to_vec())
+    }
+    
+    /// Borrow data at a specific offset without copying
+    ///
+    /// The guard holds a shared lock on the mapping, which blocks appends
+    /// that need to grow the file; drop it before awaiting.
+    pub fn read_ref(&self, offset: u64, length: usize) -> Result<MappedRwLockReadGuard<'_, [u8]>> {
+        let end = offset
+            .checked_add(length as u64)
+            .filter(|&end| end <= self.position.load(Ordering::Acquire))
+            .ok_or_else(|| VectorDbError::StorageError {
+                message: "Read beyond end of data".to_string(),
+            })?;
+        
+        Ok(RwLockReadGuard::map(self.mmap.read(), |mmap| {
+            &mmap[offset as usize..end as usize]
+        }))
+    }
+    
+    /// Borrow the length-prefixed record at `offset`, with the offset of the next one
+    fn record_at(&self, offset: u64) -> Option<(MappedRwLockReadGuard<'_, [u8]>, u64)> {
+        let end = self.position.load(Ordering::Acquire);
+        if offset + 4 > end {
+            return None;
+        }
+        
+        let mmap = self.mmap.read();
+        let start = offset as usize;
+        let length = u32::from_le_bytes(mmap[start..start + 4].try_into().unwrap()) as u64;
+        let next = offset + 4 + length;
+        if next > end {
+            return None;
         }
+        
+        let record = RwLockReadGuard::map(mmap, |mmap| &mmap[start + 4..next as usize]);
+        Some((record, next))
     }
     
     /// Get current file size
     pub async fn size(&self) -> Result<u64> {
-        Ok(*self.size.lock())
+        Ok(self.size.load(Ordering::Acquire))
     }
     
     /// Get current write position
     pub async fn position(&self) -> Result<u64> {
-        Ok(*self.position.lock())
+        Ok(self.position.load(Ordering::Acquire))
+    }
+    
+    /// Set the write position, e.g. to the length recorded by a checkpoint
+    pub fn set_position(&self, position: u64) -> Result<()> {
+        let _append = self.append_lock.lock();
+        if position > self.size.load(Ordering::Acquire) {
+            return Err(VectorDbError::StorageError {
+                message: format!("Position {} beyond end of {}", position, self.path.display()),
+            });
+        }
+        self.position.store(position, Ordering::Release);
+        Ok(())
     }
     
     /// Sync data to disk
     pub async fn sync(&self) -> Result<()> {
-        let mmap_guard = self.mmap.lock();
-        if let Some(mmap) = mmap_guard.as_ref() {
-            mmap.flush()?;
-        }
-        
+        self.mmap.read().flush()?;
         self.file.lock().sync_all()?;
         Ok(())
     }
     
-    /// Grow the file to a new size
-    async fn grow(&self, new_size: u64) -> Result<()> {
+    /// Grow the file to a new size; callers hold `append_lock`
+    fn grow(&self, new_size: u64) -> Result<()> {
         let file = self.file.lock();
-        let mut mmap_guard = self.mmap.lock();
-        let mut size = self.size.lock();
-        
-        // Drop current memory map
-        *mmap_guard = None;
         
         // Resize file
         file.set_len(new_size)?;
         file.sync_all()?;
         
-        // Create new memory map
+        // Map the larger file before taking the write lock so readers only
+        // wait for the swap
         let new_mmap = unsafe {
             MmapOptions::new()
                 .len(new_size as usize)
                 .map_mut(&*file)?
         };
         
-        *mmap_guard = Some(new_mmap);
-        *size = new_size;
+        *self.mmap.write() = new_mmap;
+        self.size.store(new_size, Ordering::Release);
         
         tracing::debug!("Grew storage file to {} bytes", new_size);
         Ok(())
@@ -170,34 +190,22 @@ pub struct StorageIterator<'a> {
 impl<'a> StorageIterator<'a> {
     /// Get the next record
     pub async fn next(&mut self) -> Result<Option<Vec<u8>>> {
-        let current_size = self.storage.position().await?;
-        
-        if self.position >= current_size {
-            return Ok(None);
-        }
-        
-        // Read length prefix (4 bytes)
-        if self.position + 4 > current_size {
-            return Ok(None);
-        }
-        
-        let length_bytes = self.storage.read(self.position, 4).await?;
-        let length = u32::from_le_bytes([
-            length_bytes[0],
-            length_bytes[1], 
-            length_bytes[2],
-            length_bytes[3],
-        ]) as u64;
-        
-        if self.position + 4 + length > current_size {
-            return Ok(None);
-        }
-        
-        // Read data
-        let data = self.storage.read(self.position + 4, length as usize).await?;
-        self.position += 4 + length;
-        
-        Ok(Some(data))
+        Ok(self.next_ref().map(|record| record.to_vec()))
+    }
+    
+    /// Borrow the next record without copying
+    ///
+    /// Each record takes its own short read lock, so a long scan does not
+    /// hold off appends between records.
+    pub fn next_ref(&mut self) -> Option<MappedRwLockReadGuard<'a, [u8]>> {
+        let (record, next) = self.storage.record_at(self.position)?;
+        self.position = next;
+        Some(record)
+    }
+    
+    /// Offset of the next record
+    pub fn position(&self) -> u64 {
+        self.position
     }
 }
 
@@ -238,4 +246,51 @@ mod tests {
         let size = storage.size().await.unwrap();
         assert!(size > INITIAL_SIZE);
     }
-}
\ No newline at end of file
+    
+    #[tokio::test]
+    async fn test_zero_copy_iteration() {
+        let temp_dir = tempdir().unwrap();
+        let storage = MMapStorage::new(temp_dir.path().join("test.bin")).await.unwrap();
+        
+        for record in [&b"first"[..], b"second", b""] {
+            let mut data = (record.len() as u32).to_le_bytes().to_vec();
+            data.extend_from_slice(record);
+            storage.append(&data).await.unwrap();
+        }
+        
+        let mut iter = storage.iter().await.unwrap();
+        assert_eq!(&*iter.next_ref().unwrap(), b"first");
+        assert_eq!(iter.next().await.unwrap().unwrap(), b"second");
+        assert_eq!(&*iter.next_ref().unwrap(), b"");
+        assert!(iter.next_ref().is_none());
+        
+        // Written data only; the preallocated tail is not readable
+        assert!(storage.read_ref(0, INITIAL_SIZE as usize).is_err());
+    }
+    
+    #[tokio::test]
+    async fn test_concurrent_reads_during_growth() {
+        let temp_dir = tempdir().unwrap();
+        let storage = std::sync::Arc::new(MMapStorage::new(temp_dir.path().join("test.bin")).await.unwrap());
+        storage.append(&[7u8; 4096]).await.unwrap();
+        
+        let readers: Vec<_> = (0..4)
+            .map(|_| {
+                let storage = std::sync::Arc::clone(&storage);
+                std::thread::spawn(move || {
+                    for _ in 0..1000 {
+                        let bytes = storage.read_ref(0, 4096).unwrap();
+                        assert!(bytes.iter().all(|&b| b == 7));
+                    }
+                })
+            })
+            .collect();
+        
+        // Appends past the initial size remap the file while readers run
+        storage.append(&vec![1u8; (INITIAL_SIZE * 2) as usize]).await.unwrap();
+        for reader in readers {
+            reader.join().unwrap();
+        }
+        assert!(storage.size().await.unwrap() > INITIAL_SIZE);
+    }
+}
@@ -1,7 +1,9 @@
 use vectordb_common::{Result, VectorDbError};
 use crate::wal::{WriteAheadLog, WALOperation};
+use crate::compaction::has_collection_files;
 use std::path::{Path, PathBuf};
 use std::collections::HashSet;
+use std::future::Future;
 use tokio::fs;
 use tracing::{info, warn};
 
@@ -18,28 +20,52 @@ impl RecoveryManager {
     }
     
     /// Recover from WAL after a crash
-    pub async fn recover_from_wal(&self, wal: &WriteAheadLog) -> Result<Vec<WALOperation>> {
-        info!("Starting crash recovery from WAL");
-        
-        // Read all operations from WAL
-        let operations = wal.read_all().await?;
-        
-        if operations.is_empty() {
-            info!("No operations found in WAL, recovery complete");
-            return Ok(operations);
+    ///
+    /// Streams entries after `from_lsn` one at a time, validates each against
+    /// the collections known so far (`collections` holds those restored from
+    /// a checkpoint) and hands valid ones to `apply`. Returns the number of
+    /// operations applied.
+    pub async fn recover_from_wal<F, Fut>(
+        &self,
+        wal: &WriteAheadLog,
+        from_lsn: u64,
+        mut collections: HashSet<String>,
+        mut apply: F,
+    ) -> Result<usize>
+    where
+        F: FnMut(WALOperation) -> Fut,
+        Fut: Future<Output = Result<()>>,
+    {
+        info!("Starting crash recovery from WAL at LSN {}", from_lsn);
+        
+        let mut reader = wal.reader_from(from_lsn).await?;
+        let mut applied = 0;
+        
+        while let Some((lsn, op)) = reader.next().await? {
+            match self.validate_operation(&op, &mut collections).await {
+                Ok(()) => {
+                    apply(op).await?;
+                    applied += 1;
+                }
+                Err(e) => {
+                    warn!("Invalid operation at LSN {}: {:?} - {}", lsn, op, e);
+                    // Continue with remaining operations
+                }
+            }
         }
         
-        // Validate operations and check for consistency
-        let validated_ops = self.validate_operations(&operations).await?;
+        self.report_untracked_collections(&collections).await?;
         
-        info!("Recovered {} valid operations from WAL", validated_ops.len());
-        Ok(validated_ops)
+        info!("Recovered {} valid operations from WAL", applied);
+        Ok(applied)
     }
     
     /// Validate operations for consistency
-    async fn validate_operations(&self, operations: &[WALOperation]) -> Result<Vec<WALOperation>> {
+    pub async fn validate_operations(&self, operations: &[WALOperation]) -> Result<Vec<WALOperation>> {
         let mut valid_ops = Vec::new();
-        let mut existing_collections = self.discover_existing_collections().await?;
+        // Collection directories on disk were created by the CreateCollection
+        // entries being replayed, so validation starts from an empty set
+        let mut existing_collections = HashSet::new();
         
         for (i, op) in operations.iter().enumerate() {
             match self.validate_operation(op, &mut existing_collections).await {
@@ -53,9 +79,20 @@ impl RecoveryManager {
             }
         }
         
+        self.report_untracked_collections(&existing_collections).await?;
+        
         Ok(valid_ops)
     }
     
+    /// Warn about collection directories that recovery did not restore
+    async fn report_untracked_collections(&self, known: &HashSet<String>) -> Result<()> {
+        let on_disk = self.discover_existing_collections().await?;
+        for name in on_disk.difference(known) {
+            warn!("Collection directory {} has no WAL history and will not be loaded", name);
+        }
+        Ok(())
+    }
+    
     /// Validate a single operation
     async fn validate_operation(
         &self,
@@ -129,10 +166,7 @@ impl RecoveryManager {
             
             if path.is_dir() {
                 // Check if it looks like a collection directory
-                let vectors_file = path.join("vectors.bin");
-                let index_file = path.join("index.bin");
-                
-                if vectors_file.exists() || index_file.exists() {
+                if has_collection_files(&path) {
                     if let Some(name) = path.file_name().and_then(|n| n.to_str()) {
                         collections.insert(name.to_string());
                     }
@@ -174,9 +208,8 @@ impl RecoveryManager {
         
         // Check if required files exist
         let vectors_file = collection_dir.join("vectors.bin");
-        let index_file = collection_dir.join("index.bin");
         
-        if !vectors_file.exists() && !index_file.exists() {
+        if !has_collection_files(&collection_dir) {
             return Err(VectorDbError::StorageError {
                 message: "No data files found".to_string(),
             });
@@ -282,6 +315,8 @@ mod tests {
             distance_metric: DistanceMetric::Cosine,
             vector_type: VectorType::Float32,
             index_config: IndexConfig::default(),
+            durability: None,
+            indexed_fields: Vec::new(),
         };
         
         let operations = vec![
@@ -299,4 +334,29 @@ mod tests {
         let validated = recovery.validate_operations(&operations).await.unwrap();
         assert_eq!(validated.len(), 2);
     }
+    
+    #[tokio::test]
+    async fn test_validate_replays_existing_collection() {
+        let temp_dir = tempdir().unwrap();
+        let recovery = RecoveryManager::new(temp_dir.path());
+        
+        // The directory exists because the logged CreateCollection made it
+        let collection_dir = temp_dir.path().join("test");
+        fs::create_dir_all(&collection_dir).await.unwrap();
+        fs::File::create(collection_dir.join("vectors.bin")).await.unwrap();
+        
+        let config = CollectionConfig {
+            name: "test".to_string(),
+            dimension: 3,
+            distance_metric: DistanceMetric::Cosine,
+            vector_type: VectorType::Float32,
+            index_config: IndexConfig::default(),
+            durability: None,
+            indexed_fields: Vec::new(),
+        };
+        
+        let operations = vec![WALOperation::CreateCollection(config)];
+        let validated = recovery.validate_operations(&operations).await.unwrap();
+        assert_eq!(validated.len(), 1);
+    }
 }
\ No newline at end of file
@@ -1,9 +1,16 @@
 use vectordb_common::{Result, VectorDbError};
 use vectordb_common::types::*;
 use serde::{Deserialize, Serialize};
+use std::collections::VecDeque;
+use std::io::{Read, Write};
 use std::path::{Path, PathBuf};
-use tokio::fs::{File, OpenOptions};
-use tokio::io::{AsyncReadExt, AsyncWriteExt, BufReader};
+use std::sync::atomic::{AtomicU64, Ordering};
+use std::sync::mpsc::{self, Receiver, RecvTimeoutError, Sender};
+use std::sync::Arc;
+use std::time::{Duration, Instant};
+use tokio::fs::File;
+use tokio::io::{AsyncReadExt, AsyncSeekExt, BufReader, SeekFrom};
+use tokio::sync::oneshot;
 use uuid::Uuid;
 
 /// Write-Ahead Log operations
@@ -34,30 +41,220 @@ struct WALEntry {
     operation: WALOperation,
 }
 
+/// Upper bound on bytes gathered into a single group commit
+const MAX_GROUP_BYTES: usize = 4 * 1024 * 1024;
+
+/// Default size at which the WAL rolls over to a new segment file
+pub const DEFAULT_SEGMENT_SIZE: u64 = 64 * 1024 * 1024;
+
+/// WAL options
+#[derive(Debug, Clone)]
+pub struct WalOptions {
+    /// Durability for appends that do not choose one
+    pub durability: DurabilityMode,
+    /// Segment size in bytes; segments may exceed it by one group commit
+    pub segment_size: u64,
+}
+
+impl Default for WalOptions {
+    fn default() -> Self {
+        Self {
+            durability: DurabilityMode::default(),
+            segment_size: DEFAULT_SEGMENT_SIZE,
+        }
+    }
+}
+
+/// Segment files are named after the LSN of their first byte
+fn segment_path(dir: &Path, start: u64) -> PathBuf {
+    dir.join(format!("{:020}.log", start))
+}
+
+/// Start LSNs of the segments in `dir`, oldest first
+fn list_segments(dir: &Path) -> Result<Vec<u64>> {
+    let mut segments = Vec::new();
+    for entry in std::fs::read_dir(dir)? {
+        let name = entry?.file_name();
+        if let Some(start) = name
+            .to_str()
+            .and_then(|name| name.strip_suffix(".log"))
+            .and_then(|stem| stem.parse().ok())
+        {
+            segments.push(start);
+        }
+    }
+    segments.sort_unstable();
+    Ok(segments)
+}
+
+/// Move a pre-segmentation single-file WAL into a segment directory
+fn migrate_legacy_log(path: &Path) -> Result<()> {
+    let legacy = path.with_extension("legacy");
+    if path.is_file() {
+        std::fs::rename(path, &legacy)?;
+    }
+    if legacy.is_file() {
+        std::fs::create_dir_all(path)?;
+        // The old file started at offset 0, so its LSNs stay valid
+        std::fs::rename(&legacy, segment_path(path, 0))?;
+        tracing::info!("Migrated WAL file to segment directory {}", path.display());
+    }
+    Ok(())
+}
+
+/// Cut a segment back to its last complete record
+///
+/// A crash during a write can leave the final record short or garbled.
+/// It was never acknowledged, so it is dropped; appending after it would
+/// make every later record unreadable.
+fn repair_segment_tail(path: &Path) -> Result<()> {
+    let file = std::fs::OpenOptions::new().read(true).write(true).open(path)?;
+    let file_len = file.metadata()?.len();
+    let mut reader = std::io::BufReader::new(&file);
+    let mut complete = 0u64;
+    let mut length_bytes = [0u8; 4];
+    let mut entry_data = Vec::new();
+    
+    while complete < file_len {
+        match reader.read_exact(&mut length_bytes) {
+            Ok(()) => {}
+            Err(e) if e.kind() == std::io::ErrorKind::UnexpectedEof => break,
+            Err(e) => return Err(e.into()),
+        }
+        let length = u32::from_le_bytes(length_bytes) as u64;
+        if complete + 4 + length > file_len {
+            break;
+        }
+        entry_data.resize(length as usize, 0);
+        reader.read_exact(&mut entry_data)?;
+        if bincode::deserialize::<WALEntry>(&entry_data).is_err() {
+            break;
+        }
+        complete += 4 + length;
+    }
+    
+    if complete < file_len {
+        tracing::warn!(
+            "Discarding {} bytes of incomplete WAL record at the end of {}",
+            file_len - complete,
+            path.display()
+        );
+        file.set_len(complete)?;
+        file.sync_all()?;
+    }
+    Ok(())
+}
+
+fn sync_dir(dir: &Path) -> Result<()> {
+    std::fs::File::open(dir)?.sync_all()?;
+    Ok(())
+}
+
+/// Work sent to the WAL writer thread
+enum WriterRequest {
+    Append {
+        record: Vec<u8>,
+        durability: DurabilityMode,
+        done: oneshot::Sender<Result<u64>>,
+    },
+    Sync {
+        done: oneshot::Sender<Result<()>>,
+    },
+    Truncate {
+        done: oneshot::Sender<Result<()>>,
+    },
+}
+
 /// Write-Ahead Log for durability
+///
+/// Appends are handed to a dedicated writer thread. Whatever appends are
+/// queued when it wakes up are written with one `write` call and, unless
+/// they all opted out, made durable with one fsync (group commit).
+///
+/// The log is a directory of segment files. An entry's LSN is its global
+/// byte offset, so segments that only hold entries already covered by a
+/// checkpoint can be deleted without renumbering the rest.
 pub struct WriteAheadLog {
-    path: PathBuf,
+    dir: PathBuf,
+    default_durability: DurabilityMode,
+    sender: Option<Sender<WriterRequest>>,
+    writer: Option<std::thread::JoinHandle<()>>,
+    lsn: Arc<AtomicU64>,
 }
 
 impl WriteAheadLog {
     pub async fn new<P: AsRef<Path>>(path: P) -> Result<Self> {
-        let path = path.as_ref().to_path_buf();
+        Self::with_options(path, WalOptions::default()).await
+    }
+    
+    /// Open a WAL whose appends use `default_durability` unless overridden
+    pub async fn with_durability<P: AsRef<Path>>(path: P, default_durability: DurabilityMode) -> Result<Self> {
+        Self::with_options(path, WalOptions {
+            durability: default_durability,
+            ..WalOptions::default()
+        }).await
+    }
+    
+    /// Open the WAL segment directory at `path`, creating it if needed
+    pub async fn with_options<P: AsRef<Path>>(path: P, options: WalOptions) -> Result<Self> {
+        let dir = path.as_ref().to_path_buf();
         
-        // Ensure parent directory exists
-        if let Some(parent) = path.parent() {
-            tokio::fs::create_dir_all(parent).await?;
-        }
+        migrate_legacy_log(&dir)?;
+        tokio::fs::create_dir_all(&dir).await?;
         
-        // Create file if it doesn't exist
-        if !path.exists() {
-            tokio::fs::File::create(&path).await?;
+        let segment_start = match list_segments(&dir)?.last() {
+            Some(&start) => start,
+            None => 0,
+        };
+        let segment = segment_path(&dir, segment_start);
+        if segment.is_file() {
+            repair_segment_tail(&segment)?;
         }
+        let file = std::fs::OpenOptions::new()
+            .create(true)
+            .append(true)
+            .open(&segment)?;
+        sync_dir(&dir)?;
+        let lsn = Arc::new(AtomicU64::new(segment_start + file.metadata()?.len()));
+        
+        let (sender, receiver) = mpsc::channel();
+        let writer = {
+            let lsn = Arc::clone(&lsn);
+            let dir = dir.clone();
+            let segment_size = options.segment_size.max(1);
+            std::thread::Builder::new()
+                .name("wal-writer".to_string())
+                .spawn(move || WalWriter::new(dir, file, segment_start, segment_size, lsn).run(receiver))?
+        };
         
-        Ok(Self { path })
+        Ok(Self {
+            dir,
+            default_durability: options.durability,
+            sender: Some(sender),
+            writer: Some(writer),
+            lsn,
+        })
+    }
+    
+    /// Default durability used when an append does not choose one
+    pub fn default_durability(&self) -> DurabilityMode {
+        self.default_durability
     }
     
-    /// Append an operation to the WAL
-    pub async fn append(&self, operation: &WALOperation) -> Result<()> {
+    /// Append an operation to the WAL with the default durability
+    ///
+    /// Returns the log sequence number (LSN) of the entry: the byte offset
+    /// just past its end. Everything with an LSN at or below a given value
+    /// was written before it.
+    pub async fn append(&self, operation: &WALOperation) -> Result<u64> {
+        self.append_with(operation, None).await
+    }
+    
+    /// Append an operation, overriding the default durability if given
+    ///
+    /// Returns once the entry is as durable as the mode requires: fsynced
+    /// for `FsyncEach` and `Group`, written to the OS for the other modes.
+    pub async fn append_with(&self, operation: &WALOperation, durability: Option<DurabilityMode>) -> Result<u64> {
         let entry = WALEntry {
             id: Uuid::new_v4(),
             timestamp: std::time::SystemTime::now()
@@ -71,35 +268,183 @@ impl WriteAheadLog {
         let serialized = bincode::serialize(&entry)
             .map_err(|e| VectorDbError::Serialization(e.to_string()))?;
         
-        // Write length prefix followed by data
-        let length = serialized.len() as u32;
-        
-        let mut file = OpenOptions::new()
-            .create(true)
-            .append(true)
-            .open(&self.path)
-            .await?;
+        // Length prefix followed by data
+        let mut record = Vec::with_capacity(4 + serialized.len());
+        record.extend_from_slice(&(serialized.len() as u32).to_le_bytes());
+        record.extend_from_slice(&serialized);
         
-        file.write_all(&length.to_le_bytes()).await?;
-        file.write_all(&serialized).await?;
-        file.sync_all().await?;
+        let (done, wait) = oneshot::channel();
+        self.send(WriterRequest::Append {
+            record,
+            durability: durability.unwrap_or(self.default_durability),
+            done,
+        })?;
+        let lsn = wait.await.map_err(|_| Self::writer_stopped())??;
         
-        tracing::debug!("Appended WAL entry: {:?}", entry.id);
-        Ok(())
+        tracing::debug!("Appended WAL entry: {:?} at LSN {}", entry.id, lsn);
+        Ok(lsn)
+    }
+    
+    fn send(&self, request: WriterRequest) -> Result<()> {
+        self.sender
+            .as_ref()
+            .and_then(|sender| sender.send(request).ok())
+            .ok_or_else(Self::writer_stopped)
+    }
+    
+    fn writer_stopped() -> VectorDbError {
+        VectorDbError::StorageError {
+            message: "WAL writer has stopped".to_string(),
+        }
     }
     
-    /// Read all entries from the WAL
+    /// Read all retained entries from the WAL into memory
     pub async fn read_all(&self) -> Result<Vec<WALOperation>> {
-        let file = File::open(&self.path).await?;
-        let mut reader = BufReader::new(file);
+        let operations: Vec<WALOperation> = self
+            .read_from(0)
+            .await?
+            .into_iter()
+            .map(|(_, op)| op)
+            .collect();
+        
+        tracing::info!("Read {} operations from WAL", operations.len());
+        Ok(operations)
+    }
+    
+    /// Read entries after the given LSN into memory, paired with their own LSNs
+    ///
+    /// Use [`WriteAheadLog::reader_from`] to stream large logs instead.
+    pub async fn read_from(&self, lsn: u64) -> Result<Vec<(u64, WALOperation)>> {
+        let mut reader = self.reader_from(lsn).await?;
         let mut operations = Vec::new();
+        while let Some(entry) = reader.next().await? {
+            operations.push(entry);
+        }
+        Ok(operations)
+    }
+    
+    /// Stream entries after the given LSN, one at a time
+    ///
+    /// Positions older than the oldest retained segment start at that
+    /// segment; everything before it was covered by a checkpoint.
+    pub async fn reader_from(&self, lsn: u64) -> Result<WalReader> {
+        let segments = list_segments(&self.dir)?;
+        // Skip segments that end at or before `lsn`
+        let first = segments
+            .iter()
+            .rposition(|&start| start <= lsn)
+            .unwrap_or(0);
         
+        Ok(WalReader {
+            dir: self.dir.clone(),
+            segments: segments[first..].iter().copied().collect(),
+            current: None,
+            position: lsn,
+        })
+    }
+    
+    /// LSN at which the oldest retained segment starts
+    pub async fn oldest_lsn(&self) -> Result<u64> {
+        Ok(list_segments(&self.dir)?.first().copied().unwrap_or(0))
+    }
+    
+    /// Delete segments holding only entries at or before `lsn`
+    ///
+    /// The active segment is never deleted. Returns the number removed.
+    pub async fn remove_segments_before(&self, lsn: u64) -> Result<usize> {
+        let segments = list_segments(&self.dir)?;
+        let mut removed = 0;
+        
+        // A segment ends where the next one starts
+        for pair in segments.windows(2) {
+            if pair[1] > lsn {
+                break;
+            }
+            tokio::fs::remove_file(segment_path(&self.dir, pair[0])).await?;
+            removed += 1;
+        }
+        
+        if removed > 0 {
+            tracing::info!("Removed {} WAL segments before LSN {}", removed, lsn);
+        }
+        Ok(removed)
+    }
+    
+    /// Current end of the log; the LSN of the most recent entry
+    pub async fn current_lsn(&self) -> Result<u64> {
+        Ok(self.lsn.load(Ordering::Acquire))
+    }
+    
+    /// Sync the WAL to disk, including appends made without fsync
+    pub async fn sync(&self) -> Result<()> {
+        let (done, wait) = oneshot::channel();
+        self.send(WriterRequest::Sync { done })?;
+        wait.await.map_err(|_| Self::writer_stopped())?
+    }
+    
+    /// Truncate the WAL (after successful checkpoint)
+    ///
+    /// Starts a new segment and deletes all older ones. LSNs keep increasing,
+    /// so positions recorded by checkpoints and snapshots stay comparable.
+    pub async fn truncate(&mut self) -> Result<()> {
+        let (done, wait) = oneshot::channel();
+        self.send(WriterRequest::Truncate { done })?;
+        wait.await.map_err(|_| Self::writer_stopped())??;
+        
+        tracing::info!("Truncated WAL");
+        Ok(())
+    }
+    
+    /// Get the total size of the retained WAL segments
+    pub async fn size(&self) -> Result<u64> {
+        let mut size = 0;
+        for start in list_segments(&self.dir)? {
+            size += tokio::fs::metadata(segment_path(&self.dir, start)).await?.len();
+        }
+        Ok(size)
+    }
+}
+
+/// Streaming reader over WAL segments
+pub struct WalReader {
+    dir: PathBuf,
+    /// Start LSNs of the segments still to be read
+    segments: VecDeque<u64>,
+    current: Option<BufReader<File>>,
+    /// LSN just past the last entry returned
+    position: u64,
+}
+
+impl WalReader {
+    /// Get the next entry and its LSN
+    pub async fn next(&mut self) -> Result<Option<(u64, WALOperation)>> {
         loop {
+            if self.current.is_none() {
+                let start = match self.segments.pop_front() {
+                    Some(start) => start,
+                    None => return Ok(None),
+                };
+                let mut file = match File::open(segment_path(&self.dir, start)).await {
+                    Ok(file) => file,
+                    // Removed by a checkpoint while we were reading older segments
+                    Err(e) if e.kind() == std::io::ErrorKind::NotFound => continue,
+                    Err(e) => return Err(e.into()),
+                };
+                self.position = self.position.max(start);
+                file.seek(SeekFrom::Start(self.position - start)).await?;
+                self.current = Some(BufReader::new(file));
+            }
+            let reader = self.current.as_mut().unwrap();
+            
             // Read length prefix
             let mut length_bytes = [0u8; 4];
             match reader.read_exact(&mut length_bytes).await {
                 Ok(_) => {}
-                Err(e) if e.kind() == std::io::ErrorKind::UnexpectedEof => break,
+                Err(e) if e.kind() == std::io::ErrorKind::UnexpectedEof => {
+                    // End of this segment, continue with the next one
+                    self.current = None;
+                    continue;
+                }
                 Err(e) => return Err(e.into()),
             }
             
@@ -107,7 +452,16 @@ impl WriteAheadLog {
             
             // Read entry data
             let mut entry_data = vec![0u8; length];
-            reader.read_exact(&mut entry_data).await?;
+            match reader.read_exact(&mut entry_data).await {
+                Ok(_) => {}
+                // A record still being written ends the log for now
+                Err(e) if e.kind() == std::io::ErrorKind::UnexpectedEof && self.segments.is_empty() => {
+                    self.current = None;
+                    return Ok(None);
+                }
+                Err(e) => return Err(e.into()),
+            }
+            self.position += 4 + length as u64;
             
             // Deserialize entry
             let entry: WALEntry = bincode::deserialize(&entry_data)
@@ -115,37 +469,243 @@ impl WriteAheadLog {
             
             // TODO: Verify checksum
             
-            operations.push(entry.operation);
+            return Ok(Some((self.position, entry.operation)));
+        }
+    }
+}
+
+impl Drop for WriteAheadLog {
+    fn drop(&mut self) {
+        // Closing the channel lets the writer flush outstanding data and exit
+        self.sender.take();
+        if let Some(writer) = self.writer.take() {
+            let _ = writer.join();
+        }
+    }
+}
+
+/// State owned by the WAL writer thread
+struct WalWriter {
+    dir: PathBuf,
+    file: std::fs::File,
+    /// LSN of the first byte of the active segment
+    segment_start: u64,
+    segment_size: u64,
+    lsn: Arc<AtomicU64>,
+    position: u64,
+    /// When data written without fsync must be synced by (interval mode)
+    sync_deadline: Option<Instant>,
+    /// Data has been written since the last fsync
+    dirty: bool,
+    /// A request pulled from the queue that must start the next batch
+    pending: Option<WriterRequest>,
+}
+
+impl WalWriter {
+    fn new(dir: PathBuf, file: std::fs::File, segment_start: u64, segment_size: u64, lsn: Arc<AtomicU64>) -> Self {
+        let position = lsn.load(Ordering::Acquire);
+        Self {
+            dir,
+            file,
+            segment_start,
+            segment_size,
+            lsn,
+            position,
+            sync_deadline: None,
+            dirty: false,
+            pending: None,
+        }
+    }
+    
+    fn run(mut self, receiver: Receiver<WriterRequest>) {
+        loop {
+            let request = match self.pending.take() {
+                Some(request) => request,
+                None => match self.sync_deadline {
+                    Some(deadline) => {
+                        match receiver.recv_timeout(deadline.saturating_duration_since(Instant::now())) {
+                            Ok(request) => request,
+                            Err(RecvTimeoutError::Timeout) => {
+                                if let Err(e) = self.sync() {
+                                    tracing::error!("Background WAL sync failed: {}", e);
+                                }
+                                continue;
+                            }
+                            Err(RecvTimeoutError::Disconnected) => break,
+                        }
+                    }
+                    None => match receiver.recv() {
+                        Ok(request) => request,
+                        Err(_) => break,
+                    },
+                },
+            };
+            
+            match request {
+                WriterRequest::Append { record, durability, done } => {
+                    let mut batch = vec![(record, durability, done)];
+                    if durability != DurabilityMode::FsyncEach {
+                        self.gather(&receiver, &mut batch);
+                    }
+                    self.commit(batch);
+                    if self.position - self.segment_start >= self.segment_size {
+                        if let Err(e) = self.rotate() {
+                            tracing::error!("WAL segment rotation failed: {}", e);
+                        }
+                    }
+                }
+                WriterRequest::Sync { done } => {
+                    let _ = done.send(self.sync());
+                }
+                WriterRequest::Truncate { done } => {
+                    let _ = done.send(self.truncate());
+                }
+            }
+            
+            // Interval-mode data is due for its background fsync
+            if self.sync_deadline.map_or(false, |deadline| Instant::now() >= deadline) {
+                if let Err(e) = self.sync() {
+                    tracing::error!("Background WAL sync failed: {}", e);
+                }
+            }
         }
         
-        tracing::info!("Read {} operations from WAL", operations.len());
-        Ok(operations)
+        if self.dirty {
+            if let Err(e) = self.sync() {
+                tracing::error!("Final WAL sync failed: {}", e);
+            }
+        }
     }
     
-    /// Sync the WAL to disk
-    pub async fn sync(&self) -> Result<()> {
-        // WAL is synced on every append, so this is a no-op
+    /// Pull already-queued appends into the batch without waiting
+    fn gather(
+        &mut self,
+        receiver: &Receiver<WriterRequest>,
+        batch: &mut Vec<(Vec<u8>, DurabilityMode, oneshot::Sender<Result<u64>>)>,
+    ) {
+        let mut bytes: usize = batch.iter().map(|(record, _, _)| record.len()).sum();
+        
+        while bytes < MAX_GROUP_BYTES {
+            match receiver.try_recv() {
+                Ok(WriterRequest::Append { record, durability, done })
+                    if durability != DurabilityMode::FsyncEach =>
+                {
+                    bytes += record.len();
+                    batch.push((record, durability, done));
+                }
+                Ok(other) => {
+                    self.pending = Some(other);
+                    break;
+                }
+                Err(_) => break,
+            }
+        }
+    }
+    
+    /// Write a batch of records with one write and at most one fsync
+    fn commit(&mut self, batch: Vec<(Vec<u8>, DurabilityMode, oneshot::Sender<Result<u64>>)>) {
+        let mut buffer = Vec::with_capacity(batch.iter().map(|(record, _, _)| record.len()).sum());
+        let mut ends = Vec::with_capacity(batch.len());
+        let mut position = self.position;
+        let mut needs_fsync = false;
+        let mut interval: Option<u64> = None;
+        
+        for (record, durability, _) in &batch {
+            buffer.extend_from_slice(record);
+            position += record.len() as u64;
+            ends.push(position);
+            
+            match durability {
+                DurabilityMode::FsyncEach | DurabilityMode::Group => needs_fsync = true,
+                DurabilityMode::IntervalMs(ms) => {
+                    interval = Some(interval.map_or(*ms, |current| current.min(*ms)));
+                }
+                DurabilityMode::None => {}
+            }
+        }
+        
+        let mut result = self.file.write_all(&buffer);
+        if result.is_ok() {
+            self.position = position;
+            self.dirty = true;
+            if needs_fsync {
+                result = self.file.sync_data();
+                if result.is_ok() {
+                    self.dirty = false;
+                    self.sync_deadline = None;
+                }
+            } else if let Some(ms) = interval {
+                let deadline = Instant::now() + Duration::from_millis(ms);
+                self.sync_deadline = Some(self.sync_deadline.map_or(deadline, |d| d.min(deadline)));
+            }
+        } else {
+            self.discard_torn_tail();
+        }
+        self.lsn.store(self.position, Ordering::Release);
+        
+        tracing::trace!("Committed {} WAL entries ({} bytes, fsync: {})", batch.len(), buffer.len(), needs_fsync);
+        
+        for ((_, _, done), end) in batch.into_iter().zip(ends) {
+            let reply = match &result {
+                Ok(()) => Ok(end),
+                Err(e) => Err(VectorDbError::StorageError {
+                    message: format!("WAL write failed: {}", e),
+                }),
+            };
+            let _ = done.send(reply);
+        }
+    }
+    
+    /// Cut off whatever part of a failed write reached the segment, so
+    /// replay never meets a partial entry. If that fails too, carry on
+    /// after the torn bytes instead, as LSNs must never go backwards.
+    fn discard_torn_tail(&mut self) {
+        if let Err(e) = self.file.set_len(self.position - self.segment_start) {
+            tracing::error!("Failed to truncate torn WAL entry: {}", e);
+            if let Ok(metadata) = self.file.metadata() {
+                self.position = self.position.max(self.segment_start + metadata.len());
+            }
+        }
+    }
+    
+    fn sync(&mut self) -> Result<()> {
+        self.file.sync_data()?;
+        self.dirty = false;
+        self.sync_deadline = None;
         Ok(())
     }
     
-    /// Truncate the WAL (after successful checkpoint)
-    pub async fn truncate(&mut self) -> Result<()> {
-        // Truncate the file
-        let _file = OpenOptions::new()
+    /// Close the active segment and start a new one at the current position
+    fn rotate(&mut self) -> Result<()> {
+        if self.position == self.segment_start {
+            return Ok(());
+        }
+        
+        // Data in the closed segment is synced now rather than by deadline
+        if self.dirty {
+            self.sync()?;
+        }
+        
+        let file = std::fs::OpenOptions::new()
             .create(true)
-            .write(true)
-            .truncate(true)
-            .open(&self.path)
-            .await?;
+            .append(true)
+            .open(segment_path(&self.dir, self.position))?;
+        sync_dir(&self.dir)?;
         
-        tracing::info!("Truncated WAL");
+        self.file = file;
+        self.segment_start = self.position;
+        tracing::debug!("Started WAL segment at LSN {}", self.segment_start);
         Ok(())
     }
     
-    /// Get WAL file size
-    pub async fn size(&self) -> Result<u64> {
-        let metadata = tokio::fs::metadata(&self.path).await?;
-        Ok(metadata.len())
+    fn truncate(&mut self) -> Result<()> {
+        self.rotate()?;
+        for start in list_segments(&self.dir)? {
+            if start < self.segment_start {
+                std::fs::remove_file(segment_path(&self.dir, start))?;
+            }
+        }
+        Ok(())
     }
 }
 
@@ -167,13 +727,25 @@ mod tests {
             distance_metric: DistanceMetric::Cosine,
             vector_type: VectorType::Float32,
             index_config: IndexConfig::default(),
+            durability: None,
+            indexed_fields: Vec::new(),
         };
         
         let op = WALOperation::CreateCollection(config);
         wal.append(&op).await.unwrap();
         
+        let vector = Vector {
+            id: Uuid::new_v4(),
+            data: vec![0.5; 128],
+            metadata: serde_json::from_value(serde_json::json!({"tag": "a", "rank": 3})).unwrap(),
+        };
+        wal.append(&WALOperation::InsertVector {
+            collection: "test".to_string(),
+            vector: vector.clone(),
+        }).await.unwrap();
+        
         let operations = wal.read_all().await.unwrap();
-        assert_eq!(operations.len(), 1);
+        assert_eq!(operations.len(), 2);
         
         match &operations[0] {
             WALOperation::CreateCollection(c) => {
@@ -181,5 +753,205 @@ mod tests {
             }
             _ => panic!("Unexpected operation type"),
         }
+        match &operations[1] {
+            WALOperation::InsertVector { vector: logged, .. } => {
+                assert_eq!(logged.metadata, vector.metadata);
+            }
+            _ => panic!("Unexpected operation type"),
+        }
+    }
+    
+    #[tokio::test]
+    async fn test_wal_read_from_lsn() {
+        let temp_dir = tempdir().unwrap();
+        let wal = WriteAheadLog::new(temp_dir.path().join("test.wal")).await.unwrap();
+        
+        let first = wal.append(&WALOperation::DeleteCollection("a".to_string())).await.unwrap();
+        let second = wal.append(&WALOperation::DeleteCollection("b".to_string())).await.unwrap();
+        assert!(second > first);
+        assert_eq!(wal.current_lsn().await.unwrap(), second);
+        
+        let tail = wal.read_from(first).await.unwrap();
+        assert_eq!(tail.len(), 1);
+        assert_eq!(tail[0].0, second);
+        match &tail[0].1 {
+            WALOperation::DeleteCollection(name) => assert_eq!(name, "b"),
+            _ => panic!("Unexpected operation type"),
+        }
     }
-}
\ No newline at end of file
+    
+    #[tokio::test]
+    async fn test_concurrent_group_commit() {
+        let temp_dir = tempdir().unwrap();
+        let wal = Arc::new(WriteAheadLog::new(temp_dir.path().join("test.wal")).await.unwrap());
+        
+        let mut handles = Vec::new();
+        for i in 0..64 {
+            let wal = Arc::clone(&wal);
+            let durability = match i % 4 {
+                0 => DurabilityMode::FsyncEach,
+                1 => DurabilityMode::Group,
+                2 => DurabilityMode::IntervalMs(5),
+                _ => DurabilityMode::None,
+            };
+            handles.push(tokio::spawn(async move {
+                let op = WALOperation::DeleteCollection(format!("c{}", i));
+                wal.append_with(&op, Some(durability)).await.unwrap()
+            }));
+        }
+        
+        let mut lsns = Vec::new();
+        for handle in handles {
+            lsns.push(handle.await.unwrap());
+        }
+        lsns.sort_unstable();
+        lsns.dedup();
+        assert_eq!(lsns.len(), 64);
+        
+        wal.sync().await.unwrap();
+        let operations = wal.read_from(0).await.unwrap();
+        assert_eq!(operations.len(), 64);
+        assert_eq!(operations.last().unwrap().0, wal.current_lsn().await.unwrap());
+    }
+    
+    #[tokio::test]
+    async fn test_wal_reopen_continues_lsn() {
+        let temp_dir = tempdir().unwrap();
+        let path = temp_dir.path().join("test.wal");
+        
+        let lsn = {
+            let wal = WriteAheadLog::with_durability(&path, DurabilityMode::None).await.unwrap();
+            wal.append(&WALOperation::DeleteCollection("a".to_string())).await.unwrap()
+        };
+        
+        let wal = WriteAheadLog::new(&path).await.unwrap();
+        assert_eq!(wal.current_lsn().await.unwrap(), lsn);
+        let next = wal.append(&WALOperation::DeleteCollection("b".to_string())).await.unwrap();
+        assert!(next > lsn);
+        assert_eq!(wal.read_all().await.unwrap().len(), 2);
+    }
+    
+    #[tokio::test]
+    async fn test_segment_rotation_and_removal() {
+        let temp_dir = tempdir().unwrap();
+        let path = temp_dir.path().join("wal");
+        let options = WalOptions {
+            durability: DurabilityMode::None,
+            segment_size: 64,
+        };
+        let wal = WriteAheadLog::with_options(&path, options).await.unwrap();
+        
+        let mut lsns = Vec::new();
+        for i in 0..20 {
+            let op = WALOperation::DeleteCollection(format!("collection_{}", i));
+            lsns.push(wal.append(&op).await.unwrap());
+        }
+        let segments = list_segments(&path).unwrap();
+        assert!(segments.len() > 2);
+        
+        // Streaming crosses segment boundaries with consistent LSNs
+        let tail = wal.read_from(lsns[4]).await.unwrap();
+        assert_eq!(tail.iter().map(|(lsn, _)| *lsn).collect::<Vec<_>>(), lsns[5..].to_vec());
+        
+        let removed = wal.remove_segments_before(lsns[10]).await.unwrap();
+        assert!(removed > 0);
+        assert!(wal.oldest_lsn().await.unwrap() <= lsns[10]);
+        assert_eq!(wal.read_from(lsns[10]).await.unwrap().len(), 9);
+        
+        // Reading from before the oldest segment starts at what is retained
+        let retained = wal.read_from(0).await.unwrap();
+        assert_eq!(retained.last().unwrap().0, lsns[19]);
+        assert!(retained.len() < 20);
+    }
+    
+    #[tokio::test]
+    async fn test_torn_write_discarded() {
+        let temp_dir = tempdir().unwrap();
+        let path = temp_dir.path().join("wal");
+        let options = WalOptions {
+            durability: DurabilityMode::None,
+            segment_size: 64,
+        };
+        let lsn = {
+            let wal = WriteAheadLog::with_options(&path, options).await.unwrap();
+            let mut lsn = 0;
+            for i in 0..4 {
+                lsn = wal.append(&WALOperation::DeleteCollection(format!("collection_{}", i))).await.unwrap();
+            }
+            lsn
+        };
+        let segment_start = *list_segments(&path).unwrap().last().unwrap();
+        assert!(segment_start > 0);
+        
+        // A write that failed after reaching the active segment in part
+        let file = std::fs::OpenOptions::new()
+            .append(true)
+            .open(segment_path(&path, segment_start))
+            .unwrap();
+        let mut writer = WalWriter::new(path.clone(), file, segment_start, 64, Arc::new(AtomicU64::new(lsn)));
+        writer.file.write_all(&[0xff; 7]).unwrap();
+        writer.discard_torn_tail();
+        assert_eq!(writer.position, lsn);
+        drop(writer);
+        
+        let wal = WriteAheadLog::new(&path).await.unwrap();
+        assert_eq!(wal.current_lsn().await.unwrap(), lsn);
+        assert_eq!(wal.read_all().await.unwrap().len(), 4);
+    }
+    
+    #[tokio::test]
+    async fn test_torn_tail_dropped_on_open() {
+        let temp_dir = tempdir().unwrap();
+        let path = temp_dir.path().join("wal");
+        
+        let lsns = {
+            let wal = WriteAheadLog::with_durability(&path, DurabilityMode::None).await.unwrap();
+            let mut lsns = Vec::new();
+            for i in 0..3 {
+                lsns.push(wal.append(&WALOperation::DeleteCollection(format!("c{}", i))).await.unwrap());
+            }
+            lsns
+        };
+        
+        // A crash cut the last record short
+        let segment = segment_path(&path, 0);
+        let file = std::fs::OpenOptions::new().write(true).open(&segment).unwrap();
+        file.set_len(lsns[2] - 3).unwrap();
+        drop(file);
+        
+        let wal = WriteAheadLog::new(&path).await.unwrap();
+        assert_eq!(wal.current_lsn().await.unwrap(), lsns[1]);
+        assert_eq!(wal.read_all().await.unwrap().len(), 2);
+        
+        let next = wal.append(&WALOperation::DeleteCollection("after".to_string())).await.unwrap();
+        let entries = wal.read_from(0).await.unwrap();
+        assert_eq!(entries.len(), 3);
+        assert_eq!(entries[2].0, next);
+        match &entries[2].1 {
+            WALOperation::DeleteCollection(name) => assert_eq!(name, "after"),
+            _ => panic!("Unexpected operation type"),
+        }
+    }
+    
+    #[tokio::test]
+    async fn test_legacy_wal_file_migrated() {
+        let temp_dir = tempdir().unwrap();
+        let path = temp_dir.path().join("wal");
+        
+        // Build a single-file log as older versions wrote it
+        let lsn = {
+            let wal = WriteAheadLog::new(&path).await.unwrap();
+            wal.append(&WALOperation::DeleteCollection("a".to_string())).await.unwrap()
+        };
+        let segment = segment_path(&path, 0);
+        let legacy = temp_dir.path().join("wal.old");
+        std::fs::rename(&segment, &legacy).unwrap();
+        std::fs::remove_dir(&path).unwrap();
+        std::fs::rename(&legacy, &path).unwrap();
+        
+        let wal = WriteAheadLog::new(&path).await.unwrap();
+        assert!(path.is_dir());
+        assert_eq!(wal.current_lsn().await.unwrap(), lsn);
+        assert_eq!(wal.read_all().await.unwrap().len(), 1);
+    }
+}
@@ -46,6 +46,8 @@ fn test_collection_config() {
         distance_metric: DistanceMetric::Cosine,
         vector_type: VectorType::Float32,
         index_config: IndexConfig::default(),
+        durability: None,
+        indexed_fields: Vec::new(),
     };
     
     assert_eq!(config.name, "test_collection");
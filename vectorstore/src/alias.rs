@@ -0,0 +1,166 @@
+use vectordb_common::{Result, VectorDbError};
+use vectordb_common::types::*;
+use parking_lot::RwLock;
+use serde::{Deserialize, Serialize};
+use std::collections::BTreeMap;
+use std::fs::{File, OpenOptions};
+use std::io::Write;
+use std::path::{Path, PathBuf};
+
+/// Alias file name inside the data directory
+pub const ALIASES_FILE: &str = "aliases.json";
+
+/// A name that resolves to a collection
+#[derive(Debug, Clone, PartialEq, Eq, Serialize, Deserialize)]
+pub struct CollectionAlias {
+    pub alias: String,
+    pub collection: CollectionId,
+    /// Changes each time the alias is created or switched, so anything
+    /// cached under the alias can tell it is stale
+    pub version: u64,
+}
+
+/// Persisted form of the aliases
+#[derive(Debug, Clone, Default, Serialize, Deserialize)]
+struct AliasTable {
+    /// Version handed to the next alias created or switched
+    next_version: u64,
+    aliases: BTreeMap<String, CollectionAlias>,
+}
+
+/// Aliases of a store's collections, kept in memory and written through to
+/// a file on every change
+pub(crate) struct Aliases {
+    dir: PathBuf,
+    table: RwLock<AliasTable>,
+    /// Serializes changes, each of which rewrites the file
+    update_lock: tokio::sync::Mutex<()>,
+}
+
+impl Aliases {
+    /// Load the aliases from a data directory; none if never written
+    pub(crate) fn load(dir: &Path) -> Result<Self> {
+        let path = dir.join(ALIASES_FILE);
+        let table = if path.exists() {
+            let content = std::fs::read(&path)?;
+            serde_json::from_slice(&content).map_err(|e| VectorDbError::StorageError {
+                message: format!("Invalid alias file {}: {}", path.display(), e),
+            })?
+        } else {
+            AliasTable::default()
+        };
+
+        Ok(Self {
+            dir: dir.to_path_buf(),
+            table: RwLock::new(table),
+            update_lock: tokio::sync::Mutex::new(()),
+        })
+    }
+
+    /// The collection an alias points at, if `name` is an alias
+    pub(crate) fn resolve(&self, name: &str) -> Option<CollectionId> {
+        self.table.read().aliases.get(name).map(|a| a.collection.clone())
+    }
+
+    pub(crate) fn get(&self, alias: &str) -> Option<CollectionAlias> {
+        self.table.read().aliases.get(alias).cloned()
+    }
+
+    /// All aliases, ordered by name
+    pub(crate) fn list(&self) -> Vec<CollectionAlias> {
+        self.table.read().aliases.values().cloned().collect()
+    }
+
+    /// Point an alias at a collection, creating it or switching it in one step
+    pub(crate) async fn set(&self, alias: &str, collection: &str) -> Result<CollectionAlias> {
+        self.update(|table| {
+            let entry = CollectionAlias {
+                alias: alias.to_string(),
+                collection: collection.to_string(),
+                version: table.next_version,
+            };
+            table.next_version += 1;
+            table.aliases.insert(alias.to_string(), entry.clone());
+            entry
+        }).await
+    }
+
+    /// Drop an alias, returning whether it existed
+    pub(crate) async fn remove(&self, alias: &str) -> Result<bool> {
+        if self.get(alias).is_none() {
+            return Ok(false);
+        }
+        self.update(|table| table.aliases.remove(alias).is_some()).await
+    }
+
+    /// Drop every alias pointing at a collection
+    pub(crate) async fn remove_collection(&self, collection: &str) -> Result<()> {
+        if !self.list().iter().any(|a| a.collection == collection) {
+            return Ok(());
+        }
+        self.update(|table| table.aliases.retain(|_, a| a.collection != collection)).await
+    }
+
+    /// Apply a change to a copy of the table, persist it, then publish it;
+    /// lookups keep seeing the old table until the file is written
+    async fn update<R>(&self, change: impl FnOnce(&mut AliasTable) -> R) -> Result<R> {
+        let _update = self.update_lock.lock().await;
+        let mut table = self.table.read().clone();
+        let result = change(&mut table);
+
+        let content = serde_json::to_vec_pretty(&table)
+            .map_err(|e| VectorDbError::Serialization(e.to_string()))?;
+        let dir = self.dir.clone();
+        tokio::task::spawn_blocking(move || write_aliases(&dir, &content))
+            .await
+            .map_err(|e| VectorDbError::Internal { message: e.to_string() })??;
+
+        *self.table.write() = table;
+        Ok(result)
+    }
+}
+
+/// Write the alias file atomically: to a temporary file, fsync, then rename
+fn write_aliases(dir: &Path, content: &[u8]) -> Result<()> {
+    let path = dir.join(ALIASES_FILE);
+    let tmp_path = dir.join(format!("{}.tmp", ALIASES_FILE));
+
+    {
+        let mut file = OpenOptions::new()
+            .create(true)
+            .write(true)
+            .truncate(true)
+            .open(&tmp_path)?;
+        file.write_all(content)?;
+        file.sync_all()?;
+    }
+
+    std::fs::rename(&tmp_path, &path)?;
+    File::open(dir)?.sync_all()?;
+    Ok(())
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use tempfile::tempdir;
+
+    #[tokio::test]
+    async fn test_aliases_switch_and_persist() {
+        let temp_dir = tempdir().unwrap();
+        let aliases = Aliases::load(temp_dir.path()).unwrap();
+        assert_eq!(aliases.resolve("live"), None);
+
+        let first = aliases.set("live", "docs_v1").await.unwrap();
+        aliases.set("staging", "docs_v1").await.unwrap();
+        let switched = aliases.set("live", "docs_v2").await.unwrap();
+        assert_eq!(aliases.resolve("live").as_deref(), Some("docs_v2"));
+        assert!(switched.version > first.version);
+
+        aliases.remove_collection("docs_v1").await.unwrap();
+        assert!(!aliases.remove("staging").await.unwrap());
+
+        let reloaded = Aliases::load(temp_dir.path()).unwrap();
+        assert_eq!(reloaded.list(), vec![switched]);
+    }
+}
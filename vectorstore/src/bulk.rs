@@ -0,0 +1,133 @@
+use vectordb_common::{Result, VectorDbError};
+use vectordb_common::types::*;
+use parking_lot::Mutex;
+use serde::Serialize;
+use std::sync::atomic::{AtomicUsize, Ordering};
+use std::time::{Duration, Instant};
+
+/// Stage of a collection's bulk load
+#[derive(Debug, Clone, Copy, PartialEq, Eq, Serialize)]
+pub enum BulkLoadPhase {
+    /// Accepting vectors
+    Loading,
+    /// Writing the vectors out and building the index over them
+    Building,
+    /// Durable and searchable
+    Done,
+}
+
+/// Where a collection's bulk load stands
+#[derive(Debug, Clone, PartialEq, Eq, Serialize)]
+pub struct BulkLoadProgress {
+    pub collection: CollectionId,
+    pub phase: BulkLoadPhase,
+    /// Vectors received so far
+    pub vectors_loaded: usize,
+    /// Vectors the final build has added to the index
+    pub vectors_indexed: usize,
+    /// Time since the load began, or its total once done
+    pub elapsed_ms: u64,
+}
+
+/// Vectors gathered for a collection's bulk load
+///
+/// They are held here, bypassing the WAL and the index, until the load
+/// finishes and hands them to storage and the index build in one go.
+pub(crate) struct BulkLoad {
+    phase: Mutex<BulkLoadPhase>,
+    vectors: Mutex<Vec<Vector>>,
+    loaded: AtomicUsize,
+    /// Read by progress reports while the index is being built
+    pub(crate) built: AtomicUsize,
+    started: Instant,
+    duration: Mutex<Option<Duration>>,
+}
+
+impl BulkLoad {
+    pub(crate) fn new() -> Self {
+        Self {
+            phase: Mutex::new(BulkLoadPhase::Loading),
+            vectors: Mutex::new(Vec::new()),
+            loaded: AtomicUsize::new(0),
+            built: AtomicUsize::new(0),
+            started: Instant::now(),
+            duration: Mutex::new(None),
+        }
+    }
+
+    pub(crate) fn phase(&self) -> BulkLoadPhase {
+        *self.phase.lock()
+    }
+
+    /// Buffer more vectors; only allowed while loading
+    pub(crate) fn push(&self, collection: &str, vectors: &[Vector]) -> Result<()> {
+        let phase = self.phase.lock();
+        if *phase != BulkLoadPhase::Loading {
+            return Err(not_loading(collection));
+        }
+        self.vectors.lock().extend_from_slice(vectors);
+        self.loaded.fetch_add(vectors.len(), Ordering::Relaxed);
+        Ok(())
+    }
+
+    /// Move to the build, taking the buffered vectors
+    pub(crate) fn start_build(&self, collection: &str) -> Result<Vec<Vector>> {
+        let mut phase = self.phase.lock();
+        if *phase != BulkLoadPhase::Loading {
+            return Err(not_loading(collection));
+        }
+        *phase = BulkLoadPhase::Building;
+        Ok(std::mem::take(&mut *self.vectors.lock()))
+    }
+
+    pub(crate) fn finish(&self) {
+        *self.duration.lock() = Some(self.started.elapsed());
+        *self.phase.lock() = BulkLoadPhase::Done;
+    }
+
+    pub(crate) fn progress(&self, collection: &str) -> BulkLoadProgress {
+        let elapsed = self.duration.lock().unwrap_or_else(|| self.started.elapsed());
+        BulkLoadProgress {
+            collection: collection.to_string(),
+            phase: self.phase(),
+            vectors_loaded: self.loaded.load(Ordering::Relaxed),
+            vectors_indexed: self.built.load(Ordering::Relaxed),
+            elapsed_ms: elapsed.as_millis() as u64,
+        }
+    }
+}
+
+fn not_loading(collection: &str) -> VectorDbError {
+    VectorDbError::ConfigError {
+        message: format!("Collection {} has no bulk load accepting vectors", collection),
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_bulk_load_phases() {
+        let load = BulkLoad::new();
+        let vector = Vector {
+            id: uuid::Uuid::new_v4(),
+            data: vec![0.5; 4],
+            metadata: None,
+        };
+        load.push("docs", &[vector.clone(), vector.clone()]).unwrap();
+        assert_eq!(load.progress("docs").vectors_loaded, 2);
+
+        assert_eq!(load.start_build("docs").unwrap().len(), 2);
+        assert_eq!(load.phase(), BulkLoadPhase::Building);
+        assert!(load.push("docs", &[vector]).is_err());
+        assert!(load.start_build("docs").is_err());
+
+        load.built.fetch_add(2, Ordering::Relaxed);
+        load.finish();
+        let progress = load.progress("docs");
+        assert_eq!(progress.phase, BulkLoadPhase::Done);
+        assert_eq!(progress.vectors_indexed, 2);
+        assert_eq!(load.progress("docs").elapsed_ms, progress.elapsed_ms);
+    }
+}
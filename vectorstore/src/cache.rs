@@ -0,0 +1,231 @@
+use vectordb_common::types::*;
+use parking_lot::{Mutex, RwLock};
+use std::collections::{BTreeMap, HashMap};
+use std::sync::atomic::{AtomicU64, Ordering};
+use std::sync::Arc;
+
+/// What makes two queries return the same results from an unchanged
+/// collection; parameters are the ones the search actually ran with
+#[derive(Debug, Clone, PartialEq, Eq, Hash)]
+pub(crate) struct QueryKey {
+    /// Query vector as raw bits, so it can be hashed and compared exactly
+    vector: Vec<u32>,
+    limit: usize,
+    /// Candidates taken from the index before rescoring
+    candidates: usize,
+    ef_search: Option<usize>,
+    nprobe: Option<usize>,
+    exact: bool,
+    /// Filter as JSON with sorted keys
+    filter: Option<String>,
+}
+
+impl QueryKey {
+    pub(crate) fn new(
+        request: &QueryRequest,
+        candidates: usize,
+        ef_search: Option<usize>,
+        nprobe: Option<usize>,
+    ) -> Self {
+        let filter = request.filter.as_ref().filter(|f| !f.is_empty()).map(|filter| {
+            let sorted: BTreeMap<_, _> = filter.iter().collect();
+            serde_json::to_string(&sorted).unwrap_or_default()
+        });
+        Self {
+            vector: request.vector.iter().map(|x| x.to_bits()).collect(),
+            limit: request.limit,
+            candidates,
+            ef_search,
+            nprobe,
+            exact: request.exact,
+            filter,
+        }
+    }
+}
+
+/// Results of recent queries, kept per collection up to a number of
+/// entries and evicted least recently used first
+///
+/// Each collection has a write generation that every write bumps once it
+/// has reached the index. Results are cached under the generation read
+/// before their search began, so any write the search may have missed
+/// leaves them stale, and lookups ignore stale entries.
+pub(crate) struct QueryCache {
+    capacity: usize,
+    collections: RwLock<HashMap<CollectionId, Arc<CollectionCache>>>,
+}
+
+struct CollectionCache {
+    generation: AtomicU64,
+    lru: Mutex<Lru>,
+}
+
+#[derive(Default)]
+struct Lru {
+    entries: HashMap<Arc<QueryKey>, CachedQuery>,
+    /// Keys by when they were last used, oldest first
+    recency: BTreeMap<u64, Arc<QueryKey>>,
+    clock: u64,
+}
+
+struct CachedQuery {
+    generation: u64,
+    last_used: u64,
+    results: Vec<QueryResult>,
+}
+
+impl QueryCache {
+    /// A cache of up to `capacity` queries per collection
+    pub(crate) fn new(capacity: usize) -> Self {
+        Self {
+            capacity,
+            collections: RwLock::new(HashMap::new()),
+        }
+    }
+
+    fn collection(&self, collection: &str) -> Arc<CollectionCache> {
+        if let Some(cache) = self.collections.read().get(collection) {
+            return Arc::clone(cache);
+        }
+        let mut collections = self.collections.write();
+        Arc::clone(collections.entry(collection.to_string()).or_insert_with(|| {
+            Arc::new(CollectionCache {
+                generation: AtomicU64::new(0),
+                lru: Mutex::new(Lru::default()),
+            })
+        }))
+    }
+
+    /// A collection's write generation, to read before searching
+    pub(crate) fn generation(&self, collection: &str) -> u64 {
+        self.collection(collection).generation.load(Ordering::Acquire)
+    }
+
+    /// Cached results of a query, unless a write has happened since
+    pub(crate) fn get(&self, collection: &str, key: &QueryKey) -> Option<Vec<QueryResult>> {
+        let cache = self.collection(collection);
+        let generation = cache.generation.load(Ordering::Acquire);
+        let mut lru = cache.lru.lock();
+        let lru = &mut *lru;
+
+        let entry = lru.entries.get_mut(key)?;
+        if entry.generation != generation {
+            lru.recency.remove(&entry.last_used);
+            lru.entries.remove(key);
+            return None;
+        }
+        lru.clock += 1;
+        let key = lru.recency.remove(&entry.last_used)?;
+        entry.last_used = lru.clock;
+        lru.recency.insert(lru.clock, key);
+        Some(entry.results.clone())
+    }
+
+    /// Cache a query's results, found by a search that began at `generation`
+    pub(crate) fn put(&self, collection: &str, key: QueryKey, generation: u64, results: Vec<QueryResult>) {
+        let cache = self.collection(collection);
+        if cache.generation.load(Ordering::Acquire) != generation {
+            return;
+        }
+        let mut lru = cache.lru.lock();
+
+        lru.clock += 1;
+        let last_used = lru.clock;
+        let key = Arc::new(key);
+        if let Some(old) = lru.entries.insert(Arc::clone(&key), CachedQuery { generation, last_used, results }) {
+            lru.recency.remove(&old.last_used);
+        }
+        lru.recency.insert(last_used, key);
+
+        while lru.entries.len() > self.capacity {
+            match lru.recency.pop_first() {
+                Some((_, oldest)) => {
+                    lru.entries.remove(&oldest);
+                }
+                None => break,
+            }
+        }
+    }
+
+    /// Mark everything cached for a collection stale; called after a write
+    /// has reached the index
+    pub(crate) fn invalidate(&self, collection: &str) {
+        self.collection(collection).generation.fetch_add(1, Ordering::AcqRel);
+    }
+
+    pub(crate) fn remove_collection(&self, collection: &str) {
+        self.collections.write().remove(collection);
+    }
+}
+
+/// Invalidates a collection's cached queries when dropped, so a write
+/// holding it invalidates them once done, even if it failed part way
+pub(crate) struct CacheInvalidation<'a> {
+    cache: Option<&'a QueryCache>,
+    collection: &'a str,
+}
+
+impl<'a> CacheInvalidation<'a> {
+    pub(crate) fn new(cache: Option<&'a QueryCache>, collection: &'a str) -> Self {
+        Self { cache, collection }
+    }
+}
+
+impl Drop for CacheInvalidation<'_> {
+    fn drop(&mut self) {
+        if let Some(cache) = self.cache {
+            cache.invalidate(self.collection);
+        }
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn request(x: f32) -> QueryRequest {
+        QueryRequest {
+            collection: "docs".to_string(),
+            vector: vec![x, 1.0],
+            limit: 1,
+            ef_search: None,
+            nprobe: None,
+            oversampling: None,
+            exact: false,
+            filter: None,
+            deadline_ms: None,
+        }
+    }
+
+    fn results(distance: f32) -> Vec<QueryResult> {
+        vec![QueryResult {
+            id: uuid::Uuid::new_v4(),
+            distance,
+            metadata: None,
+        }]
+    }
+
+    #[test]
+    fn test_query_cache_evicts_and_invalidates() {
+        let cache = QueryCache::new(2);
+        let key = |x| QueryKey::new(&request(x), 1, Some(50), None);
+
+        let generation = cache.generation("docs");
+        cache.put("docs", key(1.0), generation, results(1.0));
+        cache.put("docs", key(2.0), generation, results(2.0));
+        assert!(cache.get("docs", &key(1.0)).is_some());
+        assert!(cache.get("docs", &QueryKey::new(&request(1.0), 1, Some(60), None)).is_none());
+
+        // The least recently used entry goes first
+        cache.put("docs", key(3.0), generation, results(3.0));
+        assert!(cache.get("docs", &key(2.0)).is_none());
+        assert_eq!(cache.get("docs", &key(1.0)).unwrap()[0].distance, 1.0);
+
+        // A write invalidates entries, including ones whose search it raced
+        drop(CacheInvalidation::new(Some(&cache), "docs"));
+        assert!(cache.get("docs", &key(1.0)).is_none());
+        cache.put("docs", key(1.0), generation, results(1.0));
+        assert!(cache.get("docs", &key(1.0)).is_none());
+        assert!(cache.get("other", &key(1.0)).is_none());
+    }
+}
@@ -1,26 +1,100 @@
-use vectordb_common::{Result, VectorDbError};
+pub mod snapshot;
+pub mod pool;
+pub mod bulk;
+pub mod reindex;
+pub mod alias;
+pub mod cache;
+
+use vectordb_common::{distance, MetadataFilter, Result, VectorDbError};
 use vectordb_common::types::*;
-use vectordb_storage::StorageEngine;
-use vectordb_index::{VectorIndex, HnswIndex};
+use vectordb_storage::{CompactionStats, StorageEngine, StorageOptions, WALOperation};
+use vectordb_index::{VectorIndex, FlatIndex, HnswIndex, IvfPqIndex, SearchDeadline, SearchParams, SearchResult};
+use std::borrow::Cow;
 use std::collections::HashMap;
+use std::sync::Arc;
 use parking_lot::RwLock;
-use tracing::info;
+use tracing::{info, warn};
 use metrics::{counter, histogram, gauge};
 
+pub use pool::{WorkerPool, WorkerPoolOptions};
+pub use bulk::{BulkLoadPhase, BulkLoadProgress};
+pub use reindex::ReindexStats;
+pub use alias::CollectionAlias;
+
+use bulk::BulkLoad;
+use reindex::Reindex;
+use alias::Aliases;
+use cache::{CacheInvalidation, QueryCache, QueryKey};
+
+/// Candidates fetched per requested result from a compressed index, to be
+/// rescored against the full-precision vectors
+const RESCORE_OVERSAMPLING: f32 = 4.0;
+
+/// Oversampling for binary collections, whose Hamming ranking is coarser
+const BINARY_RESCORE_OVERSAMPLING: f32 = 8.0;
+
+/// Largest oversampling a query may ask for
+const MAX_RESCORE_OVERSAMPLING: f32 = 100.0;
+
+/// Share of a query's deadline kept back from the index search for
+/// rescoring and building the response
+const DEADLINE_RESERVE: f64 = 0.1;
+
+/// Stored vectors read into an index per step when indexing from storage;
+/// writers to a collection being reindexed wait for at most one step
+const REINDEX_CHUNK: usize = 512;
+
 /// Main vector store engine that coordinates storage and indexing
 pub struct VectorStore {
     storage: StorageEngine,
-    indexes: RwLock<HashMap<CollectionId, Box<dyn VectorIndex>>>,
+    indexes: RwLock<HashMap<CollectionId, Arc<dyn VectorIndex>>>,
+    /// Held shared by writers and exclusively while capturing snapshots, so a
+    /// snapshot's WAL position matches the index contents exactly
+    write_gate: tokio::sync::RwLock<()>,
+    /// WAL position covered by each collection's latest index snapshot
+    snapshot_lsns: RwLock<HashMap<CollectionId, u64>>,
+    /// Runs searches and index builds off the async runtime
+    pool: WorkerPool,
+    /// Current or last bulk load of each collection
+    bulk_loads: RwLock<HashMap<CollectionId, Arc<BulkLoad>>>,
+    /// Indexes being rebuilt in the background to replace the current ones
+    reindexes: RwLock<HashMap<CollectionId, Arc<Reindex>>>,
+    /// Alternative names that resolve to collections
+    aliases: Aliases,
+    /// Results of recent queries, if enabled
+    query_cache: Option<QueryCache>,
 }
 
 impl VectorStore {
     /// Create a new vector store
     pub async fn new<P: AsRef<std::path::Path>>(data_dir: P) -> Result<Self> {
-        let storage = StorageEngine::new(data_dir).await?;
+        Self::with_options(data_dir, StorageOptions::default()).await
+    }
+    
+    /// Create a new vector store with custom storage options
+    pub async fn with_options<P: AsRef<std::path::Path>>(data_dir: P, options: StorageOptions) -> Result<Self> {
+        Self::with_worker_pool(data_dir, options, WorkerPoolOptions::default()).await
+    }
+    
+    /// Create a new vector store with custom storage options and worker pool sizing
+    pub async fn with_worker_pool<P: AsRef<std::path::Path>>(
+        data_dir: P,
+        options: StorageOptions,
+        pool_options: WorkerPoolOptions,
+    ) -> Result<Self> {
+        let aliases = Aliases::load(data_dir.as_ref())?;
+        let storage = StorageEngine::with_options(data_dir, options).await?;
         
         let mut store = Self {
             storage,
             indexes: RwLock::new(HashMap::new()),
+            write_gate: tokio::sync::RwLock::new(()),
+            snapshot_lsns: RwLock::new(HashMap::new()),
+            pool: WorkerPool::new(&pool_options)?,
+            bulk_loads: RwLock::new(HashMap::new()),
+            reindexes: RwLock::new(HashMap::new()),
+            aliases,
+            query_cache: None,
         };
         
         // Rebuild indexes for existing collections
@@ -29,34 +103,57 @@ impl VectorStore {
         Ok(store)
     }
     
+    /// Cache the results of up to `entries` recent queries per collection
+    /// (0 disables the cache)
+    ///
+    /// A repeated query is answered from the cache until the collection is
+    /// next written to.
+    pub fn with_query_cache(mut self, entries: usize) -> Self {
+        self.query_cache = (entries > 0).then(|| QueryCache::new(entries));
+        self
+    }
+    
     /// Create a new collection
     pub async fn create_collection(&self, config: &CollectionConfig) -> Result<()> {
         info!("Creating collection: {}", config.name);
         counter!("vectorstore.collections.created").increment(1);
+        if config.index_config.index_type == IndexType::IvfPq {
+            IvfPqIndex::validate_config(&config.index_config, config.dimension)?;
+        }
+        if self.aliases.get(&config.name).is_some() {
+            return Err(VectorDbError::ConfigError {
+                message: format!("{} is already an alias", config.name),
+            });
+        }
+        let _gate = self.write_gate.read().await;
         
         // Create storage
         self.storage.create_collection(config).await?;
         
         // Create index
-        let index = Box::new(HnswIndex::new(
-            config.index_config.clone(),
-            config.distance_metric,
-            config.dimension,
-        ));
-        
-        self.indexes.write().insert(config.name.clone(), index);
+        self.indexes.write().insert(config.name.clone(), Self::new_index(config).into());
         
         info!("Collection created successfully: {}", config.name);
         Ok(())
     }
     
-    /// Delete a collection
+    /// Delete a collection, along with the aliases pointing at it
+    ///
+    /// Takes the collection's own name; aliases are not resolved here.
     pub async fn delete_collection(&self, name: &str) -> Result<()> {
         info!("Deleting collection: {}", name);
         counter!("vectorstore.collections.deleted").increment(1);
+        let _gate = self.write_gate.read().await;
         
         self.storage.delete_collection(name).await?;
         self.indexes.write().remove(name);
+        self.snapshot_lsns.write().remove(name);
+        self.bulk_loads.write().remove(name);
+        self.reindexes.write().remove(name);
+        if let Some(cache) = &self.query_cache {
+            cache.remove_collection(name);
+        }
+        self.aliases.remove_collection(name).await?;
         
         info!("Collection deleted successfully: {}", name);
         Ok(())
@@ -64,6 +161,17 @@ impl VectorStore {
     
     /// Insert a vector into a collection
     pub async fn insert(&self, collection: &str, vector: &Vector) -> Result<()> {
+        self.insert_with_durability(collection, vector, None).await
+    }
+    
+    /// Insert a vector, overriding the collection's WAL durability if given
+    pub async fn insert_with_durability(
+        &self,
+        collection: &str,
+        vector: &Vector,
+        durability: Option<DurabilityMode>,
+    ) -> Result<()> {
+        let collection = &*self.resolve(collection);
         let start = std::time::Instant::now();
         counter!("vectorstore.vectors.inserted").increment(1);
         
@@ -82,12 +190,15 @@ impl VectorStore {
         }
         
         // Insert into storage
-        self.storage.insert_vector(collection, vector).await?;
+        let _gate = self.write_gate.read().await;
+        let _invalidation = self.cache_invalidation(collection);
+        let rebuilt = self.index_being_rebuilt(collection, [vector.id]).await;
+        self.storage.insert_vector_with_durability(collection, vector, durability).await?;
         
-        // Insert into index
-        let mut indexes = self.indexes.write();
-        if let Some(index) = indexes.get_mut(collection) {
-            index.insert(vector.id, &vector.data, vector.metadata.clone())?;
+        // Insert into index, and into its replacement while one is being built
+        for index in self.index(collection).into_iter().chain(rebuilt) {
+            let vector = vector.clone();
+            self.pool.run(move || index.insert(vector.id, &vector.data, vector.metadata)).await??;
         }
         
         histogram!("vectorstore.insert.duration").record(start.elapsed().as_secs_f64());
@@ -96,6 +207,17 @@ impl VectorStore {
     
     /// Batch insert vectors
     pub async fn batch_insert(&self, collection: &str, vectors: &[Vector]) -> Result<()> {
+        self.batch_insert_with_durability(collection, vectors, None).await
+    }
+    
+    /// Batch insert vectors, overriding the collection's WAL durability if given
+    pub async fn batch_insert_with_durability(
+        &self,
+        collection: &str,
+        vectors: &[Vector],
+        durability: Option<DurabilityMode>,
+    ) -> Result<()> {
+        let collection = &*self.resolve(collection);
         let start = std::time::Instant::now();
         counter!("vectorstore.vectors.batch_inserted").increment(vectors.len() as u64);
         
@@ -120,14 +242,16 @@ impl VectorStore {
         }
         
         // Insert into storage
-        self.storage.batch_insert(collection, vectors).await?;
+        let _gate = self.write_gate.read().await;
+        let _invalidation = self.cache_invalidation(collection);
+        let rebuilt = self.index_being_rebuilt(collection, vectors.iter().map(|v| v.id)).await;
+        self.storage.batch_insert_with_durability(collection, vectors, durability).await?;
         
-        // Insert into index
-        let mut indexes = self.indexes.write();
-        if let Some(index) = indexes.get_mut(collection) {
-            for vector in vectors {
-                index.insert(vector.id, &vector.data, vector.metadata.clone())?;
-            }
+        // Build the graph off the async runtime; the index spreads the
+        // batch over all cores while searches keep running
+        for index in self.index(collection).into_iter().chain(rebuilt) {
+            let vectors = vectors.to_vec();
+            self.pool.run(move || index.batch_insert(&vectors)).await??;
         }
         
         histogram!("vectorstore.batch_insert.duration").record(start.elapsed().as_secs_f64());
@@ -135,8 +259,125 @@ impl VectorStore {
         Ok(())
     }
     
+    /// Start loading vectors into a collection in bulk
+    ///
+    /// Vectors passed to `bulk_insert` skip the WAL and the index until
+    /// `finish_bulk_load` writes them out and builds the index over all of
+    /// them in one parallel pass. They are neither searchable nor durable
+    /// before then; a load cut short by a restart leaves no trace.
+    pub async fn begin_bulk_load(&self, collection: &str) -> Result<BulkLoadProgress> {
+        let collection = &*self.resolve(collection);
+        if self.get_collection_config(collection)?.is_none() {
+            return Err(VectorDbError::CollectionNotFound {
+                name: collection.to_string(),
+            });
+        }
+        
+        if self.reindexes.read().contains_key(collection) {
+            return Err(VectorDbError::ConfigError {
+                message: format!("Collection {} is being reindexed", collection),
+            });
+        }
+        
+        let mut loads = self.bulk_loads.write();
+        if loads.get(collection).map_or(false, |load| load.phase() != BulkLoadPhase::Done) {
+            return Err(VectorDbError::ConfigError {
+                message: format!("Collection {} is already being bulk loaded", collection),
+            });
+        }
+        let load = Arc::new(BulkLoad::new());
+        loads.insert(collection.to_string(), Arc::clone(&load));
+        
+        info!("Started bulk load into {}", collection);
+        Ok(load.progress(collection))
+    }
+    
+    /// Add vectors to a collection's bulk load
+    pub async fn bulk_insert(&self, collection: &str, vectors: &[Vector]) -> Result<BulkLoadProgress> {
+        let collection = &*self.resolve(collection);
+        let config = self.get_collection_config(collection)?
+            .ok_or_else(|| VectorDbError::CollectionNotFound {
+                name: collection.to_string(),
+            })?;
+        
+        for vector in vectors {
+            if vector.data.len() != config.dimension {
+                return Err(VectorDbError::InvalidDimension {
+                    expected: config.dimension,
+                    actual: vector.data.len(),
+                });
+            }
+        }
+        
+        let load = self.bulk_load(collection)?;
+        load.push(collection, vectors)?;
+        counter!("vectorstore.vectors.bulk_loaded").increment(vectors.len() as u64);
+        Ok(load.progress(collection))
+    }
+    
+    /// Write a bulk load to storage, build the index over it and snapshot
+    /// the result, which is what makes the load durable
+    pub async fn finish_bulk_load(&self, collection: &str) -> Result<BulkLoadProgress> {
+        let collection = &*self.resolve(collection);
+        let start = std::time::Instant::now();
+        let load = self.bulk_load(collection)?;
+        let vectors = load.start_build(collection)?;
+        let count = vectors.len();
+        
+        let built = async {
+            let _gate = self.write_gate.read().await;
+            let _invalidation = self.cache_invalidation(collection);
+            self.storage.bulk_insert(collection, &vectors).await?;
+            if let Some(index) = self.index(collection) {
+                let load = Arc::clone(&load);
+                self.pool.run(move || index.bulk_insert(&vectors, &load.built)).await??;
+            }
+            Ok::<_, VectorDbError>(())
+        }.await;
+        if let Err(e) = built {
+            self.bulk_loads.write().remove(collection);
+            return Err(e);
+        }
+        
+        // No WAL entry covers the load, so its collection is snapshotted
+        // even if nothing was logged since the last snapshot
+        self.snapshot_lsns.write().remove(collection);
+        self.snapshot_indexes().await?;
+        load.finish();
+        
+        histogram!("vectorstore.bulk_load.build_duration").record(start.elapsed().as_secs_f64());
+        info!(
+            "Bulk loaded {} vectors into {} in {:.3}s",
+            count, collection, start.elapsed().as_secs_f64()
+        );
+        Ok(load.progress(collection))
+    }
+    
+    /// Progress of a collection's current or last bulk load
+    pub fn bulk_load_progress(&self, collection: &str) -> Option<BulkLoadProgress> {
+        let collection = &*self.resolve(collection);
+        self.bulk_loads.read().get(collection).map(|load| load.progress(collection))
+    }
+    
+    /// A collection's current bulk load
+    fn bulk_load(&self, collection: &str) -> Result<Arc<BulkLoad>> {
+        self.bulk_loads.read().get(collection).cloned().ok_or_else(|| VectorDbError::ConfigError {
+            message: format!("Collection {} has no bulk load in progress", collection),
+        })
+    }
+    
     /// Query vectors for nearest neighbors
     pub async fn query(&self, request: &QueryRequest) -> Result<Vec<QueryResult>> {
+        Ok(self.query_with_deadline(request).await?.results)
+    }
+    
+    /// Query vectors for nearest neighbors, reporting whether the request's
+    /// deadline cut the search short
+    ///
+    /// The index search gets the deadline less a reserve for rescoring and
+    /// the response; past it, an HNSW walk stops expanding and returns the
+    /// best candidates found so far. Other searches run to completion.
+    pub async fn query_with_deadline(&self, request: &QueryRequest) -> Result<QueryOutcome> {
         let start = std::time::Instant::now();
         counter!("vectorstore.queries").increment(1);
         
@@ -154,15 +395,66 @@ impl VectorStore {
             });
         }
         
-        // Search index
-        let indexes = self.indexes.read();
-        let index = indexes
-            .get(&request.collection)
+        if let Some(oversampling) = request.oversampling {
+            if !(1.0..=MAX_RESCORE_OVERSAMPLING).contains(&oversampling) {
+                return Err(VectorDbError::ConfigError {
+                    message: format!(
+                        "oversampling must be between 1 and {}, got {}",
+                        MAX_RESCORE_OVERSAMPLING, oversampling
+                    ),
+                });
+            }
+        }
+        
+        // Search on the worker pool; a full queue rejects the query
+        let index = self.index(&config.name)
             .ok_or_else(|| VectorDbError::CollectionNotFound {
                 name: request.collection.clone(),
             })?;
+        // Compressed indexes rank approximately, so fetch extra candidates
+        let rescored = Self::rescores(&config);
+        let candidates = if rescored {
+            let oversampling = request.oversampling.unwrap_or_else(|| Self::default_oversampling(&config));
+            (request.limit as f32 * oversampling).ceil() as usize
+        } else {
+            request.limit
+        };
+        let vector = request.vector.clone();
+        // Defaults come from the stored config, which tuning may have
+        // changed without rebuilding the index
+        let params = SearchParams {
+            ef_search: request.ef_search.or(Some(config.index_config.ef_search)),
+            nprobe: request.nprobe.or(Some(config.index_config.nprobe)),
+            exact: request.exact,
+            deadline: request.deadline_ms.map(|ms| {
+                let budget = std::time::Duration::from_millis(ms).mul_f64(1.0 - DEADLINE_RESERVE);
+                SearchDeadline::at(start + budget)
+            }),
+        };
+        let deadline = params.deadline.clone();
+        
+        // Serve repeated queries from the cache until the next write
+        let cached = self.query_cache.as_ref().map(|cache| {
+            let key = QueryKey::new(request, candidates, params.ef_search, params.nprobe);
+            (cache, cache.generation(&config.name), key)
+        });
+        if let Some((cache, _, key)) = &cached {
+            if let Some(results) = cache.get(&config.name, key) {
+                counter!("vectorstore.query_cache.hits").increment(1);
+                histogram!("vectorstore.query.duration").record(start.elapsed().as_secs_f64());
+                histogram!("vectorstore.query.results").record(results.len() as f64);
+                return Ok(QueryOutcome { results, partial: false });
+            }
+            counter!("vectorstore.query_cache.misses").increment(1);
+        }
         
-        let search_results = index.search(&request.vector, request.limit, request.ef_search)?;
+        let filter = request.filter.as_ref().map(MetadataFilter::new).filter(|f| !f.is_empty());
+        let mut search_results = self.pool
+            .try_run(move || index.search_with(&vector, candidates, &params, filter.as_ref()))
+            .await??;
+        if rescored {
+            search_results = self.rescore(&config, request, search_results).await?;
+        }
         
         // Convert to QueryResult
         let results: Vec<QueryResult> = search_results
@@ -174,21 +466,86 @@ impl VectorStore {
             })
             .collect();
         
+        let partial = deadline.map_or(false, |d| d.cut_short());
+        if partial {
+            counter!("vectorstore.queries.partial").increment(1);
+        } else if let Some((cache, generation, key)) = cached {
+            cache.put(&config.name, key, generation, results.clone());
+        }
+        
         histogram!("vectorstore.query.duration").record(start.elapsed().as_secs_f64());
         histogram!("vectorstore.query.results").record(results.len() as f64);
-        Ok(results)
+        Ok(QueryOutcome { results, partial })
+    }
+    
+    /// Invalidates a collection's cached queries once the write holding it
+    /// is done with the index
+    fn cache_invalidation<'a>(&'a self, collection: &'a str) -> CacheInvalidation<'a> {
+        CacheInvalidation::new(self.query_cache.as_ref(), collection)
+    }
+    
+    /// Whether a collection's index ranks by compressed vectors that queries
+    /// rescore exactly
+    fn rescores(config: &CollectionConfig) -> bool {
+        match config.index_config.index_type {
+            IndexType::Hnsw | IndexType::Flat => config.vector_type != VectorType::Float32,
+            IndexType::IvfPq => config.index_config.rerank,
+        }
+    }
+    
+    /// Candidates fetched per result when a query does not choose
+    fn default_oversampling(config: &CollectionConfig) -> f32 {
+        match config.vector_type {
+            VectorType::Binary if config.index_config.index_type != IndexType::IvfPq => BINARY_RESCORE_OVERSAMPLING,
+            _ => RESCORE_OVERSAMPLING,
+        }
+    }
+    
+    /// Recompute candidates' distances from the full-precision vectors in
+    /// storage, keeping the closest `request.limit`
+    async fn rescore(
+        &self,
+        config: &CollectionConfig,
+        request: &QueryRequest,
+        candidates: Vec<SearchResult>,
+    ) -> Result<Vec<SearchResult>> {
+        let mut rescored = Vec::with_capacity(candidates.len());
+        for mut candidate in candidates {
+            // Vectors deleted since the search are dropped
+            if let Some(vector) = self.storage.get_vector(&config.name, &candidate.id).await? {
+                candidate.distance = distance(&request.vector, &vector.data, config.distance_metric);
+                rescored.push(candidate);
+            }
+        }
+        
+        rescored.sort_by(|a, b| a.distance.partial_cmp(&b.distance).unwrap_or(std::cmp::Ordering::Equal));
+        rescored.truncate(request.limit);
+        Ok(rescored)
     }
     
     /// Delete a vector
     pub async fn delete(&self, collection: &str, id: &VectorId) -> Result<bool> {
+        self.delete_with_durability(collection, id, None).await
+    }
+    
+    /// Delete a vector, overriding the collection's WAL durability if given
+    pub async fn delete_with_durability(
+        &self,
+        collection: &str,
+        id: &VectorId,
+        durability: Option<DurabilityMode>,
+    ) -> Result<bool> {
+        let collection = &*self.resolve(collection);
         counter!("vectorstore.vectors.deleted").increment(1);
         
         // Delete from storage
-        let storage_deleted = self.storage.delete_vector(collection, id).await?;
+        let _gate = self.write_gate.read().await;
+        let _invalidation = self.cache_invalidation(collection);
+        let rebuilt = self.index_being_rebuilt(collection, [*id]).await;
+        let storage_deleted = self.storage.delete_vector_with_durability(collection, id, durability).await?;
         
-        // Delete from index
-        let mut indexes = self.indexes.write();
-        if let Some(index) = indexes.get_mut(collection) {
+        // Delete from index, and from its replacement while one is being built
+        for index in self.index(collection).into_iter().chain(rebuilt) {
             index.delete(id)?;
         }
         
@@ -197,18 +554,30 @@ impl VectorStore {
     
     /// Update a vector
     pub async fn update(&self, collection: &str, vector: &Vector) -> Result<()> {
+        self.update_with_durability(collection, vector, None).await
+    }
+    
+    /// Update a vector, overriding the collection's WAL durability if given
+    pub async fn update_with_durability(
+        &self,
+        collection: &str,
+        vector: &Vector,
+        durability: Option<DurabilityMode>,
+    ) -> Result<()> {
+        let collection = &*self.resolve(collection);
         counter!("vectorstore.vectors.updated").increment(1);
         
         // For now, implement as delete + insert
         // A more efficient implementation would update in-place
-        self.delete(collection, &vector.id).await?;
-        self.insert(collection, vector).await?;
+        self.delete_with_durability(collection, &vector.id, durability).await?;
+        self.insert_with_durability(collection, vector, durability).await?;
         
         Ok(())
     }
     
     /// Get a vector by ID
     pub async fn get(&self, collection: &str, id: &VectorId) -> Result<Option<Vector>> {
+        let collection = &*self.resolve(collection);
         self.storage.get_vector(collection, id).await
     }
     
@@ -219,11 +588,13 @@ impl VectorStore {
     
     /// Get collection configuration
     pub fn get_collection_config(&self, name: &str) -> Result<Option<CollectionConfig>> {
+        let name = &*self.resolve(name);
         self.storage.get_collection_config(name)
     }
     
     /// Get collection statistics
     pub async fn get_collection_stats(&self, name: &str) -> Result<Option<CollectionStats>> {
+        let name = &*self.resolve(name);
         let mut stats = self.storage.get_collection_stats(name).await?;
         
         if let Some(ref mut stats) = stats {
@@ -244,34 +615,523 @@ impl VectorStore {
         self.storage.sync().await
     }
     
-    /// Rebuild indexes from storage (used during startup)
-    async fn rebuild_indexes(&mut self) -> Result<()> {
-        info!("Rebuilding indexes from storage...");
+    /// Write index snapshots for all collections and checkpoint storage
+    ///
+    /// Each snapshot records the WAL position it covers, so startup only has
+    /// to replay later WAL entries instead of rebuilding the whole graph.
+    /// The storage checkpoint taken at the same position lets WAL segments
+    /// that no snapshot still needs be deleted.
+    /// Returns the number of snapshots written; nothing is written when no
+    /// operation has been logged since the previous snapshot.
+    pub async fn snapshot_indexes(&self) -> Result<usize> {
+        let start = std::time::Instant::now();
+        
+        // Capture the WAL position, index bytes and data file lengths with writers paused
+        let (lsn, captured, checkpoint) = {
+            let _gate = self.write_gate.write().await;
+            let lsn = self.storage.wal_lsn().await?;
+            let last = self.snapshot_lsns.read().clone();
+            let indexes = self.indexes.read();
+            
+            let mut captured = Vec::new();
+            for (name, index) in indexes.iter() {
+                if last.get(name) != Some(&lsn) {
+                    captured.push((name.clone(), index.serialize()?));
+                }
+            }
+            let checkpoint = self.storage.capture_checkpoint(lsn).await?;
+            (lsn, captured, checkpoint)
+        };
+        
+        let mut written = 0;
+        for (name, data) in captured {
+            let dir = self.storage.collection_dir(&name);
+            let result = tokio::task::spawn_blocking(move || snapshot::write_snapshot(&dir, lsn, &data))
+                .await
+                .map_err(|e| VectorDbError::Internal { message: e.to_string() })?;
+            
+            match result {
+                Ok(()) => {
+                    self.snapshot_lsns.write().insert(name, lsn);
+                    written += 1;
+                }
+                // The collection may have been deleted after the capture
+                Err(e) => warn!("Failed to write index snapshot for {}: {}", name, e),
+            }
+        }
+        
+        // Keep WAL entries needed by any collection whose snapshot is older
+        let retain_from = {
+            let snapshot_lsns = self.snapshot_lsns.read();
+            self.list_collections()
+                .iter()
+                .map(|name| snapshot_lsns.get(name).copied().unwrap_or(0))
+                .min()
+                .unwrap_or(lsn)
+        };
+        let removed = self.storage.write_checkpoint(&checkpoint, retain_from).await?;
+        if removed > 0 {
+            counter!("vectorstore.wal.segments_removed").increment(removed as u64);
+        }
+        
+        if written > 0 {
+            counter!("vectorstore.snapshots.written").increment(written as u64);
+            histogram!("vectorstore.snapshot.duration").record(start.elapsed().as_secs_f64());
+            info!("Wrote {} index snapshots at LSN {} in {:.3}s", written, lsn, start.elapsed().as_secs_f64());
+        }
+        
+        Ok(written)
+    }
+    
+    /// Reclaim the space held by a collection's deleted and overwritten vectors
+    ///
+    /// Live vectors are copied into fresh files, paced to
+    /// `io_budget_bytes_per_sec` or the configured budget, and swapped in
+    /// without blocking reads. A checkpoint follows so the superseded files
+    /// are deleted.
+    pub async fn compact_collection(
+        &self,
+        name: &str,
+        io_budget_bytes_per_sec: Option<u64>,
+    ) -> Result<CompactionStats> {
+        let name = &*self.resolve(name);
+        let stats = self.storage.compact_collection(name, io_budget_bytes_per_sec).await?;
+        self.snapshot_indexes().await?;
+        
+        counter!("vectorstore.compactions").increment(1);
+        counter!("vectorstore.compaction.bytes_reclaimed").increment(stats.bytes_reclaimed);
+        histogram!("vectorstore.compaction.duration").record(stats.duration_ms as f64 / 1000.0);
         
+        Ok(stats)
+    }
+    
+    /// Compact every collection whose data file is at least
+    /// `min_garbage_ratio` deleted or overwritten records
+    pub async fn compact_garbage(
+        &self,
+        min_garbage_ratio: f64,
+        io_budget_bytes_per_sec: Option<u64>,
+    ) -> Result<Vec<CompactionStats>> {
+        let mut compacted = Vec::new();
+        for name in self.list_collections() {
+            // The collection may have been deleted since it was listed
+            let ratio = match self.storage.garbage_ratio(&name).await {
+                Ok(ratio) => ratio,
+                Err(VectorDbError::CollectionNotFound { .. }) => continue,
+                Err(e) => return Err(e),
+            };
+            
+            if ratio >= min_garbage_ratio {
+                compacted.push(self.compact_collection(&name, io_budget_bytes_per_sec).await?);
+            }
+        }
+        Ok(compacted)
+    }
+    
+    /// Point an alias at a collection, creating it or switching it atomically
+    ///
+    /// Every operation that takes a collection name, except deleting the
+    /// collection, also accepts an alias. Readers using the alias move to
+    /// the new collection with their next request. The alias's version
+    /// changes on each switch, for clients caching anything under it.
+    pub async fn set_alias(&self, alias: &str, collection: &str) -> Result<CollectionAlias> {
+        if self.storage.get_collection_config(alias)?.is_some() {
+            return Err(VectorDbError::ConfigError {
+                message: format!("{} is already a collection name", alias),
+            });
+        }
+        // Aliases point at collections, never at other aliases
+        if self.storage.get_collection_config(collection)?.is_none() {
+            return Err(VectorDbError::CollectionNotFound {
+                name: collection.to_string(),
+            });
+        }
+        
+        let alias = self.aliases.set(alias, collection).await?;
+        counter!("vectorstore.aliases.switched").increment(1);
+        info!("Alias {} now points at {} (version {})", alias.alias, alias.collection, alias.version);
+        Ok(alias)
+    }
+    
+    /// Remove an alias, returning whether it existed
+    pub async fn delete_alias(&self, alias: &str) -> Result<bool> {
+        self.aliases.remove(alias).await
+    }
+    
+    /// Look up an alias
+    pub fn get_alias(&self, alias: &str) -> Option<CollectionAlias> {
+        self.aliases.get(alias)
+    }
+    
+    /// All aliases, ordered by name
+    pub fn list_aliases(&self) -> Vec<CollectionAlias> {
+        self.aliases.list()
+    }
+    
+    /// The collection `name` refers to: an alias's target, or `name` itself
+    fn resolve<'a>(&self, name: &'a str) -> Cow<'a, str> {
+        match self.aliases.resolve(name) {
+            Some(collection) => Cow::Owned(collection),
+            None => Cow::Borrowed(name),
+        }
+    }
+    
+    /// Rebuild a collection's index with new parameters
+    ///
+    /// The new index is built from the stored vectors in the background
+    /// while the current one keeps serving queries. Writes made meanwhile
+    /// go to both, and the new index is swapped in once it has caught up,
+    /// then snapshotted along with the new parameters. The index type
+    /// cannot change: only the parameters of the current type are rebuilt.
+    /// When only search-time parameters change, they are stored without a
+    /// rebuild.
+    pub async fn reindex_collection(&self, name: &str, index_config: IndexConfig) -> Result<ReindexStats> {
+        let name = &*self.resolve(name);
+        let start = std::time::Instant::now();
+        let mut config = self.get_collection_config(name)?
+            .ok_or_else(|| VectorDbError::CollectionNotFound {
+                name: name.to_string(),
+            })?;
+        if index_config.index_type != config.index_config.index_type {
+            return Err(VectorDbError::ConfigError {
+                message: format!(
+                    "Cannot reindex {} from {:?} to {:?}; the index type is fixed at creation",
+                    name, config.index_config.index_type, index_config.index_type
+                ),
+            });
+        }
+        if index_config.index_type == IndexType::IvfPq {
+            IvfPqIndex::validate_config(&index_config, config.dimension)?;
+        }
+        if Self::same_build_params(&config.index_config, &index_config) {
+            return self.set_search_params(name, index_config, start).await;
+        }
+        config.index_config = index_config;
+        
+        // Start dual writes and take the vectors to copy at the same point
+        let (reindex, ids) = {
+            let _gate = self.write_gate.write().await;
+            if self.bulk_loads.read().get(name).map_or(false, |load| load.phase() != BulkLoadPhase::Done) {
+                return Err(VectorDbError::ConfigError {
+                    message: format!("Collection {} is being bulk loaded", name),
+                });
+            }
+            let mut reindexes = self.reindexes.write();
+            if reindexes.contains_key(name) {
+                return Err(VectorDbError::ConfigError {
+                    message: format!("Collection {} is already being reindexed", name),
+                });
+            }
+            let reindex = Arc::new(Reindex::new(Self::new_index(&config).into()));
+            reindexes.insert(name.to_string(), Arc::clone(&reindex));
+            (reindex, self.storage.vector_ids(name)?)
+        };
+        info!("Reindexing {} ({} vectors)", name, ids.len());
+        
+        let vectors_indexed = match self.copy_into_reindex(name, &reindex, &ids).await {
+            Ok(copied) => copied,
+            Err(e) => {
+                self.reindexes.write().remove(name);
+                return Err(e);
+            }
+        };
+        
+        let concurrent_writes = {
+            let _gate = self.write_gate.write().await;
+            // A collection deleted during the build has nothing to swap into
+            if self.reindexes.write().remove(name).is_none() {
+                return Err(VectorDbError::CollectionNotFound {
+                    name: name.to_string(),
+                });
+            }
+            self.storage.set_index_config(name, config.index_config.clone())?;
+            self.indexes.write().insert(name.to_string(), Arc::clone(&reindex.index));
+            // The new index may rank some queries differently
+            if let Some(cache) = &self.query_cache {
+                cache.invalidate(name);
+            }
+            reindex.written.lock().await.len()
+        };
+        
+        // The new index is covered by no snapshot yet, whatever the WAL says
+        self.snapshot_lsns.write().remove(name);
+        self.snapshot_indexes().await?;
+        
+        counter!("vectorstore.reindexes").increment(1);
+        histogram!("vectorstore.reindex.duration").record(start.elapsed().as_secs_f64());
+        info!("Reindexed {} in {:.3}s", name, start.elapsed().as_secs_f64());
+        Ok(ReindexStats {
+            collection: name.to_string(),
+            vectors_indexed,
+            concurrent_writes,
+            duration_ms: start.elapsed().as_millis() as u64,
+        })
+    }
+    
+    /// Whether two index configs build the same index, differing at most in
+    /// the defaults applied at search time
+    fn same_build_params(a: &IndexConfig, b: &IndexConfig) -> bool {
+        a.index_type == b.index_type
+            && a.max_connections == b.max_connections
+            && a.ef_construction == b.ef_construction
+            && a.max_layer == b.max_layer
+            && a.nlist == b.nlist
+            && a.pq_subvectors == b.pq_subvectors
+    }
+    
+    /// Store new search-time defaults for a collection, such as `ef_search`,
+    /// which queries pick up from its config without a rebuild
+    async fn set_search_params(
+        &self,
+        name: &str,
+        index_config: IndexConfig,
+        start: std::time::Instant,
+    ) -> Result<ReindexStats> {
+        {
+            // A rebuild would overwrite the parameters when it swaps in
+            let _gate = self.write_gate.write().await;
+            if self.reindexes.read().contains_key(name) {
+                return Err(VectorDbError::ConfigError {
+                    message: format!("Collection {} is already being reindexed", name),
+                });
+            }
+            self.storage.set_index_config(name, index_config)?;
+        }
+        self.snapshot_indexes().await?;
+        
+        info!("Updated search parameters of {}", name);
+        Ok(ReindexStats {
+            collection: name.to_string(),
+            vectors_indexed: 0,
+            concurrent_writes: 0,
+            duration_ms: start.elapsed().as_millis() as u64,
+        })
+    }
+    
+    /// Copy stored vectors into a reindex, skipping any a writer has touched
+    /// since the copy began; returns the number copied
+    async fn copy_into_reindex(&self, name: &str, reindex: &Reindex, ids: &[VectorId]) -> Result<usize> {
+        let mut copied = 0;
+        for chunk in ids.chunks(REINDEX_CHUNK) {
+            let mut vectors = Vec::with_capacity(chunk.len());
+            for id in chunk {
+                if let Some(vector) = self.storage.get_vector(name, id).await? {
+                    vectors.push(vector);
+                }
+            }
+            
+            // Writers wait on the lock until this chunk is in, so none can
+            // apply a newer write to the new index before the stale copy
+            let written = reindex.written.lock().await;
+            vectors.retain(|v| !written.contains(&v.id));
+            copied += vectors.len();
+            let index = Arc::clone(&reindex.index);
+            self.pool.run(move || index.batch_insert(&vectors)).await??;
+            drop(written);
+        }
+        Ok(copied)
+    }
+    
+    /// The index replacing a collection's current one, if a reindex is
+    /// running, once the ids about to be written are recorded against it
+    async fn index_being_rebuilt(
+        &self,
+        collection: &str,
+        ids: impl IntoIterator<Item = VectorId>,
+    ) -> Option<Arc<dyn VectorIndex>> {
+        let reindex = self.reindexes.read().get(collection).cloned()?;
+        reindex.mark_written(ids).await;
+        Some(Arc::clone(&reindex.index))
+    }
+    
+    /// Shared handle to a collection's index
+    fn index(&self, collection: &str) -> Option<Arc<dyn VectorIndex>> {
+        self.indexes.read().get(collection).cloned()
+    }
+    
+    /// Create an empty index for a collection
+    fn new_index(config: &CollectionConfig) -> Box<dyn VectorIndex> {
+        match config.index_config.index_type {
+            IndexType::Hnsw => Box::new(
+                HnswIndex::new(config.index_config.clone(), config.distance_metric, config.dimension)
+                    .with_vector_type(config.vector_type)
+                    .with_indexed_fields(&config.indexed_fields),
+            ),
+            // Codes replace the stored vectors, so the vector type does not apply
+            IndexType::IvfPq => Box::new(
+                IvfPqIndex::new(config.index_config.clone(), config.distance_metric, config.dimension),
+            ),
+            IndexType::Flat => Box::new(
+                FlatIndex::new(config.distance_metric, config.dimension)
+                    .with_vector_type(config.vector_type)
+                    .with_indexed_fields(&config.indexed_fields),
+            ),
+        }
+    }
+    
+    /// Load a collection's index snapshot into `index`, returning its WAL position
+    fn load_index_snapshot(&self, name: &str, index: &mut dyn VectorIndex) -> Result<Option<u64>> {
+        match snapshot::load_snapshot(&self.storage.collection_dir(name))? {
+            Some(snapshot) => {
+                index.deserialize(snapshot.data())?;
+                Ok(Some(snapshot.lsn))
+            }
+            None => Ok(None),
+        }
+    }
+    
+    /// Rebuild indexes on startup from snapshots plus the WAL tail after them
+    async fn rebuild_indexes(&mut self) -> Result<()> {
+        let start = std::time::Instant::now();
         let collections = self.storage.list_collections();
+        let total = collections.len();
+        
+        info!("Rebuilding indexes for {} collections", total);
+        
+        // WAL position after which each collection's index needs replay
+        let mut replay_from: HashMap<CollectionId, u64> = HashMap::new();
+        // Entries before this were removed after a checkpoint, so only
+        // storage still holds every vector
+        let wal_start = self.storage.wal_oldest_lsn().await?;
         
-        for collection_name in collections {
-            if let Some(config) = self.storage.get_collection_config(&collection_name)? {
-                info!("Rebuilding index for collection: {}", collection_name);
+        for (position, collection_name) in collections.iter().enumerate() {
+            if let Some(config) = self.storage.get_collection_config(collection_name)? {
+                info!("Rebuilding index for collection: {} ({}/{})", collection_name, position + 1, total);
                 
-                let index = Box::new(HnswIndex::new(
-                    config.index_config.clone(),
-                    config.distance_metric,
-                    config.dimension,
-                ));
+                let mut index = Self::new_index(&config);
+                let lsn = match self.load_index_snapshot(collection_name, index.as_mut()) {
+                    Ok(Some(lsn)) if lsn >= wal_start => {
+                        info!("Loaded index snapshot for {} at LSN {}", collection_name, lsn);
+                        self.snapshot_lsns.write().insert(collection_name.clone(), lsn);
+                        lsn
+                    }
+                    Ok(Some(lsn)) => {
+                        warn!(
+                            "Ignoring index snapshot for {} at LSN {}; the WAL now starts at LSN {}",
+                            collection_name, lsn, wal_start
+                        );
+                        index = Self::new_index(&config);
+                        0
+                    }
+                    Ok(None) => 0,
+                    Err(e) => {
+                        warn!("Ignoring unusable index snapshot for {}: {}", collection_name, e);
+                        index = Self::new_index(&config);
+                        0
+                    }
+                };
                 
-                // TODO: Iterate through all vectors in storage and rebuild index
-                // This would require implementing an iterator over stored vectors
-                // For now, we create an empty index
+                // Replaying a WAL that no longer starts at 0 would leave out
+                // the vectors logged before it, so index storage instead
+                let lsn = if lsn < wal_start {
+                    let indexed = self.index_from_storage(collection_name, index.as_ref()).await?;
+                    info!("Indexed {} stored vectors for {}", indexed, collection_name);
+                    self.storage.wal_lsn().await?
+                } else {
+                    lsn
+                };
                 
-                self.indexes.write().insert(collection_name.clone(), index);
+                replay_from.insert(collection_name.clone(), lsn);
+                self.indexes.write().insert(collection_name.clone(), index.into());
+            }
+        }
+        
+        // Replay only what the oldest snapshot does not cover
+        if let Some(oldest) = replay_from.values().copied().min() {
+            let mut reader = self.storage.wal_reader_from(oldest).await?;
+            let mut replayed = 0usize;
+            
+            while let Some((lsn, operation)) = reader.next().await? {
+                replayed += self.replay_operation(&replay_from, lsn, operation)?;
+                if replayed > 0 && replayed % 100_000 == 0 {
+                    info!("Rebuilding indexes: replayed {} WAL vectors", replayed);
+                }
             }
+            
+            info!("Replayed {} vectors from WAL after LSN {}", replayed, oldest);
         }
         
-        info!("Index rebuild completed");
+        for (position, collection_name) in collections.iter().enumerate() {
+            if let Some(index) = self.indexes.read().get(collection_name) {
+                info!(
+                    "Rebuilt index for collection: {} ({}/{}, {} vectors)",
+                    collection_name, position + 1, total, index.stats().vector_count
+                );
+            }
+        }
+        
+        info!("Index rebuild completed in {:.3}s", start.elapsed().as_secs_f64());
         Ok(())
     }
     
+    /// Index every vector a collection has in storage, returning how many
+    async fn index_from_storage(&self, name: &str, index: &dyn VectorIndex) -> Result<usize> {
+        let ids = self.storage.vector_ids(name)?;
+        let mut indexed = 0;
+        for chunk in ids.chunks(REINDEX_CHUNK) {
+            let mut vectors = Vec::with_capacity(chunk.len());
+            for id in chunk {
+                if let Some(vector) = self.storage.get_vector(name, id).await? {
+                    vectors.push(vector);
+                }
+            }
+            index.batch_insert(&vectors)?;
+            indexed += vectors.len();
+        }
+        Ok(indexed)
+    }
+    
+    /// Apply one WAL entry to the in-memory indexes if its collection's
+    /// snapshot does not already include it. Returns the vectors applied.
+    fn replay_operation(
+        &self,
+        replay_from: &HashMap<CollectionId, u64>,
+        lsn: u64,
+        operation: WALOperation,
+    ) -> Result<usize> {
+        let pending = |collection: &str| {
+            replay_from.get(collection).map_or(false, |&from| lsn > from)
+        };
+        let mut indexes = self.indexes.write();
+        
+        match operation {
+            WALOperation::CreateCollection(config) if pending(&config.name) => {
+                indexes.insert(config.name.clone(), Self::new_index(&config).into());
+            }
+            WALOperation::DeleteCollection(name) if pending(&name) => {
+                if let Some(config) = self.storage.get_collection_config(&name)? {
+                    indexes.insert(name, Self::new_index(&config).into());
+                }
+            }
+            WALOperation::InsertVector { collection, vector } if pending(&collection) => {
+                if let Some(index) = indexes.get(&collection) {
+                    if !index.contains(&vector.id) {
+                        index.insert(vector.id, &vector.data, vector.metadata)?;
+                        return Ok(1);
+                    }
+                }
+            }
+            WALOperation::BatchInsert { collection, vectors } if pending(&collection) => {
+                if let Some(index) = indexes.get(&collection) {
+                    let missing: Vec<Vector> = vectors
+                        .into_iter()
+                        .filter(|vector| !index.contains(&vector.id))
+                        .collect();
+                    index.batch_insert(&missing)?;
+                    return Ok(missing.len());
+                }
+            }
+            WALOperation::DeleteVector { collection, id } if pending(&collection) => {
+                if let Some(index) = indexes.get(&collection) {
+                    index.delete(&id)?;
+                }
+            }
+            _ => {}
+        }
+        
+        Ok(0)
+    }
+    
     /// Get server statistics
     pub async fn get_server_stats(&self) -> Result<ServerStats> {
         let collections = self.list_collections();
@@ -298,10 +1158,21 @@ impl VectorStore {
             memory_usage,
             disk_usage: 0, // TODO: Calculate actual disk usage
             uptime_seconds: 0, // TODO: Track server uptime
+            search_queue_depth: self.pool.queue_depth() as u64,
+            search_queue_capacity: self.pool.queue_capacity() as u64,
         })
     }
 }
 
+/// Results of a query
+#[derive(Debug, Clone)]
+pub struct QueryOutcome {
+    pub results: Vec<QueryResult>,
+    /// The deadline stopped the search early; results are the best found
+    /// by then rather than the full search's
+    pub partial: bool,
+}
+
 /// Server statistics
 #[derive(Debug, Clone, serde::Serialize)]
 pub struct ServerStats {
@@ -310,21 +1181,27 @@ pub struct ServerStats {
     pub memory_usage: u64,
     pub disk_usage: u64,
     pub uptime_seconds: u64,
+    /// Searches and index builds waiting for a worker
+    pub search_queue_depth: u64,
+    /// Jobs that may wait before searches are rejected
+    pub search_queue_capacity: u64,
 }
 
 #[cfg(test)]
 mod tests {
     use super::*;
-    use tempfile::tempdir;
+    use tempfile::{tempdir, TempDir};
+    use uuid::Uuid;
     
-    async fn create_test_store() -> VectorStore {
+    async fn create_test_store() -> (VectorStore, TempDir) {
         let temp_dir = tempdir().unwrap();
-        VectorStore::new(temp_dir.path()).await.unwrap()
+        let store = VectorStore::new(temp_dir.path()).await.unwrap();
+        (store, temp_dir)
     }
     
     #[tokio::test]
     async fn test_create_collection() {
-        let store = create_test_store().await;
+        let (store, _dir) = create_test_store().await;
         
         let config = CollectionConfig {
             name: "test".to_string(),
@@ -332,6 +1209,8 @@ mod tests {
             distance_metric: DistanceMetric::Cosine,
             vector_type: VectorType::Float32,
             index_config: IndexConfig::default(),
+            durability: None,
+            indexed_fields: Vec::new(),
         };
         
         store.create_collection(&config).await.unwrap();
@@ -342,7 +1221,7 @@ mod tests {
     
     #[tokio::test]
     async fn test_insert_and_query() {
-        let store = create_test_store().await;
+        let (store, _dir) = create_test_store().await;
         
         let config = CollectionConfig {
             name: "test".to_string(),
@@ -350,6 +1229,8 @@ mod tests {
             distance_metric: DistanceMetric::Cosine,
             vector_type: VectorType::Float32,
             index_config: IndexConfig::default(),
+            durability: None,
+            indexed_fields: Vec::new(),
         };
         
         store.create_collection(&config).await.unwrap();
@@ -367,11 +1248,780 @@ mod tests {
             vector: vec![1.0, 0.0, 0.0],
             limit: 1,
             ef_search: None,
+            nprobe: None,
+            oversampling: None,
+            exact: false,
             filter: None,
+            deadline_ms: None,
         };
         
         let results = store.query(&query).await.unwrap();
         assert_eq!(results.len(), 1);
         assert_eq!(results[0].id, vector.id);
     }
-}
\ No newline at end of file
+    
+    #[tokio::test]
+    async fn test_query_deadline_returns_partial_results() {
+        let (store, _dir) = create_test_store().await;
+        
+        let config = CollectionConfig {
+            name: "test".to_string(),
+            dimension: 8,
+            distance_metric: DistanceMetric::Euclidean,
+            vector_type: VectorType::Float32,
+            index_config: IndexConfig::default(),
+            durability: None,
+            indexed_fields: Vec::new(),
+        };
+        store.create_collection(&config).await.unwrap();
+        
+        let vectors: Vec<Vector> = (0..2000)
+            .map(|i| Vector {
+                id: Uuid::new_v4(),
+                data: (0..8).map(|d| ((i * 7 + d * 13) % 97) as f32).collect(),
+                metadata: None,
+            })
+            .collect();
+        store.batch_insert("test", &vectors).await.unwrap();
+        
+        let mut query = QueryRequest {
+            collection: "test".to_string(),
+            vector: vec![40.0; 8],
+            limit: 10,
+            // Small enough that the index walks its graph rather than scanning
+            ef_search: Some(32),
+            nprobe: None,
+            oversampling: None,
+            exact: false,
+            filter: None,
+            deadline_ms: None,
+        };
+        let full = store.query_with_deadline(&query).await.unwrap();
+        assert!(!full.partial);
+        assert_eq!(full.results.len(), 10);
+        
+        // A deadline already passed still answers, with what was found
+        query.deadline_ms = Some(0);
+        let cut = store.query_with_deadline(&query).await.unwrap();
+        assert!(cut.partial);
+        assert!(!cut.results.is_empty() && cut.results.len() <= 10);
+    }
+    
+    #[tokio::test]
+    async fn test_query_cache_invalidated_by_writes() {
+        let temp_dir = tempdir().unwrap();
+        let store = VectorStore::new(temp_dir.path()).await.unwrap().with_query_cache(16);
+        
+        let config = CollectionConfig {
+            name: "test".to_string(),
+            dimension: 2,
+            distance_metric: DistanceMetric::Euclidean,
+            vector_type: VectorType::Float32,
+            index_config: IndexConfig::default(),
+            durability: None,
+            indexed_fields: Vec::new(),
+        };
+        store.create_collection(&config).await.unwrap();
+        store.set_alias("live", "test").await.unwrap();
+        
+        let far = Vector {
+            id: Uuid::new_v4(),
+            data: vec![5.0, 5.0],
+            metadata: None,
+        };
+        store.insert("test", &far).await.unwrap();
+        
+        let query = QueryRequest {
+            collection: "test".to_string(),
+            vector: vec![0.0, 0.0],
+            limit: 1,
+            ef_search: None,
+            nprobe: None,
+            oversampling: None,
+            exact: false,
+            filter: None,
+            deadline_ms: None,
+        };
+        assert_eq!(store.query(&query).await.unwrap()[0].id, far.id);
+        // Answered from the cache, whichever name the collection goes by
+        let via_alias = QueryRequest { collection: "live".to_string(), ..query.clone() };
+        assert_eq!(store.query(&via_alias).await.unwrap()[0].id, far.id);
+        
+        let near = Vector {
+            id: Uuid::new_v4(),
+            data: vec![0.1, 0.0],
+            metadata: None,
+        };
+        store.insert("test", &near).await.unwrap();
+        assert_eq!(store.query(&query).await.unwrap()[0].id, near.id);
+        
+        store.delete("test", &near.id).await.unwrap();
+        assert_eq!(store.query(&query).await.unwrap()[0].id, far.id);
+    }
+    
+    #[tokio::test]
+    async fn test_quantized_query_rescored() {
+        let (store, _temp_dir) = create_test_store().await;
+        let mut seed = 7u64;
+        let mut random = move || {
+            seed = seed.wrapping_mul(6364136223846793005).wrapping_add(1442695040888963407);
+            (seed >> 40) as f32 / (1u64 << 24) as f32 - 0.5
+        };
+        let vectors: Vec<Vector> = (0..300)
+            .map(|_| Vector {
+                id: Uuid::new_v4(),
+                data: (0..32).map(|_| random()).collect(),
+                metadata: None,
+            })
+            .collect();
+        let query: Vec<f32> = (0..32).map(|_| random()).collect();
+        
+        let mut exact: Vec<(f32, VectorId)> = vectors
+            .iter()
+            .map(|v| (distance(&query, &v.data, DistanceMetric::Euclidean), v.id))
+            .collect();
+        exact.sort_by(|a, b| a.0.partial_cmp(&b.0).unwrap());
+        
+        let mut memory = Vec::new();
+        for vector_type in [VectorType::Float32, VectorType::Float16, VectorType::Int8] {
+            let name = format!("{:?}", vector_type).to_lowercase();
+            let config = CollectionConfig {
+                name: name.clone(),
+                dimension: 32,
+                distance_metric: DistanceMetric::Euclidean,
+                vector_type,
+                index_config: IndexConfig::default(),
+                durability: None,
+                indexed_fields: Vec::new(),
+            };
+            store.create_collection(&config).await.unwrap();
+            store.batch_insert(&name, &vectors).await.unwrap();
+            
+            let request = QueryRequest {
+                collection: name.clone(),
+                vector: query.clone(),
+                limit: 5,
+                ef_search: Some(100),
+                nprobe: None,
+                oversampling: None,
+                exact: false,
+                filter: None,
+                deadline_ms: None,
+            };
+            let results = store.query(&request).await.unwrap();
+            
+            // Rescored distances are the exact ones
+            let expected: Vec<(f32, VectorId)> = exact[..5].to_vec();
+            let actual: Vec<(f32, VectorId)> = results.iter().map(|r| (r.distance, r.id)).collect();
+            assert_eq!(actual, expected, "{:?}", vector_type);
+            
+            memory.push(store.get_collection_stats(&name).await.unwrap().unwrap().memory_usage);
+        }
+        // Float32, then float16, then int8
+        assert!(memory[1] < memory[0] && memory[2] < memory[1]);
+    }
+    
+    #[tokio::test]
+    async fn test_binary_query_oversampled() {
+        let (store, _temp_dir) = create_test_store().await;
+        let mut seed = 3u64;
+        let mut random = move || {
+            seed = seed.wrapping_mul(6364136223846793005).wrapping_add(1442695040888963407);
+            (seed >> 40) as f32 / (1u64 << 24) as f32 - 0.5
+        };
+        let vectors: Vec<Vector> = (0..300)
+            .map(|_| Vector {
+                id: Uuid::new_v4(),
+                data: (0..256).map(|_| random()).collect(),
+                metadata: None,
+            })
+            .collect();
+        let query: Vec<f32> = vectors[9].data.iter().map(|x| x + 0.2 * random()).collect();
+        
+        let mut exact: Vec<(f32, VectorId)> = vectors
+            .iter()
+            .map(|v| (distance(&query, &v.data, DistanceMetric::Cosine), v.id))
+            .collect();
+        exact.sort_by(|a, b| a.0.partial_cmp(&b.0).unwrap());
+        
+        let config = CollectionConfig {
+            name: "binary".to_string(),
+            dimension: 256,
+            distance_metric: DistanceMetric::Cosine,
+            vector_type: VectorType::Binary,
+            index_config: IndexConfig::default(),
+            durability: None,
+            indexed_fields: Vec::new(),
+        };
+        store.create_collection(&config).await.unwrap();
+        store.batch_insert("binary", &vectors).await.unwrap();
+        
+        // Oversampling past the collection size rescores every vector
+        let mut request = QueryRequest {
+            collection: "binary".to_string(),
+            vector: query.clone(),
+            limit: 5,
+            ef_search: None,
+            nprobe: None,
+            oversampling: Some(60.0),
+            exact: false,
+            filter: None,
+            deadline_ms: None,
+        };
+        let results = store.query(&request).await.unwrap();
+        let actual: Vec<(f32, VectorId)> = results.iter().map(|r| (r.distance, r.id)).collect();
+        assert_eq!(actual, exact[..5].to_vec());
+        
+        // The default still finds the vector the query was perturbed from
+        request.oversampling = None;
+        assert_eq!(store.query(&request).await.unwrap()[0].id, vectors[9].id);
+        
+        request.oversampling = Some(0.5);
+        assert!(matches!(store.query(&request).await, Err(VectorDbError::ConfigError { .. })));
+    }
+    
+    #[tokio::test]
+    async fn test_ivfpq_collection_reranked() {
+        let (store, _temp_dir) = create_test_store().await;
+        let mut seed = 11u64;
+        let mut random = move || {
+            seed = seed.wrapping_mul(6364136223846793005).wrapping_add(1442695040888963407);
+            (seed >> 40) as f32 / (1u64 << 24) as f32 - 0.5
+        };
+        let vectors: Vec<Vector> = (0..1000)
+            .map(|_| Vector {
+                id: Uuid::new_v4(),
+                data: (0..32).map(|_| random()).collect(),
+                metadata: None,
+            })
+            .collect();
+        
+        let mut config = CollectionConfig {
+            name: "ivfpq".to_string(),
+            dimension: 32,
+            distance_metric: DistanceMetric::Euclidean,
+            vector_type: VectorType::Float32,
+            index_config: IndexConfig {
+                index_type: IndexType::IvfPq,
+                nlist: 16,
+                pq_subvectors: 64,
+                ..IndexConfig::default()
+            },
+            durability: None,
+            indexed_fields: Vec::new(),
+        };
+        assert!(matches!(
+            store.create_collection(&config).await,
+            Err(VectorDbError::ConfigError { .. })
+        ));
+        config.index_config.pq_subvectors = 8;
+        store.create_collection(&config).await.unwrap();
+        store.batch_insert("ivfpq", &vectors).await.unwrap();
+        
+        // Scanning every list, reranked distances are exact and the stored
+        // vector itself comes first
+        let request = QueryRequest {
+            collection: "ivfpq".to_string(),
+            vector: vectors[42].data.clone(),
+            limit: 5,
+            ef_search: None,
+            nprobe: Some(16),
+            oversampling: None,
+            exact: false,
+            filter: None,
+            deadline_ms: None,
+        };
+        let results = store.query(&request).await.unwrap();
+        assert_eq!(results.len(), 5);
+        assert_eq!(results[0].id, vectors[42].id);
+        assert_eq!(results[0].distance, 0.0);
+        for result in &results {
+            let stored = vectors.iter().find(|v| v.id == result.id).unwrap();
+            assert_eq!(result.distance, distance(&request.vector, &stored.data, DistanceMetric::Euclidean));
+        }
+    }
+    
+    #[tokio::test]
+    async fn test_flat_collection_exact() {
+        let (store, _temp_dir) = create_test_store().await;
+        let mut seed = 5u64;
+        let mut random = move || {
+            seed = seed.wrapping_mul(6364136223846793005).wrapping_add(1442695040888963407);
+            (seed >> 40) as f32 / (1u64 << 24) as f32 - 0.5
+        };
+        let vectors: Vec<Vector> = (0..500)
+            .map(|_| Vector {
+                id: Uuid::new_v4(),
+                data: (0..16).map(|_| random()).collect(),
+                metadata: None,
+            })
+            .collect();
+        
+        for index_type in [IndexType::Flat, IndexType::Hnsw] {
+            let name = format!("{:?}", index_type).to_lowercase();
+            let config = CollectionConfig {
+                name: name.clone(),
+                dimension: 16,
+                distance_metric: DistanceMetric::Euclidean,
+                vector_type: VectorType::Float32,
+                index_config: IndexConfig {
+                    index_type,
+                    ..IndexConfig::default()
+                },
+                durability: None,
+                indexed_fields: Vec::new(),
+            };
+            store.create_collection(&config).await.unwrap();
+            store.batch_insert(&name, &vectors).await.unwrap();
+            
+            // Both a flat collection and an exact query on HNSW return the
+            // true nearest neighbors
+            let query: Vec<f32> = (0..16).map(|_| random()).collect();
+            let mut expected: Vec<_> = vectors
+                .iter()
+                .map(|v| (distance(&query, &v.data, DistanceMetric::Euclidean), v.id))
+                .collect();
+            expected.sort_by(|a, b| a.0.partial_cmp(&b.0).unwrap());
+            let request = QueryRequest {
+                collection: name.clone(),
+                vector: query,
+                limit: 10,
+                ef_search: None,
+                nprobe: None,
+                oversampling: None,
+                exact: index_type == IndexType::Hnsw,
+                filter: None,
+                deadline_ms: None,
+            };
+            let results = store.query(&request).await.unwrap();
+            let ids: Vec<_> = results.iter().map(|r| r.id).collect();
+            let expected_ids: Vec<_> = expected.iter().take(10).map(|(_, id)| *id).collect();
+            assert_eq!(ids, expected_ids);
+        }
+    }
+    
+    #[tokio::test]
+    async fn test_filtered_query() {
+        let temp_dir = tempdir().unwrap();
+        let config = CollectionConfig {
+            name: "test".to_string(),
+            dimension: 2,
+            distance_metric: DistanceMetric::Euclidean,
+            vector_type: VectorType::Float32,
+            index_config: IndexConfig::default(),
+            durability: None,
+            indexed_fields: vec!["category".to_string()],
+        };
+        
+        // One vector in ten is "rare"; "parity" is not indexed
+        let vectors: Vec<Vector> = (0..500)
+            .map(|i| {
+                let category = if i % 10 == 0 { "rare" } else { "common" };
+                let metadata = serde_json::json!({"category": category, "parity": i % 2});
+                Vector {
+                    id: Uuid::new_v4(),
+                    data: vec![i as f32, 0.0],
+                    metadata: Some(serde_json::from_value(metadata).unwrap()),
+                }
+            })
+            .collect();
+        
+        let query = |filter: serde_json::Value| QueryRequest {
+            collection: "test".to_string(),
+            vector: vec![253.4, 0.0],
+            limit: 3,
+            ef_search: None,
+            nprobe: None,
+            oversampling: None,
+            exact: false,
+            filter: Some(serde_json::from_value(filter).unwrap()),
+            deadline_ms: None,
+        };
+        {
+            let store = VectorStore::new(temp_dir.path()).await.unwrap();
+            store.create_collection(&config).await.unwrap();
+            store.batch_insert("test", &vectors).await.unwrap();
+            
+            // Indexed field: exact scan over the matching subset
+            let results = store.query(&query(serde_json::json!({"category": "rare"}))).await.unwrap();
+            let ids: Vec<VectorId> = results.iter().map(|r| r.id).collect();
+            assert_eq!(ids, vec![vectors[250].id, vectors[260].id, vectors[240].id]);
+            
+            // Indexed plus unindexed conditions, with gRPC-style string values
+            let results = store.query(&query(serde_json::json!({"category": "common", "parity": "1"}))).await.unwrap();
+            let ids: Vec<VectorId> = results.iter().map(|r| r.id).collect();
+            assert_eq!(ids, vec![vectors[253].id, vectors[255].id, vectors[251].id]);
+            
+            // Unindexed field only: filtered graph traversal
+            let results = store.query(&query(serde_json::json!({"parity": 0}))).await.unwrap();
+            assert_eq!(results.len(), 3);
+            assert!(results.iter().all(|r| r.metadata.as_ref().unwrap()["parity"] == 0));
+            
+            store.delete("test", &vectors[250].id).await.unwrap();
+            store.snapshot_indexes().await.unwrap();
+        }
+        
+        // The payload index is rebuilt with the snapshot
+        let store = VectorStore::new(temp_dir.path()).await.unwrap();
+        let results = store.query(&query(serde_json::json!({"category": "rare"}))).await.unwrap();
+        let ids: Vec<VectorId> = results.iter().map(|r| r.id).collect();
+        assert_eq!(ids, vec![vectors[260].id, vectors[240].id, vectors[270].id]);
+    }
+    
+    #[tokio::test]
+    async fn test_snapshot_and_restart() {
+        let temp_dir = tempdir().unwrap();
+        let config = CollectionConfig {
+            name: "test".to_string(),
+            dimension: 3,
+            distance_metric: DistanceMetric::Euclidean,
+            vector_type: VectorType::Float32,
+            index_config: IndexConfig::default(),
+            durability: None,
+            indexed_fields: Vec::new(),
+        };
+        let before = Vector { id: Uuid::new_v4(), data: vec![1.0, 0.0, 0.0], metadata: None };
+        let after = Vector { id: Uuid::new_v4(), data: vec![0.0, 1.0, 0.0], metadata: None };
+        
+        {
+            let store = VectorStore::new(temp_dir.path()).await.unwrap();
+            store.create_collection(&config).await.unwrap();
+            store.insert("test", &before).await.unwrap();
+            assert_eq!(store.snapshot_indexes().await.unwrap(), 1);
+            assert_eq!(store.snapshot_indexes().await.unwrap(), 0); // Nothing new
+            
+            // Logged after the snapshot, so it must come back from the WAL tail
+            store.insert("test", &after).await.unwrap();
+        }
+        
+        let store = VectorStore::new(temp_dir.path()).await.unwrap();
+        let stats = store.get_collection_stats("test").await.unwrap().unwrap();
+        assert_eq!(stats.vector_count, 2);
+        
+        let query = QueryRequest {
+            collection: "test".to_string(),
+            vector: vec![0.0, 1.0, 0.0],
+            limit: 2,
+            ef_search: None,
+            nprobe: None,
+            oversampling: None,
+            exact: false,
+            filter: None,
+            deadline_ms: None,
+        };
+        let results = store.query(&query).await.unwrap();
+        assert!(results.iter().any(|r| r.id == before.id));
+        assert!(results.iter().any(|r| r.id == after.id));
+    }
+    
+    #[tokio::test]
+    async fn test_unusable_snapshot_after_wal_pruned() {
+        let temp_dir = tempdir().unwrap();
+        let options = StorageOptions {
+            wal_segment_size: 512,
+            ..StorageOptions::default()
+        };
+        let config = CollectionConfig {
+            name: "test".to_string(),
+            dimension: 3,
+            distance_metric: DistanceMetric::Euclidean,
+            vector_type: VectorType::Float32,
+            index_config: IndexConfig::default(),
+            durability: None,
+            indexed_fields: Vec::new(),
+        };
+        let vectors: Vec<Vector> = (0..50)
+            .map(|i| Vector { id: Uuid::new_v4(), data: vec![i as f32, 1.0, 0.0], metadata: None })
+            .collect();
+        
+        {
+            let store = VectorStore::with_options(temp_dir.path(), options.clone()).await.unwrap();
+            store.create_collection(&config).await.unwrap();
+            for vector in &vectors {
+                store.insert("test", vector).await.unwrap();
+            }
+            store.snapshot_indexes().await.unwrap();
+            assert!(store.storage.wal_oldest_lsn().await.unwrap() > 0);
+        }
+        
+        // The vectors logged before the retained WAL only survive in storage
+        let snapshot_path = temp_dir.path().join("test").join(snapshot::SNAPSHOT_FILE);
+        std::fs::write(&snapshot_path, b"not a snapshot").unwrap();
+        
+        let store = VectorStore::with_options(temp_dir.path(), options).await.unwrap();
+        assert_eq!(store.index("test").unwrap().stats().vector_count, vectors.len());
+    }
+    
+    #[tokio::test]
+    async fn test_bulk_load_survives_restart() {
+        let temp_dir = tempdir().unwrap();
+        let config = CollectionConfig {
+            name: "bulk".to_string(),
+            dimension: 4,
+            distance_metric: DistanceMetric::Euclidean,
+            vector_type: VectorType::Float32,
+            index_config: IndexConfig::default(),
+            durability: None,
+            indexed_fields: Vec::new(),
+        };
+        let vectors: Vec<Vector> = (0..300)
+            .map(|i| Vector {
+                id: Uuid::new_v4(),
+                data: vec![i as f32, (i % 7) as f32, (i % 13) as f32, 1.0],
+                metadata: None,
+            })
+            .collect();
+        let query = QueryRequest {
+            collection: "bulk".to_string(),
+            vector: vectors[123].data.clone(),
+            limit: 1,
+            ef_search: None,
+            nprobe: None,
+            oversampling: None,
+            exact: false,
+            filter: None,
+            deadline_ms: None,
+        };
+        
+        {
+            let store = VectorStore::new(temp_dir.path()).await.unwrap();
+            store.create_collection(&config).await.unwrap();
+            assert!(store.bulk_insert("bulk", &vectors).await.is_err());
+            
+            store.begin_bulk_load("bulk").await.unwrap();
+            assert!(store.begin_bulk_load("bulk").await.is_err());
+            for chunk in vectors.chunks(128) {
+                store.bulk_insert("bulk", chunk).await.unwrap();
+            }
+            let progress = store.bulk_load_progress("bulk").unwrap();
+            assert_eq!((progress.phase, progress.vectors_loaded), (BulkLoadPhase::Loading, 300));
+            assert!(store.query(&query).await.unwrap().is_empty());
+            
+            let progress = store.finish_bulk_load("bulk").await.unwrap();
+            assert_eq!(progress.phase, BulkLoadPhase::Done);
+            assert_eq!(progress.vectors_indexed, 300);
+            assert_eq!(store.query(&query).await.unwrap()[0].id, vectors[123].id);
+        }
+        
+        // The load was never logged; the snapshot and checkpoint carry it
+        let store = VectorStore::new(temp_dir.path()).await.unwrap();
+        let stats = store.get_collection_stats("bulk").await.unwrap().unwrap();
+        assert_eq!(stats.vector_count, 300);
+        assert_eq!(store.query(&query).await.unwrap()[0].id, vectors[123].id);
+        assert!(store.bulk_load_progress("bulk").is_none());
+    }
+    
+    #[tokio::test]
+    async fn test_reindex_with_concurrent_writes() {
+        let temp_dir = tempdir().unwrap();
+        let config = CollectionConfig {
+            name: "docs".to_string(),
+            dimension: 4,
+            distance_metric: DistanceMetric::Euclidean,
+            vector_type: VectorType::Float32,
+            index_config: IndexConfig::default(),
+            durability: None,
+            indexed_fields: Vec::new(),
+        };
+        let vector = |i: usize| Vector {
+            id: Uuid::new_v4(),
+            data: vec![i as f32, (i % 7) as f32, (i % 13) as f32, 1.0],
+            metadata: None,
+        };
+        let vectors: Vec<Vector> = (0..2000).map(vector).collect();
+        let added = vector(5000);
+        let query = |v: &Vector| QueryRequest {
+            collection: "docs".to_string(),
+            vector: v.data.clone(),
+            limit: 1,
+            ef_search: None,
+            nprobe: None,
+            oversampling: None,
+            exact: false,
+            filter: None,
+            deadline_ms: None,
+        };
+        let index_config = IndexConfig {
+            max_connections: 8,
+            ef_construction: 50,
+            ..IndexConfig::default()
+        };
+        
+        {
+            let store = VectorStore::new(temp_dir.path()).await.unwrap();
+            store.create_collection(&config).await.unwrap();
+            store.batch_insert("docs", &vectors).await.unwrap();
+        
+            let flat = IndexConfig { index_type: IndexType::Flat, ..IndexConfig::default() };
+            assert!(store.reindex_collection("docs", flat).await.is_err());
+        
+            // Writes made during the build reach the new index
+            let writes = async {
+                store.insert("docs", &added).await.unwrap();
+                store.delete("docs", &vectors[1999].id).await.unwrap();
+                store.update("docs", &Vector { data: vec![9000.0, 0.0, 0.0, 1.0], ..vectors[3].clone() }).await.unwrap();
+            };
+            let (stats, ()) = tokio::join!(store.reindex_collection("docs", index_config.clone()), writes);
+            let stats = stats.unwrap();
+            assert!(stats.vectors_indexed + stats.concurrent_writes >= 2000);
+            assert!(store.reindexes.read().is_empty());
+        
+            let current = store.get_collection_config("docs").unwrap().unwrap();
+            assert_eq!((current.index_config.max_connections, current.index_config.ef_construction), (8, 50));
+            assert_eq!(store.query(&query(&added)).await.unwrap()[0].id, added.id);
+            assert_ne!(store.query(&query(&vectors[1999])).await.unwrap()[0].id, vectors[1999].id);
+            assert_ne!(store.query(&query(&vectors[3])).await.unwrap()[0].id, vectors[3].id);
+        }
+        
+        // The new parameters and index are snapshotted with the swap
+        let store = VectorStore::new(temp_dir.path()).await.unwrap();
+        let current = store.get_collection_config("docs").unwrap().unwrap();
+        assert_eq!((current.index_config.max_connections, current.index_config.ef_construction), (8, 50));
+        assert_eq!(store.get_collection_stats("docs").await.unwrap().unwrap().vector_count, 2000);
+        assert_eq!(store.query(&query(&vectors[1234])).await.unwrap()[0].id, vectors[1234].id);
+        assert_eq!(store.query(&query(&added)).await.unwrap()[0].id, added.id);
+        
+        // A new search default is stored without rebuilding
+        let tuned = IndexConfig { ef_search: 20, ..index_config };
+        let stats = store.reindex_collection("docs", tuned).await.unwrap();
+        assert_eq!(stats.vectors_indexed, 0);
+        assert_eq!(store.get_collection_config("docs").unwrap().unwrap().index_config.ef_search, 20);
+        assert_eq!(store.query(&query(&added)).await.unwrap()[0].id, added.id);
+    }
+
+    #[tokio::test]
+    async fn test_alias_switch() {
+        let temp_dir = tempdir().unwrap();
+        let config = |name: &str| CollectionConfig {
+            name: name.to_string(),
+            dimension: 2,
+            distance_metric: DistanceMetric::Euclidean,
+            vector_type: VectorType::Float32,
+            index_config: IndexConfig::default(),
+            durability: None,
+            indexed_fields: Vec::new(),
+        };
+        let vector = |x: f32| Vector {
+            id: Uuid::new_v4(),
+            data: vec![x, 0.0],
+            metadata: None,
+        };
+        let (old, new) = (vector(1.0), vector(2.0));
+        let query = QueryRequest {
+            collection: "docs".to_string(),
+            vector: vec![0.0, 0.0],
+            limit: 10,
+            ef_search: None,
+            nprobe: None,
+            oversampling: None,
+            exact: false,
+            filter: None,
+            deadline_ms: None,
+        };
+        
+        {
+            let store = VectorStore::new(temp_dir.path()).await.unwrap();
+            store.create_collection(&config("docs_v1")).await.unwrap();
+            store.create_collection(&config("docs_v2")).await.unwrap();
+            store.insert("docs_v2", &new).await.unwrap();
+            assert!(store.set_alias("docs", "missing").await.is_err());
+            assert!(store.set_alias("docs_v1", "docs_v2").await.is_err());
+            
+            // Reads and writes through the alias reach its target
+            store.set_alias("docs", "docs_v1").await.unwrap();
+            store.insert("docs", &old).await.unwrap();
+            assert_eq!(store.query(&query).await.unwrap()[0].id, old.id);
+            assert!(store.create_collection(&config("docs")).await.is_err());
+            
+            let switched = store.set_alias("docs", "docs_v2").await.unwrap();
+            assert_eq!(switched.collection, "docs_v2");
+            assert_eq!(store.query(&query).await.unwrap()[0].id, new.id);
+            assert_eq!(store.get_collection_config("docs").unwrap().unwrap().name, "docs_v2");
+        }
+        
+        let store = VectorStore::new(temp_dir.path()).await.unwrap();
+        assert_eq!(store.get("docs", &new.id).await.unwrap().unwrap().id, new.id);
+        store.delete_collection("docs_v2").await.unwrap();
+        assert!(store.get_alias("docs").is_none());
+        assert!(store.list_aliases().is_empty());
+    }
+    
+    #[tokio::test]
+    async fn test_get_and_delete_after_restart() {
+        let temp_dir = tempdir().unwrap();
+        let config = CollectionConfig {
+            name: "test".to_string(),
+            dimension: 3,
+            distance_metric: DistanceMetric::Cosine,
+            vector_type: VectorType::Float32,
+            index_config: IndexConfig::default(),
+            durability: None,
+            indexed_fields: Vec::new(),
+        };
+        let kept = Vector { id: Uuid::new_v4(), data: vec![1.0, 2.0, 3.0], metadata: None };
+        let removed = Vector { id: Uuid::new_v4(), data: vec![3.0, 2.0, 1.0], metadata: None };
+        
+        {
+            let store = VectorStore::new(temp_dir.path()).await.unwrap();
+            store.create_collection(&config).await.unwrap();
+            store.batch_insert("test", &[kept.clone(), removed.clone()]).await.unwrap();
+            store.snapshot_indexes().await.unwrap();
+            assert!(store.delete("test", &removed.id).await.unwrap());
+        }
+        
+        let store = VectorStore::new(temp_dir.path()).await.unwrap();
+        let fetched = store.get("test", &kept.id).await.unwrap().unwrap();
+        assert_eq!(fetched.data, kept.data);
+        assert!(store.get("test", &removed.id).await.unwrap().is_none());
+        assert!(!store.delete("test", &removed.id).await.unwrap());
+    }
+    
+    #[tokio::test]
+    async fn test_compact_garbage_after_updates() {
+        let temp_dir = tempdir().unwrap();
+        let config = CollectionConfig {
+            name: "test".to_string(),
+            dimension: 3,
+            distance_metric: DistanceMetric::Cosine,
+            vector_type: VectorType::Float32,
+            index_config: IndexConfig::default(),
+            durability: None,
+            indexed_fields: Vec::new(),
+        };
+        let mut vector = Vector { id: Uuid::new_v4(), data: vec![1.0, 0.0, 0.0], metadata: None };
+        
+        {
+            let store = VectorStore::new(temp_dir.path()).await.unwrap();
+            store.create_collection(&config).await.unwrap();
+            store.insert("test", &vector).await.unwrap();
+            for i in 0..9 {
+                vector.data = vec![1.0, i as f32, 0.0];
+                store.update("test", &vector).await.unwrap();
+            }
+            
+            // Below the threshold nothing is rewritten
+            assert!(store.compact_garbage(0.95, None).await.unwrap().is_empty());
+            let compacted = store.compact_garbage(0.5, None).await.unwrap();
+            assert_eq!(compacted.len(), 1);
+            assert_eq!(compacted[0].live_vectors, 1);
+            assert!(compacted[0].bytes_reclaimed > 0);
+        }
+        
+        let store = VectorStore::new(temp_dir.path()).await.unwrap();
+        let fetched = store.get("test", &vector.id).await.unwrap().unwrap();
+        assert_eq!(fetched.data, vector.data);
+        
+        let results = store.query(&QueryRequest {
+            collection: "test".to_string(),
+            vector: vector.data.clone(),
+            limit: 1,
+            ef_search: None,
+            nprobe: None,
+            oversampling: None,
+            exact: false,
+            filter: None,
+            deadline_ms: None,
+        }).await.unwrap();
+        assert_eq!(results[0].id, vector.id);
+    }
+}
@@ -0,0 +1,195 @@
+use vectordb_common::{Result, VectorDbError};
+use metrics::{counter, gauge, histogram};
+use parking_lot::Mutex;
+use std::panic::{catch_unwind, AssertUnwindSafe};
+use std::sync::atomic::{AtomicUsize, Ordering};
+use std::sync::mpsc;
+use std::sync::Arc;
+use std::time::Instant;
+use tokio::sync::{oneshot, OwnedSemaphorePermit, Semaphore};
+
+type Job = Box<dyn FnOnce() + Send>;
+
+/// Worker pool sizing
+#[derive(Debug, Clone)]
+pub struct WorkerPoolOptions {
+    /// Worker threads; 0 means one per core
+    pub threads: usize,
+    /// Jobs allowed to wait for a worker before searches are rejected
+    pub queue_capacity: usize,
+}
+
+impl Default for WorkerPoolOptions {
+    fn default() -> Self {
+        Self {
+            threads: 0,
+            queue_capacity: 1024,
+        }
+    }
+}
+
+/// Fixed set of threads running CPU-bound index work off the async runtime
+///
+/// At most `threads + queue_capacity` jobs are admitted at once. Writers
+/// wait for a slot with `run`; searches use `try_run` and are rejected with
+/// `VectorDbError::Overloaded` when the queue is full, so a saturated server
+/// sheds load instead of stalling every connection.
+pub struct WorkerPool {
+    sender: Mutex<mpsc::Sender<Job>>,
+    slots: Arc<Semaphore>,
+    queued: Arc<AtomicUsize>,
+    threads: usize,
+    queue_capacity: usize,
+}
+
+impl WorkerPool {
+    pub fn new(options: &WorkerPoolOptions) -> Result<Self> {
+        let threads = match options.threads {
+            0 => std::thread::available_parallelism().map_or(1, |n| n.get()),
+            n => n,
+        };
+
+        let (sender, receiver) = mpsc::channel::<Job>();
+        let receiver = Arc::new(Mutex::new(receiver));
+        for worker in 0..threads {
+            let receiver = Arc::clone(&receiver);
+            std::thread::Builder::new()
+                .name(format!("vectordb-worker-{}", worker))
+                .spawn(move || loop {
+                    // Exits once the pool, and with it the sender, is dropped
+                    let job = match receiver.lock().recv() {
+                        Ok(job) => job,
+                        Err(_) => break,
+                    };
+                    // A panicking job drops its result sender; keep the worker
+                    let _ = catch_unwind(AssertUnwindSafe(job));
+                })?;
+        }
+
+        Ok(Self {
+            sender: Mutex::new(sender),
+            slots: Arc::new(Semaphore::new(threads + options.queue_capacity)),
+            queued: Arc::new(AtomicUsize::new(0)),
+            threads,
+            queue_capacity: options.queue_capacity,
+        })
+    }
+
+    /// Run a job, waiting for a free slot if the pool is saturated
+    pub async fn run<F, T>(&self, job: F) -> Result<T>
+    where
+        F: FnOnce() -> T + Send + 'static,
+        T: Send + 'static,
+    {
+        let permit = Arc::clone(&self.slots)
+            .acquire_owned()
+            .await
+            .map_err(|e| VectorDbError::Internal { message: e.to_string() })?;
+        self.dispatch(permit, job).await
+    }
+
+    /// Run a job, rejecting it if no slot is free
+    pub async fn try_run<F, T>(&self, job: F) -> Result<T>
+    where
+        F: FnOnce() -> T + Send + 'static,
+        T: Send + 'static,
+    {
+        let permit = match Arc::clone(&self.slots).try_acquire_owned() {
+            Ok(permit) => permit,
+            Err(_) => {
+                counter!("vectorstore.pool.rejected").increment(1);
+                return Err(VectorDbError::Overloaded {
+                    message: format!("{} jobs queued for {} workers", self.queue_depth(), self.threads),
+                });
+            }
+        };
+        self.dispatch(permit, job).await
+    }
+
+    /// Jobs waiting for a worker
+    pub fn queue_depth(&self) -> usize {
+        self.queued.load(Ordering::Relaxed)
+    }
+
+    /// Jobs that may wait for a worker before searches are rejected
+    pub fn queue_capacity(&self) -> usize {
+        self.queue_capacity
+    }
+
+    async fn dispatch<F, T>(&self, permit: OwnedSemaphorePermit, job: F) -> Result<T>
+    where
+        F: FnOnce() -> T + Send + 'static,
+        T: Send + 'static,
+    {
+        let (result_tx, result_rx) = oneshot::channel();
+        let queued = Arc::clone(&self.queued);
+        let enqueued_at = Instant::now();
+
+        let depth = queued.fetch_add(1, Ordering::Relaxed) + 1;
+        gauge!("vectorstore.pool.queue_depth").set(depth as f64);
+
+        let task: Job = Box::new(move || {
+            let depth = queued.fetch_sub(1, Ordering::Relaxed) - 1;
+            gauge!("vectorstore.pool.queue_depth").set(depth as f64);
+            histogram!("vectorstore.pool.wait").record(enqueued_at.elapsed().as_secs_f64());
+
+            let _ = result_tx.send(job());
+            drop(permit);
+        });
+
+        self.sender
+            .lock()
+            .send(task)
+            .map_err(|_| VectorDbError::Internal { message: "worker pool has shut down".to_string() })?;
+
+        result_rx
+            .await
+            .map_err(|_| VectorDbError::Internal { message: "worker pool job panicked".to_string() })
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use std::sync::Barrier;
+
+    #[tokio::test]
+    async fn test_jobs_run_off_runtime() {
+        let pool = WorkerPool::new(&WorkerPoolOptions { threads: 2, queue_capacity: 4 }).unwrap();
+        let name = pool.run(|| std::thread::current().name().map(String::from)).await.unwrap();
+        assert!(name.unwrap().starts_with("vectordb-worker-"));
+
+        // A panicking job fails alone and the worker keeps serving
+        assert!(pool.run(|| panic!("boom")).await.is_err());
+        assert_eq!(pool.run(|| 2 + 2).await.unwrap(), 4);
+    }
+
+    #[tokio::test]
+    async fn test_full_queue_rejects_searches() {
+        let pool = Arc::new(WorkerPool::new(&WorkerPoolOptions { threads: 1, queue_capacity: 1 }).unwrap());
+        let gate = Arc::new(Barrier::new(2));
+
+        // Occupy the worker, then the single queue slot
+        let running = {
+            let (pool, gate) = (Arc::clone(&pool), Arc::clone(&gate));
+            tokio::spawn(async move { pool.run(move || { gate.wait(); }).await })
+        };
+        let queued = {
+            let pool = Arc::clone(&pool);
+            tokio::spawn(async move { pool.run(|| 1).await })
+        };
+        while pool.slots.available_permits() > 0 {
+            tokio::task::yield_now().await;
+        }
+
+        match pool.try_run(|| 2).await {
+            Err(VectorDbError::Overloaded { .. }) => {}
+            other => panic!("expected overload, got {:?}", other.map(|_| ())),
+        }
+
+        gate.wait();
+        running.await.unwrap().unwrap();
+        assert_eq!(queued.await.unwrap().unwrap(), 1);
+        assert_eq!(pool.try_run(|| 3).await.unwrap(), 3);
+    }
+}
@@ -0,0 +1,41 @@
+use vectordb_common::types::*;
+use vectordb_index::VectorIndex;
+use serde::Serialize;
+use std::collections::HashSet;
+use std::sync::Arc;
+
+/// Outcome of rebuilding a collection's index with new parameters
+#[derive(Debug, Clone, PartialEq, Eq, Serialize)]
+pub struct ReindexStats {
+    pub collection: CollectionId,
+    /// Vectors copied from storage into the new index
+    pub vectors_indexed: usize,
+    /// Vectors written or deleted while the new index was being built
+    pub concurrent_writes: usize,
+    pub duration_ms: u64,
+}
+
+/// Index being built to replace a collection's current one
+///
+/// Writers apply their changes to both indexes while it exists. They record
+/// the ids they touch in `written` first, so the build skips those ids
+/// rather than overwrite a newer write with the stored vector it read.
+pub(crate) struct Reindex {
+    pub(crate) index: Arc<dyn VectorIndex>,
+    /// Held by the build while it adds a chunk of stored vectors
+    pub(crate) written: tokio::sync::Mutex<HashSet<VectorId>>,
+}
+
+impl Reindex {
+    pub(crate) fn new(index: Arc<dyn VectorIndex>) -> Self {
+        Self {
+            index,
+            written: tokio::sync::Mutex::new(HashSet::new()),
+        }
+    }
+
+    /// Note writes to `ids`, which the build must leave to their writers
+    pub(crate) async fn mark_written(&self, ids: impl IntoIterator<Item = VectorId>) {
+        self.written.lock().await.extend(ids);
+    }
+}
@@ -0,0 +1,105 @@
+use vectordb_common::{Result, VectorDbError};
+use memmap2::Mmap;
+use std::fs::{File, OpenOptions};
+use std::io::Write;
+use std::path::Path;
+
+/// Index snapshot file name inside each collection directory
+pub const SNAPSHOT_FILE: &str = "index.snapshot";
+
+const SNAPSHOT_MAGIC: &[u8; 8] = b"DVSNAP01";
+const HEADER_SIZE: usize = 8 + 8 + 8; // magic, WAL LSN, payload length
+
+/// A serialized index snapshot, memory-mapped from disk
+pub struct IndexSnapshot {
+    /// WAL position covered by the snapshot; later entries must be replayed
+    pub lsn: u64,
+    mmap: Mmap,
+    len: usize,
+}
+
+impl IndexSnapshot {
+    /// Serialized index bytes, borrowed from the mapping
+    pub fn data(&self) -> &[u8] {
+        &self.mmap[HEADER_SIZE..HEADER_SIZE + self.len]
+    }
+}
+
+/// Write a snapshot atomically: to a temporary file, fsync, then rename
+pub fn write_snapshot(dir: &Path, lsn: u64, data: &[u8]) -> Result<()> {
+    let path = dir.join(SNAPSHOT_FILE);
+    let tmp_path = dir.join(format!("{}.tmp", SNAPSHOT_FILE));
+
+    {
+        let mut file = OpenOptions::new()
+            .create(true)
+            .write(true)
+            .truncate(true)
+            .open(&tmp_path)?;
+        file.write_all(SNAPSHOT_MAGIC)?;
+        file.write_all(&lsn.to_le_bytes())?;
+        file.write_all(&(data.len() as u64).to_le_bytes())?;
+        file.write_all(data)?;
+        file.sync_all()?;
+    }
+
+    std::fs::rename(&tmp_path, &path)?;
+    File::open(dir)?.sync_all()?;
+    Ok(())
+}
+
+/// Load a snapshot if one exists; torn or foreign files are reported as errors
+pub fn load_snapshot(dir: &Path) -> Result<Option<IndexSnapshot>> {
+    let path = dir.join(SNAPSHOT_FILE);
+    if !path.exists() {
+        return Ok(None);
+    }
+
+    let file = File::open(&path)?;
+    let mmap = unsafe { Mmap::map(&file)? };
+
+    if mmap.len() < HEADER_SIZE || &mmap[..8] != SNAPSHOT_MAGIC {
+        return Err(VectorDbError::StorageError {
+            message: format!("Invalid index snapshot: {}", path.display()),
+        });
+    }
+
+    let lsn = u64::from_le_bytes(mmap[8..16].try_into().unwrap());
+    let len = u64::from_le_bytes(mmap[16..24].try_into().unwrap()) as usize;
+    if HEADER_SIZE + len > mmap.len() {
+        return Err(VectorDbError::StorageError {
+            message: format!("Truncated index snapshot: {}", path.display()),
+        });
+    }
+
+    Ok(Some(IndexSnapshot { lsn, mmap, len }))
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use tempfile::tempdir;
+
+    #[test]
+    fn test_snapshot_roundtrip() {
+        let temp_dir = tempdir().unwrap();
+        assert!(load_snapshot(temp_dir.path()).unwrap().is_none());
+
+        write_snapshot(temp_dir.path(), 42, b"index bytes").unwrap();
+        let snapshot = load_snapshot(temp_dir.path()).unwrap().unwrap();
+        assert_eq!(snapshot.lsn, 42);
+        assert_eq!(snapshot.data(), b"index bytes");
+    }
+
+    #[test]
+    fn test_truncated_snapshot_rejected() {
+        let temp_dir = tempdir().unwrap();
+        write_snapshot(temp_dir.path(), 7, b"index bytes").unwrap();
+
+        let path = temp_dir.path().join(SNAPSHOT_FILE);
+        let file = OpenOptions::new().write(true).open(&path).unwrap();
+        file.set_len(HEADER_SIZE as u64 + 3).unwrap();
+
+        assert!(load_snapshot(temp_dir.path()).is_err());
+    }
+}